@@ -0,0 +1,118 @@
+"""
+Conditional GET (ETag / If-None-Match) for polled read endpoints.
+
+The ETag of a response is derived without running the endpoint, from:
+
+- the request path and query string
+- the user's id, role and departments (what they are allowed to see)
+- the change counters of the tables the endpoint reads
+  (backend.wrappers.table_events.table_version)
+- the current ``ETAG_MAX_AGE_SECONDS`` window (default 60)
+
+When the client's ``If-None-Match`` matches, the endpoint answers
+``304 Not Modified`` before touching the database or serializing anything.
+The change counters only see writes made by this process, so the time window
+bounds how long a write from another process or a SQL console can go
+unnoticed. ``ETAG_MAX_AGE_SECONDS=0`` turns conditional GET off: responses
+still carry an ETag, but every request is answered in full.
+
+Usage:
+    @router.get("/users")
+    def list_users(etag: str = Depends(conditional_get("users"))):
+        ...
+"""
+import hashlib
+import json
+import os
+import time
+import uuid
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from backend.utils.security import get_current_user
+from backend.wrappers.table_events import table_versions
+
+DEFAULT_MAX_AGE_SECONDS = 60
+
+# Counters restart with the process; keep tags from different runs apart
+_PROCESS_ID = uuid.uuid4().hex
+
+
+def etag_max_age() -> float:
+    """Seconds an ETag can stay valid without a local write (0: conditional GET is off)"""
+    return float(os.getenv("ETAG_MAX_AGE_SECONDS", DEFAULT_MAX_AGE_SECONDS))
+
+
+def compute_etag(request: Request, user: dict, tables: tuple, now: Optional[float] = None) -> str:
+    """
+    Strong ETag for what the user would get from this request right now
+
+    Args:
+        request: Incoming request
+        user: Decoded token of the requesting user
+        tables: Tables the endpoint's response is derived from
+        now: Current time (injectable for tests)
+
+    Returns:
+        Quoted ETag value
+    """
+    max_age = etag_max_age()
+    window = int((time.time() if now is None else now) // max_age) if max_age > 0 else 0
+    material = json.dumps([
+        _PROCESS_ID,
+        window,
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        user.get("sub"),
+        (user.get("role") or "").lower(),
+        sorted(user.get("departments") or []),
+        list(zip(tables, table_versions(tables))),
+    ])
+    return '"' + hashlib.sha256(material.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches etag (weak comparison, RFC 9110)
+
+    Args:
+        if_none_match: Header value, e.g. '"abc"', 'W/"abc", "def"' or '*'
+        etag: Current quoted ETag
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """Headers to send with a response carrying etag"""
+    # private: bodies are per user; no-cache: browsers must revalidate each time
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def conditional_get(*tables: str):
+    """
+    Dependency that answers 304 when the client's copy is still current
+    (never when ETAG_MAX_AGE_SECONDS is 0)
+
+    Args:
+        tables: Tables the endpoint reads
+
+    Returns:
+        Dependency returning the request's ETag. The ETag headers are set on
+        the injected response; endpoints that return a Response object
+        themselves must pass etag_headers(etag) to it.
+    """
+    def dependency(request: Request, response: Response, user: dict = Depends(get_current_user)) -> str:
+        etag = compute_etag(request, user, tables)
+        if etag_max_age() > 0 and etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=etag_headers(etag))
+        response.headers.update(etag_headers(etag))
+        return etag
+
+    return dependency
@@ -0,0 +1,104 @@
+"""
+ASGI middleware that records the Supabase calls made by each request.
+
+Every HTTP request gets its own QueryLog (see
+backend.wrappers.supabase_wrapper.instrumentation). When the response starts,
+the call count and database time so far are added as ``X-DB-Calls`` and
+``Server-Timing`` headers; when the request finishes, a one-line JSON summary
+is logged on the ``spm.queries`` logger, at WARNING level when the request made
+more than ``QUERY_LOG_MAX_CALLS`` calls, repeated a query, or looks like an
+N+1 pattern.
+
+Environment:
+    QUERY_LOG_MAX_CALLS            call count that flags a request (default 20)
+    QUERY_LOG_N_PLUS_ONE           repeats of one query shape that flag N+1 (default 5)
+    QUERY_LOG_RESPONSE_BYTES       "true" to size row payloads by re-serializing them
+                                   (default off; adds serialization work to every call)
+"""
+import json
+import logging
+import os
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from backend.wrappers.supabase_wrapper.instrumentation import (
+    QueryLog,
+    capture_queries,
+    DEFAULT_MAX_CALLS,
+    DEFAULT_N_PLUS_ONE_THRESHOLD,
+)
+
+logger = logging.getLogger("spm.queries")
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Attach a QueryLog to every HTTP request and report on it
+
+    Args:
+        app: ASGI application
+        max_calls: Call count above which a request is flagged
+        n_plus_one_threshold: Repeats of one query shape that count as N+1
+        add_headers: Whether to add X-DB-Calls / Server-Timing response headers
+        measure_bytes: Whether to size row payloads (see QueryLog)
+    """
+
+    def __init__(
+        self,
+        app,
+        max_calls: Optional[int] = None,
+        n_plus_one_threshold: Optional[int] = None,
+        add_headers: bool = True,
+        measure_bytes: Optional[bool] = None,
+    ):
+        self.app = app
+        self.max_calls = (
+            max_calls if max_calls is not None
+            else int(os.getenv("QUERY_LOG_MAX_CALLS", DEFAULT_MAX_CALLS))
+        )
+        self.n_plus_one_threshold = (
+            n_plus_one_threshold if n_plus_one_threshold is not None
+            else int(os.getenv("QUERY_LOG_N_PLUS_ONE", DEFAULT_N_PLUS_ONE_THRESHOLD))
+        )
+        self.add_headers = add_headers
+        self.measure_bytes = (
+            measure_bytes if measure_bytes is not None
+            else os.getenv("QUERY_LOG_RESPONSE_BYTES", "false").lower() in ("1", "true", "yes")
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log = QueryLog(
+            max_calls=self.max_calls,
+            n_plus_one_threshold=self.n_plus_one_threshold,
+            measure_bytes=self.measure_bytes,
+        )
+        status = {"code": None}
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message.get("status")
+                if self.add_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Calls"] = str(log.call_count)
+                    headers.append("Server-Timing", f'db;dur={log.total_ms:.1f};desc="{log.call_count} calls"')
+            await send(message)
+
+        with capture_queries(log):
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                self._report(scope, status["code"], log)
+
+    @staticmethod
+    def _report(scope, status_code: Optional[int], log: QueryLog) -> None:
+        summary = log.summary()
+        if not summary["calls"]:
+            return
+        summary = {"method": scope.get("method"), "path": scope.get("path"), "status": status_code, **summary}
+        level = logging.WARNING if summary["warnings"] else logging.INFO
+        logger.log(level, json.dumps(summary, default=str))
@@ -0,0 +1,25 @@
+"""
+JSON response class rendered with orjson.
+
+``FastJSONResponse`` is the app's default response class, so every endpoint's
+final encode uses orjson (stdlib json when orjson is not installed). FastAPI
+still walks a returned dict with ``jsonable_encoder`` and re-validates it
+against ``response_model`` first; endpoints that return large lists return a
+``FastJSONResponse`` directly to skip that walk. Pydantic models are
+serialized by pydantic-core in one pass.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from backend.wrappers.supabase_wrapper.fast_json import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with the fast JSON path"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return dumps(content)
@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from backend.core.query_instrumentation import QueryInstrumentationMiddleware
+from backend.core.responses import FastJSONResponse
 from backend.routers import auth, task, health, crud_test, project, reports , notification
 
-app = FastAPI(title="SPM Project API")
+app = FastAPI(title="SPM Project API", default_response_class=FastJSONResponse)
 
 # CORS middleware BEFORE routers (correct order!)
 origins = [
@@ -18,8 +20,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Calls", "Server-Timing"],
 )
 
+# Per-request Supabase call log; flags chatty and N+1 requests
+app.add_middleware(QueryInstrumentationMiddleware)
+
 app.include_router(health.router)
 app.include_router(auth.router)
 app.include_router(task.router)
@@ -0,0 +1,49 @@
+-- Migration: Record who could see a task before it moved out of their list
+-- /api/tasks/sync only reads the changed tasks a user can see now. A task that
+-- was reassigned, handed to another owner, moved to another main task,
+-- archived or deleted is no longer visible, so the delta would never tell the
+-- users who held it. This log keeps the access columns as they were before
+-- each such change, so the endpoint can send a tombstone to exactly those users.
+
+-- Step 1: One row per access change, holding the values before the change
+CREATE TABLE IF NOT EXISTS task_access_changes (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    task_id UUID NOT NULL,
+    owner_user_id UUID,
+    assignee_ids UUID[],
+    parent_id UUID,
+    is_archived BOOLEAN,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_access_changes_changed_at ON task_access_changes(changed_at);
+
+-- Step 2: Maintained by triggers so every writer is covered; NOW() matches the
+-- updated_at stamped by tasks_touch_updated_at in the same transaction
+CREATE OR REPLACE FUNCTION record_task_access_change() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO task_access_changes (task_id, owner_user_id, assignee_ids, parent_id, is_archived)
+    VALUES (OLD.id, OLD.owner_user_id, OLD.assignee_ids, OLD.parent_id, OLD.is_archived);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_record_access_change ON tasks;
+CREATE TRIGGER tasks_record_access_change
+AFTER UPDATE ON tasks
+FOR EACH ROW
+WHEN (
+    OLD.owner_user_id IS DISTINCT FROM NEW.owner_user_id
+    OR OLD.assignee_ids IS DISTINCT FROM NEW.assignee_ids
+    OR OLD.parent_id IS DISTINCT FROM NEW.parent_id
+    OR OLD.is_archived IS DISTINCT FROM NEW.is_archived
+)
+EXECUTE FUNCTION record_task_access_change();
+
+DROP TRIGGER IF EXISTS tasks_record_access_change_on_delete ON tasks;
+CREATE TRIGGER tasks_record_access_change_on_delete
+AFTER DELETE ON tasks
+FOR EACH ROW EXECUTE FUNCTION record_task_access_change();
+
+COMMENT ON TABLE task_access_changes IS
+'Access columns of tasks before they changed, for delta sync; rows older than the sync retention window (30 days) can be pruned';
@@ -0,0 +1,11 @@
+-- Migration: Index the archive flag used by TaskReader's server-side filters
+-- Regular task reads send is_archived IS NOT TRUE; /readArchivedTasks sends
+-- is_archived = true AND parent_id IS NOT NULL
+
+-- Step 1: Partial index covering only archived subtasks (small even when most tasks are archived)
+CREATE INDEX IF NOT EXISTS idx_tasks_archived_subtasks ON tasks(parent_id)
+WHERE is_archived IS TRUE AND parent_id IS NOT NULL;
+
+-- Step 2: Partial index over the active rows read by /readTasks
+CREATE INDEX IF NOT EXISTS idx_tasks_active ON tasks(id)
+WHERE is_archived IS NOT TRUE;
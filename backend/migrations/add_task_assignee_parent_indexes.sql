@@ -0,0 +1,12 @@
+-- Migration: Index the columns TaskReader filters on in the database
+-- Staff/manager task reads filter with assignee_ids @> '{<user_id>}' and then
+-- fetch parent tasks by id; without an index the containment check scans tasks
+
+-- Step 1: GIN index so the assignee_ids containment filter (PostgREST "cs") is index-backed
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee_ids ON tasks USING GIN (assignee_ids);
+
+-- Step 2: Index parent_id for subtask lookups by parent
+CREATE INDEX IF NOT EXISTS idx_tasks_parent_id ON tasks(parent_id);
+
+-- Verification query - should show an index scan on idx_tasks_assignee_ids
+-- EXPLAIN SELECT id FROM tasks WHERE assignee_ids @> ARRAY['<user_id>']::uuid[];
@@ -0,0 +1,17 @@
+-- Migration: Index the sort keys of the paginated /readTasks listing
+-- Pages are read with ORDER BY <sort column>, id and a keyset predicate on the
+-- same pair, over rows where is_archived IS NOT TRUE
+
+-- One (sort column, id) index per sort key, limited to active rows;
+-- the project_id filter uses idx_tasks_project_id from add_project_id_to_tasks.sql
+CREATE INDEX IF NOT EXISTS idx_tasks_active_due_date ON tasks(due_date, id)
+WHERE is_archived IS NOT TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_tasks_active_priority ON tasks(priority, id)
+WHERE is_archived IS NOT TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_tasks_active_status ON tasks(status, id)
+WHERE is_archived IS NOT TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_tasks_active_updated_at ON tasks(updated_at, id)
+WHERE is_archived IS NOT TRUE;
@@ -0,0 +1,49 @@
+-- Migration: Change tracking for the /api/tasks/sync delta endpoint
+-- Clients resume from a watermark on (updated_at, id); deleted tasks are
+-- reported from task_tombstones. Both are maintained by triggers so every
+-- writer (API, recurrence regeneration, SQL console) is covered.
+
+-- Step 1: updated_at on every task, maintained by the database
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ;
+UPDATE tasks SET updated_at = COALESCE(created_at, NOW()) WHERE updated_at IS NULL;
+ALTER TABLE tasks ALTER COLUMN updated_at SET DEFAULT NOW();
+ALTER TABLE tasks ALTER COLUMN updated_at SET NOT NULL;
+
+CREATE OR REPLACE FUNCTION touch_task_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_touch_updated_at ON tasks;
+CREATE TRIGGER tasks_touch_updated_at
+BEFORE UPDATE ON tasks
+FOR EACH ROW EXECUTE FUNCTION touch_task_updated_at();
+
+-- Step 2: Watermark scans read (updated_at, id) in order
+CREATE INDEX IF NOT EXISTS idx_tasks_updated_at_id ON tasks(updated_at, id);
+
+-- Step 3: One tombstone per deleted task
+CREATE TABLE IF NOT EXISTS task_tombstones (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    task_id UUID NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_tombstones_deleted_at ON task_tombstones(deleted_at);
+
+CREATE OR REPLACE FUNCTION record_task_tombstone() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO task_tombstones (task_id) VALUES (OLD.id);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_record_tombstone ON tasks;
+CREATE TRIGGER tasks_record_tombstone
+AFTER DELETE ON tasks
+FOR EACH ROW EXECUTE FUNCTION record_task_tombstone();
+
+COMMENT ON TABLE task_tombstones IS
+'Deleted task ids for delta sync; rows older than the sync retention window (30 days) can be pruned';
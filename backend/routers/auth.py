@@ -1,16 +1,18 @@
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from backend.schemas.user import TokenResponse
+from backend.core.etag import conditional_get
 from backend.utils.security import verify_password, create_access_token, get_current_user
 
 from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.supabase_wrapper.projections import projection, USER_AUTH
 from backend.utils.user_crud.user_manager import UserManager
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 @router.post("/login", response_model=TokenResponse)
 def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    result = SupabaseCRUD().client.table("users").select("*").eq("email", form_data.username).execute()
+    result = SupabaseCRUD().client.table("users").select(projection("users", USER_AUTH)).eq("email", form_data.username).execute()
     if not result.data:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
@@ -34,7 +36,10 @@ def logout():
 
 
 @router.get("/users")
-def get_all_users_for_assignment(user: dict = Depends(get_current_user)):
+def get_all_users_for_assignment(
+    user: dict = Depends(get_current_user),
+    etag: str = Depends(conditional_get("users"))
+):
     """Get list of all users for task assignment"""
     try:
         user_manager = UserManager()
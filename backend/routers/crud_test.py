@@ -1,5 +1,9 @@
+from dataclasses import asdict
 from fastapi import APIRouter, HTTPException
 from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.supabase_wrapper.query_cache import get_shared_cache
+from backend.wrappers.supabase_wrapper.resilience import get_execution_policy
+from backend.wrappers.supabase_wrapper.singleflight import get_singleflight, get_async_singleflight
 from backend.schemas.crud_schemas import (
     ReadRequest,
     CreateRequest,
@@ -57,7 +61,34 @@ def delete_record(request: DeleteRequest):
 @router.post("/count")
 def count_records(request: CountRequest):
     try:
-        result = SupabaseCRUD().count(table=request.table_name, filters=request.filters)
+        result = SupabaseCRUD().count(table=request.table_name, filters=request.filters, mode=request.mode)
         return {"count": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error counting {request.table_name}: {str(e)}")
+
+
+@router.get("/cache-stats")
+def cache_stats():
+    cache = get_shared_cache()
+    if cache is None:
+        return {"enabled": False}
+    stats = cache.stats()
+    return {"enabled": True, **asdict(stats), "hit_ratio": round(stats.hit_ratio, 4)}
+
+
+@router.get("/resilience-stats")
+def resilience_stats():
+    policy = get_execution_policy()
+    return {"breaker": policy.breaker.state, "trips": policy.breaker.trips, **policy.metrics().to_dict()}
+
+
+@router.get("/coalescing-stats")
+def coalescing_stats():
+    flights, async_flights = get_singleflight(), get_async_singleflight()
+    if flights is None:
+        return {"enabled": False}
+    stats = {}
+    for name, source in (("sync", flights), ("async", async_flights)):
+        counters = source.stats()
+        stats[name] = {**asdict(counters), "saved_ratio": round(counters.saved_ratio, 4)}
+    return {"enabled": True, **stats}
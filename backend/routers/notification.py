@@ -1,5 +1,6 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, Query, HTTPException
+from backend.core.etag import conditional_get
 from backend.utils.security import get_current_user
 from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
 
@@ -9,6 +10,7 @@ router = APIRouter(prefix="/api/notifications", tags=["notifications"])
 def get_notifications(
     limit: Optional[int] = Query(50, description="Max notifications to return"),
     user: dict = Depends(get_current_user),
+    etag: str = Depends(conditional_get("notifications")),
 ):
     """
     Return all notifications for the authenticated user (no read/unread filtering).
@@ -1,6 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List
+from backend.core.etag import conditional_get
 from backend.utils.security import get_current_user
+from backend.wrappers.table_events import notify_write
+from backend.wrappers.supabase_wrapper.query_cache import get_shared_cache
+from backend.wrappers.supabase_wrapper.singleflight import get_singleflight
 from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
 from backend.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
 from datetime import datetime
@@ -8,6 +12,22 @@ from datetime import datetime
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
 
+def _projects_written() -> None:
+    """
+    Do what SupabaseCRUD does after a write to the projects table
+
+    The writes below go through the raw client, so they skip the CRUD layer's
+    cache invalidation, in-flight read cleanup and write notifications.
+    """
+    cache = get_shared_cache()
+    if cache is not None:
+        cache.invalidate("projects")
+    flights = get_singleflight()
+    if flights is not None:
+        flights.forget("projects")
+    notify_write("projects")
+
+
 @router.post("/create", response_model=ProjectResponse, status_code=201)
 def create_project(project: ProjectCreate, user: dict = Depends(get_current_user)):
     """Create a new project with collaborators"""
@@ -26,6 +46,7 @@ def create_project(project: ProjectCreate, user: dict = Depends(get_current_user
 
         # Insert into database
         result = crud.client.table("projects").insert(project_data).execute()
+        _projects_written()
 
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to create project")
@@ -36,7 +57,10 @@ def create_project(project: ProjectCreate, user: dict = Depends(get_current_user
 
 
 @router.get("/list", response_model=List[ProjectResponse])
-def list_projects(user: dict = Depends(get_current_user)):
+def list_projects(
+    user: dict = Depends(get_current_user),
+    etag: str = Depends(conditional_get("projects", "tasks"))
+):
     """
     List projects where the user is a collaborator or has assigned tasks
     """
@@ -141,6 +165,7 @@ def update_project(
 
         # Update in database
         result = crud.client.table("projects").update(update_data).eq("id", project_id).execute()
+        _projects_written()
 
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to update project")
@@ -165,6 +190,7 @@ def delete_project(project_id: str, user: dict = Depends(get_current_user)):
 
         # Delete from database
         crud.client.table("projects").delete().eq("id", project_id).execute()
+        _projects_written()
 
         return {"message": "Project deleted successfully"}
     except HTTPException:
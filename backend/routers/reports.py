@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import StreamingResponse
+from backend.core.responses import FastJSONResponse
 from backend.utils.security import get_current_user
 from backend.schemas.report_schemas import (
     TaskCompletionRequest,
@@ -55,7 +56,7 @@ def generate_task_completion_report(
             start_date=request.start_date,
             end_date=request.end_date
         )
-        return report
+        return FastJSONResponse(report)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -184,7 +185,7 @@ def generate_team_summary_report(
             start_date=request.start_date,
             end_date=request.end_date
         )
-        return report
+        return FastJSONResponse(report)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -317,7 +318,7 @@ def generate_logged_time_report(
             start_date=request.start_date,
             end_date=request.end_date
         )
-        return report
+        return FastJSONResponse(report)
     except Exception as e:
         raise HTTPException(
             status_code=500,
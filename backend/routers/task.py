@@ -1,15 +1,24 @@
-from typing import Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime
+import asyncio
 import json
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import ValidationError
+from backend.core.etag import conditional_get, etag_headers
+from backend.core.responses import FastJSONResponse
 from backend.utils.security import get_current_user
 from backend.utils.task_crud.create import TaskCreator
 from backend.utils.task_crud.read import TaskReader
+from backend.utils.task_crud.pagination import TaskPageRequest
+from backend.utils.task_crud.day_buckets import calendar_window
 from backend.utils.task_crud.update import TaskUpdater
 from backend.schemas.task import TaskCreateRequest, TaskUpdateRequest
-from backend.wrappers.storage import SupabaseStorage
-from backend.utils.task_crud.constants import MAX_FILE_SIZE_BYTES, FILE_TOO_LARGE_ERROR, FILE_UPLOAD_ERROR
+from backend.wrappers.async_storage import AsyncSupabaseStorage
+from backend.wrappers.crud_backend import SUPABASE_BACKEND, create_crud, selected_backend
+from backend.wrappers.supabase_wrapper.async_supabase_crud import AsyncSupabaseCRUD
+from backend.wrappers.supabase_wrapper.filters import in_
+from backend.utils.task_crud.constants import MAX_FILE_SIZE_BYTES, FILE_TOO_LARGE_ERROR, FILE_UPLOAD_ERROR, MAX_TASK_PAGE_SIZE, TASKS_TABLE_NAME, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, DEFAULT_CALENDAR_TASKS_PER_DAY, MAX_CALENDAR_TASKS_PER_DAY
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
@@ -32,8 +41,8 @@ async def create_task_endpoint(
                 raise HTTPException(status_code=400, detail=FILE_TOO_LARGE_ERROR)
 
             try:
-                storage = SupabaseStorage()
-                file_url = storage.upload_file(
+                storage = AsyncSupabaseStorage()
+                file_url = await storage.upload_file(
                     file_name=file.filename,
                     file_bytes=file_bytes,
                     content_type=file.content_type,
@@ -48,7 +57,8 @@ async def create_task_endpoint(
             request.main_task.file_url = file_url
 
         task_creator = TaskCreator()
-        result = task_creator.create_task_with_subtasks(
+        result = await run_in_threadpool(
+            task_creator.create_task_with_subtasks,
             user_id=user_id,
             main_task=request.main_task,
             subtasks=request.subtasks
@@ -63,6 +73,35 @@ async def create_task_endpoint(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+async def _load_previous_tasks(main_task_id: str, subtask_ids: List[str]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Read the rows an update starts from, from the backend TaskUpdater writes to
+
+    The main task and the subtasks are independent reads, so they run
+    concurrently: through AsyncSupabaseCRUD on Supabase, otherwise through
+    create_crud() in the threadpool.
+
+    Returns:
+        (previous main task or {}, previous subtasks by id)
+    """
+    main_filters = {"id": main_task_id}
+    subtask_filters = [in_("id", subtask_ids)]
+    if selected_backend() == SUPABASE_BACKEND:
+        crud = AsyncSupabaseCRUD()
+        main_read = crud.select(TASKS_TABLE_NAME, filters=main_filters)
+        subtask_read = crud.select(TASKS_TABLE_NAME, filters=subtask_filters) if subtask_ids else None
+    else:
+        crud = create_crud()
+        main_read = run_in_threadpool(crud.select, TASKS_TABLE_NAME, filters=main_filters)
+        subtask_read = run_in_threadpool(crud.select, TASKS_TABLE_NAME, filters=subtask_filters) if subtask_ids else None
+    previous_main_rows, previous_subtask_rows = await asyncio.gather(
+        main_read,
+        subtask_read if subtask_read is not None else asyncio.sleep(0, result=[]),
+    )
+    previous_main_task = previous_main_rows[0] if previous_main_rows else {}
+    return previous_main_task, {row["id"]: row for row in previous_subtask_rows or []}
+
+
 @router.put("/updateTask")
 async def update_task_endpoint(
     task_data: str = Form(...),
@@ -77,13 +116,13 @@ async def update_task_endpoint(
         request_dict = json.loads(task_data)
         request = TaskUpdateRequest(**request_dict)
 
+        subtask_ids = list(request.subtasks.keys()) if request.subtasks else []
+        previous_main_task, previous_subtasks = await _load_previous_tasks(request.main_task_id, subtask_ids)
+
         if remove_file and request.main_task:
-            from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
-            crud = SupabaseCRUD()
-            existing_task = crud.select("tasks", filters={"id": request.main_task_id})
-            if existing_task and existing_task[0].get("file_url"):
-                storage = SupabaseStorage()
-                storage.delete_file(existing_task[0]["file_url"])
+            if previous_main_task.get("file_url"):
+                storage = AsyncSupabaseStorage()
+                await storage.delete_file(previous_main_task["file_url"])
             request.main_task.file_url = None
 
         file_url = None
@@ -93,15 +132,11 @@ async def update_task_endpoint(
                 raise HTTPException(status_code=400, detail=FILE_TOO_LARGE_ERROR)
 
             try:
-                from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
-                crud = SupabaseCRUD()
-                existing_task = crud.select("tasks", filters={"id": request.main_task_id})
-                if existing_task and existing_task[0].get("file_url"):
-                    storage = SupabaseStorage()
-                    storage.delete_file(existing_task[0]["file_url"])
-
-                storage = SupabaseStorage()
-                file_url = storage.upload_file(
+                storage = AsyncSupabaseStorage()
+                if previous_main_task.get("file_url"):
+                    await storage.delete_file(previous_main_task["file_url"])
+
+                file_url = await storage.upload_file(
                     file_name=file.filename,
                     file_bytes=file_bytes,
                     content_type=file.content_type,
@@ -116,13 +151,16 @@ async def update_task_endpoint(
             request.main_task.file_url = file_url
 
         task_updater = TaskUpdater()
-        result = task_updater.update_tasks(
+        result = await run_in_threadpool(
+            task_updater.update_tasks,
             main_task_id=request.main_task_id,
             user_id=user_id,
             user_role=user_role,
             main_task=request.main_task,
             subtasks=request.subtasks,
-            new_subtasks=request.new_subtasks
+            new_subtasks=request.new_subtasks,
+            previous_main_task=previous_main_task,
+            previous_subtasks=previous_subtasks
         )
 
         return result
@@ -136,8 +174,24 @@ async def update_task_endpoint(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+def _split_csv(value: Optional[str]) -> list:
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+
 @router.get("/readTasks")
-def read_tasks_endpoint(user: dict = Depends(get_current_user)):
+def read_tasks_endpoint(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_TASK_PAGE_SIZE, description="Page size; omit for every task"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    sort: Optional[str] = Query(None, description="due_date, priority, status or updated_at"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    status: Optional[str] = Query(None, description="Comma-separated statuses"),
+    project_id: Optional[str] = None,
+    priority_min: Optional[int] = Query(None, ge=1, le=10),
+    priority_max: Optional[int] = Query(None, ge=1, le=10),
+    user: dict = Depends(get_current_user),
+    etag: str = Depends(conditional_get(TASKS_TABLE_NAME, "users"))
+):
     """
     Read tasks based on user access control rules.
 
@@ -145,6 +199,18 @@ def read_tasks_endpoint(user: dict = Depends(get_current_user)):
     - Role hierarchy (managing_director > director > manager > staff)
     - Project collaboration (tasks in projects where user is a collaborator)
     - Direct task assignment (tasks where user is an assignee)
+
+    Without query parameters every visible task is returned. With any of them
+    the listing is filtered, sorted and projected in the database and the
+    response also carries "next_cursor"; pass it back as cursor to get the
+    next page of limit tasks (it is null on the last page).
+
+    Responses carry an ETag; polls sending it back in If-None-Match get
+    304 Not Modified until a task or user is written through this worker.
+    Writes made through another worker (or the SQL console) are only noticed
+    when the ETAG_MAX_AGE_SECONDS window (default 60) rolls over, so until
+    then this worker can answer 304 for a list that has changed. Set it to 0
+    to turn conditional GET off.
     """
     try:
         user_id = user["sub"]
@@ -152,19 +218,179 @@ def read_tasks_endpoint(user: dict = Depends(get_current_user)):
         user_departments = user.get("departments", [])
 
         task_reader = TaskReader()
-        tasks = task_reader.get_tasks_for_user(
-            user_id=user_id,
-            user_role=user_role,
-            user_departments=user_departments
+        paged = any(value is not None for value in (limit, cursor, sort, fields, status, project_id, priority_min, priority_max))
+        if not paged and order == "asc":
+            tasks = task_reader.get_tasks_for_user(
+                user_id=user_id,
+                user_role=user_role,
+                user_departments=user_departments
+            )
+            return FastJSONResponse({"tasks": tasks}, headers=etag_headers(etag))
+
+        try:
+            page = TaskPageRequest(
+                limit=limit,
+                cursor=cursor,
+                sort=sort,
+                descending=order == "desc",
+                fields=_split_csv(fields) or None,
+                statuses=_split_csv(status),
+                project_id=project_id,
+                priority_min=priority_min,
+                priority_max=priority_max
+            )
+            result = task_reader.get_task_page(
+                user_id=user_id,
+                user_role=user_role,
+                user_departments=user_departments,
+                page=page
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return FastJSONResponse(result, headers=etag_headers(etag))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/readTaskTree")
+def read_task_tree_endpoint(
+    user: dict = Depends(get_current_user),
+    etag: str = Depends(conditional_get(TASKS_TABLE_NAME, "users"))
+):
+    """
+    Read the tasks of /readTasks nested as main tasks with their subtasks attached.
+
+    Subtasks whose main task the user cannot see are returned at the top level.
+    """
+    try:
+        task_reader = TaskReader()
+        tree = task_reader.get_task_tree(
+            user_id=user["sub"],
+            user_role=user["role"],
+            user_departments=user.get("departments", [])
         )
 
-        return {"tasks": tasks}
+        return FastJSONResponse({"tasks": tree}, headers=etag_headers(etag))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/search")
+def search_tasks_endpoint(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in task titles and descriptions"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    user: dict = Depends(get_current_user),
+    etag: str = Depends(conditional_get(TASKS_TABLE_NAME, "users"))
+):
+    """
+    Search the tasks the user can read by title and description.
+
+    Every word of q must match the start of a word in the task ("rep" finds
+    "report"); results are ranked with title matches first and returned as
+    task summaries, best match first. For admins and directors of very large
+    departments a very common word can return fewer than limit tasks: only
+    the first MAX_SEARCH_FETCH_BATCHES batches of matches are checked.
+
+    Served from this worker's search index: writes made through this worker
+    are searchable immediately, writes made through other workers within
+    TASK_SEARCH_INDEX_REFRESH_SECONDS (default 5).
+    """
+    try:
+        task_reader = TaskReader()
+        tasks = task_reader.search_tasks(
+            user_id=user["sub"],
+            user_role=user["role"],
+            user_departments=user.get("departments", []),
+            query=q,
+            limit=limit
+        )
+
+        return FastJSONResponse({"tasks": tasks}, headers=etag_headers(etag))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/calendar")
+def read_calendar_endpoint(
+    view: str = Query("month", pattern="^(month|week)$"),
+    day: Optional[date] = Query(None, description="Any day of the month or week to show; defaults to today"),
+    tasks_per_day: int = Query(DEFAULT_CALENDAR_TASKS_PER_DAY, ge=0, le=MAX_CALENDAR_TASKS_PER_DAY),
+    project_id: Optional[str] = None,
+    user: dict = Depends(get_current_user),
+    etag: str = Depends(conditional_get(TASKS_TABLE_NAME, "users"))
+):
+    """
+    Per-day task counts and summaries for a calendar month or week.
+
+    Weeks run Sunday to Saturday like the calendar grid. Every day of the
+    window is listed with the number of visible, non-archived tasks due that
+    day and up to tasks_per_day task summaries.
+
+    Served from this worker's due-day buckets: writes made through this worker
+    show up immediately, writes made through other workers within
+    TASK_CALENDAR_REFRESH_SECONDS (default 5).
+    """
+    try:
+        start, end = calendar_window(view, day or date.today())
+        task_reader = TaskReader()
+        result = task_reader.get_calendar(
+            user_id=user["sub"],
+            user_role=user["role"],
+            user_departments=user.get("departments", []),
+            start=start,
+            end=end,
+            tasks_per_day=tasks_per_day,
+            project_id=project_id
+        )
+
+        return FastJSONResponse(result, headers=etag_headers(etag))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/sync")
+def sync_tasks_endpoint(
+    watermark: Optional[str] = Query(None, description="watermark of the previous sync response"),
+    limit: int = Query(MAX_TASK_PAGE_SIZE, ge=1, le=MAX_TASK_PAGE_SIZE),
+    user: dict = Depends(get_current_user)
+):
+    """
+    Delta sync of the task list shown by /readTasks.
+
+    Returns the visible tasks created or updated since the watermark, the ids
+    of tasks that were deleted or are no longer visible ("tombstones"; ids the
+    client does not have can be ignored) and a new watermark. Call again with
+    the new watermark while "has_more" is true. When "reset" is true the
+    response starts a full snapshot and the client should drop its copy first.
+    """
+    try:
+        task_reader = TaskReader()
+        try:
+            result = task_reader.get_task_changes(
+                user_id=user["sub"],
+                user_role=user["role"],
+                user_departments=user.get("departments", []),
+                watermark=watermark,
+                limit=limit
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
 @router.get("/readArchivedTasks")
-def read_archived_tasks_endpoint(user: dict = Depends(get_current_user)):
+def read_archived_tasks_endpoint(
+    user: dict = Depends(get_current_user),
+    etag: str = Depends(conditional_get(TASKS_TABLE_NAME, "users"))
+):
     """Read archived subtasks with their main tasks based on user access control rules"""
     try:
         user_id = user["sub"]
@@ -204,25 +430,19 @@ def filter_tasks_by_due_date(
         user_role = user["role"]
         user_departments = user.get("departments", [])
 
-        # Get all tasks user has access to
         task_reader = TaskReader()
-        tasks = task_reader.get_tasks_for_user(
+        if not start_date and not end_date:
+            return {"tasks": task_reader.get_tasks_for_user(user_id, user_role, user_departments)}
+
+        # Range and access control are applied in one database query
+        tasks = task_reader.get_tasks_due_between(
             user_id=user_id,
             user_role=user_role,
-            user_departments=user_departments
+            user_departments=user_departments,
+            start=datetime.fromisoformat(start_date).date() if start_date else None,
+            end=datetime.fromisoformat(end_date).date() if end_date else None
         )
-
-        # Filter by due date range if provided
-        filtered_tasks = tasks
-        if start_date:
-            start = datetime.fromisoformat(start_date).date()
-            filtered_tasks = [t for t in filtered_tasks if t.get("due_date") and datetime.fromisoformat(t["due_date"]).date() >= start]
-
-        if end_date:
-            end = datetime.fromisoformat(end_date).date()
-            filtered_tasks = [t for t in filtered_tasks if t.get("due_date") and datetime.fromisoformat(t["due_date"]).date() <= end]
-
-        return {"tasks": filtered_tasks}
+        return {"tasks": tasks}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
     except Exception as e:
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Literal
 
 
 class ReadRequest(BaseModel):
@@ -30,3 +30,4 @@ class DeleteRequest(BaseModel):
 class CountRequest(BaseModel):
     table_name: str
     filters: Optional[Dict[str, Any]] = None
+    mode: Literal["exact", "planned", "estimated"] = "exact"
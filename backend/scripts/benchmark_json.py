@@ -0,0 +1,78 @@
+"""
+Compare the stdlib and fast JSON paths on large task payloads.
+
+Decode: the PostgREST body as postgrest-py decodes it (pydantic JSON
+validator) vs fast_json.decode_response (orjson).
+Encode: FastAPI's default handling of a returned dict (jsonable_encoder walk +
+JSONResponse) vs returning FastJSONResponse directly.
+
+Usage:
+    python -m backend.scripts.benchmark_json [--sizes 10000 100000] [--repeat 3]
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from postgrest.base_request_builder import APIResponse
+
+from backend.core.responses import FastJSONResponse
+from backend.wrappers.supabase_wrapper.fast_json import HAS_ORJSON, decode_response, dumps
+
+
+def make_tasks(count):
+    """Task rows shaped like the tasks table"""
+    start = date(2025, 1, 1)
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{index:012d}",
+            "title": f"Task {index}",
+            "description": "Prepare the quarterly report and circulate it to the team " * 2,
+            "status": ("Ongoing", "Under Review", "Completed", "Unassigned")[index % 4],
+            "priority": index % 10 + 1,
+            "due_date": (start + timedelta(days=index % 365)).isoformat(),
+            "owner_user_id": f"user-{index % 50}",
+            "assignee_ids": [f"user-{index % 50}", f"user-{(index + 7) % 50}"],
+            "project_id": f"project-{index % 20}",
+            "parent_id": None if index % 5 else f"00000000-0000-0000-0000-{index - 1:012d}",
+            "is_archived": index % 17 == 0,
+            "tags": ["finance", "q1"] if index % 3 else [],
+        }
+        for index in range(count)
+    ]
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(sizes, repeat):
+    print(f"orjson installed: {HAS_ORJSON}")
+    print(f"{'rows':>8} {'step':<8} {'stdlib (s)':>11} {'fast (s)':>10} {'speedup':>8}")
+    for size in sizes:
+        tasks = make_tasks(size)
+        request = httpx.Request("GET", "http://postgrest/tasks")
+        response = httpx.Response(200, content=dumps(tasks), request=request)
+
+        decode_std = best_of(repeat, lambda: APIResponse.from_http_request_response(response))
+        decode_fast = best_of(repeat, lambda: decode_response(response))
+        encode_std = best_of(repeat, lambda: JSONResponse(jsonable_encoder({"tasks": tasks})))
+        encode_fast = best_of(repeat, lambda: FastJSONResponse({"tasks": tasks}))
+
+        for step, std, fast in (("decode", decode_std, decode_fast), ("encode", encode_std, encode_fast)):
+            print(f"{size:>8} {step:<8} {std:>11.3f} {fast:>10.3f} {std / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -6,6 +6,10 @@ from datetime import date, timedelta
 from backend.main import app
 from backend.utils.security import create_access_token
 from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.supabase_wrapper.async_supabase_crud import AsyncSupabaseCRUD
+from backend.wrappers.supabase_wrapper import resilience
+from backend.utils.user_crud import user_directory
+from backend.utils.task_crud import day_buckets, search, visibility
 
 client = TestClient(app)
 
@@ -89,6 +93,21 @@ def sample_subtasks():
             "priority": 2
         }
     ]
+@pytest.fixture(autouse=True)
+def fresh_execution_policy(monkeypatch):
+    """Give every test its own shared execution policy so a tripped breaker does not leak between tests"""
+    monkeypatch.setattr(resilience, "_shared_policy", None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_user_directory(monkeypatch):
+    """Give every test its own shared user directory and task indexes so snapshots do not leak between tests"""
+    monkeypatch.setattr(user_directory, "_shared_directory", None)
+    monkeypatch.setattr(visibility, "_shared_index", None)
+    monkeypatch.setattr(search, "_shared_index", None)
+    monkeypatch.setattr(day_buckets, "_shared_buckets", None)
+
+
 @pytest.fixture(autouse=True)
 def mock_notification_service(monkeypatch):
     """Mock the NotificationService used by task creation logic."""
@@ -102,20 +121,46 @@ def patch_crud_for_testing(monkeypatch):
 
     # Store original methods
     original_select = SupabaseCRUD.select
+    original_select_iter = SupabaseCRUD.select_iter
     original_insert = SupabaseCRUD.insert
+    original_insert_many = SupabaseCRUD.insert_many
+    original_upsert_many = SupabaseCRUD.upsert_many
+    original_update_many = SupabaseCRUD.update_many
+    original_delete_many = SupabaseCRUD.delete_many
     original_update = SupabaseCRUD.update
     original_delete = SupabaseCRUD.delete
     original_count = SupabaseCRUD.count
     original_exists = SupabaseCRUD.exists
+    original_async_table = AsyncSupabaseCRUD._table
 
     def patched_select(self, table, columns="*", filters=None, limit=None, order_by=None, ascending=True):
         test_table = f"{table}_test"
         return original_select(self, test_table, columns, filters, limit, order_by, ascending)
 
+    def patched_select_iter(self, table, *args, **kwargs):
+        test_table = f"{table}_test"
+        return original_select_iter(self, test_table, *args, **kwargs)
+
     def patched_insert(self, table, data):
         test_table = f"{table}_test"
         return original_insert(self, test_table, data)
 
+    def patched_insert_many(self, table, *args, **kwargs):
+        test_table = f"{table}_test"
+        return original_insert_many(self, test_table, *args, **kwargs)
+
+    def patched_upsert_many(self, table, *args, **kwargs):
+        test_table = f"{table}_test"
+        return original_upsert_many(self, test_table, *args, **kwargs)
+
+    def patched_update_many(self, table, *args, **kwargs):
+        test_table = f"{table}_test"
+        return original_update_many(self, test_table, *args, **kwargs)
+
+    def patched_delete_many(self, table, *args, **kwargs):
+        test_table = f"{table}_test"
+        return original_delete_many(self, test_table, *args, **kwargs)
+
     def patched_update(self, table, data, filters):
         test_table = f"{table}_test"
         return original_update(self, test_table, data, filters)
@@ -124,21 +169,34 @@ def patch_crud_for_testing(monkeypatch):
         test_table = f"{table}_test"
         return original_delete(self, test_table, filters)
 
-    def patched_count(self, table, filters=None):
+    def patched_count(self, table, *args, **kwargs):
+        test_table = f"{table}_test"
+        return original_count(self, test_table, *args, **kwargs)
+
+    def patched_exists(self, table, *args, **kwargs):
         test_table = f"{table}_test"
-        return original_count(self, test_table, filters)
+        return original_exists(self, test_table, *args, **kwargs)
 
-    def patched_exists(self, table, filters):
+    async def patched_async_table(self, table):
         test_table = f"{table}_test"
-        return original_exists(self, test_table, filters)
+        return await original_async_table(self, test_table)
+
+    # Writes go to users_test, which the directory does not watch; reload users on every lookup
+    monkeypatch.setattr(user_directory, "_shared_directory", user_directory.UserDirectory(ttl=0))
 
     # Apply patches to instance methods
     monkeypatch.setattr(SupabaseCRUD, "select", patched_select)
+    monkeypatch.setattr(SupabaseCRUD, "select_iter", patched_select_iter)
     monkeypatch.setattr(SupabaseCRUD, "insert", patched_insert)
+    monkeypatch.setattr(SupabaseCRUD, "insert_many", patched_insert_many)
+    monkeypatch.setattr(SupabaseCRUD, "upsert_many", patched_upsert_many)
+    monkeypatch.setattr(SupabaseCRUD, "update_many", patched_update_many)
+    monkeypatch.setattr(SupabaseCRUD, "delete_many", patched_delete_many)
     monkeypatch.setattr(SupabaseCRUD, "update", patched_update)
     monkeypatch.setattr(SupabaseCRUD, "delete", patched_delete)
     monkeypatch.setattr(SupabaseCRUD, "count", patched_count)
     monkeypatch.setattr(SupabaseCRUD, "exists", patched_exists)
+    monkeypatch.setattr(AsyncSupabaseCRUD, "_table", patched_async_table)
 
     yield
 
@@ -99,7 +99,8 @@ def test_count_records_success(client, mock_supabase_crud):
     assert response.json() == {"count": 5}
     mock_supabase_crud.count.assert_called_once_with(
         table="users",
-        filters=None
+        filters=None,
+        mode="exact"
     )
 
 
@@ -115,10 +116,26 @@ def test_count_records_with_filters(client, mock_supabase_crud):
     assert response.json() == {"count": 2}
     mock_supabase_crud.count.assert_called_once_with(
         table="users",
-        filters={"status": "active"}
+        filters={"status": "active"},
+        mode="exact"
     )
 
 
+def test_count_records_planned_mode(client, mock_supabase_crud):
+    mock_supabase_crud.count.return_value = 1000
+
+    response = client.post("/api/crud/count", json={"table_name": "tasks", "mode": "planned"})
+
+    assert response.status_code == 200
+    mock_supabase_crud.count.assert_called_once_with(table="tasks", filters=None, mode="planned")
+
+
+def test_count_records_rejects_unknown_mode(client, mock_supabase_crud):
+    response = client.post("/api/crud/count", json={"table_name": "tasks", "mode": "fast"})
+
+    assert response.status_code == 422
+
+
 def test_read_table_error(client, mock_supabase_crud):
     mock_supabase_crud.select.side_effect = Exception("Database error")
 
@@ -140,3 +157,31 @@ def test_create_record_error(client, mock_supabase_crud):
 
     assert response.status_code == 500
     assert "Error creating record in users" in response.json()["detail"]
+
+
+def test_cache_stats_disabled(client, monkeypatch):
+    monkeypatch.delenv("SUPABASE_QUERY_CACHE", raising=False)
+
+    response = client.get("/api/crud/cache-stats")
+
+    assert response.status_code == 200
+    assert response.json() == {"enabled": False}
+
+
+def test_resilience_stats(client):
+    response = client.get("/api/crud/resilience-stats")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["breaker"] in ("closed", "open", "half_open")
+    assert {"attempts", "retries", "short_circuits", "operations"} <= set(body)
+
+
+def test_coalescing_stats(client):
+    response = client.get("/api/crud/coalescing-stats")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["enabled"] is True
+    assert {"executed", "coalesced", "saved_ratio"} <= set(body["sync"])
+    assert {"executed", "coalesced", "saved_ratio"} <= set(body["async"])
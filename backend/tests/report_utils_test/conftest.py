@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import Mock
 from datetime import date, timedelta
+from backend.utils.report_util import logged_time_util, team_summary_util
+from backend.utils.user_crud.user_directory import UserDirectory
 
 
 @pytest.fixture
@@ -13,10 +15,21 @@ def mock_crud():
     mock.insert.return_value = {}
     mock.update.return_value = []
     mock.delete.return_value = []
+    # select_iter pages through the same rows select would return
+    mock.select_iter.side_effect = lambda *args, **kwargs: iter(mock.select(*args, **kwargs))
 
     return mock
 
 
+@pytest.fixture(autouse=True)
+def user_directory(monkeypatch, mock_crud):
+    """Load the report generators' user directory from mock_crud"""
+    directory = UserDirectory(crud=mock_crud)
+    for module in (logged_time_util, team_summary_util):
+        monkeypatch.setattr(module, "get_user_directory", lambda: directory)
+    return directory
+
+
 @pytest.fixture
 def sample_project():
     """Sample project data"""
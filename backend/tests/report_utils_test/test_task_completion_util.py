@@ -2,6 +2,7 @@ from datetime import date, timedelta
 from io import BytesIO
 from backend.utils.report_util.task_completion_util import TaskCompletionReportGenerator
 from backend.schemas.report_schemas import TaskCompletionResponse, TaskCompletionItem
+from backend.wrappers.supabase_wrapper.projections import projection, PROJECT_NAME, TASK_SUMMARY, USER_DIRECTORY
 
 
 class TestTaskCompletionReportGenerator:
@@ -74,7 +75,9 @@ class TestTaskCompletionReportGenerator:
 
         # Assert
         assert result == "Test Project"
-        mock_crud.select.assert_called_once_with("projects", filters={"id": "proj-123"})
+        mock_crud.select.assert_called_once_with(
+            "projects", columns=projection("projects", PROJECT_NAME), filters={"id": "proj-123"}
+        )
 
     def test_get_scope_name_for_project_not_found(self, mock_crud):
         """Test getting scope name for non-existent project"""
@@ -103,7 +106,9 @@ class TestTaskCompletionReportGenerator:
 
         # Assert
         assert result == "user1@test.com"
-        mock_crud.select.assert_called_once_with("users", filters={"uuid": "user-1"})
+        mock_crud.select.assert_called_once_with(
+            "users", columns=projection("users", USER_DIRECTORY), filters={"uuid": "user-1"}
+        )
 
     def test_get_scope_name_for_staff_not_found(self, mock_crud):
         """Test getting scope name for non-existent staff"""
@@ -136,7 +141,9 @@ class TestTaskCompletionReportGenerator:
         )
 
         # Assert
-        mock_crud.select.assert_called_once_with("tasks", filters={"project_id": "proj-123"})
+        mock_crud.select.assert_called_once_with(
+            "tasks", columns=projection("tasks", TASK_SUMMARY), filters={"project_id": "proj-123"}
+        )
         assert len(result) == 3
 
     def test_get_tasks_by_staff_as_assignee(self, mock_crud, sample_tasks, date_range):
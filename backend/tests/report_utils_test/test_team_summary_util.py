@@ -2,6 +2,7 @@ from datetime import date, timedelta
 from io import BytesIO
 from backend.utils.report_util.team_summary_util import TeamSummaryReportGenerator
 from backend.schemas.report_schemas import TeamSummaryResponse, StaffTaskSummary
+from backend.wrappers.supabase_wrapper.projections import projection, PROJECT_NAME
 
 
 class TestTeamSummaryReportGenerator:
@@ -90,7 +91,9 @@ class TestTeamSummaryReportGenerator:
 
         # Assert
         assert result == "Test Project"
-        mock_crud.select.assert_called_once_with("projects", filters={"id": "proj-123"})
+        mock_crud.select.assert_called_once_with(
+            "projects", columns=projection("projects", PROJECT_NAME), filters={"id": "proj-123"}
+        )
 
     def test_get_scope_name_for_project_not_found(self, mock_crud):
         """Test getting scope name for non-existent project"""
@@ -489,3 +489,182 @@ class TestReadTaskEndpoint:
             user_role="manager",
             user_departments=["finance"]
         )
+
+    @patch('backend.utils.task_crud.read.TaskReader.get_task_page')
+    def test_read_tasks_page_parameters(self, mock_get_page, regular_staff_token, sample_tasks):
+        """Test that paging, sort, filter and fields parameters reach TaskReader.get_task_page"""
+        # Arrange
+        mock_get_page.return_value = {"tasks": sample_tasks[:1], "next_cursor": "abc"}
+        headers = {"Authorization": f"Bearer {regular_staff_token}"}
+
+        # Act
+        response = client.get(
+            "/api/tasks/readTasks?limit=1&sort=due_date&order=desc&fields=title,status"
+            "&status=TO_DO,IN_PROGRESS&project_id=p1&priority_min=2&priority_max=8",
+            headers=headers
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"tasks": sample_tasks[:1], "next_cursor": "abc"}
+        page = mock_get_page.call_args.kwargs["page"]
+        assert (page.limit, page.sort, page.descending) == (1, "due_date", True)
+        assert page.fields == ["title", "status"]
+        assert page.statuses == ["TO_DO", "IN_PROGRESS"]
+        assert (page.project_id, page.priority_min, page.priority_max) == ("p1", 2, 8)
+
+    @pytest.mark.parametrize("query, status_code", [
+        ("sort=title", 400),
+        ("fields=password_hash", 400),
+        ("limit=1&cursor=garbage", 400),
+        ("limit=100000", 422),
+        ("order=sideways", 422),
+    ])
+    def test_read_tasks_rejects_invalid_page_parameters(self, query, status_code, managing_director_token):
+        """Test that invalid paging parameters are client errors"""
+        headers = {"Authorization": f"Bearer {managing_director_token}"}
+
+        with patch('backend.utils.task_crud.read.TaskReader._visibility_filters', return_value=[]):
+            response = client.get(f"/api/tasks/readTasks?{query}", headers=headers)
+
+        assert response.status_code == status_code
+
+    @patch('backend.utils.task_crud.read.TaskReader.get_task_changes')
+    def test_sync_passes_watermark_and_returns_delta(self, mock_changes, regular_staff_token):
+        """Test that /sync forwards the watermark and returns the delta as-is"""
+        delta = {"tasks": [], "tombstones": ["t1"], "watermark": "w2", "has_more": False, "reset": False}
+        mock_changes.return_value = delta
+        headers = {"Authorization": f"Bearer {regular_staff_token}"}
+
+        response = client.get("/api/tasks/sync?watermark=w1&limit=10", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == delta
+        mock_changes.assert_called_once_with(
+            user_id="550e8400-e29b-41d4-a716-446655440003",
+            user_role="staff",
+            user_departments=["engineering"],
+            watermark="w1",
+            limit=10
+        )
+
+    @patch('backend.utils.task_crud.read.TaskReader.get_task_changes', side_effect=ValueError("Invalid watermark"))
+    def test_sync_rejects_invalid_watermark(self, mock_changes, regular_staff_token):
+        """Test that a malformed watermark is a client error"""
+        headers = {"Authorization": f"Bearer {regular_staff_token}"}
+
+        response = client.get("/api/tasks/sync?watermark=garbage", headers=headers)
+
+        assert response.status_code == 400
+
+    @patch('backend.utils.task_crud.read.TaskReader.get_task_tree')
+    def test_read_task_tree(self, mock_tree, regular_staff_token):
+        """Test that /readTaskTree returns the nested tasks"""
+        tree = [{"id": "m1", "subtasks": [{"id": "s1", "subtasks": []}]}]
+        mock_tree.return_value = tree
+        headers = {"Authorization": f"Bearer {regular_staff_token}"}
+
+        response = client.get("/api/tasks/readTaskTree", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"tasks": tree}
+        assert response.headers["ETag"]
+        mock_tree.assert_called_once_with(
+            user_id="550e8400-e29b-41d4-a716-446655440003",
+            user_role="staff",
+            user_departments=["engineering"]
+        )
+
+    @patch('backend.utils.task_crud.read.TaskReader.get_tasks_due_between')
+    def test_filter_by_due_date_passes_range_to_reader(self, mock_due, regular_staff_token):
+        """Test that /filterByDueDate leaves the range to the database query"""
+        mock_due.return_value = [{"id": "t1", "due_date": "2025-03-01"}]
+        headers = {"Authorization": f"Bearer {regular_staff_token}"}
+
+        response = client.get("/api/tasks/filterByDueDate?start_date=2025-03-01&end_date=2025-03-31T00:00:00", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"tasks": [{"id": "t1", "due_date": "2025-03-01"}]}
+        mock_due.assert_called_once_with(
+            user_id="550e8400-e29b-41d4-a716-446655440003",
+            user_role="staff",
+            user_departments=["engineering"],
+            start=date(2025, 3, 1),
+            end=date(2025, 3, 31)
+        )
+
+    @patch('backend.utils.task_crud.read.TaskReader.get_task_page')
+    def test_filter_by_due_date_with_reversed_range_is_empty(self, mock_page, regular_staff_token):
+        """Test that a start date after the end date matches no task instead of failing"""
+        headers = {"Authorization": f"Bearer {regular_staff_token}"}
+
+        response = client.get("/api/tasks/filterByDueDate?start_date=2025-03-31&end_date=2025-03-01", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"tasks": []}
+        mock_page.assert_not_called()
+
+    def test_filter_by_due_date_rejects_invalid_dates(self, regular_staff_token):
+        """Test that an unparseable date is a client error"""
+        headers = {"Authorization": f"Bearer {regular_staff_token}"}
+
+        response = client.get("/api/tasks/filterByDueDate?start_date=March", headers=headers)
+
+        assert response.status_code == 400
+
+    @patch('backend.utils.task_crud.read.TaskReader.search_tasks')
+    def test_search_returns_ranked_tasks(self, mock_search, regular_staff_token):
+        """Test that /search forwards the query and limit"""
+        mock_search.return_value = [{"id": "t1", "title": "Quarterly report"}]
+        headers = {"Authorization": f"Bearer {regular_staff_token}"}
+
+        response = client.get("/api/tasks/search?q=quart%20rep&limit=5", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"tasks": [{"id": "t1", "title": "Quarterly report"}]}
+        mock_search.assert_called_once_with(
+            user_id="550e8400-e29b-41d4-a716-446655440003",
+            user_role="staff",
+            user_departments=["engineering"],
+            query="quart rep",
+            limit=5
+        )
+
+    @pytest.mark.parametrize("query", ["", "q=", "q=report&limit=0", "q=report&limit=101"])
+    def test_search_validates_parameters(self, query, regular_staff_token):
+        """Test that a missing query or out-of-range limit is rejected"""
+        headers = {"Authorization": f"Bearer {regular_staff_token}"}
+
+        response = client.get(f"/api/tasks/search?{query}", headers=headers)
+
+        assert response.status_code == 422
+
+    @patch('backend.utils.task_crud.read.TaskReader.get_calendar')
+    def test_calendar_week_window(self, mock_calendar, regular_staff_token):
+        """Test that /calendar turns view and day into a Sunday-to-Saturday window"""
+        mock_calendar.return_value = {"start": "2025-03-02", "end": "2025-03-08", "total": 0, "days": []}
+        headers = {"Authorization": f"Bearer {regular_staff_token}"}
+
+        response = client.get("/api/tasks/calendar?view=week&day=2025-03-05&tasks_per_day=5&project_id=p1", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json() == mock_calendar.return_value
+        assert response.headers["ETag"]
+        mock_calendar.assert_called_once_with(
+            user_id="550e8400-e29b-41d4-a716-446655440003",
+            user_role="staff",
+            user_departments=["engineering"],
+            start=date(2025, 3, 2),
+            end=date(2025, 3, 8),
+            tasks_per_day=5,
+            project_id="p1"
+        )
+
+    @pytest.mark.parametrize("query", ["view=year", "day=2025-13-01", "tasks_per_day=101"])
+    def test_calendar_validates_parameters(self, query, regular_staff_token):
+        """Test that unknown views, bad days and oversized pages are rejected"""
+        headers = {"Authorization": f"Bearer {regular_staff_token}"}
+
+        response = client.get(f"/api/tasks/calendar?{query}", headers=headers)
+
+        assert response.status_code == 422
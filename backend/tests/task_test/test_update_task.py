@@ -176,3 +176,23 @@ def test_update_nonexistent_task_fails(auth_headers, patch_crud_for_testing):
     assert response.status_code == 200  # Update returns success even if task not found
     data = response.json()
     assert data["main_task"] is None  # Should return null for non-existent task
+
+
+def test_previous_tasks_are_read_from_the_selected_backend(monkeypatch):
+    """The update prefetch reads from the same backend TaskUpdater writes to"""
+    import asyncio
+    from backend.routers import task as task_router
+    from backend.wrappers.sqlite_wrapper.sqlite_crud import SQLiteCRUD
+
+    crud = SQLiteCRUD(":memory:")
+    crud.insert_many("tasks", [{"id": "m1", "title": "Main"}, {"id": "s1", "parent_id": "m1"}, {"id": "s2", "parent_id": "m1"}])
+    monkeypatch.setenv("CRUD_BACKEND", "sqlite")
+    monkeypatch.setattr(task_router, "create_crud", lambda: crud)
+    monkeypatch.setattr(task_router, "AsyncSupabaseCRUD", None)
+
+    main_task, subtasks = asyncio.run(task_router._load_previous_tasks("m1", ["s1", "s2"]))
+    assert main_task["title"] == "Main"
+    assert sorted(subtasks) == ["s1", "s2"]
+
+    assert asyncio.run(task_router._load_previous_tasks("missing", [])) == ({}, {})
+    crud.close()
@@ -1,7 +1,18 @@
 import pytest
 from unittest.mock import Mock
 from datetime import date, timedelta
+from backend.utils.task_crud import read
 from backend.utils.task_crud.constants import make_future_due_date
+from backend.utils.task_crud.read import TaskReader
+from backend.utils.user_crud.user_directory import UserDirectory
+from backend.wrappers.sqlite_wrapper.sqlite_crud import SQLiteCRUD
+
+# Users behind the directory fixture: user-1 and user-2 in dept1, user-3 in dept2
+DIRECTORY_USERS = [
+    {"uuid": "user-1", "departments": ["dept1"]},
+    {"uuid": "user-2", "departments": ["dept1"]},
+    {"uuid": "user-3", "departments": ["dept2"]},
+]
 
 @pytest.fixture
 def mock_crud():
@@ -88,3 +99,39 @@ def mock_task_in_db():
         "created_at": "2025-09-22T00:00:00Z",
         "updated_at": "2025-09-22T00:00:00Z",
     }
+
+
+@pytest.fixture
+def task_rows(request):
+    """Tasks seeded into crud; override in a test module, or parametrize indirectly"""
+    return getattr(request, "param", [])
+
+
+@pytest.fixture
+def crud(task_rows):
+    """In-memory SQLiteCRUD seeded with task_rows"""
+    backend = SQLiteCRUD(":memory:")
+    backend.insert_many("tasks", task_rows)
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def directory():
+    """UserDirectory over DIRECTORY_USERS"""
+    users = Mock()
+    users.select.return_value = [dict(user) for user in DIRECTORY_USERS]
+    return UserDirectory(crud=users)
+
+
+@pytest.fixture
+def reader(crud, directory, monkeypatch):
+    """
+    TaskReader reading crud and directory
+
+    Fixtures that swap in a shared index must be requested before this one,
+    since the reader picks the shared indexes up when it is created.
+    """
+    monkeypatch.setattr(read, "create_crud", lambda: crud)
+    monkeypatch.setattr(read, "get_user_directory", lambda: directory)
+    return TaskReader()
@@ -0,0 +1,142 @@
+"""
+Tests for the due-day buckets and TaskReader.get_calendar against SQLiteCRUD
+"""
+import pytest
+from datetime import date
+from unittest.mock import Mock
+from backend.utils.task_crud import day_buckets
+from backend.utils.task_crud.day_buckets import TaskDayBuckets, calendar_window
+
+TASKS = [
+    {"id": "t1", "title": "Plan", "due_date": "2025-03-03", "owner_user_id": "user-1", "assignee_ids": ["user-1"], "project_id": "p1"},
+    {"id": "t2", "title": "Build", "due_date": "2025-03-03T17:00:00+00:00", "owner_user_id": "user-3", "assignee_ids": ["user-2"], "parent_id": "t1", "project_id": "p1"},
+    {"id": "t3", "title": "Ship", "due_date": "2025-03-31", "owner_user_id": "user-3", "assignee_ids": ["user-3"], "project_id": "p2"},
+    {"id": "t4", "title": "Old", "due_date": "2025-03-03", "owner_user_id": "user-1", "assignee_ids": ["user-1"], "is_archived": True},
+    {"id": "t5", "title": "Someday", "due_date": None, "owner_user_id": "user-1", "assignee_ids": ["user-1"]},
+    {"id": "t6", "title": "April", "due_date": "2025-04-01", "owner_user_id": "user-1", "assignee_ids": ["user-1"]},
+]
+
+
+@pytest.fixture
+def task_rows():
+    return TASKS
+
+
+@pytest.fixture
+def buckets(crud, monkeypatch):
+    shared = TaskDayBuckets(crud=crud)
+    monkeypatch.setattr(day_buckets, "_shared_buckets", shared)
+    return shared
+
+
+@pytest.fixture
+def reader(buckets, reader):
+    return reader
+
+
+def _counts(calendar):
+    return {entry["date"]: entry["count"] for entry in calendar["days"] if entry["count"]}
+
+
+class TestCalendarWindow:
+    """Month and Sunday-to-Saturday week windows"""
+
+    @pytest.mark.parametrize("view, anchor, expected", [
+        ("month", date(2024, 2, 10), (date(2024, 2, 1), date(2024, 2, 29))),
+        ("week", date(2025, 3, 5), (date(2025, 3, 2), date(2025, 3, 8))),
+        ("week", date(2025, 3, 2), (date(2025, 3, 2), date(2025, 3, 8))),
+        ("week", date(2025, 3, 8), (date(2025, 3, 2), date(2025, 3, 8))),
+    ])
+    def test_windows(self, view, anchor, expected):
+        assert calendar_window(view, anchor) == expected
+
+    def test_unknown_view_raises(self):
+        with pytest.raises(ValueError):
+            calendar_window("year", date(2025, 1, 1))
+
+
+class TestTaskDayBuckets:
+    """Buckets hold non-archived tasks by due day and follow writes"""
+
+    def test_window_reads_only_its_days(self, buckets):
+        result = buckets.tasks_between(date(2025, 3, 1), date(2025, 3, 31))
+
+        assert {day: [task["id"] for task in tasks] for day, tasks in result.items()} == {
+            "2025-03-03": ["t1", "t2"], "2025-03-31": ["t3"],
+        }
+
+    def test_writes_move_tasks_between_buckets(self, crud, buckets):
+        buckets.tasks_between(date(2025, 3, 1), date(2025, 3, 31))
+
+        crud.update("tasks", {"due_date": "2025-03-31"}, {"id": "t1"})
+        crud.update_many("tasks", {"is_archived": True}, ["t3"])
+        crud.insert("tasks", {"id": "t7", "title": "New", "due_date": "2025-03-04"})
+        crud.delete("tasks", {"id": "t2"})
+
+        result = buckets.tasks_between(date(2025, 3, 1), date(2025, 3, 31))
+        assert {day: [task["id"] for task in tasks] for day, tasks in result.items()} == {
+            "2025-03-04": ["t7"], "2025-03-31": ["t1"],
+        }
+        assert buckets.loads == 1
+
+    def test_catches_up_with_writes_from_other_workers(self, crud):
+        clock = Mock(return_value=0)
+        # Not the shared buckets, so local write events never reach it
+        other_worker = TaskDayBuckets(crud=crud, refresh_interval=5, clock=clock)
+        other_worker.tasks_between(date(2025, 3, 1), date(2025, 3, 31))
+
+        crud.update("tasks", {"due_date": "2025-03-04"}, {"id": "t1"})
+        crud.insert("tasks", {"id": "t7", "title": "New", "due_date": "2025-03-31"})
+        crud.delete("tasks", {"id": "t3"})
+
+        clock.return_value = 4
+        assert set(other_worker.tasks_between(date(2025, 3, 1), date(2025, 3, 31))) == {"2025-03-03", "2025-03-31"}
+
+        clock.return_value = 5
+        result = other_worker.tasks_between(date(2025, 3, 1), date(2025, 3, 31))
+        assert {day: [task["id"] for task in tasks] for day, tasks in result.items()} == {
+            "2025-03-03": ["t2"], "2025-03-04": ["t1"], "2025-03-31": ["t7"],
+        }
+        assert "updated_at" not in result["2025-03-04"][0]
+        assert other_worker.loads == 1
+
+
+class TestGetCalendar:
+    """TaskReader.get_calendar applies the read rules to the buckets"""
+
+    def test_admin_month(self, reader):
+        calendar = reader.get_calendar("user-9", "admin", [], date(2025, 3, 1), date(2025, 3, 31))
+
+        assert (calendar["start"], calendar["end"], calendar["total"], len(calendar["days"])) == ("2025-03-01", "2025-03-31", 3, 31)
+        assert _counts(calendar) == {"2025-03-03": 2, "2025-03-31": 1}
+        assert calendar["days"][2]["tasks"][0] == {
+            "id": "t1", "title": "Plan", "status": None, "priority": None,
+            "due_date": "2025-03-03", "project_id": "p1", "parent_id": None,
+        }
+
+    @pytest.mark.parametrize("user_id, role, departments, expected", [
+        ("user-2", "staff", [], {"2025-03-03": 2}),
+        ("user-3", "manager", [], {"2025-03-31": 1}),
+        ("user-9", "director", ["dept2"], {"2025-03-03": 1, "2025-03-31": 1}),
+        ("user-9", "director", [], {}),
+    ])
+    def test_access_control(self, reader, user_id, role, departments, expected):
+        assert _counts(reader.get_calendar(user_id, role, departments, date(2025, 3, 1), date(2025, 3, 31))) == expected
+
+    def test_counts_all_tasks_but_caps_summaries(self, reader):
+        calendar = reader.get_calendar("user-9", "admin", [], date(2025, 3, 3), date(2025, 3, 3), tasks_per_day=1)
+
+        assert calendar["days"] == [{"date": "2025-03-03", "count": 2, "tasks": [calendar["days"][0]["tasks"][0]]}]
+        assert calendar["days"][0]["tasks"][0]["id"] == "t1"
+
+    def test_project_filter(self, reader):
+        calendar = reader.get_calendar("user-9", "admin", [], date(2025, 3, 1), date(2025, 3, 31), project_id="p2")
+
+        assert _counts(calendar) == {"2025-03-31": 1}
+
+    def test_switching_months_does_not_reload(self, reader, buckets):
+        reader.get_calendar("user-9", "admin", [], date(2025, 3, 1), date(2025, 3, 31))
+        april = reader.get_calendar("user-9", "admin", [], date(2025, 4, 1), date(2025, 4, 30))
+
+        assert _counts(april) == {"2025-04-01": 1}
+        assert buckets.loads == 1
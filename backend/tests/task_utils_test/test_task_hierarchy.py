@@ -0,0 +1,67 @@
+"""
+Tests for TaskHierarchy and the nested task tree
+"""
+from unittest.mock import patch
+from backend.utils.task_crud.hierarchy import TaskHierarchy
+from backend.utils.task_crud.read import TaskReader
+
+TASKS = [
+    {"id": "m1", "parent_id": None},
+    {"id": "s1", "parent_id": "m1"},
+    {"id": "m2", "parent_id": None},
+    {"id": "s2", "parent_id": "m1"},
+    {"id": "s3", "parent_id": "hidden"},
+]
+
+
+class TestTaskHierarchy:
+    """Lookups built in one pass over the rows"""
+
+    def test_lookups(self):
+        hierarchy = TaskHierarchy(TASKS)
+
+        assert len(hierarchy) == 5 and "s1" in hierarchy
+        assert hierarchy.parent_of(TASKS[1]) is TASKS[0]
+        assert hierarchy.parent_of(TASKS[0]) is None
+        assert hierarchy.parent_of(TASKS[4]) is None
+        assert [task["id"] for task in hierarchy.children_of("m1")] == ["s1", "s2"]
+        assert hierarchy.children_of("m2") == []
+        assert [task["id"] for task in hierarchy.roots()] == ["m1", "m2"]
+        assert [task["id"] for task in hierarchy.orphans()] == ["s3"]
+        assert hierarchy.missing_parent_ids() == {"hidden"}
+
+    def test_add_fills_missing_parents_and_ignores_duplicates(self):
+        hierarchy = TaskHierarchy(TASKS)
+
+        hierarchy.add([{"id": "hidden", "parent_id": None}, {"id": "m1", "parent_id": None, "title": "dup"}])
+
+        assert hierarchy.missing_parent_ids() == set()
+        assert hierarchy.parent_of(TASKS[4])["id"] == "hidden"
+        assert "title" not in hierarchy.get("m1")
+
+    def test_tree_nests_children_without_touching_rows(self):
+        tree = TaskHierarchy(TASKS).tree()
+
+        assert [(task["id"], [sub["id"] for sub in task["subtasks"]]) for task in tree] == [
+            ("m1", ["s1", "s2"]), ("m2", []), ("s3", []),
+        ]
+        assert "subtasks" not in TASKS[0]
+
+    def test_tree_survives_parent_cycles(self):
+        tree = TaskHierarchy([{"id": "a", "parent_id": None}, {"id": "b", "parent_id": "a"}, {"id": "a2", "parent_id": "b"}]).tree()
+
+        assert tree[0]["subtasks"][0]["subtasks"][0]["id"] == "a2"
+
+
+class TestGetTaskTree:
+    """TaskReader.get_task_tree nests what get_tasks_for_user returns"""
+
+    @patch("backend.utils.task_crud.read.get_user_directory")
+    @patch("backend.utils.task_crud.read.create_crud")
+    def test_tree_of_visible_tasks(self, mock_create_crud, mock_directory):
+        reader = TaskReader()
+        with patch.object(TaskReader, "get_tasks_for_user", return_value=TASKS) as mock_get:
+            tree = reader.get_task_tree("user-1", "staff", ["dept1"])
+
+        mock_get.assert_called_once_with("user-1", "staff", ["dept1"])
+        assert [task["id"] for task in tree] == ["m1", "m2", "s3"]
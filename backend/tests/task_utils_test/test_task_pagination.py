@@ -0,0 +1,177 @@
+"""
+Tests for paginated task listings (TaskReader.get_task_page) against SQLiteCRUD
+"""
+import pytest
+from datetime import date
+from unittest.mock import Mock
+from backend.utils.task_crud import read
+from backend.utils.task_crud.pagination import TaskPageRequest, decode_cursor, encode_cursor
+
+TASKS = [
+    {"id": "t01", "status": "TO_DO", "priority": 3, "due_date": "2025-03-01", "owner_user_id": "user-1", "assignee_ids": ["user-1"], "project_id": "p1"},
+    {"id": "t02", "status": "IN_PROGRESS", "priority": 7, "due_date": None, "owner_user_id": "user-1", "assignee_ids": ["user-2"], "project_id": "p1"},
+    {"id": "t03", "status": "TO_DO", "priority": 3, "due_date": "2025-01-15", "owner_user_id": "user-3", "assignee_ids": ["user-3"], "project_id": "p2"},
+    {"id": "t04", "status": "COMPLETED", "priority": None, "due_date": "2025-03-01", "owner_user_id": "user-3", "assignee_ids": ["user-2"], "project_id": "p2"},
+    {"id": "t05", "status": "BLOCKED", "priority": 9, "due_date": None, "owner_user_id": "user-1", "assignee_ids": ["user-1"], "project_id": "p1"},
+    {"id": "t06", "status": "TO_DO", "priority": None, "due_date": "2025-02-01", "owner_user_id": "user-3", "assignee_ids": ["user-3"], "project_id": "p1"},
+    {"id": "t07", "status": "TO_DO", "priority": 5, "due_date": "2025-02-01", "owner_user_id": "user-1", "assignee_ids": ["user-2"], "parent_id": "t03", "project_id": "p2"},
+    {"id": "t08", "status": "TO_DO", "priority": 1, "due_date": "2025-04-01", "owner_user_id": "user-1", "assignee_ids": ["user-2"], "is_archived": True, "project_id": "p1"},
+]
+
+
+@pytest.fixture
+def task_rows():
+    return TASKS
+
+
+def _walk(reader, page_size, role="managing_director", user_id="user-1", departments=(), **options):
+    """Follow next_cursor until the last page and return every page"""
+    pages, cursor = [], None
+    while True:
+        page = TaskPageRequest(limit=page_size, cursor=cursor, **options)
+        result = reader.get_task_page(user_id, role, list(departments), page)
+        pages.append([task["id"] for task in result["tasks"]])
+        cursor = result["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def _expected(sort, descending, rows):
+    """Reference ordering: PostgreSQL puts NULLs last ascending and first descending"""
+    present = sorted((row for row in rows if row.get(sort) is not None), key=lambda row: (row[sort], row["id"]), reverse=descending)
+    missing = sorted((row for row in rows if row.get(sort) is None), key=lambda row: row["id"], reverse=descending)
+    ordered = missing + present if descending else present + missing
+    return [row["id"] for row in ordered]
+
+
+ACTIVE = [task for task in TASKS if not task.get("is_archived")]
+
+
+class TestTaskPagination:
+    """Keyset pages cover every visible task exactly once, in sort order"""
+
+    @pytest.mark.parametrize("sort", ["priority", "due_date", "status", None])
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_pages_follow_sort_order_including_nulls(self, reader, sort, descending):
+        pages = _walk(reader, 2, sort=sort, descending=descending)
+
+        assert all(len(page) <= 2 for page in pages)
+        expected = _expected(sort or "id", descending, ACTIVE)
+        assert [task_id for page in pages for task_id in page] == expected
+
+    def test_unlimited_request_returns_every_task(self, reader):
+        result = reader.get_task_page("user-1", "admin", [], TaskPageRequest(sort="priority"))
+
+        assert [task["id"] for task in result["tasks"]] == _expected("priority", False, ACTIVE)
+        assert result["next_cursor"] is None
+
+    def test_filters_and_projection(self, reader):
+        page = TaskPageRequest(
+            limit=10, sort="due_date", fields=["status"], statuses=["TO_DO", "BLOCKED"],
+            project_id="p1", priority_min=3, priority_max=9
+        )
+
+        result = reader.get_task_page("user-1", "admin", [], page)
+
+        assert result["tasks"] == [
+            {"id": "t01", "due_date": "2025-03-01", "status": "TO_DO"},
+            {"id": "t05", "due_date": None, "status": "BLOCKED"},
+        ]
+
+    def test_staff_sees_assigned_tasks_and_parents_of_assigned_subtasks(self, reader):
+        pages = _walk(reader, 1, role="staff", user_id="user-2")
+
+        assert [task_id for page in pages for task_id in page] == ["t02", "t03", "t04", "t07"]
+
+    def test_director_sees_department_owned_tasks(self, reader):
+        pages = _walk(reader, 3, role="director", departments=["dept2"], sort="due_date")
+
+        assert [task_id for page in pages for task_id in page] == ["t03", "t06", "t04"]
+
+    @pytest.mark.parametrize("page_size", [1, 2, 5])
+    def test_large_departments_are_filtered_by_owner_in_memory(self, reader, monkeypatch, page_size):
+        expected = _walk(reader, page_size, role="director", departments=["dept1"], sort="due_date")
+        monkeypatch.setattr(read, "MAX_OWNER_FILTER_IDS", 1)
+        select = Mock(wraps=reader.crud.select)
+        monkeypatch.setattr(reader.crud, "select", select)
+
+        pages = _walk(reader, page_size, role="director", departments=["dept1"], sort="due_date")
+
+        assert pages == expected
+        assert [task_id for page in pages for task_id in page] == ["t07", "t01", "t02", "t05"]
+        assert not any("owner_user_id" in str(call.kwargs["filters"]) for call in select.call_args_list)
+
+    def test_owner_checked_in_memory_is_not_added_to_the_projection(self, reader, monkeypatch):
+        monkeypatch.setattr(read, "MAX_OWNER_FILTER_IDS", 1)
+
+        result = reader.get_task_page("user-9", "director", ["dept1"], TaskPageRequest(limit=10, fields=["status"]))
+
+        assert result["tasks"] == [{"id": "t01", "status": "TO_DO"}, {"id": "t02", "status": "IN_PROGRESS"},
+                                   {"id": "t05", "status": "BLOCKED"}, {"id": "t07", "status": "TO_DO"}]
+
+    def test_director_without_department_users_gets_nothing(self, reader):
+        result = reader.get_task_page("user-1", "director", ["unknown"], TaskPageRequest(limit=5))
+
+        assert result == {"tasks": [], "next_cursor": None}
+
+
+class TestTasksDueBetween:
+    """get_tasks_due_between pushes the due date range into the page query"""
+
+    @pytest.mark.parametrize("start, end, expected", [
+        (date(2025, 2, 1), date(2025, 3, 1), ["t06", "t07", "t01", "t04"]),
+        (date(2025, 2, 2), None, ["t01", "t04"]),
+        (None, date(2025, 1, 31), ["t03"]),
+        (None, None, ["t03", "t06", "t07", "t01", "t04"]),
+        (date(2025, 3, 1), date(2025, 2, 1), []),
+    ])
+    def test_range_is_inclusive_and_sorted_by_due_date(self, reader, start, end, expected):
+        tasks = reader.get_tasks_due_between("user-1", "managing_director", [], start, end)
+
+        assert [task["id"] for task in tasks] == expected
+
+    def test_range_respects_access_control(self, reader):
+        tasks = reader.get_tasks_due_between("user-2", "staff", [], date(2025, 1, 1), date(2025, 2, 28))
+
+        assert [task["id"] for task in tasks] == ["t03", "t07"]
+
+    def test_end_day_matches_timestamps_later_that_day(self):
+        conditions = TaskPageRequest(due_to=date(2025, 3, 1)).filters()
+
+        assert [(c.column, c.operator, c.value) for c in conditions] == [("due_date", "lt", "2025-03-02")]
+
+
+class TestTaskPageRequest:
+    """Request validation and cursor handling"""
+
+    def test_cursor_roundtrip(self):
+        cursor = encode_cursor("due_date", True, {"id": "t1", "due_date": "2025-01-01"})
+
+        assert decode_cursor(cursor, "due_date", True) == ("2025-01-01", "t1")
+
+    @pytest.mark.parametrize("sort, descending", [("priority", True), ("due_date", False)])
+    def test_cursor_from_other_sort_order_is_rejected(self, sort, descending):
+        cursor = encode_cursor("due_date", True, {"id": "t1", "due_date": "2025-01-01"})
+
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, sort, descending)
+
+    def test_malformed_cursor_is_rejected(self):
+        with pytest.raises(ValueError):
+            TaskPageRequest(limit=5).after("not-a-cursor")
+
+    @pytest.mark.parametrize("options", [
+        {"sort": "title"},
+        {"fields": ["id", "password_hash"]},
+        {"limit": 0},
+        {"limit": 501},
+        {"priority_min": 8, "priority_max": 2},
+        {"due_from": date(2025, 3, 2), "due_to": date(2025, 3, 1)},
+    ])
+    def test_invalid_requests_raise_value_error(self, options):
+        with pytest.raises(ValueError):
+            TaskPageRequest(**options)
+
+    def test_projection_always_includes_id_and_sort_column(self):
+        assert TaskPageRequest(sort="priority", fields=["title", "id"]).columns() == "id, priority, title"
+        assert TaskPageRequest().columns() == "*"
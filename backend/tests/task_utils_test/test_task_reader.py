@@ -1,6 +1,27 @@
 import pytest
 from unittest.mock import Mock
+from backend.utils.task_crud import read
 from backend.utils.task_crud.read import TaskReader
+from backend.utils.user_crud.user_directory import UserDirectory
+from backend.wrappers.supabase_wrapper.filters import CONTAINS, EQ, IN, IS, Filter, contains, in_, normalize_filters
+
+NOT_ARCHIVED = Filter("is_archived", IS, True, negate=True)
+
+
+def _matches(row, condition):
+    """Evaluate the filter operators TaskReader sends against an in-memory row"""
+    value = row.get(condition.column)
+    if condition.operator == EQ:
+        matched = value == condition.value
+    elif condition.operator == IN:
+        matched = value in condition.value
+    elif condition.operator == CONTAINS:
+        matched = all(item in (value or []) for item in condition.value)
+    elif condition.operator == IS:
+        matched = value is condition.value
+    else:
+        raise AssertionError(f"unexpected operator {condition.operator}")
+    return matched != condition.negate
 
 
 class TestTaskReader:
@@ -8,8 +29,28 @@ class TestTaskReader:
 
     @pytest.fixture
     def mock_crud(self):
-        """Mock CRUD instance"""
-        return Mock()
+        """Mock CRUD instance whose select applies its filters to select.return_value"""
+        mock = Mock()
+        mock.select.side_effect = lambda table, columns="*", filters=None, **kwargs: [
+            row for row in mock.select.return_value
+            if all(_matches(row, condition) for condition in normalize_filters(filters))
+        ]
+        # select_iter pages through the same rows select would return
+        mock.select_iter.side_effect = lambda *args, **kwargs: iter(mock.select(*args, **kwargs))
+        return mock
+
+    @pytest.fixture(autouse=True)
+    def user_directory(self, monkeypatch):
+        """User directory over an in-memory users table (dept1: user-1, user-2; dept2: user-3)"""
+        users = Mock()
+        users.select.return_value = [
+            {"uuid": "user-1", "email": "user1@test.com", "departments": ["dept1"]},
+            {"uuid": "user-2", "email": "user2@test.com", "departments": ["Dept1 "]},
+            {"uuid": "user-3", "email": "user3@test.com", "departments": ["dept2"]},
+        ]
+        directory = UserDirectory(crud=users)
+        monkeypatch.setattr(read, "get_user_directory", lambda: directory)
+        return directory
 
     @pytest.fixture
     def mock_user_manager(self):
@@ -75,13 +116,12 @@ class TestTaskReader:
 
         # Assert
         assert result == sample_tasks
-        mock_crud.select.assert_called_once_with("tasks")
+        mock_crud.select_iter.assert_called_once_with("tasks", filters=[NOT_ARCHIVED])
 
-    def test_director_can_view_department_tasks(self, mock_crud, mock_user_manager, sample_tasks, sample_users):
+    def test_director_can_view_department_tasks(self, mock_crud, mock_user_manager, sample_tasks, user_directory):
         """Test that directors can view all tasks in their department"""
         # Arrange
         mock_crud.select.return_value = sample_tasks
-        mock_user_manager.get_users_by_department.return_value = sample_users["dept_users"]
 
         reader = TaskReader()
         reader.crud = mock_crud
@@ -95,7 +135,7 @@ class TestTaskReader:
         )
 
         # Assert
-        mock_user_manager.get_users_by_department.assert_called_once_with("dept1")
+        assert user_directory.loads == 1
         # Should return tasks owned by users in the department (user-1, user-2)
         expected_tasks = [task for task in sample_tasks if task["owner_user_id"] in ["user-1", "user-2"]]
         assert result == expected_tasks
@@ -213,7 +253,6 @@ class TestTaskReader:
         """Test that departments with no users return empty results"""
         # Arrange
         mock_crud.select.return_value = sample_tasks
-        mock_user_manager.get_users_by_department.return_value = []  # No users
 
         reader = TaskReader()
         reader.crud = mock_crud
@@ -414,7 +453,7 @@ class TestTaskReader:
 
         # Assert
         assert result == sample_tasks
-        mock_crud.select.assert_called_once_with("tasks")
+        mock_crud.select_iter.assert_called_once_with("tasks", filters=[])
 
     def test_get_assigned_tasks_method(self, mock_crud, sample_tasks):
         """Test the _get_assigned_tasks private method"""
@@ -514,3 +553,135 @@ class TestTaskReader:
         assert result[0]["main_task"]["id"] == "task-1"
         assert result[1]["main_task"]["id"] == "task-1"
         assert result[0]["main_task"] is result[1]["main_task"]
+
+    def test_assignment_is_filtered_in_the_database(self, mock_crud, sample_tasks):
+        """Test that staff reads push the assignee filter down and fetch only missing parents"""
+        # Arrange: user-4 is assigned only to subtask task-3, whose parent is task-1
+        mock_crud.select.return_value = sample_tasks
+        reader = TaskReader()
+        reader.crud = mock_crud
+
+        # Act
+        result = reader._filter_tasks_by_assignment("user-4")
+
+        # Assert
+        assert [task["id"] for task in result] == ["task-3", "task-1"]
+        (_, assigned_call), (_, parent_call) = mock_crud.select.call_args_list
+        assert assigned_call["filters"] == [contains("assignee_ids", ["user-4"]), NOT_ARCHIVED]
+        assert parent_call["filters"] == [in_("id", ["task-1"]), NOT_ARCHIVED]
+
+    def test_assigned_parent_is_not_fetched_twice(self, mock_crud, sample_tasks):
+        """Test that no follow-up query runs when every parent is already assigned"""
+        # Arrange
+        mock_crud.select.return_value = sample_tasks
+        reader = TaskReader()
+        reader.crud = mock_crud
+
+        # Act
+        result = reader._filter_tasks_by_assignment("user-1")
+
+        # Assert
+        assert [task["id"] for task in result] == ["task-1", "task-3"]
+        assert mock_crud.select.call_count == 1
+
+    @pytest.mark.parametrize("role", ["managing_director", "director", "staff"])
+    def test_archived_tasks_are_excluded_for_every_role(self, mock_crud, mock_user_manager, sample_tasks, sample_users, role):
+        """Test that archived rows are filtered out of regular reads"""
+        # Arrange
+        archived = {**sample_tasks[0], "id": "task-4", "is_archived": True}
+        mock_crud.select.return_value = sample_tasks + [archived]
+        reader = TaskReader()
+        reader.crud = mock_crud
+        reader.user_manager = mock_user_manager
+
+        # Act
+        result = reader.get_tasks_for_user(user_id="user-1", user_role=role, user_departments=["dept1"])
+
+        # Assert
+        assert result
+        assert "task-4" not in {task["id"] for task in result}
+        assert all(NOT_ARCHIVED in call.kwargs["filters"] for call in mock_crud.select.call_args_list)
+
+    def test_archived_view_fetches_only_archived_subtasks(self, mock_crud, mock_user_manager, sample_tasks):
+        """Test that /readArchivedTasks asks the database for archived subtasks only"""
+        # Arrange
+        archived = {**sample_tasks[2], "id": "task-5", "is_archived": True}
+        mock_crud.select.return_value = sample_tasks + [archived]
+        reader = TaskReader()
+        reader.crud = mock_crud
+        reader.user_manager = mock_user_manager
+
+        # Act
+        result = reader.get_archived_subtasks_for_user(user_id="user-1", user_role="managing_director", user_departments=[])
+
+        # Assert
+        assert [(entry["subtask"]["id"], entry["main_task"]["id"]) for entry in result] == [("task-5", "task-1")]
+        subtask_call, main_task_call = mock_crud.select.call_args_list
+        assert subtask_call.kwargs["filters"] == [Filter("is_archived", EQ, True), Filter("parent_id", IS, None, negate=True)]
+        assert main_task_call.kwargs["filters"] == [in_("id", ["task-1"])]
+
+    def test_director_archived_view_hides_main_tasks_outside_departments(self, mock_crud, mock_user_manager, sample_users):
+        """Test that directors do not receive main tasks owned outside their departments"""
+        # Arrange
+        main_task = {"id": "task-1", "owner_user_id": "user-9", "parent_id": None}
+        subtask = {"id": "task-2", "owner_user_id": "user-1", "parent_id": "task-1", "is_archived": True}
+        mock_crud.select.return_value = [main_task, subtask]
+        reader = TaskReader()
+        reader.crud = mock_crud
+        reader.user_manager = mock_user_manager
+
+        # Act
+        result = reader.get_archived_subtasks_for_user(user_id="director-1", user_role="director", user_departments=["dept1"])
+
+        # Assert
+        assert result == [{"subtask": subtask, "main_task": None}]
+
+    def test_get_task_by_id_is_a_point_lookup(self, mock_crud, mock_user_manager, sample_tasks):
+        """Test that get_task_by_id reads one row instead of every visible task"""
+        # Arrange
+        mock_crud.select.return_value = sample_tasks
+        reader = TaskReader()
+        reader.crud = mock_crud
+        reader.user_manager = mock_user_manager
+
+        # Act
+        result = reader.get_task_by_id(task_id="task-3", user_id="user-4", user_role="staff", user_departments=[])
+
+        # Assert
+        assert result["id"] == "task-3"
+        mock_crud.select.assert_called_once_with("tasks", filters=[Filter("id", EQ, "task-3"), NOT_ARCHIVED], limit=1)
+        mock_crud.select_iter.assert_not_called()
+        mock_crud.exists.assert_not_called()
+
+    def test_get_task_by_id_parent_visible_through_assigned_subtask(self, mock_crud, mock_user_manager, sample_tasks):
+        """Test that a main task is visible to a user assigned only to its subtask"""
+        # Arrange
+        mock_crud.select.return_value = sample_tasks
+        mock_crud.exists.return_value = True
+        reader = TaskReader()
+        reader.crud = mock_crud
+        reader.user_manager = mock_user_manager
+
+        # Act
+        result = reader.get_task_by_id(task_id="task-1", user_id="user-4", user_role="staff", user_departments=[])
+
+        # Assert
+        assert result["id"] == "task-1"
+        (_, conditions), kwargs = mock_crud.exists.call_args
+        assert conditions == [Filter("parent_id", EQ, "task-1"), contains("assignee_ids", ["user-4"]), NOT_ARCHIVED]
+
+    @pytest.mark.parametrize("director_departments, visible", [(["dept1", "dept2"], True), (["dept1"], False), (["DEPT2"], False)])
+    def test_get_task_by_id_director_checks_owner_department(self, mock_crud, sample_tasks, user_directory, director_departments, visible):
+        """Test that directors see a task only when its owner shares one of their departments"""
+        # Arrange: task-2 is owned by user-3 (dept2)
+        mock_crud.select.return_value = sample_tasks
+        reader = TaskReader()
+        reader.crud = mock_crud
+
+        # Act
+        result = reader.get_task_by_id(task_id="task-2", user_id="director-1", user_role="director", user_departments=director_departments)
+
+        # Assert
+        assert (result is not None) == visible
+        assert mock_crud.select.call_count == 1
+        assert user_directory.loads == 1
@@ -0,0 +1,156 @@
+"""
+Tests for the task search index and TaskReader.search_tasks against SQLiteCRUD
+"""
+import pytest
+from unittest.mock import Mock
+from backend.utils.task_crud import read, search
+from backend.utils.task_crud.search import TaskSearchIndex, tokenize
+from backend.utils.task_crud.visibility import TaskVisibilityIndex
+from backend.wrappers.table_events import TableChange
+
+TASKS = [
+    {"id": "t1", "title": "Quarterly report", "description": "Collect sales numbers", "assignee_ids": ["user-1"], "owner_user_id": "user-3"},
+    {"id": "t2", "title": "Reply to vendor", "description": "About the quarterly report draft", "assignee_ids": ["user-2"], "owner_user_id": "user-2"},
+    {"id": "t3", "title": "Report bug", "description": None, "assignee_ids": ["user-2"], "parent_id": "t1", "owner_user_id": "user-3"},
+    {"id": "t4", "title": "Old quarterly report", "description": "", "assignee_ids": ["user-1"], "is_archived": True},
+    {"id": "t5", "title": "Café opening", "description": "Représentation", "assignee_ids": ["user-3"]},
+]
+
+
+@pytest.fixture
+def task_rows():
+    return TASKS
+
+
+@pytest.fixture
+def index(crud, monkeypatch):
+    shared = TaskSearchIndex(crud=crud)
+    monkeypatch.setattr(search, "_shared_index", shared)
+    return shared
+
+
+def _ids(results):
+    return [task_id for task_id, _ in results]
+
+
+class TestTaskSearchIndex:
+    """Prefix matching and ranking"""
+
+    def test_tokenize(self):
+        assert tokenize("Fix: Q3-report (DRAFT)") == ["fix", "q3", "report", "draft"]
+        assert tokenize(None) == []
+
+    def test_title_matches_rank_above_description_matches(self, index):
+        assert _ids(index.search("quarterly")) == ["t1", "t2"]
+
+    def test_every_term_must_match_as_a_prefix(self, index):
+        assert sorted(_ids(index.search("quart rep"))) == ["t1", "t2"]
+        # "reply" is rarer than "report", so t2's title match ranks first; t5 has "représentation"
+        assert _ids(index.search("rep")) == ["t2", "t1", "t3", "t5"]
+        assert _ids(index.search("quarterly bug")) == []
+
+    def test_single_characters_only_match_whole_tokens(self, index):
+        assert index.search("q") == []
+
+    def test_exact_token_outranks_prefix_match(self, index):
+        results = dict(index.search("report"))
+
+        assert results["t3"] > results["t2"]
+        assert dict(index.search("rep"))["t3"] < results["t3"]
+
+    def test_unicode_and_case(self, index):
+        assert _ids(index.search("CAFÉ")) == ["t5"]
+        assert _ids(index.search("représ")) == ["t5"]
+
+    def test_archived_tasks_and_empty_queries_return_nothing(self, index):
+        assert "t4" not in _ids(index.search("old"))
+        assert index.search("  --  ") == []
+
+    def test_writes_update_the_index_without_reloading(self, crud, index):
+        index.search("report")
+
+        crud.insert("tasks", {"id": "t6", "title": "Budget review"})
+        crud.update("tasks", {"title": "Vendor call"}, {"id": "t3"})
+        crud.delete("tasks", {"id": "t2"})
+
+        assert _ids(index.search("budg")) == ["t6"]
+        assert _ids(index.search("report")) == ["t1"]
+        assert _ids(index.search("vendor")) == ["t3"]
+        assert index.loads == 1
+
+    def test_catches_up_with_writes_from_other_workers(self, crud):
+        clock = Mock(return_value=0)
+        # Not the shared index, so local write events never reach it
+        other_worker = TaskSearchIndex(crud=crud, refresh_interval=5, clock=clock)
+        assert _ids(other_worker.search("report")) == ["t1", "t3", "t2"]
+
+        crud.update("tasks", {"title": "Vendor call"}, {"id": "t3"})
+        crud.insert("tasks", {"id": "t6", "title": "Report archive"})
+        crud.delete("tasks", {"id": "t2"})
+
+        clock.return_value = 4
+        assert _ids(other_worker.search("report")) == ["t1", "t3", "t2"]
+
+        clock.return_value = 5
+        assert _ids(other_worker.search("report")) == ["t1", "t6"]
+        assert _ids(other_worker.search("vendor")) == ["t3"]
+        assert other_worker.loads == 1
+
+    def test_unknown_rows_drop_the_index(self, index):
+        index.search("report")
+        index.apply(TableChange("tasks", "update_many", None))
+
+        index.search("report")
+        assert index.loads == 2
+
+
+class TestSearchTasks:
+    """TaskReader.search_tasks applies the read rules to the ranked ids"""
+
+    @pytest.fixture
+    def reader(self, index, reader, monkeypatch):
+        monkeypatch.setattr(read, "TASK_ID_FETCH_BATCH_SIZE", 1)
+        return reader
+
+    def test_admin_gets_ranked_summaries(self, reader):
+        tasks = reader.search_tasks("user-9", "admin", [], "quarterly report")
+
+        assert [task["id"] for task in tasks] == ["t1", "t2"]
+        assert "description" not in tasks[0] and tasks[0]["title"] == "Quarterly report"
+
+    def test_staff_sees_only_readable_matches(self, reader):
+        assert [task["id"] for task in reader.search_tasks("user-2", "staff", [], "report")] == ["t1", "t3", "t2"]
+        assert [task["id"] for task in reader.search_tasks("user-3", "staff", [], "report")] == []
+
+    def test_limit_stops_fetching_early(self, reader, crud, index, monkeypatch):
+        index.search("rep")
+        select = Mock(wraps=crud.select)
+        monkeypatch.setattr(crud, "select", select)
+
+        tasks = reader.search_tasks("user-9", "admin", [], "rep", limit=1)
+
+        assert len(tasks) == 1 and select.call_count == 1
+
+    def test_staff_fetches_only_visible_matches(self, reader, crud, index, monkeypatch):
+        index.search("rep")
+        select = Mock(wraps=crud.select)
+        monkeypatch.setattr(crud, "select", select)
+
+        assert [task["id"] for task in reader.search_tasks("user-1", "staff", [], "report")] == ["t1"]
+        assert [task["id"] for task in reader.search_tasks("user-3", "staff", [], "report")] == []
+        assert select.call_count == 1
+
+    def test_unfiltered_roles_stop_after_max_batches(self, reader, monkeypatch):
+        monkeypatch.setattr(read, "MAX_OWNER_FILTER_IDS", 0)
+        monkeypatch.setattr(read, "MAX_SEARCH_FETCH_BATCHES", 2)
+
+        # Ranked t1, t3, t2; only t2 is owned in dept1 and it is in the third batch
+        assert reader.search_tasks("user-9", "director", ["dept1"], "report") == []
+        monkeypatch.setattr(read, "MAX_SEARCH_FETCH_BATCHES", 3)
+        assert [task["id"] for task in reader.search_tasks("user-9", "director", ["dept1"], "report")] == ["t2"]
+
+    def test_uses_visibility_index_when_enabled(self, reader, crud):
+        directory = reader.user_directory
+        reader.visibility_index = TaskVisibilityIndex(crud=crud, user_directory=directory)
+
+        assert [task["id"] for task in reader.search_tasks("user-1", "staff", [], "report")] == ["t1"]
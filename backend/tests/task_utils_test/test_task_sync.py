@@ -0,0 +1,202 @@
+"""
+Tests for delta sync (TaskReader.get_task_changes) against SQLiteCRUD
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from backend.utils.task_crud import read
+from backend.utils.task_crud.sync import decode_watermark, encode_watermark, sync_scope
+from backend.wrappers.sqlite_wrapper import sqlite_crud
+
+T0 = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class Clock:
+    """Write timestamps for SQLiteCRUD, advanced by hand"""
+
+    def __init__(self):
+        self.current = T0
+
+    def advance(self, seconds=60):
+        self.current += timedelta(seconds=seconds)
+
+    def __call__(self):
+        return self.current.isoformat()
+
+    def later(self, seconds=60):
+        return self.current + timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sqlite_crud, "_now", clock)
+    return clock
+
+
+@pytest.fixture
+def task_rows(clock):
+    # Requesting clock first stamps the seeded rows with T0
+    return [
+        {"id": "t1", "title": "Mine", "owner_user_id": "user-1", "assignee_ids": ["user-1"]},
+        {"id": "t2", "title": "Other", "owner_user_id": "user-3", "assignee_ids": ["user-3"]},
+        {"id": "t3", "title": "Parent", "owner_user_id": "user-3", "assignee_ids": ["user-3"]},
+        {"id": "t4", "title": "Sub", "owner_user_id": "user-3", "assignee_ids": ["user-3"], "parent_id": "t3"},
+        {"id": "t5", "title": "Also mine", "owner_user_id": "user-3", "assignee_ids": ["user-1", "user-3"]},
+    ]
+
+
+def _sync(reader, clock, watermark=None, role="staff", departments=("dept1",), **kwargs):
+    return reader.get_task_changes("user-1", role, list(departments), watermark, now=clock.later(), **kwargs)
+
+
+def _ids(result):
+    return [task["id"] for task in result["tasks"]]
+
+
+class TestTaskSync:
+    """Watermarks, deltas and tombstones"""
+
+    def test_first_sync_is_a_full_snapshot(self, reader, clock):
+        result = _sync(reader, clock)
+
+        assert result["reset"] is True
+        assert sorted(_ids(result)) == ["t1", "t5"]
+        assert result["tombstones"] == []
+        assert result["has_more"] is False
+
+    def test_unchanged_list_returns_empty_delta(self, reader, clock):
+        first = _sync(reader, clock)
+        clock.advance()
+
+        result = _sync(reader, clock, first["watermark"])
+
+        assert (result["tasks"], result["tombstones"], result["reset"]) == ([], [], False)
+
+    def test_delta_contains_updates_and_tombstones(self, reader, crud, clock):
+        watermark = _sync(reader, clock)["watermark"]
+        clock.advance()
+        crud.update("tasks", {"title": "Renamed"}, {"id": "t1"})
+        crud.update("tasks", {"assignee_ids": ["user-3"]}, {"id": "t5"})
+        crud.update("tasks", {"title": "Not mine"}, {"id": "t2"})
+        crud.insert("tasks", {"id": "t6", "title": "New", "owner_user_id": "user-3", "assignee_ids": ["user-1"]})
+        crud.delete("tasks", {"id": "t1"})
+        clock.advance()
+
+        result = _sync(reader, clock, watermark)
+
+        assert _ids(result) == ["t6"]
+        assert result["tombstones"] == ["t1", "t5"]
+
+    def test_other_users_edits_are_not_reported(self, reader, crud, clock):
+        watermark = _sync(reader, clock)["watermark"]
+        clock.advance()
+        crud.update("tasks", {"title": "Edited by user-3"}, {"id": "t2"})
+        crud.update("tasks", {"assignee_ids": ["user-2"]}, {"id": "t4"})
+        crud.insert("tasks", {"id": "t6", "title": "Created by user-3", "owner_user_id": "user-3", "assignee_ids": ["user-3"]})
+        clock.advance()
+
+        result = _sync(reader, clock, watermark)
+
+        assert (result["tasks"], result["tombstones"], result["has_more"]) == ([], [], False)
+
+    def test_task_handed_out_of_the_department_is_a_tombstone(self, reader, crud, clock):
+        watermark = _sync(reader, clock, role="director")["watermark"]
+        clock.advance()
+        crud.update("tasks", {"owner_user_id": "user-3"}, {"id": "t1"})
+        clock.advance()
+
+        result = _sync(reader, clock, watermark, role="director")
+
+        assert (result["tasks"], result["tombstones"]) == ([], ["t1"])
+
+    def test_assigned_subtask_brings_its_main_task(self, reader, crud, clock):
+        watermark = _sync(reader, clock)["watermark"]
+        clock.advance()
+        crud.update("tasks", {"assignee_ids": ["user-1"]}, {"id": "t4"})
+        clock.advance()
+
+        delta = _sync(reader, clock, watermark)
+        assert sorted(_ids(delta)) == ["t3", "t4"]
+
+        clock.advance()
+        crud.update("tasks", {"is_archived": True}, {"id": "t4"})
+        clock.advance()
+
+        assert _sync(reader, clock, delta["watermark"])["tombstones"] == ["t3", "t4"]
+
+    def test_changes_are_paged_in_order(self, reader, crud, clock):
+        watermark = _sync(reader, clock)["watermark"]
+        for task_id in ("t5", "t1"):
+            clock.advance()
+            crud.update("tasks", {"title": "Touched"}, {"id": task_id})
+        clock.advance()
+
+        first = _sync(reader, clock, watermark, limit=1)
+        second = _sync(reader, clock, first["watermark"], limit=1)
+
+        assert (_ids(first), first["has_more"]) == (["t5"], True)
+        assert (_ids(second), second["has_more"]) == (["t1"], False)
+
+    def test_recent_changes_are_sent_again_until_settled(self, reader, crud, clock):
+        watermark = _sync(reader, clock)["watermark"]
+        clock.advance()
+        crud.update("tasks", {"title": "Just now"}, {"id": "t1"})
+
+        now = clock.current + timedelta(seconds=1)
+        first = reader.get_task_changes("user-1", "staff", ["dept1"], watermark, now=now)
+        again = reader.get_task_changes("user-1", "staff", ["dept1"], first["watermark"], now=now + timedelta(seconds=10))
+        settled = reader.get_task_changes("user-1", "staff", ["dept1"], again["watermark"], now=now + timedelta(seconds=20))
+
+        assert _ids(first) == _ids(again) == ["t1"]
+        assert _ids(settled) == []
+
+    def test_scope_change_or_expiry_forces_reset(self, reader, clock):
+        watermark = _sync(reader, clock)["watermark"]
+
+        assert _sync(reader, clock, watermark, departments=("dept2",))["reset"] is True
+        old = decode_watermark(watermark)
+        expired = encode_watermark((T0 - timedelta(days=60)).isoformat(), "", old.scope)
+        assert _sync(reader, clock, expired)["reset"] is True
+
+    def test_director_department_membership_change_forces_reset(self, reader, clock):
+        watermark = _sync(reader, clock, role="director")["watermark"]
+        assert _sync(reader, clock, watermark, role="director")["reset"] is False
+
+        directory = reader.user_directory
+        directory.crud.select.return_value = [{"uuid": "user-1", "departments": ["dept1"]}, {"uuid": "user-3", "departments": ["dept1"]}]
+        directory.invalidate()
+
+        result = _sync(reader, clock, watermark, role="director")
+        assert result["reset"] is True
+        assert sorted(_ids(result)) == ["t1", "t2", "t3", "t4", "t5"]
+
+    def test_large_departments_are_filtered_by_owner_in_memory(self, reader, crud, clock, monkeypatch):
+        first = _sync(reader, clock, role="director", limit=1)
+        clock.advance()
+        crud.update("tasks", {"title": "x"}, {"id": "t2"})
+        crud.update("tasks", {"owner_user_id": "user-1"}, {"id": "t3"})
+        clock.advance()
+        delta = _sync(reader, clock, first["watermark"], role="director")
+
+        monkeypatch.setattr(read, "MAX_OWNER_FILTER_IDS", 0)
+        filtered_first = _sync(reader, clock, role="director", limit=1)
+        filtered_delta = _sync(reader, clock, first["watermark"], role="director")
+
+        assert (_ids(filtered_first), filtered_first["has_more"]) == (["t1"], True)
+        assert filtered_delta == delta
+        assert (_ids(delta), delta["tombstones"]) == (["t3"], [])
+
+    def test_malformed_watermark_raises(self, reader, clock):
+        with pytest.raises(ValueError):
+            _sync(reader, clock, "garbage")
+
+    def test_managing_director_gets_every_change(self, reader, crud, clock):
+        watermark = _sync(reader, clock, role="managing_director")["watermark"]
+        clock.advance()
+        crud.update("tasks", {"title": "x"}, {"id": "t2"})
+        clock.advance()
+
+        assert _ids(_sync(reader, clock, watermark, role="managing_director")) == ["t2"]
+
+    def test_scope_ignores_department_order(self):
+        assert sync_scope("Staff", ["b", "a"]) == sync_scope("staff", ["a", "b"])
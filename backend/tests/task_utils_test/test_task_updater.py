@@ -1,11 +1,29 @@
+import pytest
 from datetime import date, datetime
 from backend.utils.task_crud.update import TaskUpdater
 from backend.schemas.task import TaskUpdate
+from backend.wrappers.supabase_wrapper.supabase_crud import BulkWriteError, BulkWriteResult, ChunkError
 
 
 class TestTaskUpdater:
     """Unit tests for TaskUpdater class"""
 
+    def test_main_task_archival_checks_for_one_unarchived_subtask(self, mock_crud):
+        """Archival validation asks for a single blocking subtask instead of loading them all"""
+        updater = TaskUpdater()
+        updater.crud = mock_crud
+        mock_crud.exists.return_value = True
+
+        assert updater._validate_main_task_archival("main-task-id", True) is False
+        assert updater._validate_main_task_archival("main-task-id", False) is True
+
+        mock_crud.exists.assert_called_once()
+        table, conditions = mock_crud.exists.call_args[0]
+        assert table == "tasks"
+        assert [c.to_postgrest() for c in conditions] == ["parent_id.eq.main-task-id", "is_archived.not.is.true"]
+        assert mock_crud.exists.call_args[1] == {"column": "id"}
+        mock_crud.select.assert_not_called()
+
     def test_update_main_task_basic_fields(self, mock_crud, mock_task_in_db):
         """Test updating basic fields of a main task"""
         # Arrange
@@ -182,6 +200,83 @@ class TestTaskUpdater:
         assert call_args[0][1]["title"] == "New Title"
         assert call_args[0][2] == {"id": "subtask-id", "parent_id": "main-task-id"}  # filter
 
+    def test_identical_subtask_updates_are_batched(self, mock_crud):
+        """Test subtasks receiving the same change share one bulk update"""
+        # Arrange
+        archived = [
+            {"id": "sub-1", "parent_id": "main-task-id", "is_archived": True},
+            {"id": "sub-2", "parent_id": "main-task-id", "is_archived": True},
+        ]
+        mock_crud.select.return_value = []
+        mock_crud.update_many.return_value = BulkWriteResult(rows=archived, chunks=1)
+
+        updater = TaskUpdater()
+        updater.crud = mock_crud
+
+        subtask_updates = {
+            "sub-1": TaskUpdate(is_archived=True),
+            "sub-2": TaskUpdate(is_archived=True),
+        }
+
+        # Act
+        result = updater.update_tasks("main-task-id", "user-1", "manager", subtasks=subtask_updates)
+
+        # Assert
+        mock_crud.update.assert_not_called()
+        mock_crud.update_many.assert_called_once_with(
+            "tasks",
+            {"is_archived": True},
+            ["sub-1", "sub-2"],
+            filters={"parent_id": "main-task-id"}
+        )
+        assert result["updated_subtasks"] == archived
+
+    def test_failed_subtask_chunk_fails_the_update(self, mock_crud):
+        """Test a failed bulk subtask update is raised instead of dropping the subtasks"""
+        # Arrange
+        mock_crud.select.return_value = []
+        mock_crud.update_many.return_value = BulkWriteResult(
+            rows=[], errors=[ChunkError(chunk_index=0, size=2, error="timeout", keys=["sub-1", "sub-2"])], chunks=1
+        )
+
+        updater = TaskUpdater()
+        updater.crud = mock_crud
+
+        # Act / Assert
+        with pytest.raises(BulkWriteError):
+            updater.update_tasks(
+                "main-task-id", "user-1", "manager",
+                subtasks={"sub-1": TaskUpdate(is_archived=True), "sub-2": TaskUpdate(is_archived=True)}
+            )
+
+    def test_each_task_row_is_read_once(self, mock_crud):
+        """Test the main task and subtasks are fetched once despite repeated checks"""
+        # Arrange
+        main_row = {"id": "main-task-id", "assignee_ids": ["user-1"]}
+        subtask_rows = [
+            {"id": "sub-1", "parent_id": "main-task-id", "assignee_ids": ["user-1"]},
+            {"id": "sub-2", "parent_id": "main-task-id", "assignee_ids": ["user-1"]},
+        ]
+        mock_crud.select.side_effect = [[main_row], subtask_rows]
+        mock_crud.update.side_effect = lambda table, data, filters: [{**main_row, **data}]
+        mock_crud.update_many.return_value = BulkWriteResult(rows=subtask_rows, chunks=1)
+
+        updater = TaskUpdater()
+        updater.crud = mock_crud
+
+        # Act
+        updater.update_tasks(
+            "main-task-id", "user-1", "manager",
+            main_task=TaskUpdate(assignee_ids=["user-1", "user-2"]),
+            subtasks={
+                "sub-1": TaskUpdate(assignee_ids=["user-1", "user-2"]),
+                "sub-2": TaskUpdate(assignee_ids=["user-1", "user-2"]),
+            }
+        )
+
+        # Assert: one read for the main task, one for all subtasks
+        assert mock_crud.select.call_count == 2
+
     def test_subtask_assignee_permissions_manager(self, mock_crud):
         """Test that managers can modify subtask assignees"""
         # Arrange
@@ -312,11 +407,11 @@ class TestTaskUpdater:
 
         inserted_records = []
 
-        def mock_insert(table_name, record):
-            inserted_records.append(record)
-            return [record]
+        def mock_insert_many(table_name, records):
+            inserted_records.extend(records)
+            return records
 
-        mock_crud.insert.side_effect = mock_insert
+        mock_crud.insert_many.side_effect = mock_insert_many
 
         updater = TaskUpdater()
         updater.crud = mock_crud
@@ -351,3 +446,5 @@ class TestTaskUpdater:
         assert mock_crud.delete.called
         assert len(inserted_records) == 3  # because we skip the first (original) date
         assert all(r["parent_id"] == main_task_id for r in inserted_records)
+        mock_crud.insert_many.assert_called_once()  # all instances in one bulk request
+        mock_crud.insert.assert_not_called()
@@ -0,0 +1,197 @@
+"""
+Tests for the materialized task visibility index against SQLiteCRUD
+"""
+import pytest
+from datetime import date
+from unittest.mock import Mock
+from backend.utils.task_crud import read, visibility
+from backend.utils.task_crud.visibility import TaskVisibilityIndex, get_task_visibility_index
+from backend.wrappers.supabase_wrapper.supabase_crud import BulkWriteError
+from backend.wrappers.table_events import TableChange, on_change, remove_listener
+
+TASKS = [
+    {"id": "m1", "owner_user_id": "user-1", "assignee_ids": ["user-1"], "due_date": "2025-03-01"},
+    {"id": "s1", "owner_user_id": "user-1", "assignee_ids": ["user-2"], "parent_id": "m1", "due_date": "2025-02-10"},
+    {"id": "m2", "owner_user_id": "user-3", "assignee_ids": ["user-3"], "due_date": "2025-03-01T17:00:00+00:00"},
+    {"id": "s2", "owner_user_id": "user-3", "assignee_ids": ["user-2"], "parent_id": "m2", "is_archived": True},
+    {"id": "m3", "owner_user_id": "user-1", "assignee_ids": ["user-2"], "is_archived": True},
+]
+
+
+@pytest.fixture
+def task_rows():
+    return TASKS
+
+
+@pytest.fixture
+def index(crud, directory, monkeypatch):
+    shared = TaskVisibilityIndex(crud=crud, user_directory=directory)
+    monkeypatch.setattr(visibility, "_shared_index", shared)
+    return shared
+
+
+class TestVisibleTaskIds:
+    """The index answers what get_tasks_for_user would return"""
+
+    @pytest.mark.parametrize("user_id, role, departments, expected", [
+        ("user-9", "admin", [], {"m1", "s1", "m2"}),
+        ("user-9", "managing_director", [], {"m1", "s1", "m2"}),
+        ("user-9", "director", ["dept1"], {"m1", "s1"}),
+        ("user-9", "director", ["DEPT1 "], set()),
+        ("user-9", "director", [], set()),
+        ("user-2", "staff", ["dept1"], {"s1", "m1"}),
+        ("user-3", "manager", ["dept2"], {"m2"}),
+        ("user-9", "staff", [], set()),
+    ])
+    def test_roles(self, index, user_id, role, departments, expected):
+        assert index.visible_task_ids(user_id, role, departments) == expected
+
+    def test_include_archived(self, index):
+        assert index.visible_task_ids("user-2", "staff", [], include_archived=True) == {"s1", "m1", "s2", "m2", "m3"}
+
+    @pytest.mark.parametrize("start, end, expected", [
+        (None, None, ["s1", "m1", "m2"]),
+        (date(2025, 3, 1), date(2025, 3, 1), ["m1", "m2"]),
+        (None, date(2025, 2, 28), ["s1"]),
+        (date(2025, 3, 2), None, []),
+    ])
+    def test_due_date_ranges_are_bisected(self, index, start, end, expected):
+        assert index.task_ids_due_between(start, end) == expected
+
+    def test_builds_once_until_ttl(self, crud, directory):
+        clock = Mock(return_value=0)
+        index = TaskVisibilityIndex(crud=crud, user_directory=directory, ttl=60, clock=clock)
+
+        index.visible_task_ids("user-2", "staff", [])
+        clock.return_value = 59
+        index.visible_task_ids("user-2", "staff", [])
+        assert index.loads == 1
+
+        clock.return_value = 60
+        index.visible_task_ids("user-2", "staff", [])
+        assert index.loads == 2
+
+
+class TestIncrementalUpdates:
+    """Writes through the CRUD backend keep the shared index current without reloads"""
+
+    def test_insert_update_delete(self, crud, index):
+        assert index.visible_task_ids("user-4", "staff", []) == set()
+
+        crud.insert("tasks", {"id": "s3", "owner_user_id": "user-3", "assignee_ids": ["user-4"], "parent_id": "m2"})
+        assert index.visible_task_ids("user-4", "staff", []) == {"s3", "m2"}
+
+        crud.update("tasks", {"assignee_ids": ["user-1"], "due_date": "2025-01-01"}, {"id": "s3"})
+        assert index.task_ids_due_between(None, date(2025, 1, 1)) == ["s3"]
+        assert index.visible_task_ids("user-4", "staff", []) == set()
+        assert index.visible_task_ids("user-1", "staff", []) == {"m1", "s3", "m2"}
+
+        crud.update_many("tasks", {"is_archived": True}, ["m1"])
+        crud.delete("tasks", {"id": "s3"})
+        assert index.visible_task_ids("user-1", "staff", []) == set()
+        assert index.task_ids_due_between() == ["s1", "m2"]
+        assert index.loads == 1
+
+    def test_catches_up_with_writes_from_other_workers(self, crud, directory):
+        clock = Mock(return_value=0)
+        # Not the shared index, so local write events never reach it
+        other_worker = TaskVisibilityIndex(crud=crud, user_directory=directory, refresh_interval=5, clock=clock)
+        assert other_worker.visible_task_ids("user-2", "staff", []) == {"s1", "m1"}
+
+        crud.update("tasks", {"assignee_ids": ["user-4"]}, {"id": "s1"})
+        crud.insert("tasks", {"id": "s3", "owner_user_id": "user-3", "assignee_ids": ["user-2"], "parent_id": "m2"})
+        crud.delete("tasks", {"id": "m1"})
+
+        clock.return_value = 4
+        assert other_worker.visible_task_ids("user-2", "staff", []) == {"s1", "m1"}
+
+        clock.return_value = 5
+        assert other_worker.visible_task_ids("user-2", "staff", []) == {"s3", "m2"}
+        assert other_worker.visible_task_ids("user-4", "staff", []) == {"s1"}
+        assert other_worker.loads == 1
+
+    def test_builds_outside_the_lock(self, crud, index, monkeypatch):
+        select_iter = crud.select_iter
+        written = []
+
+        def scan(*args, **kwargs):
+            assert not index._lock.locked()
+            rows = list(select_iter(*args, **kwargs))
+            if not written:
+                # Lands after the scan read its rows, before the snapshot is swapped in
+                written.append(crud.insert("tasks", {"id": "s3", "owner_user_id": "user-3", "assignee_ids": ["user-4"]}))
+            return iter(rows)
+
+        monkeypatch.setattr(crud, "select_iter", scan)
+
+        assert index.visible_task_ids("user-4", "staff", []) == {"s3"}
+        assert index.loads == 1
+
+    def test_failed_write_drops_the_index(self, crud, index):
+        index.visible_task_ids("user-1", "staff", [])
+
+        with pytest.raises(BulkWriteError):
+            crud.insert_many("tasks", [{"id": "m1"}])
+
+        assert index.visible_task_ids("user-1", "staff", []) == {"m1"}
+        assert index.loads == 2
+
+    def test_partial_rows_drop_the_index(self, index):
+        index.visible_task_ids("user-1", "staff", [])
+
+        index.apply(TableChange("tasks", "update", [{"id": "m1", "title": "renamed"}]))
+
+        index.visible_task_ids("user-1", "staff", [])
+        assert index.loads == 2
+
+    def test_change_listeners_receive_written_rows(self, crud):
+        changes = []
+        on_change("tasks", changes.append)
+        try:
+            crud.insert("tasks", {"id": "t9"})
+            crud.delete("tasks", {"id": "t9"})
+        finally:
+            remove_listener("tasks", changes.append)
+
+        assert [(change.operation, change.deleted, [row["id"] for row in change.rows]) for change in changes] == [
+            ("insert", False, ["t9"]), ("delete", True, ["t9"]),
+        ]
+
+
+class TestTaskReaderWithIndex:
+    """TaskReader answers from the index when TASK_VISIBILITY_INDEX is on"""
+
+    @pytest.fixture
+    def reader(self, index, reader, monkeypatch):
+        monkeypatch.setenv("TASK_VISIBILITY_INDEX", "true")
+        monkeypatch.setattr(read, "TASK_ID_FETCH_BATCH_SIZE", 1)
+        reader.visibility_index = get_task_visibility_index()
+        return reader
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("TASK_VISIBILITY_INDEX", raising=False)
+        assert get_task_visibility_index() is None
+
+    @pytest.mark.parametrize("user_id, role, departments", [
+        ("user-2", "staff", []),
+        ("user-9", "director", ["dept1"]),
+        ("user-9", "admin", []),
+    ])
+    def test_same_tasks_as_table_scan(self, reader, user_id, role, departments):
+        from_index = reader.get_tasks_for_user(user_id, role, departments)
+        reader.visibility_index = None
+        from_scan = reader.get_tasks_for_user(user_id, role, departments)
+
+        assert [task["id"] for task in from_index] == sorted(task["id"] for task in from_scan)
+        assert from_index == sorted(from_scan, key=lambda task: task["id"])
+
+    def test_due_date_range_matches_database_query(self, reader):
+        from_index = reader.get_tasks_due_between("user-9", "admin", [], date(2025, 2, 1), date(2025, 3, 1))
+        reader.visibility_index = None
+        from_database = reader.get_tasks_due_between("user-9", "admin", [], date(2025, 2, 1), date(2025, 3, 1))
+
+        assert [task["id"] for task in from_index] == [task["id"] for task in from_database] == ["s1", "m1", "m2"]
+
+    def test_read_check_is_set_membership(self, reader):
+        assert reader.get_task_by_id("m1", "user-2", "staff", []) is not None
+        assert reader.get_task_by_id("m2", "user-2", "staff", []) is None
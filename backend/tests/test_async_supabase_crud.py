@@ -0,0 +1,165 @@
+"""
+Tests for AsyncSupabaseCRUD and AsyncSupabaseStorage wrappers
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock
+from backend.wrappers.supabase_wrapper.async_supabase_crud import AsyncSupabaseCRUD
+from backend.wrappers.supabase_wrapper.supabase_crud import BulkWriteError
+from backend.wrappers.supabase_wrapper.filters import in_
+from backend.wrappers.async_storage import AsyncSupabaseStorage
+
+
+def _chain(builder, *methods):
+    """Make builder methods return the builder itself so calls can be chained"""
+    for method in methods:
+        getattr(builder, method).return_value = builder
+    return builder
+
+
+class TestAsyncSupabaseCRUD:
+    """Test AsyncSupabaseCRUD methods"""
+
+    @pytest.fixture
+    def mock_client(self):
+        return Mock()
+
+    @pytest.fixture
+    def crud_with_mock(self, mock_client):
+        return AsyncSupabaseCRUD(client=mock_client)
+
+    def test_select_applies_filters_and_awaits_execute(self, crud_with_mock, mock_client):
+        query = _chain(mock_client.table.return_value.select.return_value, "eq", "in_", "order", "limit")
+        query.execute = AsyncMock(return_value=Mock(data=[{"id": "t1"}]))
+
+        result = asyncio.run(crud_with_mock.select(
+            "tasks",
+            filters=[in_("id", ["t1", "t2"])],
+            order_by="due_date",
+            limit=5
+        ))
+
+        mock_client.table.assert_called_once_with("tasks")
+        query.in_.assert_called_once_with("id", ["t1", "t2"])
+        query.order.assert_called_once_with("due_date", desc=False)
+        query.limit.assert_called_once_with(5)
+        assert result == [{"id": "t1"}]
+
+    def test_select_iter_pages_until_short_page(self, crud_with_mock, mock_client):
+        query = _chain(mock_client.table.return_value.select.return_value, "gt", "order", "limit")
+        query.execute = AsyncMock(side_effect=[
+            Mock(data=[{"id": "a"}, {"id": "b"}]),
+            Mock(data=[{"id": "c"}]),
+        ])
+
+        async def collect():
+            return [row async for row in crud_with_mock.select_iter("tasks", page_size=2)]
+
+        rows = asyncio.run(collect())
+
+        assert [row["id"] for row in rows] == ["a", "b", "c"]
+        query.gt.assert_called_once_with("id", "b")
+
+    def test_insert_returns_first_row(self, crud_with_mock, mock_client):
+        insert = mock_client.table.return_value.insert.return_value
+        insert.execute = AsyncMock(return_value=Mock(data=[{"id": "new"}]))
+
+        result = asyncio.run(crud_with_mock.insert("tasks", {"title": "x"}))
+
+        assert result == {"id": "new"}
+
+    def test_insert_many_raises_on_failed_chunk(self, crud_with_mock, mock_client):
+        insert = mock_client.table.return_value.insert.return_value
+        insert.execute = AsyncMock(side_effect=[Mock(data=[{"id": 1}]), Exception("boom")])
+
+        with pytest.raises(BulkWriteError) as exc_info:
+            asyncio.run(crud_with_mock.insert_many("tasks", [{"id": 1}, {"id": 2}], batch_size=1))
+
+        assert exc_info.value.result.rows == [{"id": 1}]
+        assert exc_info.value.result.errors[0].chunk_index == 1
+
+    def test_update_many_filters_each_chunk_by_ids(self, crud_with_mock, mock_client):
+        query = _chain(mock_client.table.return_value.update.return_value, "in_", "eq")
+        query.execute = AsyncMock(return_value=Mock(data=[{"id": "a"}]))
+
+        result = asyncio.run(crud_with_mock.update_many(
+            "tasks", {"status": "COMPLETED"}, ["a", "b", "c"], filters={"parent_id": "p"}, batch_size=2
+        ))
+
+        assert result.chunks == 2
+        query.in_.assert_any_call("id", ["a", "b"])
+        query.in_.assert_any_call("id", ["c"])
+        query.eq.assert_called_with("parent_id", "p")
+
+    def test_exists_fetches_one_row(self, crud_with_mock, mock_client):
+        query = _chain(mock_client.table.return_value.select.return_value, "eq", "limit")
+        query.execute = AsyncMock(return_value=Mock(data=[]))
+
+        assert asyncio.run(crud_with_mock.exists("tasks", {"id": "missing"})) is False
+        mock_client.table.return_value.select.assert_called_once_with("id")
+        query.limit.assert_called_once_with(1)
+
+    def test_independent_reads_run_concurrently(self, crud_with_mock, mock_client):
+        started = []
+
+        async def run():
+            gate = asyncio.Event()
+
+            async def slow_execute():
+                started.append(True)
+                await gate.wait()
+                return Mock(data=[])
+
+            query = _chain(mock_client.table.return_value.select.return_value, "eq")
+            query.execute = slow_execute
+
+            async def open_gate():
+                while len(started) < 2:
+                    await asyncio.sleep(0)
+                gate.set()
+
+            await asyncio.gather(
+                crud_with_mock.select("tasks", filters={"id": "main"}),
+                crud_with_mock.select("tasks", filters={"id": "sub"}),
+                open_gate(),
+            )
+
+        asyncio.run(asyncio.wait_for(run(), timeout=1))
+        assert len(started) == 2
+
+
+class TestAsyncSupabaseStorage:
+    """Test AsyncSupabaseStorage methods"""
+
+    @pytest.fixture
+    def bucket(self):
+        bucket = Mock()
+        bucket.upload = AsyncMock(return_value=Mock(error=None))
+        bucket.get_public_url = AsyncMock(return_value="https://x.supabase.co/storage/v1/object/public/files/tasks/u1/a.txt")
+        bucket.remove = AsyncMock(return_value=Mock(error=None))
+        return bucket
+
+    @pytest.fixture
+    def storage(self, bucket):
+        client = Mock()
+        client.storage.from_.return_value = bucket
+        return AsyncSupabaseStorage(bucket_name="files", client=client)
+
+    def test_upload_file_returns_public_url(self, storage, bucket):
+        url = asyncio.run(storage.upload_file(file_name="../a.txt", file_bytes=b"data", user_id="u1"))
+
+        path = bucket.upload.await_args.args[0]
+        assert path.startswith("tasks/u1/") and path.endswith("_a.txt")
+        assert url.endswith("/tasks/u1/a.txt")
+
+    def test_upload_empty_file_rejected(self, storage):
+        with pytest.raises(ValueError):
+            asyncio.run(storage.upload_file(file_name="a.txt", file_bytes=b""))
+
+    def test_delete_file_removes_storage_path(self, storage, bucket):
+        deleted = asyncio.run(storage.delete_file(
+            "https://x.supabase.co/storage/v1/object/public/files/tasks/u1/a.txt"
+        ))
+
+        assert deleted is True
+        bucket.remove.assert_awaited_once_with(["tasks/u1/a.txt"])
@@ -0,0 +1,115 @@
+"""
+Tests for conditional GET support (ETag / If-None-Match)
+"""
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from backend.core.etag import compute_etag, etag_matches
+from backend.main import app
+from backend.utils.security import create_access_token
+from backend.wrappers.table_events import notify_write, table_version
+
+client = TestClient(app)
+
+USER = {"sub": "user-1", "role": "staff", "departments": ["engineering"]}
+
+
+def _request(path="/api/tasks/readTasks", query=b""):
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query, "headers": []})
+
+
+class TestComputeEtag:
+    """The tag changes exactly when the response could"""
+
+    def test_stable_until_a_table_is_written(self):
+        first = compute_etag(_request(), USER, ("tasks", "users"), now=0)
+
+        assert compute_etag(_request(), USER, ("tasks", "users"), now=1) == first
+        notify_write("tasks")
+        assert compute_etag(_request(), USER, ("tasks", "users"), now=1) != first
+
+    def test_write_to_unrelated_table_keeps_tag(self):
+        first = compute_etag(_request(), USER, ("tasks",), now=0)
+        notify_write("notifications")
+
+        assert compute_etag(_request(), USER, ("tasks",), now=0) == first
+
+    @pytest.mark.parametrize("request_, user", [
+        (_request(query=b"limit=10"), USER),
+        (_request(path="/api/tasks/readArchivedTasks"), USER),
+        (_request(), {**USER, "sub": "user-2"}),
+        (_request(), {**USER, "role": "director"}),
+        (_request(), {**USER, "departments": ["sales"]}),
+    ])
+    def test_depends_on_request_and_user(self, request_, user):
+        assert compute_etag(request_, user, ("tasks",), now=0) != compute_etag(_request(), USER, ("tasks",), now=0)
+
+    def test_expires_with_the_max_age_window(self, monkeypatch):
+        monkeypatch.setenv("ETAG_MAX_AGE_SECONDS", "60")
+
+        assert compute_etag(_request(), USER, ("tasks",), now=0) == compute_etag(_request(), USER, ("tasks",), now=59)
+        assert compute_etag(_request(), USER, ("tasks",), now=0) != compute_etag(_request(), USER, ("tasks",), now=60)
+
+    def test_write_counter(self):
+        before = table_version("projects")
+        notify_write("projects")
+        assert table_version("projects") == before + 1
+
+
+class TestEtagMatches:
+    """If-None-Match parsing"""
+
+    @pytest.mark.parametrize("header, matched", [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"x", "abc"', True),
+        ("*", True),
+        ('"abcd"', False),
+        ("", False),
+        (None, False),
+    ])
+    def test_header_forms(self, header, matched):
+        assert etag_matches(header, '"abc"') is matched
+
+
+class TestConditionalEndpoints:
+    """Endpoints answer 304 without running when the client's copy is current"""
+
+    @pytest.fixture
+    def headers(self):
+        return {"Authorization": f"Bearer {create_access_token(dict(USER))}"}
+
+    @patch("backend.routers.auth.UserManager")
+    def test_users_list_revalidates(self, mock_manager, headers):
+        mock_manager.return_value.get_all_users.return_value = [{"uuid": "user-1"}]
+
+        first = client.get("/api/auth/users", headers=headers)
+        etag = first.headers["ETag"]
+        repeat = client.get("/api/auth/users", headers={**headers, "If-None-Match": etag})
+        notify_write("users")
+        changed = client.get("/api/auth/users", headers={**headers, "If-None-Match": etag})
+
+        assert first.status_code == 200 and first.headers["Cache-Control"] == "private, no-cache"
+        assert (repeat.status_code, repeat.content, repeat.headers["ETag"]) == (304, b"", etag)
+        assert changed.status_code == 200 and changed.headers["ETag"] != etag
+        assert mock_manager.return_value.get_all_users.call_count == 2
+
+    @patch("backend.utils.task_crud.read.TaskReader.get_tasks_for_user", return_value=[])
+    def test_read_tasks_sends_etag_and_304(self, mock_get_tasks, headers):
+        first = client.get("/api/tasks/readTasks", headers=headers)
+        repeat = client.get("/api/tasks/readTasks", headers={**headers, "If-None-Match": first.headers["ETag"]})
+
+        assert first.status_code == 200 and first.headers["ETag"]
+        assert repeat.status_code == 304
+        mock_get_tasks.assert_called_once()
+
+    @patch("backend.utils.task_crud.read.TaskReader.get_tasks_for_user", return_value=[])
+    def test_zero_max_age_disables_conditional_get(self, mock_get_tasks, headers, monkeypatch):
+        monkeypatch.setenv("ETAG_MAX_AGE_SECONDS", "0")
+
+        first = client.get("/api/tasks/readTasks", headers=headers)
+        repeat = client.get("/api/tasks/readTasks", headers={**headers, "If-None-Match": first.headers["ETag"]})
+
+        assert (first.status_code, repeat.status_code) == (200, 200)
+        assert mock_get_tasks.call_count == 2
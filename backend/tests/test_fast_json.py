@@ -0,0 +1,95 @@
+"""
+Tests for the fast JSON decode path and FastJSONResponse
+"""
+import asyncio
+from datetime import date
+from unittest.mock import Mock
+import httpx
+import pytest
+from postgrest import APIError, AsyncPostgrestClient, SyncPostgrestClient
+from backend.core.responses import FastJSONResponse
+from backend.schemas.crud_schemas import CountRequest
+from backend.wrappers.supabase_wrapper import fast_json
+from backend.wrappers.supabase_wrapper.fast_json import async_executor, executor, loads, dumps
+from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+
+ROWS = [{"id": "t1", "title": "Å task", "assignee_ids": ["u1"]}, {"id": "t2", "title": "B", "assignee_ids": []}]
+
+
+def _handler(request):
+    if request.url.path.endswith("/missing"):
+        return httpx.Response(404, json={"message": "relation does not exist", "code": "42P01"})
+    if request.method == "HEAD":
+        return httpx.Response(200, headers={"content-range": "*/42"})
+    return httpx.Response(200, content=dumps(ROWS), headers={"content-range": "0-1/2"})
+
+
+def _client():
+    return SyncPostgrestClient("http://postgrest", http_client=httpx.Client(transport=httpx.MockTransport(_handler)))
+
+
+class TestFastDecode:
+    """Test that the fast path builds the same responses as postgrest-py"""
+
+    def test_select_matches_builtin_execute(self):
+        query = _client().table("tasks").select("*").eq("id", "t1")
+
+        fast = executor(query)()
+        builtin = query.execute()
+
+        assert fast.data == builtin.data == ROWS
+        assert fast.count == builtin.count
+
+    def test_head_count(self):
+        query = _client().table("tasks").select("*", count="exact", head=True)
+
+        response = executor(query)()
+
+        assert (response.data, response.count) == ([], 42)
+
+    def test_error_raises_api_error(self):
+        with pytest.raises(APIError) as error:
+            executor(_client().table("missing").select("*"))()
+        assert error.value.code == "42P01"
+
+    def test_async_select(self):
+        async def run():
+            client = AsyncPostgrestClient(
+                "http://postgrest", http_client=httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+            )
+            return await async_executor(client.table("tasks").select("*"))()
+
+        assert asyncio.run(run()).data == ROWS
+
+    def test_other_builders_and_doubles_keep_execute(self, monkeypatch):
+        double = Mock()
+        assert executor(double) == double.execute
+        single = _client().table("tasks").select("*").single()
+        assert executor(single) == single.execute
+
+        monkeypatch.setenv("SUPABASE_FAST_JSON", "false")
+        query = _client().table("tasks").select("*")
+        assert executor(query) == query.execute
+
+    def test_crud_select_uses_fast_path(self):
+        crud = SupabaseCRUD(flights=Mock(do=lambda table, key, fn: (fn(), False)))
+        crud.client = _client()
+
+        assert crud.select("tasks", filters={"id": "t1"}) == ROWS
+
+    def test_stdlib_fallback_roundtrip(self, monkeypatch):
+        monkeypatch.setattr(fast_json, "orjson", None)
+
+        assert loads(dumps(ROWS)) == ROWS
+        assert dumps({"a": 1}) == b'{"a":1}'
+
+
+class TestFastJSONResponse:
+    """Test the response class"""
+
+    def test_renders_dicts_and_models(self):
+        response = FastJSONResponse({"tasks": ROWS, "day": date(2025, 1, 2)})
+
+        assert loads(response.body) == {"tasks": ROWS, "day": "2025-01-02"}
+        assert response.headers["content-type"] == "application/json"
+        assert loads(FastJSONResponse(CountRequest(table_name="tasks")).body)["table_name"] == "tasks"
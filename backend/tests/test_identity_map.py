@@ -0,0 +1,92 @@
+"""
+Tests for the request-scoped IdentityMap
+"""
+from unittest.mock import Mock
+from backend.wrappers.supabase_wrapper.identity_map import IdentityMap
+from backend.wrappers.supabase_wrapper.supabase_crud import BulkWriteResult
+
+
+class TestIdentityMap:
+    """Test IdentityMap read deduplication and write refresh"""
+
+    def test_get_fetches_once(self):
+        crud = Mock()
+        crud.select.return_value = [{"id": "t1", "title": "Old"}]
+        rows = IdentityMap(crud)
+
+        assert rows.get("tasks", "t1") == {"id": "t1", "title": "Old"}
+        assert rows.get("tasks", "t1") == {"id": "t1", "title": "Old"}
+
+        crud.select.assert_called_once_with("tasks", filters={"id": "t1"})
+        assert (rows.hits, rows.misses) == (1, 1)
+
+    def test_missing_row_is_remembered(self):
+        crud = Mock()
+        crud.select.return_value = []
+        rows = IdentityMap(crud)
+
+        assert rows.get("tasks", "nope") is None
+        assert rows.get("tasks", "nope") is None
+        crud.select.assert_called_once()
+
+    def test_get_many_fetches_only_missing_ids_in_one_query(self):
+        crud = Mock()
+        crud.select.return_value = [{"id": "b"}, {"id": "c"}]
+        rows = IdentityMap(crud)
+        rows.add("tasks", [{"id": "a"}])
+
+        found = rows.get_many("tasks", ["a", "b", "c", "d"])
+
+        assert set(found) == {"a", "b", "c"}
+        crud.select.assert_called_once()
+        in_filter = crud.select.call_args.kwargs["filters"][0]
+        assert in_filter.to_postgrest() == "id.in.(b,c,d)"
+        assert rows.get("tasks", "d") is None
+        crud.select.assert_called_once()
+
+    def test_update_refreshes_row(self):
+        crud = Mock()
+        crud.select.return_value = [{"id": "t1", "status": "TO_DO"}]
+        crud.update.return_value = [{"id": "t1", "status": "COMPLETED"}]
+        rows = IdentityMap(crud)
+
+        previous = rows.get("tasks", "t1")
+        rows.update("tasks", {"status": "COMPLETED"}, {"id": "t1"})
+
+        assert previous["status"] == "TO_DO"
+        assert rows.get("tasks", "t1")["status"] == "COMPLETED"
+        crud.select.assert_called_once()
+
+    def test_update_without_returned_row_forgets_target(self):
+        crud = Mock()
+        crud.select.return_value = [{"id": "t1"}]
+        crud.update.return_value = []
+        rows = IdentityMap(crud)
+
+        rows.get("tasks", "t1")
+        rows.update("tasks", {"status": "COMPLETED"}, {"id": "t1"})
+        rows.get("tasks", "t1")
+
+        assert crud.select.call_count == 2
+
+    def test_update_many_and_delete(self):
+        crud = Mock()
+        crud.update_many.return_value = BulkWriteResult(rows=[{"id": "a", "is_archived": True}], chunks=1)
+        crud.delete.return_value = [{"id": "b"}]
+        rows = IdentityMap(crud)
+        rows.add("tasks", [{"id": "a", "is_archived": False}, {"id": "b"}])
+
+        rows.update_many("tasks", {"is_archived": True}, ["a"])
+        rows.delete("tasks", {"parent_id": "p"})
+
+        assert rows.get("tasks", "a")["is_archived"] is True
+        assert rows.get("tasks", "b") is None
+        crud.select.assert_not_called()
+
+    def test_returned_rows_are_copies(self):
+        rows = IdentityMap(Mock())
+        rows.add("tasks", [{"id": "a", "title": "x"}])
+
+        rows.get("tasks", "a")["title"] = "mutated"
+
+        assert rows.get("tasks", "a")["title"] == "x"
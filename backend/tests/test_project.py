@@ -529,6 +529,27 @@ def test_delete_project_success(monkeypatch):
     assert response.json()["message"] == "Project deleted successfully"
 
 
+def test_delete_project_drops_cached_project_reads(monkeypatch):
+    """Raw client writes still invalidate the shared query cache"""
+    from backend.wrappers.supabase_wrapper.query_cache import QueryCache
+    import backend.routers.project as project_router
+
+    mock_user = create_mock_user(uuid="user-123", role="admin")
+    cache = QueryCache(default_ttl=60)
+    cache.set("projects", "all", [{"id": "proj-1"}])
+    cache.set("users", "all", [{"uuid": "user-123"}])
+    monkeypatch.setattr(project_router, "get_shared_cache", lambda: cache)
+    monkeypatch.setattr(project_router, "get_current_user", lambda: mock_user)
+    monkeypatch.setattr(project_router, "SupabaseCRUD", lambda: DummySupabase([{"id": "proj-1", "collaborator_ids": []}]))
+
+    token = security.create_access_token(mock_user)
+    response = client.delete("/api/projects/proj-1", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert cache.get("projects", "all") == (False, None)
+    assert cache.get("users", "all")[0] is True
+
+
 def test_delete_project_not_found(monkeypatch):
     """Test deleting a non-existent project"""
     mock_user = create_mock_user(uuid="user-123", role="admin")
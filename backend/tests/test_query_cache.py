@@ -0,0 +1,153 @@
+"""
+Tests for the SupabaseCRUD read-through query cache
+"""
+import pytest
+from unittest.mock import Mock
+from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.supabase_wrapper.query_cache import QueryCache, make_cache_key
+from backend.wrappers.supabase_wrapper.filters import eq, gte
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQueryCache:
+    """Test QueryCache TTL, LRU and counters"""
+
+    def test_hit_and_miss_counters(self):
+        cache = QueryCache(table_ttls={"users": 10})
+
+        assert cache.get("users", "k") == (False, None)
+        cache.set("users", "k", [{"uuid": "u1"}])
+        assert cache.get("users", "k") == (True, [{"uuid": "u1"}])
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+        assert stats.hit_ratio == 0.5
+
+    def test_entries_expire_after_table_ttl(self):
+        clock = FakeClock()
+        cache = QueryCache(table_ttls={"tasks": 5, "users": 60}, clock=clock)
+        cache.set("tasks", "k", 1)
+        cache.set("users", "k", 2)
+
+        clock.now = 6
+        assert cache.get("tasks", "k") == (False, None)
+        assert cache.get("users", "k") == (True, 2)
+        assert cache.stats().expirations == 1
+
+    def test_zero_ttl_disables_caching_for_table(self):
+        cache = QueryCache(table_ttls={"notifications": 0})
+        cache.set("notifications", "k", 1)
+        assert cache.stats().size == 0
+
+    def test_lru_eviction(self):
+        cache = QueryCache(max_entries=2, default_ttl=60)
+        cache.set("t", "a", 1)
+        cache.set("t", "b", 2)
+        cache.get("t", "a")  # a is now most recently used
+        cache.set("t", "c", 3)
+
+        assert cache.get("t", "b") == (False, None)
+        assert cache.get("t", "a") == (True, 1)
+        assert cache.stats().evictions == 1
+
+    def test_invalidate_only_drops_that_table(self):
+        cache = QueryCache(default_ttl=60)
+        cache.set("tasks", "a", 1)
+        cache.set("tasks", "b", 2)
+        cache.set("users", "a", 3)
+
+        assert cache.invalidate("tasks") == 2
+        assert cache.get("users", "a") == (True, 3)
+        assert cache.stats().invalidations == 2
+
+    def test_results_read_before_an_invalidation_are_not_stored(self):
+        cache = QueryCache(default_ttl=60)
+        tasks, users = cache.generation("tasks"), cache.generation("users")
+
+        cache.invalidate("tasks")
+        cache.set("tasks", "a", "stale", tasks)
+        cache.set("users", "a", "fresh", users)
+        assert cache.get("tasks", "a") == (False, None)
+        assert cache.get("users", "a") == (True, "fresh")
+
+        users = cache.generation("users")
+        cache.invalidate()
+        cache.set("users", "b", "stale", users)
+        assert cache.get("users", "b") == (False, None)
+
+    def test_key_ignores_filter_order(self):
+        assert make_cache_key("select", "*", {"a": 1, "b": 2}) == make_cache_key("select", "*", {"b": 2, "a": 1})
+        assert make_cache_key("select", "*", [gte("x", 1)]) != make_cache_key("select", "*", [eq("x", 1)])
+
+    def test_invalid_size_rejected(self):
+        with pytest.raises(ValueError):
+            QueryCache(max_entries=0)
+
+
+class TestSupabaseCRUDCaching:
+    """Test SupabaseCRUD reads through and invalidates the cache"""
+
+    @pytest.fixture
+    def crud(self):
+        crud = SupabaseCRUD(cache=QueryCache(default_ttl=60))
+        crud.client = Mock()
+        query = crud.client.table.return_value.select.return_value
+        query.eq.return_value = query
+        query.execute.return_value = Mock(data=[{"uuid": "u1"}], count=1)
+        return crud
+
+    def test_repeated_select_served_from_cache(self, crud):
+        first = crud.select("users", columns="uuid", filters={"uuid": "u1"})
+        second = crud.select("users", columns="uuid", filters={"uuid": "u1"})
+
+        assert first == second == [{"uuid": "u1"}]
+        crud.client.table.return_value.select.return_value.execute.assert_called_once()
+
+    def test_cached_rows_are_copies(self, crud):
+        crud.select("users")[0]["uuid"] = "mutated"
+        assert crud.select("users") == [{"uuid": "u1"}]
+
+    def test_different_columns_are_separate_entries(self, crud):
+        crud.select("users", columns="uuid")
+        crud.select("users", columns="uuid, email")
+        assert crud.client.table.return_value.select.return_value.execute.call_count == 2
+
+    def test_write_invalidates_table(self, crud):
+        crud.client.table.return_value.insert.return_value.execute.return_value = Mock(data=[{"uuid": "u2"}])
+        crud.select("users")
+        crud.count("users")
+
+        crud.insert("users", {"uuid": "u2"})
+        crud.select("users")
+
+        assert crud.client.table.return_value.select.return_value.execute.call_count == 3
+        assert crud.cache.stats().invalidations == 2
+
+    def test_failed_write_still_invalidates(self, crud):
+        crud.client.table.return_value.delete.return_value.eq.return_value.execute.side_effect = Exception("boom")
+        crud.select("users")
+
+        with pytest.raises(Exception):
+            crud.delete("users", {"uuid": "u1"})
+
+        assert crud.cache.stats().size == 0
+
+    def test_read_racing_a_write_is_not_cached(self, crud):
+        def write_during_read():
+            crud.cache.invalidate("users")
+            return Mock(data=[{"uuid": "old"}])
+
+        crud.client.table.return_value.select.return_value.execute.side_effect = write_during_read
+        assert crud.select("users") == [{"uuid": "old"}]
+        assert crud.cache.stats().size == 0
+
+    def test_no_cache_by_default(self, monkeypatch):
+        monkeypatch.delenv("SUPABASE_QUERY_CACHE", raising=False)
+        assert SupabaseCRUD().cache is None
@@ -0,0 +1,162 @@
+"""
+Tests for per-request Supabase call instrumentation and the N+1 detector
+"""
+import logging
+from unittest.mock import Mock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.core.query_instrumentation import QueryInstrumentationMiddleware
+from backend.wrappers.supabase_wrapper.instrumentation import (
+    QueryLog,
+    QueryRecord,
+    capture_queries,
+    current_query_log,
+    query_fingerprint,
+    query_shape,
+)
+from backend.wrappers.supabase_wrapper.filters import in_
+from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+
+
+def _crud_returning(rows):
+    """SupabaseCRUD whose every query chain resolves to rows"""
+    query = Mock()
+    for name in ("select", "eq", "in_", "order", "limit", "insert", "update", "delete"):
+        getattr(query, name).return_value = query
+    query.execute.return_value = Mock(data=rows, count=len(rows))
+    crud = SupabaseCRUD()
+    crud.client = Mock()
+    crud.client.table.return_value = query
+    return crud
+
+
+def _record(fingerprint, shape, duration_ms=1.0):
+    return QueryRecord(table="users", operation="select", fingerprint=fingerprint, shape=shape,
+                       duration_ms=duration_ms, rows=1, response_bytes=10)
+
+
+class TestQueryLog:
+    """Test QueryLog aggregation and detection"""
+
+    def test_shape_ignores_values_but_fingerprint_does_not(self):
+        assert query_shape("select", "users", {"uuid": "a"}) == query_shape("select", "users", {"uuid": "b"})
+        assert query_fingerprint("select", "users", "*", {"uuid": "a"}) != query_fingerprint("select", "users", "*", {"uuid": "b"})
+        assert query_fingerprint("select", "tasks", "*", [in_("id", ["a", "b"])]) == "select tasks [*] id.in.(a,b)"
+
+    def test_detects_repeats_n_plus_one_and_chatty_requests(self):
+        log = QueryLog(max_calls=5, n_plus_one_threshold=3)
+        log.record(_record("select users uuid.eq.same", "select users uuid.eq"))
+        for user_id in range(5):
+            log.record(_record(f"select users uuid.eq.{user_id}", "select users uuid.eq"))
+
+        assert log.repeated_queries() == {}
+        assert log.n_plus_one_suspects() == {"select users uuid.eq": 6}
+        log.record(_record("select users uuid.eq.same", "select users uuid.eq"))
+
+        warnings = log.warnings()
+        assert any("7 Supabase calls" in warning for warning in warnings)
+        assert any("repeated 2x" in warning for warning in warnings)
+        assert any("possible N+1" in warning for warning in warnings)
+
+    def test_summary_groups_by_table(self):
+        log = QueryLog()
+        log.record(_record("a", "a", duration_ms=2.0))
+        log.record(_record("b", "b", duration_ms=3.0))
+
+        summary = log.summary()
+
+        assert summary["calls"] == 2
+        assert summary["total_ms"] == 5.0
+        assert summary["tables"]["users"] == {"calls": 2, "ms": 5.0, "rows": 2, "bytes": 20}
+        assert summary["warnings"] == []
+
+
+class TestCrudInstrumentation:
+    """Test that SupabaseCRUD records its round trips"""
+
+    def test_nothing_recorded_without_active_log(self):
+        crud = _crud_returning([{"id": "t1"}])
+        assert current_query_log() is None
+        assert crud.select("tasks", filters={"id": "t1"}) == [{"id": "t1"}]
+
+    def test_select_and_update_are_recorded(self):
+        crud = _crud_returning([{"id": "t1", "title": "A"}])
+
+        with capture_queries() as log:
+            crud.select("tasks", columns="id, title", filters={"id": "t1"})
+            crud.update("tasks", {"title": "B"}, {"id": "t1"})
+
+        select, update = log.records
+        assert (select.table, select.operation, select.rows) == ("tasks", "select", 1)
+        assert select.fingerprint == "select tasks [id, title] id.eq.t1 None None True"
+        assert select.response_bytes is None
+        assert update.operation == "update"
+        assert update.shape == "update tasks id.eq"
+        assert current_query_log() is None
+
+    def test_response_bytes_are_opt_in(self):
+        crud = _crud_returning([{"id": "t1", "title": "A"}])
+
+        with capture_queries(QueryLog(measure_bytes=True)) as log:
+            crud.select("tasks", columns="id, title", filters={"id": "t1"})
+
+        assert log.records[0].response_bytes == len('[{"id":"t1","title":"A"}]')
+
+    def test_unmeasured_sizes_are_left_out_of_the_summary(self):
+        log = QueryLog()
+        log.record(_record("a", "a"))
+        log.record(QueryRecord(table="users", operation="select", fingerprint="b", shape="b",
+                               duration_ms=1.0, rows=1, response_bytes=None))
+        log.record(QueryRecord(table="tasks", operation="select", fingerprint="c", shape="c",
+                               duration_ms=1.0, rows=1, response_bytes=None))
+
+        summary = log.summary()
+
+        assert summary["response_bytes"] == 10
+        assert summary["tables"]["users"]["bytes"] == 10
+        assert summary["tables"]["tasks"]["bytes"] is None
+
+    def test_failed_call_is_recorded_with_error(self):
+        crud = _crud_returning([])
+        crud.client.table.return_value.execute.side_effect = RuntimeError("down")
+
+        with capture_queries() as log:
+            try:
+                crud.count("tasks")
+            except RuntimeError:
+                pass
+
+        assert log.records[0].error == "RuntimeError"
+
+
+class TestQueryInstrumentationMiddleware:
+    """Test the per-request middleware"""
+
+    def _client(self, calls):
+        app = FastAPI()
+        app.add_middleware(QueryInstrumentationMiddleware, max_calls=2)
+
+        @app.get("/items")
+        def items():
+            crud = _crud_returning([{"uuid": "u"}])
+            for user_id in range(calls):
+                crud.select("users", filters={"uuid": str(user_id)})
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_adds_call_headers(self):
+        response = self._client(calls=2).get("/items")
+
+        assert response.status_code == 200
+        assert response.headers["X-DB-Calls"] == "2"
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+
+    def test_flags_chatty_request(self, caplog):
+        with caplog.at_level(logging.INFO, logger="spm.queries"):
+            self._client(calls=6).get("/items")
+
+        record = caplog.records[-1]
+        assert record.levelno == logging.WARNING
+        assert '"path": "/items"' in record.getMessage()
+        assert "possible N+1" in record.getMessage()
@@ -0,0 +1,158 @@
+"""
+Tests for the Supabase execution policy: retries, budgets and circuit breaker
+"""
+import asyncio
+import random
+import httpx
+import pytest
+from unittest.mock import Mock
+from postgrest.exceptions import APIError
+from backend.wrappers.supabase_wrapper.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ExecutionPolicy,
+    is_transient,
+    CLOSED,
+    OPEN,
+    HALF_OPEN,
+)
+from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _policy(clock, **kwargs):
+    kwargs.setdefault("breaker", CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock))
+    return ExecutionPolicy(sleep=clock.sleep, clock=clock, rng=random.Random(0), **kwargs)
+
+
+def _flaky(failures, error=None):
+    """Callable that fails `failures` times, then returns "ok" """
+    call = Mock(side_effect=[error or httpx.ConnectError("boom")] * failures + ["ok"])
+    return call
+
+
+class TestExecutionPolicy:
+    """Test retry and budget behaviour"""
+
+    def test_transient_errors(self):
+        assert is_transient(httpx.ReadTimeout("slow"))
+        assert is_transient(APIError({"code": "503", "message": "unavailable"}))
+        assert not is_transient(APIError({"code": "23505", "message": "duplicate key"}))
+        assert not is_transient(APIError({"code": "57014", "message": "canceling statement due to statement timeout"}))
+        assert not is_transient(ValueError("bad"))
+
+    def test_idempotent_call_is_retried_with_bounded_jitter(self):
+        clock = FakeClock()
+        policy = _policy(clock, max_attempts=3, base_delay=0.1)
+        call = _flaky(2)
+
+        assert policy.run("select", call) == "ok"
+
+        assert call.call_count == 3
+        assert 0 <= clock.now <= 0.1 + 0.2
+        metrics = policy.metrics()
+        assert (metrics.attempts, metrics.retries, metrics.successes) == (3, 2, 1)
+
+    @pytest.mark.parametrize("operation", ["insert", "delete"])
+    def test_non_idempotent_write_is_not_retried(self, operation):
+        clock = FakeClock()
+        policy = _policy(clock)
+        call = _flaky(1)
+
+        with pytest.raises(httpx.ConnectError):
+            policy.run(operation, call)
+        assert call.call_count == 1
+
+    def test_non_transient_error_is_not_retried(self):
+        clock = FakeClock()
+        policy = _policy(clock)
+        call = _flaky(1, error=ValueError("bad filter"))
+
+        with pytest.raises(ValueError):
+            policy.run("select", call)
+        assert call.call_count == 1
+        assert policy.breaker.state == CLOSED
+
+    def test_retry_stops_at_budget(self):
+        clock = FakeClock()
+        policy = _policy(clock, max_attempts=10, base_delay=1.0, max_delay=1.0, read_budget=0.5)
+        call = Mock(side_effect=httpx.ConnectError("down"))
+
+        with pytest.raises(httpx.ConnectError):
+            policy.run("select", call)
+        assert clock.now < 0.5
+
+    def test_async_call_is_cancelled_at_budget(self):
+        policy = ExecutionPolicy(max_attempts=1, read_budget=0.01, breaker=CircuitBreaker())
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(policy.run_async("select", slow))
+        assert policy.metrics().timeouts == 1
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions"""
+
+    def test_opens_fails_fast_and_recovers(self):
+        clock = FakeClock()
+        policy = _policy(clock, max_attempts=1)
+        down = Mock(side_effect=httpx.ConnectError("down"))
+
+        for _ in range(3):
+            with pytest.raises(httpx.ConnectError):
+                policy.run("select", down)
+        assert policy.breaker.state == OPEN
+        assert policy.breaker.trips == 1
+
+        with pytest.raises(CircuitOpenError):
+            policy.run("select", down)
+        assert down.call_count == 3
+        assert policy.metrics().short_circuits == 1
+
+        clock.now += 30
+        assert policy.breaker.state == HALF_OPEN
+        assert policy.run("select", lambda: "ok") == "ok"
+        assert policy.breaker.state == CLOSED
+
+    def test_failed_trial_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+
+        assert breaker.allow()
+        assert not breaker.allow()  # only one trial at a time
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+
+class TestCrudUsesPolicy:
+    """Test that SupabaseCRUD runs its round trips under the policy"""
+
+    def test_select_retries_transient_failure(self):
+        clock = FakeClock()
+        query = Mock()
+        query.select.return_value = query
+        query.eq.return_value = query
+        query.execute.side_effect = [httpx.ReadTimeout("slow"), Mock(data=[{"id": "t1"}])]
+
+        crud = SupabaseCRUD(policy=_policy(clock))
+        crud.client = Mock()
+        crud.client.table.return_value = query
+
+        assert crud.select("tasks", filters={"id": "t1"}) == [{"id": "t1"}]
+        assert query.execute.call_count == 2
+        assert query.request.retry_enabled is False
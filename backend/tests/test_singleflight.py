@@ -0,0 +1,135 @@
+"""
+Tests for coalescing of identical concurrent reads
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+import pytest
+from backend.wrappers.supabase_wrapper.singleflight import SingleFlight, AsyncSingleFlight
+from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+class TestSingleFlight:
+    """Test the threaded coalescer"""
+
+    def test_concurrent_identical_calls_run_once(self):
+        flights = SingleFlight()
+        callers = 8
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            _wait_for(lambda: flights.stats().coalesced == callers - 1)
+            return ["row"]
+
+        with ThreadPoolExecutor(max_workers=callers) as pool:
+            results = list(pool.map(lambda _: flights.do("tasks", "all", fetch), range(callers)))
+
+        assert len(calls) == 1
+        assert all(result == (["row"], True) for result in results)
+        stats = flights.stats()
+        assert (stats.executed, stats.coalesced) == (1, callers - 1)
+        assert stats.saved_ratio == pytest.approx(7 / 8)
+
+    def test_error_is_shared_and_next_call_retries(self):
+        flights = SingleFlight()
+
+        with pytest.raises(RuntimeError):
+            flights.do("tasks", "all", Mock(side_effect=RuntimeError("down")))
+
+        assert flights.do("tasks", "all", lambda: "ok") == ("ok", False)
+
+    def test_forget_starts_a_new_flight(self):
+        flights = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "stale"
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            leader = pool.submit(flights.do, "tasks", "all", slow)
+            started.wait(5)
+            flights.forget("tasks")
+            assert flights.do("tasks", "all", lambda: "fresh") == ("fresh", False)
+            release.set()
+            assert leader.result() == ("stale", False)
+
+
+class TestAsyncSingleFlight:
+    """Test the asyncio coalescer"""
+
+    def test_gathered_identical_calls_run_once(self):
+        flights = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return ["row"]
+
+        async def run():
+            return await asyncio.gather(*(flights.do("tasks", "all", fetch) for _ in range(5)))
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(result == (["row"], True) for result in results)
+        assert flights.stats().coalesced == 4
+
+    def test_different_keys_are_not_coalesced(self):
+        flights = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0)
+            return "row"
+
+        async def run():
+            return await asyncio.gather(flights.do("tasks", "a", fetch), flights.do("tasks", "b", fetch))
+
+        assert asyncio.run(run()) == [("row", False), ("row", False)]
+        assert flights.stats().executed == 2
+
+
+class TestCrudCoalescing:
+    """Test that SupabaseCRUD reads go through the coalescer"""
+
+    def _crud(self, flights):
+        query = Mock()
+        query.select.return_value = query
+        query.eq.return_value = query
+        query.execute.return_value = Mock(data=[{"id": "t1"}])
+        crud = SupabaseCRUD(flights=flights)
+        crud.client = Mock()
+        crud.client.table.return_value = query
+        return crud, query
+
+    def test_shared_rows_are_copied_per_caller(self):
+        flights = Mock()
+        flights.do.side_effect = lambda table, key, fn: (fn(), True)
+        crud, query = self._crud(flights)
+
+        rows = crud.select("tasks", filters={"id": "t1"})
+        rows[0]["id"] = "changed"
+
+        assert flights.do.call_args.args[0] == "tasks"
+        assert query.execute.return_value.data == [{"id": "t1"}]
+
+    def test_write_forgets_table(self):
+        flights = Mock()
+        crud, _ = self._crud(flights)
+        crud.client.table.return_value.update.return_value = crud.client.table.return_value
+
+        crud.update("tasks", {"title": "B"}, {"id": "t1"})
+
+        flights.forget.assert_called_once_with("tasks")
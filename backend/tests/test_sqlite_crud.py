@@ -0,0 +1,190 @@
+"""
+Tests for the SQLite CRUD backend and create_crud backend selection
+"""
+import pytest
+from backend.wrappers.crud_backend import CRUDBackend, create_crud
+from backend.wrappers.sqlite_wrapper.sqlite_crud import SQLiteCRUD
+from backend.wrappers.supabase_wrapper.supabase_crud import BulkWriteError
+from backend.wrappers.supabase_wrapper.filters import contains, overlaps, in_, gt, is_null, not_, or_, eq
+from backend.wrappers.table_events import on_change, remove_listener
+
+
+@pytest.fixture
+def crud():
+    backend = SQLiteCRUD(":memory:")
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def tasks(crud):
+    crud.insert_many("tasks", [
+        {"id": "t1", "title": "Alpha", "priority": 3, "assignee_ids": ["u1", "u2"], "parent_id": None},
+        {"id": "t2", "title": "Beta", "priority": 7, "assignee_ids": ["u2"], "parent_id": "t1", "is_archived": True},
+        {"id": "t3", "title": "Gamma", "priority": None, "assignee_ids": ["u3"], "parent_id": "t1"},
+    ])
+    return crud
+
+
+class TestSQLiteCRUD:
+    """Test SQLiteCRUD against the SupabaseCRUD contract"""
+
+    def test_insert_applies_defaults_and_round_trips_types(self, crud):
+        row = crud.insert("tasks", {"title": "New", "comments": [{"text": "hi"}]})
+
+        assert row["id"]
+        assert row["created_at"]
+        assert row["assignee_ids"] == []
+        assert row["is_archived"] is False
+        assert row["comments"] == [{"text": "hi"}]
+        assert crud.select("tasks", columns="id, title", filters={"id": row["id"]}) == [{"id": row["id"], "title": "New"}]
+
+    def test_users_primary_key_is_uuid(self, crud):
+        row = crud.insert("users", {"email": "a@example.com"})
+        assert row["uuid"]
+        assert row["departments"] == []
+
+    def test_filters(self, tasks):
+        def ids(filters):
+            return sorted(row["id"] for row in tasks.select("tasks", filters=filters))
+
+        assert ids({"parent_id": "t1"}) == ["t2", "t3"]
+        assert ids({"is_archived": False}) == ["t1", "t3"]
+        assert ids([in_("id", ["t1", "t3"])]) == ["t1", "t3"]
+        assert ids([in_("id", [])]) == []
+        assert ids([gt("priority", 5)]) == ["t2"]
+        assert ids([is_null("parent_id")]) == ["t1"]
+        assert ids([contains("assignee_ids", ["u2"])]) == ["t1", "t2"]
+        assert ids([contains("assignee_ids", ["u1", "u2"])]) == ["t1"]
+        assert ids([overlaps("assignee_ids", ["u1", "u3"])]) == ["t1", "t3"]
+        assert ids([not_(contains("assignee_ids", ["u2"]))]) == ["t3"]
+        assert ids([or_(eq("id", "t1"), gt("priority", 5))]) == ["t1", "t2"]
+
+    def test_order_places_nulls_like_postgres(self, tasks):
+        ascending = [row["id"] for row in tasks.select("tasks", order_by="priority")]
+        descending = [row["id"] for row in tasks.select("tasks", order_by="priority", ascending=False)]
+
+        assert ascending == ["t1", "t2", "t3"]
+        assert descending == ["t3", "t2", "t1"]
+        assert len(tasks.select("tasks", limit=2)) == 2
+
+    def test_unknown_column_in_filter_raises(self, tasks):
+        with pytest.raises(ValueError):
+            tasks.select("tasks", filters={"nope": 1})
+
+    def test_update_reindexes_arrays(self, tasks):
+        updated = tasks.update("tasks", {"assignee_ids": ["u9"]}, {"id": "t1"})
+
+        assert updated[0]["assignee_ids"] == ["u9"]
+        assert tasks.select("tasks", filters=[contains("assignee_ids", ["u1"])]) == []
+        assert [row["id"] for row in tasks.select("tasks", filters=[contains("assignee_ids", ["u9"])])] == ["t1"]
+
+    def test_update_adds_unknown_columns(self, tasks):
+        tasks.update("tasks", {"flag": True}, {"id": "t2"})
+        assert tasks.select("tasks", columns="id, flag", filters={"flag": True}) == [{"id": "t2", "flag": True}]
+
+    def test_delete_returns_rows_and_clears_index(self, tasks):
+        deleted = tasks.delete("tasks", {"id": "t2"})
+
+        assert [row["id"] for row in deleted] == ["t2"]
+        assert tasks.count("tasks") == 2
+        assert [row["id"] for row in tasks.select("tasks", filters=[contains("assignee_ids", ["u2"])])] == ["t1"]
+
+    def test_task_writes_emulate_sync_triggers(self, tasks):
+        before = tasks.select("tasks", columns="updated_at", filters={"id": "t1"})[0]["updated_at"]
+
+        updated = tasks.update("tasks", {"title": "Alpha 2", "updated_at": "2000-01-01T00:00:00+00:00"}, {"id": "t1"})
+        tasks.delete("tasks", [in_("id", ["t2", "t3"])])
+
+        assert before and updated[0]["updated_at"] >= before
+        assert updated[0]["updated_at"] != "2000-01-01T00:00:00+00:00"
+        tombstones = tasks.select("task_tombstones", columns="task_id, deleted_at")
+        assert sorted(row["task_id"] for row in tombstones) == ["t2", "t3"]
+        assert all(row["deleted_at"] for row in tombstones)
+        assert tasks.count("task_tombstones_test") == 0
+
+    def test_access_changes_log_previous_values(self, tasks):
+        tasks.update("tasks", {"title": "Alpha 2"}, {"id": "t1"})
+        tasks.update("tasks", {"assignee_ids": ["u2"], "title": "Alpha 3"}, {"id": "t1"})
+        tasks.update("tasks", {"assignee_ids": ["u3"]}, {"id": "t3"})
+        tasks.delete("tasks", {"id": "t2"})
+
+        logged = tasks.select("task_access_changes", columns="task_id, assignee_ids, parent_id, is_archived", order_by="task_id")
+        assert logged == [
+            {"task_id": "t1", "assignee_ids": ["u1", "u2"], "parent_id": None, "is_archived": False},
+            {"task_id": "t2", "assignee_ids": ["u2"], "parent_id": "t1", "is_archived": True},
+        ]
+
+    def test_upsert_many_updates_existing_and_inserts_new(self, tasks):
+        result = tasks.upsert_many("tasks", [{"id": "t1", "title": "Alpha 2"}, {"id": "t4", "title": "Delta"}])
+
+        assert result.ok
+        assert tasks.select("tasks", columns="title", filters={"id": "t1"}) == [{"title": "Alpha 2"}]
+        assert tasks.count("tasks") == 4
+
+    def test_upsert_many_reports_composite_conflict_keys(self, tasks):
+        result = tasks.upsert_many("tasks", [{"id": "t1", "title": "Other", "priority": 1}], on_conflict="title, priority")
+
+        assert [error.keys for error in result.errors] == [[("Other", 1)]]
+
+    def test_bulk_writes_notify_once(self, tasks):
+        changes = []
+        on_change("tasks", changes.append)
+        try:
+            tasks.update_many("tasks", {"status": "Completed"}, ["t1", "t2"], batch_size=1)
+            tasks.delete_many("tasks", ["t1", "t3"], batch_size=1)
+        finally:
+            remove_listener("tasks", changes.append)
+
+        assert [(change.operation, sorted(row["id"] for row in change.rows)) for change in changes] == [
+            ("update_many", ["t1", "t2"]),
+            ("delete_many", ["t1", "t3"]),
+        ]
+
+    def test_insert_many_reports_failed_chunks(self, tasks):
+        with pytest.raises(BulkWriteError) as exc_info:
+            tasks.insert_many("tasks", [{"id": "t1"}])
+        assert len(exc_info.value.result.errors) == 1
+        assert tasks.count("tasks") == 3
+
+    def test_bulk_update_and_delete_by_ids(self, tasks):
+        result = tasks.update_many("tasks", {"status": "Completed"}, ["t1", "t2"], batch_size=1)
+
+        assert result.ok and result.chunks == 2
+        assert tasks.count("tasks", {"status": "Completed"}) == 2
+        assert tasks.delete_many("tasks", ["t1", "t3"]).ok
+        assert tasks.exists("tasks", {"id": "t2"})
+        assert not tasks.exists("tasks", {"id": "t1"})
+
+    def test_select_iter_pages_in_key_order(self, tasks):
+        rows = list(tasks.select_iter("tasks", columns="title", page_size=2))
+        assert [row["id"] for row in rows] == ["t1", "t2", "t3"]
+
+    def test_data_persists_across_connections(self, tmp_path):
+        path = str(tmp_path / "spm.sqlite3")
+        first = SQLiteCRUD(path)
+        first.insert("users", {"uuid": "u1", "departments": ["IT"]})
+        first.close()
+
+        second = SQLiteCRUD(path)
+        assert second.select("users", filters=[contains("departments", ["IT"])])[0]["uuid"] == "u1"
+        second.close()
+
+
+class TestCreateCrud:
+    """Test backend selection from CRUD_BACKEND"""
+
+    def test_sqlite_backend_is_shared_per_path(self, monkeypatch):
+        monkeypatch.setenv("CRUD_BACKEND", "sqlite")
+        monkeypatch.setenv("SQLITE_DATABASE_PATH", ":memory:")
+
+        backend = create_crud()
+
+        assert isinstance(backend, SQLiteCRUD)
+        assert isinstance(backend, CRUDBackend)
+        assert create_crud() is backend
+
+    def test_unknown_backend_raises(self, monkeypatch):
+        monkeypatch.setenv("CRUD_BACKEND", "mongo")
+        with pytest.raises(ValueError):
+            create_crud()
@@ -3,7 +3,7 @@ Tests for SupabaseCRUD wrapper
 """
 import pytest
 from unittest.mock import Mock
-from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD, BulkWriteError
 
 
 class TestSupabaseCRUD:
@@ -64,6 +64,20 @@ class TestSupabaseCRUD:
         mock_select.order.assert_called_once_with("created_at", desc=True)
         assert result == [{"id": 2}, {"id": 1}]
 
+    def test_select_with_several_order_columns(self, crud_with_mock, mock_client):
+        """Test select orders by each column in turn, later ones breaking ties"""
+        # Arrange
+        mock_select = mock_client.table.return_value.select.return_value
+        mock_select.order.return_value = mock_select
+        mock_select.execute.return_value = Mock(data=[{"id": 1}])
+
+        # Act
+        crud_with_mock.select("tasks", order_by=("due_date", "id"), ascending=False)
+
+        # Assert
+        assert [c.args for c in mock_select.order.call_args_list] == [("due_date",), ("id",)]
+        assert all(c.kwargs == {"desc": True} for c in mock_select.order.call_args_list)
+
     def test_select_with_limit(self, crud_with_mock, mock_client):
         """Test select with limit parameter"""
         # Arrange
@@ -124,7 +138,7 @@ class TestSupabaseCRUD:
         result = crud_with_mock.count("tasks", filters={"status": "completed"})
 
         # Assert
-        mock_table.select.assert_called_once_with("*", count="exact")
+        mock_table.select.assert_called_once_with("*", count="exact", head=True)
         mock_select.eq.assert_called_once_with("status", "completed")
         assert result == 5
 
@@ -144,45 +158,223 @@ class TestSupabaseCRUD:
         result = crud_with_mock.count("tasks")
 
         # Assert
-        mock_table.select.assert_called_once_with("*", count="exact")
+        mock_table.select.assert_called_once_with("*", count="exact", head=True)
         assert result == 10
 
-    def test_exists_returns_true_when_count_greater_than_zero(self, crud_with_mock, mock_client):
-        """Test exists returns True when records exist"""
+    def test_exists_returns_true_when_a_row_matches(self, crud_with_mock, mock_client):
+        """Test exists fetches one row of the filtered column"""
         # Arrange
         mock_table = Mock()
         mock_select = Mock()
         mock_eq = Mock()
+        mock_limit = Mock()
         mock_result = Mock()
-        mock_result.count = 1
+        mock_result.data = [{"id": "task-1"}]
 
         mock_client.table.return_value = mock_table
         mock_table.select.return_value = mock_select
         mock_select.eq.return_value = mock_eq
-        mock_eq.execute.return_value = mock_result
+        mock_eq.limit.return_value = mock_limit
+        mock_limit.execute.return_value = mock_result
 
         # Act
         result = crud_with_mock.exists("tasks", {"id": "task-1"})
 
         # Assert
         assert result is True
+        mock_table.select.assert_called_once_with("id")
+        mock_eq.limit.assert_called_once_with(1)
 
-    def test_exists_returns_false_when_count_is_zero(self, crud_with_mock, mock_client):
+    def test_exists_returns_false_when_no_row_matches(self, crud_with_mock, mock_client):
         """Test exists returns False when no records exist"""
         # Arrange
         mock_table = Mock()
         mock_select = Mock()
         mock_eq = Mock()
+        mock_limit = Mock()
         mock_result = Mock()
-        mock_result.count = 0
+        mock_result.data = []
 
         mock_client.table.return_value = mock_table
         mock_table.select.return_value = mock_select
         mock_select.eq.return_value = mock_eq
-        mock_eq.execute.return_value = mock_result
+        mock_eq.limit.return_value = mock_limit
+        mock_limit.execute.return_value = mock_result
 
         # Act
-        result = crud_with_mock.exists("tasks", {"id": "nonexistent"})
+        result = crud_with_mock.exists("tasks", {"id": "nonexistent"}, column="uuid")
 
         # Assert
         assert result is False
+        mock_table.select.assert_called_once_with("uuid")
+
+    def test_count_planned_mode(self, crud_with_mock, mock_client):
+        """Test count passes the requested count mode"""
+        mock_table = Mock()
+        mock_client.table.return_value = mock_table
+        mock_table.select.return_value.execute.return_value = Mock(count=1200)
+
+        assert crud_with_mock.count("tasks", mode="planned") == 1200
+        mock_table.select.assert_called_once_with("*", count="planned", head=True)
+
+    def test_count_rejects_unknown_mode(self, crud_with_mock):
+        with pytest.raises(ValueError):
+            crud_with_mock.count("tasks", mode="fast")
+
+    def _paged_query(self, mock_client, pages):
+        """Chainable mock query whose execute() returns the given pages in order"""
+        query = Mock()
+        for method in ("select", "order", "limit", "gt", "lt", "or_", "eq"):
+            getattr(query, method).return_value = query
+        query.execute.side_effect = [Mock(data=page) for page in pages]
+        mock_client.table.return_value = query
+        return query
+
+    def test_select_iter_pages_by_keyset(self, crud_with_mock, mock_client):
+        """Test select_iter requests pages after the last seen key"""
+        # Arrange
+        query = self._paged_query(mock_client, [[{"id": "a"}, {"id": "b"}], [{"id": "c"}]])
+
+        # Act
+        result = list(crud_with_mock.select_iter("tasks", page_size=2))
+
+        # Assert
+        assert result == [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+        assert query.execute.call_count == 2
+        query.gt.assert_called_once_with("id", "b")
+        query.limit.assert_called_with(2)
+        query.order.assert_called_with("id", desc=False)
+
+    def test_select_iter_composite_key(self, crud_with_mock, mock_client):
+        """Test select_iter with a (due_date, id) key uses an or-group for the next page"""
+        # Arrange
+        query = self._paged_query(mock_client, [[{"id": "a", "due_date": "2025-01-01"}], []])
+
+        # Act
+        result = list(crud_with_mock.select_iter(
+            "tasks", columns="id, title", key_columns=("due_date", "id"), page_size=1
+        ))
+
+        # Assert
+        assert len(result) == 1
+        query.select.assert_called_with("id, title, due_date")
+        query.or_.assert_called_once_with("due_date.gt.2025-01-01,and(due_date.eq.2025-01-01,id.gt.a)")
+
+    def test_select_iter_is_lazy(self, crud_with_mock, mock_client):
+        """Test select_iter does not fetch the next page until it is needed"""
+        # Arrange
+        query = self._paged_query(mock_client, [[{"id": "a"}], [{"id": "b"}]])
+
+        # Act
+        iterator = crud_with_mock.select_iter("tasks", page_size=1)
+        first = next(iterator)
+
+        # Assert
+        assert first == {"id": "a"}
+        assert query.execute.call_count == 1
+
+    def test_select_iter_rejects_null_keys(self, crud_with_mock, mock_client):
+        """Test select_iter fails loudly instead of skipping rows with a null key"""
+        # Arrange
+        self._paged_query(mock_client, [[{"id": None}]])
+
+        # Act / Assert
+        with pytest.raises(ValueError):
+            list(crud_with_mock.select_iter("tasks", page_size=1))
+
+    def test_insert_many_chunks_requests(self, crud_with_mock, mock_client):
+        """Test insert_many sends one request per batch"""
+        # Arrange
+        mock_table = Mock()
+        mock_client.table.return_value = mock_table
+        mock_table.insert.return_value.execute.side_effect = [
+            Mock(data=[{"id": 1}, {"id": 2}]),
+            Mock(data=[{"id": 3}]),
+        ]
+        data = [{"name": "a"}, {"name": "b"}, {"name": "c"}]
+
+        # Act
+        result = crud_with_mock.insert_many("tasks", data, batch_size=2)
+
+        # Assert
+        assert mock_table.insert.call_count == 2
+        mock_table.insert.assert_any_call([{"name": "a"}, {"name": "b"}])
+        mock_table.insert.assert_any_call([{"name": "c"}])
+        assert result == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+    def test_insert_many_raises_with_partial_result(self, crud_with_mock, mock_client):
+        """Test insert_many reports which chunk failed"""
+        # Arrange
+        mock_table = Mock()
+        mock_client.table.return_value = mock_table
+        mock_table.insert.return_value.execute.side_effect = [Mock(data=[{"id": 1}]), Exception("boom")]
+
+        # Act / Assert
+        with pytest.raises(BulkWriteError) as exc_info:
+            crud_with_mock.insert_many("tasks", [{"name": "a"}, {"name": "b"}], batch_size=1)
+
+        assert exc_info.value.result.rows == [{"id": 1}]
+        assert exc_info.value.result.errors[0].chunk_index == 1
+
+    def test_update_many_uses_in_filter_per_chunk(self, crud_with_mock, mock_client):
+        """Test update_many applies one patch to chunks of ids"""
+        # Arrange
+        query = Mock()
+        mock_client.table.return_value.update.return_value = query
+        query.in_.return_value = query
+        query.eq.return_value = query
+        query.execute.side_effect = [Mock(data=[{"id": "a"}, {"id": "b"}]), Exception("timeout")]
+
+        # Act
+        result = crud_with_mock.update_many(
+            "tasks", {"is_archived": True}, ["a", "b", "c"], filters={"parent_id": "p"}, batch_size=2
+        )
+
+        # Assert
+        mock_client.table.return_value.update.assert_called_with({"is_archived": True})
+        query.in_.assert_any_call("id", ["a", "b"])
+        query.in_.assert_any_call("id", ["c"])
+        query.eq.assert_called_with("parent_id", "p")
+        assert result.rows == [{"id": "a"}, {"id": "b"}]
+        assert not result.ok
+        assert result.errors[0].keys == ["c"]
+
+    def test_delete_many_uses_in_filter(self, crud_with_mock, mock_client):
+        """Test delete_many deletes by id list"""
+        # Arrange
+        query = Mock()
+        mock_client.table.return_value.delete.return_value = query
+        query.in_.return_value = query
+        query.execute.return_value = Mock(data=[{"id": "a"}])
+
+        # Act
+        result = crud_with_mock.delete_many("tasks", ["a"])
+
+        # Assert
+        query.in_.assert_called_once_with("id", ["a"])
+        assert result.ok and result.chunks == 1
+
+    def test_upsert_many_passes_on_conflict(self, crud_with_mock, mock_client):
+        """Test upsert_many upserts each chunk on the conflict column"""
+        # Arrange
+        mock_table = Mock()
+        mock_client.table.return_value = mock_table
+        mock_table.upsert.return_value.execute.return_value = Mock(data=[{"id": "a"}])
+
+        # Act
+        result = crud_with_mock.upsert_many("tasks", [{"id": "a", "title": "t"}])
+
+        # Assert
+        mock_table.upsert.assert_called_once_with([{"id": "a", "title": "t"}], on_conflict="id")
+        assert result.rows == [{"id": "a"}]
+
+    def test_upsert_many_reports_composite_conflict_keys(self, crud_with_mock, mock_client):
+        """Test failed chunks of a composite-key upsert report one tuple per row"""
+        # Arrange
+        mock_client.table.return_value.upsert.return_value.execute.side_effect = Exception("conflict")
+
+        # Act
+        result = crud_with_mock.upsert_many("members", [{"team_id": "t", "user_id": "u"}], on_conflict="team_id, user_id")
+
+        # Assert
+        assert result.errors[0].keys == [("t", "u")]
@@ -0,0 +1,140 @@
+"""
+Tests for SupabaseCRUD filter expressions
+"""
+import pytest
+from unittest.mock import Mock
+from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.supabase_wrapper.filters import (
+    eq,
+    gt,
+    gte,
+    lte,
+    in_,
+    contains,
+    overlaps,
+    is_null,
+    not_null,
+    or_,
+    and_,
+    not_,
+    apply_filters,
+    normalize_filters,
+)
+
+
+class TestFilterRendering:
+    """Test PostgREST rendering of filter conditions"""
+
+    def test_simple_operators_render(self):
+        assert eq("status", "TO_DO").to_postgrest() == "status.eq.TO_DO"
+        assert gte("priority", 5).to_postgrest() == "priority.gte.5"
+        assert is_null("parent_id").to_postgrest() == "parent_id.is.null"
+        assert not_null("parent_id").to_postgrest() == "parent_id.not.is.null"
+
+    def test_list_operators_render(self):
+        assert in_("id", ["a", "b"]).to_postgrest() == "id.in.(a,b)"
+        assert contains("assignee_ids", ["u1"]).to_postgrest() == "assignee_ids.cs.{u1}"
+        assert overlaps("departments", ["hr", "it"]).to_postgrest() == "departments.ov.{hr,it}"
+
+    def test_reserved_characters_are_quoted(self):
+        assert lte("due_date", "2025-01-31T10:00:00").to_postgrest() == 'due_date.lte."2025-01-31T10:00:00"'
+
+    def test_nested_groups_render(self):
+        condition = or_(eq("status", "TO_DO"), and_(eq("status", "BLOCKED"), gt("priority", 5)))
+        assert condition.to_postgrest() == "or(status.eq.TO_DO,and(status.eq.BLOCKED,priority.gt.5))"
+
+    def test_not_inverts_negation(self):
+        assert not_(not_(eq("a", 1))) == eq("a", 1)
+        assert not_(or_(eq("a", 1))).to_postgrest() == "not.or(a.eq.1)"
+
+    def test_normalize_dict_and_list(self):
+        assert normalize_filters(None) == []
+        assert normalize_filters({"id": "x"}) == [eq("id", "x")]
+        assert normalize_filters([gt("priority", 1)]) == [gt("priority", 1)]
+
+    def test_empty_group_rejected(self):
+        with pytest.raises(ValueError):
+            or_()
+
+
+class TestApplyFilters:
+    """Test that conditions drive the query builder"""
+
+    def test_dict_filters_use_eq(self):
+        query = Mock()
+        query.eq.return_value = query
+
+        apply_filters(query, {"id": "task-1", "is_archived": False})
+
+        query.eq.assert_any_call("id", "task-1")
+        query.eq.assert_any_call("is_archived", False)
+
+    def test_conditions_use_matching_builder_methods(self):
+        query = Mock()
+        for method in ("contains", "gte", "lte", "in_", "or_"):
+            getattr(query, method).return_value = query
+
+        apply_filters(query, [
+            contains("assignee_ids", ["u1"]),
+            gte("due_date", "2025-01-01"),
+            lte("due_date", "2025-01-31"),
+            in_("id", ["a"]),
+            or_(eq("status", "TO_DO"), eq("status", "IN_PROGRESS")),
+        ])
+
+        query.contains.assert_called_once_with("assignee_ids", ["u1"])
+        query.gte.assert_called_once_with("due_date", "2025-01-01")
+        query.lte.assert_called_once_with("due_date", "2025-01-31")
+        query.in_.assert_called_once_with("id", ["a"])
+        query.or_.assert_called_once_with("status.eq.TO_DO,status.eq.IN_PROGRESS")
+
+    def test_negated_filter_uses_not(self):
+        query = Mock()
+        query.not_.is_.return_value = query
+
+        apply_filters(query, [not_null("parent_id")])
+
+        query.not_.is_.assert_called_once_with("parent_id", "null")
+
+    def test_negated_and_becomes_or_of_negations(self):
+        query = Mock()
+        query.or_.return_value = query
+
+        apply_filters(query, [not_(and_(eq("a", 1), eq("b", 2)))])
+
+        query.or_.assert_called_once_with("a.not.eq.1,b.not.eq.2")
+
+
+class TestSupabaseCRUDWithConditions:
+    """Test SupabaseCRUD methods accept filter conditions"""
+
+    @pytest.fixture
+    def crud_with_mock(self):
+        crud = SupabaseCRUD()
+        crud.client = Mock()
+        return crud
+
+    def test_select_with_conditions(self, crud_with_mock):
+        mock_select = crud_with_mock.client.table.return_value.select.return_value
+        mock_select.contains.return_value = mock_select
+        mock_select.gte.return_value = mock_select
+        mock_select.execute.return_value = Mock(data=[{"id": "t1"}])
+
+        result = crud_with_mock.select(
+            "tasks",
+            filters=[contains("assignee_ids", ["u1"]), gte("due_date", "2025-01-01")]
+        )
+
+        mock_select.contains.assert_called_once_with("assignee_ids", ["u1"])
+        mock_select.gte.assert_called_once_with("due_date", "2025-01-01")
+        assert result == [{"id": "t1"}]
+
+    def test_delete_with_in_condition(self, crud_with_mock):
+        mock_delete = crud_with_mock.client.table.return_value.delete.return_value
+        mock_delete.in_.return_value = mock_delete
+        mock_delete.execute.return_value = Mock(data=[{"id": "a"}, {"id": "b"}])
+
+        result = crud_with_mock.delete("tasks", filters=[in_("id", ["a", "b"])])
+
+        mock_delete.in_.assert_called_once_with("id", ["a", "b"])
+        assert len(result) == 2
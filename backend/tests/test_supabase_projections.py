@@ -0,0 +1,46 @@
+"""
+Tests for named column projections
+"""
+import pytest
+from backend.wrappers.supabase_wrapper.projections import (
+    projection,
+    projection_columns,
+    register_projection,
+    TASK_FULL,
+    TASK_SUMMARY,
+    TASK_TIME_LOG,
+    USER_AUTH,
+    USER_DIRECTORY,
+)
+
+
+class TestProjections:
+    """Test the projection registry"""
+
+    def test_task_summary_excludes_inline_json(self):
+        columns = projection_columns("tasks", TASK_SUMMARY)
+        assert "comments" not in columns
+        assert "attachments" not in columns
+        assert {"id", "status", "due_date", "assignee_ids"} <= set(columns)
+
+    def test_time_log_extends_summary(self):
+        assert projection_columns("tasks", TASK_TIME_LOG) == projection_columns("tasks", TASK_SUMMARY) + ("time_log",)
+
+    def test_password_hash_only_in_auth_projection(self):
+        assert "password_hash" not in projection_columns("users", USER_DIRECTORY)
+        assert "password_hash" in projection_columns("users", USER_AUTH)
+
+    def test_projection_renders_select_string(self):
+        assert projection("tasks", TASK_FULL) == "*"
+        assert projection("users", USER_DIRECTORY) == "uuid, email, role, departments, teams"
+
+    def test_unknown_projection_rejected(self):
+        with pytest.raises(ValueError):
+            projection("tasks", "does_not_exist")
+
+    def test_register_projection(self):
+        register_projection("notifications", "notification_ids", ["id", "receiver_id"])
+        assert projection("notifications", "notification_ids") == "id, receiver_id"
+
+        with pytest.raises(ValueError):
+            register_projection("notifications", "empty", [])
@@ -0,0 +1,84 @@
+"""
+Tests for the in-process user directory
+"""
+from unittest.mock import Mock
+from backend.utils.user_crud import user_directory
+from backend.utils.user_crud.user_directory import UserDirectory, get_user_directory
+from backend.wrappers.table_events import notify_write
+
+USERS = [
+    {"uuid": "u1", "email": "a@test.com", "role": "staff", "departments": ["Engineering", "IT"], "teams": ["Core"]},
+    {"uuid": "u2", "email": "b@test.com", "role": "manager", "departments": [" engineering "], "teams": []},
+    {"uuid": "u3", "email": "c@test.com", "role": "staff", "departments": None},
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _directory(**kwargs):
+    crud = Mock()
+    crud.select.return_value = USERS
+    return UserDirectory(crud=crud, **kwargs), crud
+
+
+class TestUserDirectory:
+    """Test snapshot indexes and refresh"""
+
+    def test_indexes(self):
+        directory, crud = _directory()
+
+        assert directory.user_ids_in_departments(["ENGINEERING"], fold_case=True) == {"u1", "u2"}
+        assert directory.user_ids_in_departments(["it", "missing"], fold_case=True) == {"u1"}
+        assert [user["uuid"] for user in directory.users_in_department("Engineering", fold_case=True)] == ["u1", "u2"]
+        assert directory.user_ids_in_teams(["core"], fold_case=True) == {"u1"}
+        assert directory.emails()["u3"] == "c@test.com"
+        assert directory.get("u2")["role"] == "manager"
+        assert directory.get("nope") is None
+        assert crud.select.call_count == 1
+
+    def test_access_control_lookups_match_exactly(self):
+        directory, _ = _directory()
+
+        assert directory.user_ids_in_departments(["Engineering"]) == {"u1"}
+        assert directory.user_ids_in_departments(["ENGINEERING", "it"]) == set()
+        assert [user["uuid"] for user in directory.users_in_department(" engineering ")] == ["u2"]
+        assert directory.user_ids_in_teams(["core"]) == set()
+
+    def test_returned_rows_are_copies(self):
+        directory, _ = _directory()
+
+        directory.get("u1")["email"] = "changed"
+
+        assert directory.get("u1")["email"] == "a@test.com"
+
+    def test_snapshot_expires_after_ttl(self):
+        clock = FakeClock()
+        directory, crud = _directory(ttl=60, clock=clock)
+
+        directory.user_ids_in_departments(["IT"])
+        clock.now = 59
+        directory.user_ids_in_departments(["IT"])
+        assert crud.select.call_count == 1
+
+        clock.now = 60
+        directory.user_ids_in_departments(["IT"])
+        assert crud.select.call_count == 2
+
+    def test_shared_directory_reloads_after_users_write(self, monkeypatch):
+        directory, crud = _directory()
+        monkeypatch.setattr(user_directory, "_shared_directory", directory)
+
+        get_user_directory().all_users()
+        notify_write("tasks")
+        get_user_directory().all_users()
+        assert crud.select.call_count == 1
+
+        notify_write("users")
+        get_user_directory().all_users()
+        assert crud.select.call_count == 2
@@ -1,10 +1,10 @@
 from datetime import datetime
-from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.crud_backend import create_crud
 from backend.utils.notif_util.email_utils import send_email  # create this helper
 
 class NotificationService:
     def __init__(self):
-        self.crud = SupabaseCRUD()
+        self.crud = create_crud()
 
     def create_in_app_notification(self, sender_id, receiver_id, action, task):
         message = f"Task '{task['title']}' was {action}."
@@ -10,6 +10,8 @@ After removing the teams abstraction, RBAC is based on:
 
 from typing import List, Dict, Any
 from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.supabase_wrapper.projections import projection, PROJECT_COLLABORATORS
+from backend.utils.user_crud.user_directory import get_user_directory
 
 # Role constants - 3-tier role system
 ADMIN_ROLE = "admin"
@@ -75,7 +77,7 @@ class RBACHelper:
             List of project IDs where user is a collaborator
         """
         try:
-            projects = self.crud.client.table("projects").select("id, collaborator_ids").execute()
+            projects = self.crud.client.table("projects").select(projection("projects", PROJECT_COLLABORATORS)).execute()
 
             user_project_ids = []
             for project in projects.data:
@@ -126,7 +128,7 @@ class RBACHelper:
                 return True
 
             # Get the project
-            project = self.crud.client.table("projects").select("*").eq("id", project_id).execute()
+            project = self.crud.client.table("projects").select(projection("projects", PROJECT_COLLABORATORS)).eq("id", project_id).execute()
             if not project.data:
                 return False
 
@@ -154,15 +156,7 @@ class RBACHelper:
             return set()
 
         try:
-            users = self.crud.client.table("users").select("uuid, departments").execute()
-            dept_user_ids = set()
-
-            for user in users.data:
-                user_depts = user.get("departments", [])
-                if any(dept in departments for dept in user_depts):
-                    dept_user_ids.add(user["uuid"])
-
-            return dept_user_ids
+            return get_user_directory().user_ids_in_departments(departments)
         except Exception as e:
             print(f"Error getting department users: {e}")
             return set()
@@ -1,7 +1,9 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 from datetime import date, datetime
 from io import BytesIO
-from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.crud_backend import create_crud
+from backend.utils.user_crud.user_directory import get_user_directory
+from backend.wrappers.supabase_wrapper.projections import projection, PROJECT_NAME, TASK_TIME_LOG
 from backend.schemas.report_schemas import LoggedTimeResponse, LoggedTimeItem
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
@@ -18,7 +20,8 @@ class LoggedTimeReportGenerator:
     """
 
     def __init__(self):
-        self.crud = SupabaseCRUD()
+        self.crud = create_crud()
+        self.user_directory = get_user_directory()
 
     def generate_report(
         self,
@@ -67,7 +70,7 @@ class LoggedTimeReportGenerator:
         if scope_type == "department":
             return scope_id  # Department name is the ID itself
         else:  # project
-            projects = self.crud.select("projects", filters={"id": scope_id})
+            projects = self.crud.select("projects", columns=projection("projects", PROJECT_NAME), filters={"id": scope_id})
             if projects:
                 return projects[0].get("name", "Unknown Project")
             return "Unknown Project"
@@ -80,14 +83,10 @@ class LoggedTimeReportGenerator:
     ) -> List[LoggedTimeItem]:
         """Get time entries for all staff in a department"""
         # Get all users in this department
-        all_users = self.crud.select("users")
-        department_users = [
-            user for user in all_users
-            if department_name.lower() in [dept.lower() for dept in user.get("departments", [])]
-        ]
-
-        # Get all tasks
-        all_tasks = self.crud.select("tasks")
+        department_users = self.user_directory.users_in_department(department_name, fold_case=True)
+
+        # Stream all tasks page by page, keeping only those in range
+        all_tasks = self.crud.select_iter("tasks", columns=projection("tasks", TASK_TIME_LOG))
         filtered_tasks = self._filter_by_date_range(all_tasks, start_date, end_date)
 
         # Build time entries for each user-task combination
@@ -116,12 +115,11 @@ class LoggedTimeReportGenerator:
     ) -> List[LoggedTimeItem]:
         """Get time entries for all staff in a project"""
         # Get all tasks for this project
-        project_tasks = self.crud.select("tasks", filters={"project_id": project_id})
+        project_tasks = self.crud.select("tasks", columns=projection("tasks", TASK_TIME_LOG), filters={"project_id": project_id})
         filtered_tasks = self._filter_by_date_range(project_tasks, start_date, end_date)
 
         # Get user details
-        all_users = self.crud.select("users")
-        user_map = {user["uuid"]: user.get("email", "Unknown") for user in all_users}
+        user_map = self.user_directory.emails()
 
         # Build time entries
         time_entries = []
@@ -135,7 +133,7 @@ class LoggedTimeReportGenerator:
 
     def _filter_by_date_range(
         self,
-        tasks: List[Dict[str, Any]],
+        tasks: Iterable[Dict[str, Any]],
         start_date: date,
         end_date: date
     ) -> List[Dict[str, Any]]:
@@ -1,7 +1,8 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 from datetime import date, datetime
 from io import BytesIO
-from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.crud_backend import create_crud
+from backend.wrappers.supabase_wrapper.projections import projection, PROJECT_NAME, TASK_SUMMARY, USER_DIRECTORY
 from backend.schemas.report_schemas import TaskCompletionResponse, TaskCompletionItem
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
@@ -18,7 +19,7 @@ class TaskCompletionReportGenerator:
     """
 
     def __init__(self):
-        self.crud = SupabaseCRUD()
+        self.crud = create_crud()
 
     def generate_report(
         self,
@@ -64,12 +65,12 @@ class TaskCompletionReportGenerator:
     def _get_scope_name(self, scope_type: str, scope_id: str) -> str:
         """Get the display name for the scope (project name or staff email)"""
         if scope_type == "project":
-            projects = self.crud.select("projects", filters={"id": scope_id})
+            projects = self.crud.select("projects", columns=projection("projects", PROJECT_NAME), filters={"id": scope_id})
             if projects:
                 return projects[0].get("name", "Unknown Project")
             return "Unknown Project"
         else:  # staff
-            users = self.crud.select("users", filters={"uuid": scope_id})
+            users = self.crud.select("users", columns=projection("users", USER_DIRECTORY), filters={"uuid": scope_id})
             if users:
                 return users[0].get("email", "Unknown User")
             return "Unknown User"
@@ -81,7 +82,7 @@ class TaskCompletionReportGenerator:
         end_date: date
     ) -> List[Dict[str, Any]]:
         """Get all tasks for a specific project within date range"""
-        all_tasks = self.crud.select("tasks", filters={"project_id": project_id})
+        all_tasks = self.crud.select("tasks", columns=projection("tasks", TASK_SUMMARY), filters={"project_id": project_id})
         return self._filter_by_date_range(all_tasks, start_date, end_date)
 
     def _get_tasks_by_staff(
@@ -91,10 +92,9 @@ class TaskCompletionReportGenerator:
         end_date: date
     ) -> List[Dict[str, Any]]:
         """Get all tasks assigned to a specific staff member within date range"""
-        all_tasks = self.crud.select("tasks")
+        all_tasks = self.crud.select_iter("tasks", columns=projection("tasks", TASK_SUMMARY))
 
         print(f"DEBUG: Looking for tasks for user_id: {user_id}")
-        print(f"DEBUG: Total tasks in database: {len(all_tasks)}")
 
         # Filter tasks where user is in assignee_ids OR is the owner
         assigned_tasks = []
@@ -131,7 +131,7 @@ class TaskCompletionReportGenerator:
 
     def _filter_by_date_range(
         self,
-        tasks: List[Dict[str, Any]],
+        tasks: Iterable[Dict[str, Any]],
         start_date: date,
         end_date: date
     ) -> List[Dict[str, Any]]:
@@ -1,7 +1,9 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 from datetime import date, datetime
 from io import BytesIO
-from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.crud_backend import create_crud
+from backend.utils.user_crud.user_directory import get_user_directory
+from backend.wrappers.supabase_wrapper.projections import projection, PROJECT_NAME, TASK_SUMMARY
 from backend.schemas.report_schemas import TeamSummaryResponse, StaffTaskSummary
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
@@ -18,7 +20,8 @@ class TeamSummaryReportGenerator:
     """
 
     def __init__(self):
-        self.crud = SupabaseCRUD()
+        self.crud = create_crud()
+        self.user_directory = get_user_directory()
 
     def generate_report(
         self,
@@ -66,7 +69,7 @@ class TeamSummaryReportGenerator:
         if scope_type == "department":
             return scope_id  # Department name is the ID itself
         else:  # project
-            projects = self.crud.select("projects", filters={"id": scope_id})
+            projects = self.crud.select("projects", columns=projection("projects", PROJECT_NAME), filters={"id": scope_id})
             if projects:
                 return projects[0].get("name", "Unknown Project")
             return "Unknown Project"
@@ -79,14 +82,10 @@ class TeamSummaryReportGenerator:
     ) -> List[StaffTaskSummary]:
         """Get task summaries for all staff in a department"""
         # Get all users in this department
-        all_users = self.crud.select("users")
-        department_users = [
-            user for user in all_users
-            if department_name.lower() in [dept.lower() for dept in user.get("departments", [])]
-        ]
-
-        # Get all tasks
-        all_tasks = self.crud.select("tasks")
+        department_users = self.user_directory.users_in_department(department_name, fold_case=True)
+
+        # Stream all tasks page by page, keeping only those in range
+        all_tasks = self.crud.select_iter("tasks", columns=projection("tasks", TASK_SUMMARY))
         filtered_tasks = self._filter_by_date_range(all_tasks, start_date, end_date)
 
         # Aggregate tasks by user
@@ -115,7 +114,7 @@ class TeamSummaryReportGenerator:
     ) -> List[StaffTaskSummary]:
         """Get task summaries for all staff in a project"""
         # Get all tasks for this project
-        project_tasks = self.crud.select("tasks", filters={"project_id": project_id})
+        project_tasks = self.crud.select("tasks", columns=projection("tasks", TASK_SUMMARY), filters={"project_id": project_id})
         filtered_tasks = self._filter_by_date_range(project_tasks, start_date, end_date)
 
         # Get unique assignee IDs from tasks
@@ -124,8 +123,7 @@ class TeamSummaryReportGenerator:
             assignee_ids.update(task.get("assignee_ids", []))
 
         # Get user details
-        all_users = self.crud.select("users")
-        user_map = {user["uuid"]: user.get("email", "Unknown") for user in all_users}
+        user_map = self.user_directory.emails()
 
         # Aggregate tasks by user
         staff_summaries = []
@@ -145,7 +143,7 @@ class TeamSummaryReportGenerator:
 
     def _filter_by_date_range(
         self,
-        tasks: List[Dict[str, Any]],
+        tasks: Iterable[Dict[str, Any]],
         start_date: date,
         end_date: date
     ) -> List[Dict[str, Any]]:
@@ -0,0 +1,103 @@
+"""
+Catch-up reads that keep the in-process task indexes current across workers.
+
+The calendar buckets and the search index follow the writes made through this
+process's CRUD backend (table_events.on_change), but every API worker has its
+own copy, and writes from other workers (or the SQL console) do not reach it.
+Instead of rebuilding the whole snapshot, an index remembers where the tasks
+table stood when it last looked:
+
+    marks = current_marks(crud)           # before the full scan
+    ...
+    changed, deleted, marks = read_changes_since(crud, columns, marks)
+
+and every few seconds reads only the tasks whose updated_at is at or after
+that mark and the task_tombstones recorded after it. Both are range scans on
+indexed columns (see migrations/add_task_sync_tracking.sql) that return just
+what changed. Rows come back in full, so re-applying one the index already
+has from a local write is harmless.
+
+updated_at is stamped when a transaction starts, so a transaction that
+commits after a later mark was taken can be missed; the periodic full reload
+of each index picks those up.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from backend.utils.task_crud.constants import (
+    DELETED_AT_FIELD,
+    TASK_ID_FIELD,
+    TASK_TOMBSTONES_TABLE_NAME,
+    TASKS_TABLE_NAME,
+    TOMBSTONE_TASK_ID_FIELD,
+    UPDATED_AT_FIELD,
+)
+from backend.wrappers.supabase_wrapper.filters import gt, gte, not_null
+
+
+class TaskMarks(NamedTuple):
+    """Newest tasks.updated_at and task_tombstones.deleted_at seen (None: no rows yet)"""
+    updated_at: Optional[str] = None
+    deleted_at: Optional[str] = None
+
+
+def current_marks(crud) -> TaskMarks:
+    """
+    Where the tasks table stands now; take it before a full scan
+
+    Args:
+        crud: CRUD backend
+
+    Returns:
+        TaskMarks of the newest update and the newest deletion
+    """
+    newest = crud.select(
+        TASKS_TABLE_NAME,
+        columns=UPDATED_AT_FIELD,
+        filters=[not_null(UPDATED_AT_FIELD)],
+        limit=1,
+        order_by=UPDATED_AT_FIELD,
+        ascending=False
+    ) or []
+    deleted = crud.select(
+        TASK_TOMBSTONES_TABLE_NAME,
+        columns=DELETED_AT_FIELD,
+        limit=1,
+        order_by=DELETED_AT_FIELD,
+        ascending=False
+    ) or []
+    return TaskMarks(
+        newest[0][UPDATED_AT_FIELD] if newest else None,
+        deleted[0][DELETED_AT_FIELD] if deleted else None,
+    )
+
+
+def read_changes_since(crud, columns: str, marks: TaskMarks) -> Tuple[List[Dict[str, Any]], List[str], TaskMarks]:
+    """
+    Tasks written and deleted since marks
+
+    Args:
+        crud: CRUD backend
+        columns: Projection to read the changed tasks with
+        marks: Marks from current_marks or the previous call
+
+    Returns:
+        (changed task rows in updated_at order, ids of deleted tasks, marks for
+        the next call)
+    """
+    changed = list(crud.select_iter(
+        TASKS_TABLE_NAME,
+        columns=columns,
+        filters=[gte(UPDATED_AT_FIELD, marks.updated_at) if marks.updated_at else not_null(UPDATED_AT_FIELD)],
+        key_columns=(UPDATED_AT_FIELD, TASK_ID_FIELD)
+    ))
+    tombstones = list(crud.select_iter(
+        TASK_TOMBSTONES_TABLE_NAME,
+        columns=TOMBSTONE_TASK_ID_FIELD,
+        filters=[gt(DELETED_AT_FIELD, marks.deleted_at)] if marks.deleted_at else None,
+        key_columns=(DELETED_AT_FIELD, TOMBSTONE_TASK_ID_FIELD)
+    ))
+    next_marks = TaskMarks(
+        changed[-1][UPDATED_AT_FIELD] if changed else marks.updated_at,
+        tombstones[-1][DELETED_AT_FIELD] if tombstones else marks.deleted_at,
+    )
+    return changed, [row[TOMBSTONE_TASK_ID_FIELD] for row in tombstones], next_marks
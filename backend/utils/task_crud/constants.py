@@ -12,6 +12,8 @@ load_dotenv()
 
 # Database table names
 TASKS_TABLE_NAME = "tasks"
+TASK_TOMBSTONES_TABLE_NAME = "task_tombstones"
+TASK_ACCESS_CHANGES_TABLE_NAME = "task_access_changes"
 
 # User roles with specific access permissions - 3-tier role system
 ADMIN_ROLE = "admin"
@@ -36,6 +38,50 @@ PRIORITY_FIELD = "priority"
 COMMENTS_FIELD = "comments"
 ATTACHMENTS_FIELD = "attachments"
 FILE_URL_FIELD = "file_url"
+PROJECT_ID_FIELD = "project_id"
+UPDATED_AT_FIELD = "updated_at"
+
+# Columns of the tasks table that /readTasks can project with fields=
+TASK_COLUMNS = (
+    "id", "title", "description", "due_date", "status", "priority", "owner_user_id",
+    "assignee_ids", "parent_id", "project_id", "is_archived", "comments", "attachments",
+    "file_url", "time_log", "recurrence_rule", "recurrence_interval", "recurrence_end_date",
+    "created_at", "updated_at",
+)
+
+# Task list pagination
+TASK_SORT_FIELDS = (DUE_DATE_FIELD, PRIORITY_FIELD, STATUS_FIELD, UPDATED_AT_FIELD)
+DEFAULT_TASK_PAGE_SIZE = 50
+# Stays under PostgREST's max-rows even with the one-row lookahead
+MAX_TASK_PAGE_SIZE = 500
+
+# Delta sync
+TOMBSTONE_TASK_ID_FIELD = "task_id"
+DELETED_AT_FIELD = "deleted_at"
+CHANGED_AT_FIELD = "changed_at"
+# Changes this recent are sent again on the next poll, so writes whose
+# transaction committed after a later timestamp was already read are not missed
+SYNC_SETTLE_SECONDS = 5
+# Watermarks older than this get a full resync (tombstones may have been pruned)
+SYNC_RETENTION_DAYS = 30
+
+# Visibility index: ids per id IN (...) request, short enough for a URL
+TASK_ID_FETCH_BATCH_SIZE = 200
+# Directors whose departments have more users than this are filtered by owner
+# in memory rather than with an owner_user_id IN (...) that would overflow the URL
+MAX_OWNER_FILTER_IDS = 200
+
+# Task search
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+# Ranked ids checked against access control in the database at most this many
+# id IN (...) batches per search (admins and large-department directors only)
+MAX_SEARCH_FETCH_BATCHES = 5
+
+# Calendar
+CALENDAR_SUMMARY_FIELDS = (TASK_ID_FIELD, TITLE_FIELD, STATUS_FIELD, PRIORITY_FIELD, DUE_DATE_FIELD, PROJECT_ID_FIELD, PARENT_ID_FIELD)
+DEFAULT_CALENDAR_TASKS_PER_DAY = 20
+MAX_CALENDAR_TASKS_PER_DAY = 100
 
 # File upload constraints
 MAX_FILE_SIZE_MB = 50
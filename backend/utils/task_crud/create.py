@@ -1,7 +1,7 @@
 from datetime import timedelta, datetime
 from dateutil.relativedelta import relativedelta  # handles monthly recurrences cleanly
 from typing import List, Dict, Any, Optional
-from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.crud_backend import create_crud
 from backend.schemas.task import TaskCreate, MAIN_TASK_PARENT_ID
 from backend.utils.notif_util.notification_service import NotificationService
 from backend.utils.task_crud.constants import (
@@ -35,7 +35,7 @@ class TaskCreator:
 
 
    def __init__(self):
-       self.crud = SupabaseCRUD()
+       self.crud = create_crud()
        self.table_name = TASKS_TABLE_NAME
 
 
@@ -110,11 +110,16 @@ class TaskCreator:
            )
 
 
+           instances = []
            for due_date in recurrence_dates[1:]:
                instance_dict = {**main_task_dict}
                instance_dict[DUE_DATE_FIELD] = due_date.isoformat()
                instance_dict[PARENT_ID_FIELD] = created_main_task[TASK_ID_FIELD]
-               self.crud.insert(self.table_name, instance_dict)
+               instances.append(instance_dict)
+
+           # One request per batch instead of one per recurrence instance
+           if instances:
+               self.crud.insert_many(self.table_name, instances)
 
 
        if subtasks:
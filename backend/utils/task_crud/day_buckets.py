@@ -0,0 +1,249 @@
+"""
+Non-archived tasks bucketed by due day, for calendar views.
+
+A calendar shows one month or week at a time. ``TaskDayBuckets`` keeps the
+summary rows (TASK_SUMMARY projection) of every non-archived task with a due
+date, grouped by the ISO day it is due, so a calendar window is read from at
+most 42 buckets instead of the tasks table:
+
+    buckets = get_task_day_buckets()
+    buckets.tasks_between(date(2025, 3, 1), date(2025, 3, 31))
+    # {"2025-03-04": [summary, ...], ...}
+
+The buckets are built from one paged scan on first use and kept current from
+the rows every CRUD write to the tasks table returns (table_events.on_change),
+in the same way as the task visibility and search indexes. Writes from other
+processes are caught up with at most every ``TASK_CALENDAR_REFRESH_SECONDS``
+(default 5) by reading only the tasks changed since (see catch_up), so a
+calendar is at most that many seconds behind them. The buckets are also
+rebuilt after ``TASK_CALENDAR_TTL_SECONDS`` (default 300). Access control is
+left to TaskReader.get_calendar.
+"""
+import calendar
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.utils.task_crud.catch_up import TaskMarks, current_marks, read_changes_since
+from backend.utils.task_crud.constants import (
+    DUE_DATE_FIELD,
+    IS_ARCHIVED_FIELD,
+    TASK_ID_FIELD,
+    TASKS_TABLE_NAME,
+)
+from backend.wrappers.crud_backend import create_crud
+from backend.wrappers.supabase_wrapper.filters import Filter, IS, not_null
+from backend.wrappers.supabase_wrapper.projections import projection, projection_columns, TASK_SUMMARY
+from backend.wrappers.table_events import TableChange, on_change
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_REFRESH_SECONDS = 5.0
+CALENDAR_VIEWS = ("month", "week")
+
+
+def calendar_window(view: str, anchor: date) -> Tuple[date, date]:
+    """
+    First and last day of the month or week containing anchor
+
+    Args:
+        view: "month", or "week" for the Sunday-to-Saturday week the
+            calendar grid shows
+        anchor: Any day of the window
+
+    Returns:
+        (start, end), both inclusive
+    """
+    if view == "month":
+        return anchor.replace(day=1), anchor.replace(day=calendar.monthrange(anchor.year, anchor.month)[1])
+    if view == "week":
+        start = anchor - timedelta(days=(anchor.weekday() + 1) % 7)
+        return start, start + timedelta(days=6)
+    raise ValueError(f"view must be one of: {', '.join(CALENDAR_VIEWS)}")
+
+
+def due_day(task: Dict[str, Any]) -> Optional[str]:
+    """ISO day (YYYY-MM-DD) task is due; dates and timestamps both start with it"""
+    value = task.get(DUE_DATE_FIELD)
+    return str(value)[:10] if value else None
+
+
+@dataclass
+class _Snapshot:
+    # day -> task id -> summary row, rows in each day kept in insertion order
+    by_day: Dict[str, Dict[str, Dict[str, Any]]] = field(default_factory=dict)
+    day_of: Dict[str, str] = field(default_factory=dict)
+    marks: TaskMarks = TaskMarks()
+    loaded_at: float = 0.0
+    refreshed_at: float = 0.0
+
+    def add(self, task: Dict[str, Any]) -> None:
+        task_id = task[TASK_ID_FIELD]
+        self.remove(task_id)
+        day = due_day(task)
+        if day is None or task.get(IS_ARCHIVED_FIELD) is True:
+            return
+        self.by_day.setdefault(day, {})[task_id] = task
+        self.day_of[task_id] = day
+
+    def remove(self, task_id: str) -> None:
+        day = self.day_of.pop(task_id, None)
+        if day is None:
+            return
+        bucket = self.by_day[day]
+        bucket.pop(task_id, None)
+        if not bucket:
+            del self.by_day[day]
+
+
+class TaskDayBuckets:
+    """
+    Task summaries grouped by due day
+
+    Args:
+        crud: CRUD backend used to load tasks; created on first load when omitted
+        ttl: Seconds until the buckets are rebuilt (0 reloads on every read)
+        refresh_interval: Seconds between catch-up reads of tasks written by
+            other processes (0 catches up on every read)
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        crud=None,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        refresh_interval: float = DEFAULT_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._crud = crud
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self.loads = 0
+
+    @property
+    def crud(self):
+        if self._crud is None:
+            self._crud = create_crud()
+        return self._crud
+
+    def invalidate(self) -> None:
+        """Drop the buckets so the next read reloads them"""
+        with self._lock:
+            self._snapshot = None
+
+    def rebuild(self) -> None:
+        """Reload the buckets from the tasks table now"""
+        with self._lock:
+            self._snapshot = self._load()
+
+    def _load(self) -> _Snapshot:
+        # Taken first, so writes landing during the scan are caught up with later
+        snapshot = _Snapshot(marks=current_marks(self.crud))
+        for task in self.crud.select_iter(
+            TASKS_TABLE_NAME,
+            columns=projection(TASKS_TABLE_NAME, TASK_SUMMARY),
+            filters=[not_null(DUE_DATE_FIELD), Filter(IS_ARCHIVED_FIELD, IS, True, negate=True)]
+        ):
+            if task.get(TASK_ID_FIELD) is not None:
+                snapshot.add(task)
+        snapshot.loaded_at = snapshot.refreshed_at = self._clock()
+        self.loads += 1
+        return snapshot
+
+    def _catch_up(self, snapshot: _Snapshot) -> None:
+        columns = projection_columns(TASKS_TABLE_NAME, TASK_SUMMARY)
+        changed, deleted, snapshot.marks = read_changes_since(
+            self.crud, projection(TASKS_TABLE_NAME, TASK_SUMMARY), snapshot.marks
+        )
+        for row in changed:
+            snapshot.add({column: row.get(column) for column in columns})
+        for task_id in deleted:
+            snapshot.remove(task_id)
+        snapshot.refreshed_at = self._clock()
+
+    def _current(self) -> _Snapshot:
+        now = self._clock()
+        if self._snapshot is None or now - self._snapshot.loaded_at >= self.ttl:
+            self._snapshot = self._load()
+        elif now - self._snapshot.refreshed_at >= self.refresh_interval:
+            self._catch_up(self._snapshot)
+        return self._snapshot
+
+    def apply(self, change: TableChange) -> None:
+        """
+        Update the buckets from a write to the tasks table
+
+        Args:
+            change: The write; rows must carry every summary column, otherwise
+                the buckets are dropped and reloaded on the next read
+        """
+        columns = projection_columns(TASKS_TABLE_NAME, TASK_SUMMARY)
+        with self._lock:
+            if self._snapshot is None:
+                return
+            if change.rows is None or not all(all(column in row for column in columns) for row in change.rows):
+                self._snapshot = None
+                return
+            for row in change.rows:
+                if change.deleted:
+                    self._snapshot.remove(row[TASK_ID_FIELD])
+                else:
+                    self._snapshot.add({column: row[column] for column in columns})
+
+    def tasks_between(self, start: date, end: date) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Summaries of the tasks due from start to end inclusive
+
+        Args:
+            start: First day of the window
+            end: Last day of the window
+
+        Returns:
+            Map of ISO day to copies of the summary rows due that day; days
+            without tasks are left out
+        """
+        with self._lock:
+            snapshot = self._current()
+            result: Dict[str, List[Dict[str, Any]]] = {}
+            day = start
+            while day <= end:
+                bucket = snapshot.by_day.get(day.isoformat())
+                if bucket:
+                    result[day.isoformat()] = [dict(task) for task in bucket.values()]
+                day += timedelta(days=1)
+            return result
+
+
+_shared_buckets: Optional[TaskDayBuckets] = None
+_shared_buckets_lock = threading.Lock()
+
+
+def get_task_day_buckets() -> TaskDayBuckets:
+    """
+    Process-wide TaskDayBuckets, kept current by writes to the tasks table
+
+    Returns:
+        The shared buckets
+    """
+    global _shared_buckets
+    if _shared_buckets is None:
+        with _shared_buckets_lock:
+            if _shared_buckets is None:
+                _shared_buckets = TaskDayBuckets(
+                    ttl=float(os.getenv("TASK_CALENDAR_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+                    refresh_interval=float(os.getenv("TASK_CALENDAR_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS))
+                )
+    return _shared_buckets
+
+
+def _apply_to_shared_buckets(change: TableChange) -> None:
+    if _shared_buckets is not None:
+        _shared_buckets.apply(change)
+
+
+on_change(TASKS_TABLE_NAME, _apply_to_shared_buckets)
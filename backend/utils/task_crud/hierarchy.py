@@ -0,0 +1,101 @@
+"""
+Parent/child index over a list of task rows.
+
+Tasks form a two-level tree through ``parent_id`` (main task -> subtasks).
+``TaskHierarchy`` indexes a list of rows in one pass so that parent lookups,
+child lists and the set of referenced-but-missing parents are dictionary
+lookups instead of scans over the list:
+
+    hierarchy = TaskHierarchy(tasks)
+    hierarchy.parent_of(subtask)        # main task row or None
+    hierarchy.children_of(main_task_id) # subtask rows, in input order
+    hierarchy.missing_parent_ids()      # parents referenced but not loaded
+    hierarchy.tree()                    # main tasks with "subtasks" attached
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from backend.utils.task_crud.constants import TASK_ID_FIELD, PARENT_ID_FIELD, SUBTASKS_RESPONSE_KEY
+
+
+class TaskHierarchy:
+    """
+    Index of task rows by id and by parent
+
+    Args:
+        tasks: Task rows; a row whose id was already seen is ignored
+    """
+
+    def __init__(self, tasks: Iterable[Dict[str, Any]] = ()):
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._children: Dict[str, List[Dict[str, Any]]] = {}
+        self._order: List[str] = []
+        self.add(tasks)
+
+    def add(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """Index more rows (e.g. parents fetched after the first load)"""
+        for task in tasks:
+            task_id = task.get(TASK_ID_FIELD)
+            if task_id is None or task_id in self._by_id:
+                continue
+            self._by_id[task_id] = task
+            self._order.append(task_id)
+            parent_id = task.get(PARENT_ID_FIELD)
+            if parent_id is not None:
+                self._children.setdefault(parent_id, []).append(task)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._by_id
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Row with this id, or None"""
+        return self._by_id.get(task_id)
+
+    def tasks(self) -> List[Dict[str, Any]]:
+        """Every indexed row, in insertion order"""
+        return [self._by_id[task_id] for task_id in self._order]
+
+    def parent_of(self, task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Parent row of task, or None for main tasks and parents that are not indexed"""
+        parent_id = task.get(PARENT_ID_FIELD)
+        return self._by_id.get(parent_id) if parent_id is not None else None
+
+    def children_of(self, task_id: str) -> List[Dict[str, Any]]:
+        """Rows whose parent_id is task_id, in insertion order"""
+        return list(self._children.get(task_id, ()))
+
+    def roots(self) -> List[Dict[str, Any]]:
+        """Rows without a parent_id (main tasks), in insertion order"""
+        return [task for task in self.tasks() if task.get(PARENT_ID_FIELD) is None]
+
+    def orphans(self) -> List[Dict[str, Any]]:
+        """Rows whose parent is referenced but not indexed, in insertion order"""
+        return [
+            task for task in self.tasks()
+            if task.get(PARENT_ID_FIELD) is not None and task[PARENT_ID_FIELD] not in self._by_id
+        ]
+
+    def missing_parent_ids(self) -> Set[str]:
+        """IDs referenced as parent_id by indexed rows but not indexed themselves"""
+        return {parent_id for parent_id in self._children if parent_id not in self._by_id}
+
+    def tree(self, children_key: str = SUBTASKS_RESPONSE_KEY) -> List[Dict[str, Any]]:
+        """
+        Nest the rows under their parents
+
+        Args:
+            children_key: Key the child list is stored under
+
+        Returns:
+            Copies of the main tasks, each with its children attached under
+            children_key, followed by orphans (rows whose parent is not
+            indexed) as top-level entries; input rows are not modified
+        """
+        def nest(task: Dict[str, Any], ancestors: Set[str]) -> Dict[str, Any]:
+            task_id = task[TASK_ID_FIELD]
+            children = [child for child in self._children.get(task_id, ()) if child[TASK_ID_FIELD] not in ancestors]
+            return {**task, children_key: [nest(child, ancestors | {task_id}) for child in children]}
+
+        return [nest(task, set()) for task in self.roots() + self.orphans()]
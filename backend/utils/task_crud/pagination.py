@@ -0,0 +1,189 @@
+"""
+Cursor pagination, sorting, filtering and projection for task lists.
+
+A ``TaskPageRequest`` describes one request to ``GET /api/tasks/readTasks``
+and compiles to database-side conditions, an ORDER BY and a column list, so
+TaskReader only ever reads one page of rows per request.
+
+Pages are keyset-paginated on (sort column, id). The cursor is an opaque
+URL-safe token holding the sort column, direction and the key of the last row
+returned; the next page starts strictly after that key. Rows whose sort column
+is NULL follow PostgreSQL ordering: last when ascending, first when
+descending.
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.wrappers.supabase_wrapper.filters import (
+    Condition, and_, eq, gt, gte, in_, is_null, lt, lte, not_null, or_
+)
+from backend.utils.task_crud.constants import (
+    TASK_ID_FIELD,
+    DUE_DATE_FIELD,
+    STATUS_FIELD,
+    PRIORITY_FIELD,
+    PROJECT_ID_FIELD,
+    TASK_COLUMNS,
+    TASK_SORT_FIELDS,
+    MAX_TASK_PAGE_SIZE,
+)
+
+
+def encode_cursor(sort: Optional[str], descending: bool, row: Dict[str, Any]) -> str:
+    """
+    Build the cursor that resumes after row
+
+    Args:
+        sort: Sort column of the listing (None when ordered by id only)
+        descending: Whether the listing is in descending order
+        row: Last row of the current page
+
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    value = row.get(sort) if sort else None
+    payload = json.dumps([sort, descending, value, row[TASK_ID_FIELD]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: Optional[str], descending: bool) -> Tuple[Any, str]:
+    """
+    Read the (sort value, id) key out of a cursor
+
+    Args:
+        cursor: Cursor returned with the previous page
+        sort: Sort column of the current request
+        descending: Sort direction of the current request
+
+    Returns:
+        Tuple of (sort value, task id)
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_descending, value, task_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cursor_sort != sort or cursor_descending != descending or not isinstance(task_id, str):
+        raise ValueError("Cursor does not match the requested sort order")
+    return value, task_id
+
+
+def keyset_after(sort: Optional[str], descending: bool, value: Any, task_id: str) -> Condition:
+    """
+    Predicate selecting the rows that come after (value, task_id)
+
+    Args:
+        sort: Sort column (None when ordered by id only)
+        descending: Sort direction
+        value: Sort column value of the last row (may be None)
+        task_id: ID of the last row
+
+    Returns:
+        Condition to add to the page query
+    """
+    after = lt if descending else gt
+    if sort is None:
+        return after(TASK_ID_FIELD, task_id)
+
+    if descending:
+        # NULLs come first: after a NULL row come the remaining NULLs, then all non-NULLs
+        if value is None:
+            return or_(not_null(sort), and_(is_null(sort), lt(TASK_ID_FIELD, task_id)))
+        return or_(lt(sort, value), and_(eq(sort, value), lt(TASK_ID_FIELD, task_id)))
+
+    # NULLs come last: after a non-NULL row the NULL rows are still to come
+    if value is None:
+        return and_(is_null(sort), gt(TASK_ID_FIELD, task_id))
+    return or_(gt(sort, value), and_(eq(sort, value), gt(TASK_ID_FIELD, task_id)), is_null(sort))
+
+
+@dataclass
+class TaskPageRequest:
+    """
+    One page request for the task list
+
+    Args:
+        limit: Page size; None returns every matching task
+        cursor: Cursor from the previous page (None for the first page)
+        sort: Sort column, one of TASK_SORT_FIELDS (None orders by id)
+        descending: Sort direction
+        fields: Columns to return (None returns every column); id and the sort
+            column are always included
+        statuses: Only tasks with one of these statuses
+        project_id: Only tasks of this project
+        priority_min: Only tasks with priority >= priority_min
+        priority_max: Only tasks with priority <= priority_max
+        due_from: Only tasks due on or after this day
+        due_to: Only tasks due on or before this day
+    """
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+    sort: Optional[str] = None
+    descending: bool = False
+    fields: Optional[List[str]] = None
+    statuses: List[str] = field(default_factory=list)
+    project_id: Optional[str] = None
+    priority_min: Optional[int] = None
+    priority_max: Optional[int] = None
+    due_from: Optional[date] = None
+    due_to: Optional[date] = None
+
+    def __post_init__(self):
+        if self.limit is not None and not 1 <= self.limit <= MAX_TASK_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_TASK_PAGE_SIZE}")
+        if self.sort is not None and self.sort not in TASK_SORT_FIELDS:
+            raise ValueError(f"sort must be one of: {', '.join(TASK_SORT_FIELDS)}")
+        unknown = [name for name in self.fields or [] if name not in TASK_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        if self.priority_min is not None and self.priority_max is not None and self.priority_min > self.priority_max:
+            raise ValueError("priority_min must not be greater than priority_max")
+        if self.due_from is not None and self.due_to is not None and self.due_from > self.due_to:
+            raise ValueError("due_from must not be after due_to")
+
+    def columns(self) -> str:
+        """Projection string for the page query"""
+        if not self.fields:
+            return "*"
+        required = [TASK_ID_FIELD] + ([self.sort] if self.sort else [])
+        selected = required + [name for name in self.fields if name not in required]
+        return ", ".join(selected)
+
+    def order_by(self) -> Tuple[str, ...]:
+        """ORDER BY columns; id breaks ties so the order is total"""
+        return (self.sort, TASK_ID_FIELD) if self.sort else (TASK_ID_FIELD,)
+
+    def filters(self) -> List[Condition]:
+        """Database-side conditions for the status, project, priority and due date filters"""
+        conditions: List[Condition] = []
+        if self.statuses:
+            conditions.append(eq(STATUS_FIELD, self.statuses[0]) if len(self.statuses) == 1 else in_(STATUS_FIELD, self.statuses))
+        if self.project_id is not None:
+            conditions.append(eq(PROJECT_ID_FIELD, self.project_id))
+        if self.priority_min is not None:
+            conditions.append(gte(PRIORITY_FIELD, self.priority_min))
+        if self.priority_max is not None:
+            conditions.append(lte(PRIORITY_FIELD, self.priority_max))
+        if self.due_from is not None:
+            conditions.append(gte(DUE_DATE_FIELD, self.due_from.isoformat()))
+        if self.due_to is not None:
+            # Before the next day, so the whole day matches even for timestamp values
+            conditions.append(lt(DUE_DATE_FIELD, (self.due_to + timedelta(days=1)).isoformat()))
+        return conditions
+
+    def after(self, cursor: Optional[str]) -> Optional[Condition]:
+        """Keyset condition for the page following cursor (None for the first page)"""
+        if not cursor:
+            return None
+        value, task_id = decode_cursor(cursor, self.sort, self.descending)
+        return keyset_after(self.sort, self.descending, value, task_id)
+
+    def cursor_for(self, row: Dict[str, Any]) -> str:
+        """Cursor that resumes after row"""
+        return encode_cursor(self.sort, self.descending, row)
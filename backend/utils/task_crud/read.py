@@ -1,6 +1,15 @@
-from typing import List, Dict, Any, Optional
-from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
-from backend.utils.user_crud.user_manager import UserManager
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
+from backend.wrappers.crud_backend import create_crud
+from backend.wrappers.supabase_wrapper.filters import Condition, Filter, and_, contains, eq, gt, gte, in_, lte, not_null, or_, IS
+from backend.utils.user_crud.user_directory import get_user_directory
+from backend.utils.task_crud.hierarchy import TaskHierarchy
+from backend.utils.task_crud.pagination import TaskPageRequest
+from backend.utils.task_crud.sync import decode_watermark, encode_watermark, parse_timestamp, sync_key, sync_scope
+from backend.utils.task_crud.visibility import get_task_visibility_index
+from backend.utils.task_crud.search import get_task_search_index
+from backend.utils.task_crud.day_buckets import get_task_day_buckets
+from backend.wrappers.supabase_wrapper.projections import projection, TASK_SUMMARY
 from backend.utils.task_crud.constants import (
     TASKS_TABLE_NAME,
     ADMIN_ROLE,
@@ -9,9 +18,25 @@ from backend.utils.task_crud.constants import (
     PARENT_ID_FIELD,
     IS_ARCHIVED_FIELD,
     TASK_ID_FIELD,
-    USER_ID_FIELD,
+    DUE_DATE_FIELD,
     SUBTASK_KEY,
-    MAIN_TASK_KEY
+    MAIN_TASK_KEY,
+    MAX_TASK_PAGE_SIZE,
+    UPDATED_AT_FIELD,
+    TASK_TOMBSTONES_TABLE_NAME,
+    TASK_ACCESS_CHANGES_TABLE_NAME,
+    TOMBSTONE_TASK_ID_FIELD,
+    DELETED_AT_FIELD,
+    CHANGED_AT_FIELD,
+    SYNC_SETTLE_SECONDS,
+    SYNC_RETENTION_DAYS,
+    TASK_ID_FETCH_BATCH_SIZE,
+    MAX_OWNER_FILTER_IDS,
+    DEFAULT_SEARCH_LIMIT,
+    MAX_SEARCH_FETCH_BATCHES,
+    PROJECT_ID_FIELD,
+    CALENDAR_SUMMARY_FIELDS,
+    DEFAULT_CALENDAR_TASKS_PER_DAY
 )
 
 
@@ -24,8 +49,11 @@ class TaskReader:
     """
 
     def __init__(self):
-        self.crud = SupabaseCRUD()
-        self.user_manager = UserManager()
+        self.crud = create_crud()
+        self.user_directory = get_user_directory()
+        self.visibility_index = get_task_visibility_index()
+        self.search_index = get_task_search_index()
+        self.day_buckets = get_task_day_buckets()
         self.table_name = TASKS_TABLE_NAME
 
     def get_tasks_for_user(self, user_id: str, user_role: str, user_departments: List[str]) -> List[Dict[str, Any]]:
@@ -45,8 +73,667 @@ class TaskReader:
         Returns:
             List of task dictionaries the user is authorized to access
         """
+        if self.visibility_index is not None:
+            return self._get_tasks_by_ids(self.visibility_index.visible_task_ids(user_id, user_role, user_departments))
         return self._apply_access_control(user_id, user_role, user_departments, include_archived=False)
 
+    def _get_tasks_by_ids(self, task_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch non-archived tasks by ID in batched id IN (...) queries.
+
+        Args:
+            task_ids: IDs to fetch
+
+        Returns:
+            The tasks that exist and are not archived, ordered by ID
+        """
+        task_ids = sorted(task_ids)
+        tasks: List[Dict[str, Any]] = []
+        for start in range(0, len(task_ids), TASK_ID_FETCH_BATCH_SIZE):
+            tasks.extend(self.crud.select(
+                self.table_name,
+                filters=[in_(TASK_ID_FIELD, task_ids[start:start + TASK_ID_FETCH_BATCH_SIZE]), *self._archive_filters(False)],
+                order_by=TASK_ID_FIELD
+            ))
+        return tasks
+
+    def get_task_tree(self, user_id: str, user_role: str, user_departments: List[str]) -> List[Dict[str, Any]]:
+        """
+        Retrieve the visible tasks as a tree of main tasks with their subtasks.
+
+        Same tasks as get_tasks_for_user. Each main task carries its visible
+        subtasks under "subtasks"; subtasks whose main task is not visible to
+        the user are listed at the top level after the main tasks.
+
+        Args:
+            user_id: Unique identifier of the requesting user
+            user_role: User's organizational role
+            user_departments: List of departments the user belongs to
+
+        Returns:
+            List of main task dictionaries with nested "subtasks" lists
+        """
+        return TaskHierarchy(self.get_tasks_for_user(user_id, user_role, user_departments)).tree()
+
+    def get_tasks_due_between(
+        self,
+        user_id: str,
+        user_role: str,
+        user_departments: List[str],
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve the non-archived tasks visible to the user that are due in a range of days.
+
+        The range is applied in the database together with the access control
+        conditions (served by the due_date index), or, when the visibility
+        index is enabled, by bisecting its due date order.
+
+        Args:
+            user_id: Unique identifier of the requesting user
+            user_role: User's organizational role
+            user_departments: List of departments the user belongs to
+            start: First day of the range (None for no lower bound)
+            end: Last day of the range, inclusive (None for no upper bound)
+
+        Returns:
+            Tasks ordered by due date, then ID; tasks without a due date are
+            not included, and a range that ends before it starts matches nothing
+        """
+        if start is not None and end is not None and start > end:
+            return []
+        if self.visibility_index is not None:
+            visible = self.visibility_index.visible_task_ids(user_id, user_role, user_departments)
+            task_ids = [task_id for task_id in self.visibility_index.task_ids_due_between(start, end) if task_id in visible]
+            return sorted(self._get_tasks_by_ids(task_ids), key=lambda task: (str(task[DUE_DATE_FIELD]), task[TASK_ID_FIELD]))
+
+        page = TaskPageRequest(sort=DUE_DATE_FIELD, due_from=start, due_to=end)
+        return [
+            task for task in self.get_task_page(user_id, user_role, user_departments, page)["tasks"]
+            if task.get(DUE_DATE_FIELD)
+        ]
+
+    def search_tasks(
+        self,
+        user_id: str,
+        user_role: str,
+        user_departments: List[str],
+        query: str,
+        limit: int = DEFAULT_SEARCH_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the titles and descriptions of the non-archived tasks visible to the user.
+
+        Matching and ranking come from the in-process search index. The ranked
+        ids are narrowed to the ones the user can see before any task is
+        fetched: in memory with the visibility index, otherwise with one
+        indexed read of the user's visible ids. Roles without a visibility
+        condition (admins, directors of departments too large for an owner
+        filter) have their ranked ids checked in the database batch by batch
+        until limit tasks are found, for at most MAX_SEARCH_FETCH_BATCHES
+        batches, so a very common word can return fewer than limit tasks.
+
+        Args:
+            user_id: Unique identifier of the requesting user
+            user_role: User's organizational role
+            user_departments: List of departments the user belongs to
+            query: Search text; every word must match the start of a word in
+                the title or description
+            limit: Maximum number of tasks to return
+
+        Returns:
+            Task summaries, best match first
+        """
+        ranked = [task_id for task_id, _ in self.search_index.search(query)]
+        if not ranked:
+            return []
+
+        max_batches: Optional[int] = None
+        if self.visibility_index is not None:
+            visible = self.visibility_index.visible_task_ids(user_id, user_role, user_departments)
+            ranked = [task_id for task_id in ranked if task_id in visible]
+            visibility: Optional[List[Condition]] = []
+        else:
+            visibility = self._visibility_filters(user_id, user_role, user_departments)
+            if visibility is None:
+                return []
+            if visibility:
+                visible = {
+                    row[TASK_ID_FIELD] for row in self.crud.select_iter(
+                        self.table_name,
+                        columns=TASK_ID_FIELD,
+                        filters=self._archive_filters(include_archived=False) + visibility
+                    )
+                }
+                ranked = [task_id for task_id in ranked if task_id in visible]
+            else:
+                max_batches = MAX_SEARCH_FETCH_BATCHES
+        owners = None if self.visibility_index is not None else self._owner_filter(user_role, user_departments)
+
+        conditions = self._archive_filters(include_archived=False) + visibility
+        tasks: List[Dict[str, Any]] = []
+        for batch_number, start in enumerate(range(0, len(ranked), TASK_ID_FETCH_BATCH_SIZE)):
+            if max_batches is not None and batch_number >= max_batches:
+                break
+            batch = ranked[start:start + TASK_ID_FETCH_BATCH_SIZE]
+            rows = {
+                row[TASK_ID_FIELD]: row for row in self.crud.select(
+                    self.table_name,
+                    columns=projection(TASKS_TABLE_NAME, TASK_SUMMARY),
+                    filters=[in_(TASK_ID_FIELD, batch), *conditions]
+                )
+                if owners is None or row.get(OWNER_USER_ID_FIELD) in owners
+            }
+            tasks.extend(rows[task_id] for task_id in batch if task_id in rows)
+            if len(tasks) >= limit:
+                break
+        return tasks[:limit]
+
+    def get_calendar(
+        self,
+        user_id: str,
+        user_role: str,
+        user_departments: List[str],
+        start: date,
+        end: date,
+        tasks_per_day: int = DEFAULT_CALENDAR_TASKS_PER_DAY,
+        project_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Per-day counts and task summaries of the user's non-archived tasks due in a window.
+
+        Reads the in-process due-day buckets, so a month costs at most 31
+        bucket lookups rather than a read of the tasks table.
+
+        Args:
+            user_id: Unique identifier of the requesting user
+            user_role: User's organizational role
+            user_departments: List of departments the user belongs to
+            start: First day of the window
+            end: Last day of the window, inclusive
+            tasks_per_day: Maximum number of summaries returned per day
+            project_id: Only count tasks of this project
+
+        Returns:
+            Dictionary with "start", "end", "total" and "days": one entry per
+            day of the window with "date", "count" (all visible tasks due that
+            day) and "tasks" (up to tasks_per_day summaries, ordered by ID)
+        """
+        can_read = self._visibility_check(user_id, user_role, user_departments)
+        buckets = self.day_buckets.tasks_between(start, end)
+
+        days: List[Dict[str, Any]] = []
+        day = start
+        while day <= end:
+            tasks = sorted(
+                (
+                    task for task in buckets.get(day.isoformat(), ())
+                    if can_read(task) and (project_id is None or task.get(PROJECT_ID_FIELD) == project_id)
+                ),
+                key=lambda task: task[TASK_ID_FIELD]
+            )
+            days.append({
+                "date": day.isoformat(),
+                "count": len(tasks),
+                "tasks": [{column: task.get(column) for column in CALENDAR_SUMMARY_FIELDS} for task in tasks[:tasks_per_day]],
+            })
+            day += timedelta(days=1)
+
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "total": sum(entry["count"] for entry in days),
+            "days": days,
+        }
+
+    def get_task_page(
+        self,
+        user_id: str,
+        user_role: str,
+        user_departments: List[str],
+        page: TaskPageRequest
+    ) -> Dict[str, Any]:
+        """
+        Retrieve one page of the non-archived tasks visible to the user.
+
+        Access control, the page filters, the sort order and the cursor are all
+        applied in the database, so a request reads at most one page of rows
+        (plus one lookahead row to detect the last page).
+
+        Args:
+            user_id: Unique identifier of the requesting user
+            user_role: User's organizational role
+            user_departments: List of departments the user belongs to
+            page: Page size, cursor, sort order, filters and projection
+
+        Returns:
+            Dictionary with "tasks" (the page) and "next_cursor" (None on the last page);
+            without a page limit every matching task is returned
+        """
+        visibility = self._visibility_filters(user_id, user_role, user_departments)
+        if visibility is None:
+            return {"tasks": [], "next_cursor": None}
+
+        conditions = self._archive_filters(include_archived=False) + visibility + page.filters()
+        owners = self._owner_filter(user_role, user_departments)
+        if page.limit is not None:
+            return self._read_page(conditions, page, page.cursor, page.limit, owners)
+
+        tasks: List[Dict[str, Any]] = []
+        cursor = page.cursor
+        while True:
+            result = self._read_page(conditions, page, cursor, MAX_TASK_PAGE_SIZE, owners)
+            tasks.extend(result["tasks"])
+            cursor = result["next_cursor"]
+            if cursor is None:
+                return {"tasks": tasks, "next_cursor": None}
+
+    def _read_page(
+        self,
+        conditions: List[Condition],
+        page: TaskPageRequest,
+        cursor: Optional[str],
+        limit: int,
+        owners: Optional[set] = None
+    ) -> Dict[str, Any]:
+        """
+        Read the page of up to limit tasks that follows cursor.
+
+        Args:
+            conditions: Visibility and filter conditions
+            page: Page request providing the projection and sort order
+            cursor: Cursor of the previous page, or None for the first page
+            limit: Page size
+            owners: Owner user IDs to keep, checked in memory (see _owner_filter)
+
+        Returns:
+            Dictionary with "tasks" and "next_cursor"
+        """
+        columns = page.columns()
+        # The owner is needed for the in-memory check even if the page does not show it
+        added_owner = owners is not None and bool(page.fields) and OWNER_USER_ID_FIELD not in page.fields
+        if added_owner:
+            columns = f"{columns}, {OWNER_USER_ID_FIELD}"
+
+        def read_batch(last: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            after = page.after(page.cursor_for(last) if last is not None else cursor)
+            return self.crud.select(
+                self.table_name,
+                columns=columns,
+                filters=conditions + ([after] if after is not None else []),
+                limit=limit + 1,
+                order_by=page.order_by(),
+                ascending=not page.descending
+            ) or []
+
+        rows = read_batch(None) if owners is None else self._read_owned(owners, read_batch, limit)
+        next_cursor = page.cursor_for(rows[limit - 1]) if len(rows) > limit else None
+        if added_owner:
+            rows = [{key: value for key, value in row.items() if key != OWNER_USER_ID_FIELD} for row in rows]
+        return {"tasks": rows[:limit], "next_cursor": next_cursor}
+
+    def _visibility_filters(self, user_id: str, user_role: str, user_departments: List[str]) -> Optional[List[Condition]]:
+        """
+        Express the access control rules as database conditions.
+
+        Mirrors _apply_access_control: admins and managing directors see every
+        task, directors the tasks owned by their departments' users, and
+        everyone else the tasks assigned to them plus the main tasks of their
+        assigned subtasks. A director with more than MAX_OWNER_FILTER_IDS
+        department users gets no owner condition; callers must then apply
+        _owner_filter to the rows they read.
+
+        Args:
+            user_id: ID of the requesting user
+            user_role: User's organizational role
+            user_departments: List of departments the user belongs to
+
+        Returns:
+            List of conditions, or None when the user can see no task at all
+        """
+        if user_role.lower() in [ADMIN_ROLE, "managing_director"]:
+            return []
+        if user_role.lower() == "director":
+            department_user_ids = self._get_department_user_ids(user_departments)
+            if not department_user_ids:
+                return None
+            if len(department_user_ids) > MAX_OWNER_FILTER_IDS:
+                return []
+            return [in_(OWNER_USER_ID_FIELD, sorted(department_user_ids))]
+
+        assigned = contains(ASSIGNEE_IDS_FIELD, [user_id])
+        parent_task_ids = self._assigned_parent_ids(user_id)
+        if not parent_task_ids:
+            return [assigned]
+        return [or_(assigned, in_(TASK_ID_FIELD, sorted(parent_task_ids)))]
+
+    def _owner_filter(self, user_role: str, user_departments: List[str]) -> Optional[set]:
+        """
+        Owners a director's rows must be checked against in memory.
+
+        Args:
+            user_role: User's organizational role
+            user_departments: List of departments the user belongs to
+
+        Returns:
+            The department user IDs when _visibility_filters left the owner
+            condition out (see MAX_OWNER_FILTER_IDS), otherwise None
+        """
+        if user_role.lower() != "director":
+            return None
+        department_user_ids = self._get_department_user_ids(user_departments)
+        return department_user_ids if len(department_user_ids) > MAX_OWNER_FILTER_IDS else None
+
+    @staticmethod
+    def _read_owned(
+        owners: set,
+        read_batch: Callable[[Optional[Dict[str, Any]]], List[Dict[str, Any]]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Read ordered batches until limit + 1 rows owned by owners are found.
+
+        Args:
+            owners: Owner user IDs to keep
+            read_batch: Reads the limit + 1 rows that follow a row in the
+                query's order (the first limit + 1 rows when given None)
+            limit: Number of rows wanted; one more is kept as lookahead
+
+        Returns:
+            Up to limit + 1 owned rows, in the query's order
+        """
+        owned: List[Dict[str, Any]] = []
+        last = None
+        while True:
+            rows = read_batch(last)
+            owned.extend(row for row in rows if row.get(OWNER_USER_ID_FIELD) in owners)
+            if len(owned) > limit or len(rows) <= limit:
+                return owned[:limit + 1]
+            last = rows[-1]
+
+    def _assigned_parent_ids(self, user_id: str) -> set:
+        """
+        IDs of the main tasks of the user's non-archived assigned subtasks.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            Set of parent task IDs
+        """
+        return {
+            task[PARENT_ID_FIELD] for task in self.crud.select_iter(
+                self.table_name,
+                columns=PARENT_ID_FIELD,
+                filters=[contains(ASSIGNEE_IDS_FIELD, [user_id]), not_null(PARENT_ID_FIELD), *self._archive_filters(include_archived=False)]
+            )
+            if task.get(PARENT_ID_FIELD) is not None
+        }
+
+    def _visibility_check(self, user_id: str, user_role: str, user_departments: List[str]) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Express the access control rules as a test on task rows already in memory.
+
+        Mirrors _visibility_filters; the rows must carry id, owner_user_id and
+        assignee_ids.
+
+        Args:
+            user_id: ID of the requesting user
+            user_role: User's organizational role
+            user_departments: List of departments the user belongs to
+
+        Returns:
+            Function telling whether the user may read a (non-archived) task
+        """
+        if self.visibility_index is not None:
+            visible = self.visibility_index.visible_task_ids(user_id, user_role, user_departments)
+            return lambda task: task[TASK_ID_FIELD] in visible
+        if user_role.lower() in [ADMIN_ROLE, "managing_director"]:
+            return lambda task: True
+        if user_role.lower() == "director":
+            department_user_ids = self._get_department_user_ids(user_departments)
+            return lambda task: task.get(OWNER_USER_ID_FIELD) in department_user_ids
+
+        parent_task_ids = self._assigned_parent_ids(user_id)
+        return lambda task: user_id in (task.get(ASSIGNEE_IDS_FIELD) or []) or task[TASK_ID_FIELD] in parent_task_ids
+
+    def get_task_changes(
+        self,
+        user_id: str,
+        user_role: str,
+        user_departments: List[str],
+        watermark: Optional[str] = None,
+        limit: int = MAX_TASK_PAGE_SIZE,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve what changed in the user's task list since a watermark.
+
+        Changes are read in (updated_at, id) order, limit rows at a time, and
+        only among the tasks the user can see, so other users' edits never show
+        up. Changed tasks (and the main tasks of changed subtasks) are returned
+        in full. Tasks the user could see before an access change (unassigned,
+        handed to another owner, moved, archived) or a deletion in the same
+        window, and cannot see now, are reported as tombstones, and so are
+        deleted tasks. Without a usable watermark (none, expired, or issued for
+        another role, department set or, for directors, set of department
+        members) the first page of a full snapshot is returned with reset=True,
+        and the client should discard its copy.
+
+        Args:
+            user_id: Unique identifier of the requesting user
+            user_role: User's organizational role
+            user_departments: List of departments the user belongs to
+            watermark: Watermark from the previous response
+            limit: Maximum number of changed rows read per call
+            now: Current time (injectable for tests)
+
+        Returns:
+            Dictionary with "tasks", "tombstones" (task ids), "watermark" (pass it
+            to the next call), "has_more" (more changes are waiting) and "reset"
+
+        Raises:
+            ValueError: If the watermark is malformed
+        """
+        now = now or datetime.now(timezone.utc)
+        # Directors see tasks by owner, so department membership is part of the scope
+        member_ids = self._get_department_user_ids(user_departments) if user_role.lower() == "director" else ()
+        scope = sync_scope(user_role, user_departments, member_ids)
+        since = self._resume_point(watermark, scope, now)
+        visibility = self._visibility_filters(user_id, user_role, user_departments)
+        visible_conditions = None if visibility is None else self._archive_filters(include_archived=False) + visibility
+        owners = self._owner_filter(user_role, user_departments)
+        key_columns = (UPDATED_AT_FIELD, TASK_ID_FIELD)
+
+        def after_key(updated_at: str, task_id: str) -> Condition:
+            return or_(gt(UPDATED_AT_FIELD, updated_at), and_(eq(UPDATED_AT_FIELD, updated_at), gt(TASK_ID_FIELD, task_id)))
+
+        def read_batch(last: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            start = (last[UPDATED_AT_FIELD], last[TASK_ID_FIELD]) if last is not None else since
+            return self.crud.select(
+                self.table_name,
+                filters=[*visible_conditions, not_null(UPDATED_AT_FIELD)] + ([after_key(*start)] if start else []),
+                limit=limit + 1,
+                order_by=key_columns
+            ) or []
+
+        if visible_conditions is None:
+            rows = []
+        else:
+            rows = read_batch(None) if owners is None else self._read_owned(owners, read_batch, limit)
+        changed = tasks = rows[:limit]
+        tombstones: set = set()
+        if since is not None and visible_conditions is not None:
+            # A changed subtask can make its main task appear
+            parent_ids = {row[PARENT_ID_FIELD] for row in changed if row.get(PARENT_ID_FIELD)}
+            tasks = changed + self._visible_tasks_among(parent_ids - {row[TASK_ID_FIELD] for row in changed}, visible_conditions, owners)
+            tasks.sort(key=lambda task: sync_key(task[UPDATED_AT_FIELD], task[TASK_ID_FIELD]))
+            upper = changed[-1][UPDATED_AT_FIELD] if len(rows) > limit else None
+            held = self._previously_held_ids(user_id, user_role, member_ids, since[0], upper)
+            still_visible = {task[TASK_ID_FIELD] for task in self._visible_tasks_among(held, visible_conditions, owners)}
+            tombstones = (held - still_visible) | self._deleted_task_ids(since[0], upper)
+
+        has_more = len(rows) > limit
+        last = (changed[-1][UPDATED_AT_FIELD], changed[-1][TASK_ID_FIELD]) if changed else since
+        next_key = last if has_more else self._settled_watermark(last, since, now)
+        return {
+            "tasks": tasks,
+            "tombstones": sorted(tombstones),
+            "watermark": encode_watermark(next_key[0], next_key[1], scope),
+            "has_more": has_more,
+            "reset": since is None
+        }
+
+    def _resume_point(self, watermark: Optional[str], scope: str, now: datetime) -> Optional[Tuple[str, str]]:
+        """
+        The (updated_at, id) key to resume from, or None when a full resync is needed.
+
+        Args:
+            watermark: Watermark sent by the client
+            scope: Scope fingerprint of the current user
+            now: Current time
+
+        Returns:
+            Resume key, or None for a missing, out-of-scope or expired watermark
+        """
+        if not watermark:
+            return None
+        decoded = decode_watermark(watermark)
+        if decoded.scope != scope:
+            return None
+        if parse_timestamp(decoded.updated_at) < now - timedelta(days=SYNC_RETENTION_DAYS):
+            return None
+        return decoded.updated_at, decoded.task_id
+
+    def _settled_watermark(
+        self,
+        last: Optional[Tuple[str, str]],
+        since: Optional[Tuple[str, str]],
+        now: datetime
+    ) -> Tuple[str, str]:
+        """
+        Watermark after the last page of changes.
+
+        Never later than SYNC_SETTLE_SECONDS ago, so changes whose transaction
+        committed out of timestamp order are picked up by the next call, and
+        never earlier than where the client already is.
+
+        Args:
+            last: Key of the last changed row read (None if none)
+            since: Key the client resumed from (None on reset)
+            now: Current time
+
+        Returns:
+            (updated_at, id) key for the next watermark
+        """
+        settled = (now - timedelta(seconds=SYNC_SETTLE_SECONDS)).isoformat()
+        key = last if last is not None and sync_key(*last) <= sync_key(settled, "") else (settled, "")
+        if since is not None and sync_key(*since) > sync_key(*key):
+            return since
+        return key
+
+    def _visible_tasks_among(
+        self,
+        task_ids: Iterable[str],
+        visible_conditions: List[Condition],
+        owners: Optional[set]
+    ) -> List[Dict[str, Any]]:
+        """
+        The tasks among task_ids that the user can see.
+
+        Args:
+            task_ids: Candidate task IDs
+            visible_conditions: Archive and visibility conditions of the user
+            owners: Owner user IDs to check in memory (see _owner_filter), or None
+
+        Returns:
+            Visible task rows, in no particular order
+        """
+        task_ids = sorted(task_ids)
+        tasks: List[Dict[str, Any]] = []
+        for start in range(0, len(task_ids), TASK_ID_FETCH_BATCH_SIZE):
+            tasks.extend(self.crud.select(
+                self.table_name,
+                filters=[in_(TASK_ID_FIELD, task_ids[start:start + TASK_ID_FETCH_BATCH_SIZE]), *visible_conditions]
+            ) or [])
+        if owners is not None:
+            tasks = [task for task in tasks if task.get(OWNER_USER_ID_FIELD) in owners]
+        return tasks
+
+    def _previously_held_ids(
+        self,
+        user_id: str,
+        user_role: str,
+        member_ids: Iterable[str],
+        since: str,
+        until: Optional[str]
+    ) -> set:
+        """
+        IDs of tasks the user could see before an access change or deletion in the window.
+
+        Applies the visibility rules to the values task_access_changes recorded
+        before each change: the task itself for its previous assignees (and,
+        for a subtask, its previous main task), for the directors of its
+        previous owner, and for admins and managing directors. A main task
+        seen through assigned subtasks is matched on the subtasks the user
+        holds now.
+
+        Args:
+            user_id: ID of the requesting user
+            user_role: User's organizational role
+            member_ids: Department user IDs of a director (empty otherwise)
+            since: Inclusive lower bound on changed_at
+            until: Inclusive upper bound on changed_at, or None
+
+        Returns:
+            Set of task IDs (some may still be visible)
+        """
+        role = user_role.lower()
+        member_ids = set(member_ids)
+        conditions = [gte(CHANGED_AT_FIELD, since)] + ([lte(CHANGED_AT_FIELD, until)] if until else [])
+        held: set = set()
+        assigned_parent_ids: Optional[set] = None
+        for change in self.crud.select_iter(
+            TASK_ACCESS_CHANGES_TABLE_NAME,
+            columns=f"{TOMBSTONE_TASK_ID_FIELD}, {OWNER_USER_ID_FIELD}, {ASSIGNEE_IDS_FIELD}, {PARENT_ID_FIELD}, {IS_ARCHIVED_FIELD}",
+            filters=conditions,
+            key_columns=(CHANGED_AT_FIELD, TASK_ID_FIELD)
+        ):
+            task_id = change[TOMBSTONE_TASK_ID_FIELD]
+            if change.get(IS_ARCHIVED_FIELD):
+                continue
+            if role in [ADMIN_ROLE, "managing_director"]:
+                held.add(task_id)
+            elif role == "director":
+                if change.get(OWNER_USER_ID_FIELD) in member_ids:
+                    held.add(task_id)
+            elif user_id in (change.get(ASSIGNEE_IDS_FIELD) or []):
+                held.add(task_id)
+                if change.get(PARENT_ID_FIELD):
+                    held.add(change[PARENT_ID_FIELD])
+            else:
+                if assigned_parent_ids is None:
+                    assigned_parent_ids = self._assigned_parent_ids(user_id)
+                if task_id in assigned_parent_ids:
+                    held.add(task_id)
+        return held
+
+    def _deleted_task_ids(self, since: str, until: Optional[str]) -> set:
+        """
+        IDs of tasks deleted after since (and up to until, when given).
+
+        Args:
+            since: Exclusive lower bound on deleted_at
+            until: Inclusive upper bound on deleted_at, or None
+
+        Returns:
+            Set of deleted task IDs
+        """
+        conditions = [gt(DELETED_AT_FIELD, since)] + ([lte(DELETED_AT_FIELD, until)] if until else [])
+        rows = self.crud.select(TASK_TOMBSTONES_TABLE_NAME, columns=TOMBSTONE_TASK_ID_FIELD, filters=conditions) or []
+        return {row[TOMBSTONE_TASK_ID_FIELD] for row in rows}
+
     def get_task_by_id(self, task_id: str, user_id: str, user_role: str, user_departments: List[str]) -> Optional[Dict[str, Any]]:
         """
         Get a specific task by ID if user has access.
@@ -60,13 +747,49 @@ class TaskReader:
         Returns:
             Task data if accessible, None otherwise
         """
-        accessible_tasks = self.get_tasks_for_user(user_id, user_role, user_departments)
+        # Point lookup by primary key; access is then decided on this row alone
+        tasks = self.crud.select(
+            self.table_name,
+            filters=[eq(TASK_ID_FIELD, task_id), *self._archive_filters(False)],
+            limit=1
+        )
+        if not tasks:
+            return None
+
+        task = tasks[0]
+        return task if self._can_read_task(task, user_id, user_role, user_departments) else None
+
+    def _can_read_task(self, task: Dict[str, Any], user_id: str, user_role: str, user_departments: List[str]) -> bool:
+        """
+        Evaluate the read access rules of get_tasks_for_user for a single task.
+
+        Args:
+            task: Task row (not archived)
+            user_id: ID of the requesting user
+            user_role: User's organizational role
+            user_departments: List of departments the user belongs to
+
+        Returns:
+            True if the task would be among the user's visible tasks
+        """
+        if self.visibility_index is not None:
+            return self.visibility_index.can_read(task[TASK_ID_FIELD], user_id, user_role, user_departments)
+
+        if user_role.lower() in [ADMIN_ROLE, "managing_director"]:
+            return True
 
-        for task in accessible_tasks:
-            if task[TASK_ID_FIELD] == task_id:
-                return task
+        if user_role.lower() == "director":
+            return task.get(OWNER_USER_ID_FIELD) in self._get_department_user_ids(user_departments)
 
-        return None
+        if user_id in (task.get(ASSIGNEE_IDS_FIELD) or []):
+            return True
+
+        # Main tasks are visible to users assigned to one of their active subtasks
+        return self.crud.exists(
+            self.table_name,
+            [eq(PARENT_ID_FIELD, task[TASK_ID_FIELD]), contains(ASSIGNEE_IDS_FIELD, [user_id]), *self._archive_filters(False)],
+            column=TASK_ID_FIELD
+        )
 
     def get_archived_subtasks_for_user(self, user_id: str, user_role: str, user_departments: List[str]) -> List[Dict[str, Any]]:
         """
@@ -83,27 +806,72 @@ class TaskReader:
         Returns:
             List of dictionaries containing 'subtask' and 'main_task' keys
         """
-        accessible_tasks = self._get_all_accessible_tasks(user_id, user_role, user_departments)
+        # Only archived subtasks leave the database; their main tasks follow in one query
+        archived_subtasks = self._apply_access_control(
+            user_id, user_role, user_departments,
+            include_archived=True,
+            filters=[eq(IS_ARCHIVED_FIELD, True), not_null(PARENT_ID_FIELD)],
+            with_parents=False
+        )
+        hierarchy = TaskHierarchy(archived_subtasks)
+        main_task_ids = sorted(hierarchy.missing_parent_ids())
+        hierarchy.add(self._get_visible_main_tasks(main_task_ids, user_role, user_departments).values())
+
+        return [
+            {SUBTASK_KEY: task, MAIN_TASK_KEY: hierarchy.parent_of(task)}
+            for task in archived_subtasks
+        ]
+
+
+    def _get_visible_main_tasks(self, main_task_ids: List[str], user_role: str, user_departments: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch main tasks by ID, keeping only those the user may see.
 
-        result = []
-        main_task_cache = {}
+        Staff and managers may always see the main task of a subtask they are
+        assigned to; directors only see main tasks owned within their departments.
 
-        for task in accessible_tasks:
-            if task.get(PARENT_ID_FIELD) is not None and task.get(IS_ARCHIVED_FIELD, False):
-                main_task_id = task[PARENT_ID_FIELD]
-                if main_task_id not in main_task_cache:
-                    main_task = next((t for t in accessible_tasks if t[TASK_ID_FIELD] == main_task_id), None)
-                    main_task_cache[main_task_id] = main_task
+        Args:
+            main_task_ids: IDs of the main tasks to fetch
+            user_role: User's organizational role
+            user_departments: List of departments the user belongs to
 
-                result.append({
-                    SUBTASK_KEY: task,
-                    MAIN_TASK_KEY: main_task_cache[main_task_id]
-                })
+        Returns:
+            Dictionary of main task ID to main task
+        """
+        if not main_task_ids:
+            return {}
 
-        return result
+        main_tasks = self.crud.select(self.table_name, filters=[in_(TASK_ID_FIELD, main_task_ids)])
+        if user_role.lower() == "director":
+            department_user_ids = self._get_department_user_ids(user_departments)
+            main_tasks = [task for task in main_tasks if task.get(OWNER_USER_ID_FIELD) in department_user_ids]
 
+        return {task[TASK_ID_FIELD]: task for task in main_tasks}
 
-    def _apply_access_control(self, user_id: str, user_role: str, user_departments: List[str], include_archived: bool = False) -> List[Dict[str, Any]]:
+    def _archive_filters(self, include_archived: bool) -> List[Condition]:
+        """
+        Server-side predicate for the archive flag.
+
+        Args:
+            include_archived: Whether archived tasks should be returned
+
+        Returns:
+            No conditions when archived tasks are included, otherwise
+            "is_archived is not true" (which also keeps rows where it is NULL)
+        """
+        if include_archived:
+            return []
+        return [Filter(IS_ARCHIVED_FIELD, IS, True, negate=True)]
+
+    def _apply_access_control(
+        self,
+        user_id: str,
+        user_role: str,
+        user_departments: List[str],
+        include_archived: bool = False,
+        filters: Optional[List[Condition]] = None,
+        with_parents: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         Apply hierarchical access control rules to retrieve tasks.
 
@@ -119,17 +887,20 @@ class TaskReader:
             user_role: User's organizational role
             user_departments: List of departments the user belongs to
             include_archived: Whether to include archived tasks
+            filters: Additional conditions applied in the database
+            with_parents: Whether staff/manager results include the main tasks
+                of assigned subtasks
 
         Returns:
             List of tasks the user is authorized to access
         """
         if user_role.lower() in [ADMIN_ROLE, "managing_director"]:
-            return self._get_all_tasks()
+            return self._get_all_tasks(include_archived, filters)
         elif user_role.lower() == "director":
-            return self._filter_tasks_by_departments(user_departments, include_archived)
+            return self._filter_tasks_by_departments(user_departments, include_archived, filters)
         # Manager and staff see only their assigned tasks
         # (Managers have additional privileges for updating, but same read access)
-        return self._filter_tasks_by_assignment(user_id, include_archived)
+        return self._filter_tasks_by_assignment(user_id, include_archived, filters, with_parents)
 
     def _get_all_accessible_tasks(self, user_id: str, user_role: str, user_departments: List[str]) -> List[Dict[str, Any]]:
         """
@@ -149,17 +920,22 @@ class TaskReader:
         return self._apply_access_control(user_id, user_role, user_departments, include_archived=True)
 
 
-    def _get_all_tasks(self) -> List[Dict[str, Any]]:
+    def _get_all_tasks(self, include_archived: bool = True, filters: Optional[List[Condition]] = None) -> List[Dict[str, Any]]:
         """
-        Retrieve all tasks in the system without filtering.
+        Retrieve all tasks in the system without access filtering.
 
         Used for managing directors who have unrestricted access.
-        Includes both active and archived tasks.
+
+        Args:
+            include_archived: Whether to include archived tasks
+            filters: Additional conditions applied in the database
 
         Returns:
             Complete list of all tasks in the system
         """
-        return self.crud.select(self.table_name)
+        # Paged so large tables are not truncated by PostgREST's max-rows limit
+        conditions = self._archive_filters(include_archived) + list(filters or [])
+        return list(self.crud.select_iter(self.table_name, filters=conditions))
 
     def _get_tasks_by_departments(self, departments: List[str]) -> List[Dict[str, Any]]:
         """
@@ -265,22 +1041,22 @@ class TaskReader:
         if not departments:
             return set()
 
-        department_user_ids = set()
-        for dept in departments:
-            dept_users = self.user_manager.get_users_by_department(dept)
-            for user in dept_users:
-                department_user_ids.add(user[USER_ID_FIELD])
-
-        return department_user_ids
+        return self.user_directory.user_ids_in_departments(departments)
 
 
-    def _filter_tasks_by_departments(self, departments: List[str], include_archived: bool = False) -> List[Dict[str, Any]]:
+    def _filter_tasks_by_departments(
+        self,
+        departments: List[str],
+        include_archived: bool = False,
+        filters: Optional[List[Condition]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Filter tasks by department ownership.
 
         Args:
             departments: List of department names to include
             include_archived: Whether to include archived tasks
+            filters: Additional conditions applied in the database
 
         Returns:
             List of tasks owned by users in the specified departments
@@ -289,32 +1065,51 @@ class TaskReader:
         if not department_user_ids:
             return []
 
-        all_tasks = self.crud.select(self.table_name)
-        return [task for task in all_tasks if task[OWNER_USER_ID_FIELD] in department_user_ids]
-
-    def _filter_tasks_by_assignment(self, user_id: str, include_archived: bool = False) -> List[Dict[str, Any]]:
+        conditions = self._archive_filters(include_archived) + list(filters or [])
+        return [
+            task for task in self.crud.select_iter(self.table_name, filters=conditions)
+            if task[OWNER_USER_ID_FIELD] in department_user_ids
+        ]
+
+    def _filter_tasks_by_assignment(
+        self,
+        user_id: str,
+        include_archived: bool = False,
+        filters: Optional[List[Condition]] = None,
+        with_parents: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         Filter tasks by user assignment.
 
+        The assignment check runs in the database (assignee_ids contains
+        user_id); parents of assigned subtasks are then fetched with a single
+        id IN (...) query, so the cost follows the user's own tasks rather
+        than the size of the tasks table.
+
         Args:
             user_id: ID of the user to find assignments for
             include_archived: Whether to include archived tasks
+            filters: Additional conditions applied in the database
+            with_parents: Whether to include the main tasks of assigned subtasks
 
         Returns:
             List of tasks where the user is assigned (including tasks where user is assigned to subtasks)
         """
-        all_tasks = self.crud.select(self.table_name)
-
-        # Build a map of parent task IDs for quick lookup
-        parent_task_ids = set()
-        for task in all_tasks:
-            if user_id in task.get(ASSIGNEE_IDS_FIELD, []):
-                # If user is assigned to this task
-                if task.get(PARENT_ID_FIELD) is not None:
-                    # It's a subtask, include the parent task
-                    parent_task_ids.add(task[PARENT_ID_FIELD])
-
-        # Return tasks where user is directly assigned OR user is assigned to any of its subtasks
-        return [task for task in all_tasks if
-                user_id in task.get(ASSIGNEE_IDS_FIELD, []) or
-                task.get(TASK_ID_FIELD) in parent_task_ids]
+        archive_filters = self._archive_filters(include_archived)
+        assigned_tasks = list(self.crud.select_iter(
+            self.table_name,
+            filters=[contains(ASSIGNEE_IDS_FIELD, [user_id]), *archive_filters, *(filters or [])]
+        ))
+        if not with_parents:
+            return assigned_tasks
+
+        # Parents of assigned subtasks that are not themselves assigned to the user
+        parent_task_ids = TaskHierarchy(assigned_tasks).missing_parent_ids()
+        if not parent_task_ids:
+            return assigned_tasks
+
+        parent_tasks = self.crud.select(
+            self.table_name,
+            filters=[in_(TASK_ID_FIELD, sorted(parent_task_ids)), *archive_filters]
+        )
+        return assigned_tasks + parent_tasks
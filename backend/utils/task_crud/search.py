@@ -0,0 +1,293 @@
+"""
+In-process full-text index over task titles and descriptions.
+
+``TaskSearchIndex`` keeps an inverted index from tokens to the tasks
+containing them, together with a sorted vocabulary so that prefixes are
+resolved by bisection:
+
+    index = get_task_search_index()
+    index.search("quart rep")   # [(task_id, score), ...], best first
+
+Text is split into lowercase word tokens. Every query term matches as a
+prefix ("rep" finds "report" and "reply"), and a task must match every term.
+Each task is scored by summing, per query term, the best of its matching
+tokens: occurrences in the title weigh ``TITLE_WEIGHT`` times as much as
+occurrences in the description, rarer tokens weigh more (inverse document
+frequency) and a token that merely starts with the term counts
+``PREFIX_MATCH_WEIGHT`` of an exact match. To keep short prefixes cheap, terms
+shorter than ``MIN_PREFIX_LENGTH`` only match whole tokens and a prefix expands
+to at most ``MAX_PREFIX_EXPANSIONS`` tokens (the most common ones). Archived
+tasks are not returned.
+
+The index is built from one paged scan on first use and kept current from the
+rows every CRUD write to the tasks table returns (table_events.on_change), in
+the same way as the task visibility index. Writes from other processes are
+caught up with at most every ``TASK_SEARCH_INDEX_REFRESH_SECONDS`` (default 5)
+by reading only the tasks changed since (see catch_up), and the index is
+rebuilt after ``TASK_SEARCH_INDEX_TTL_SECONDS`` (default 300). It does not
+know who may read what: TaskReader.search_tasks applies the access rules to
+the ranked ids.
+"""
+import bisect
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from backend.utils.task_crud.catch_up import TaskMarks, current_marks, read_changes_since
+from backend.utils.task_crud.constants import (
+    DESCRIPTION_FIELD,
+    IS_ARCHIVED_FIELD,
+    TASK_ID_FIELD,
+    TASKS_TABLE_NAME,
+    TITLE_FIELD,
+)
+from backend.wrappers.crud_backend import create_crud
+from backend.wrappers.supabase_wrapper.projections import projection, projection_columns, TASK_SEARCH
+from backend.wrappers.table_events import TableChange, on_change
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_REFRESH_SECONDS = 5.0
+TITLE_WEIGHT = 3.0
+PREFIX_MATCH_WEIGHT = 0.5
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSIONS = 64
+
+_TOKEN = re.compile(r"\w+")
+# Sorts after every token that starts with a given prefix
+_PREFIX_END = "\U0010ffff"
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens of text, in order"""
+    return _TOKEN.findall(text.casefold()) if text else []
+
+
+def _term_weights(task: Dict[str, Any]) -> Dict[str, float]:
+    weights: Counter = Counter()
+    for token in tokenize(task.get(TITLE_FIELD)):
+        weights[token] += TITLE_WEIGHT
+    for token in tokenize(task.get(DESCRIPTION_FIELD)):
+        weights[token] += 1.0
+    return dict(weights)
+
+
+@dataclass
+class _Snapshot:
+    # token -> task id -> weight of the token in that task
+    postings: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    vocabulary: List[str] = field(default_factory=list)
+    tokens_of: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    archived: Set[str] = field(default_factory=set)
+    marks: TaskMarks = TaskMarks()
+    loaded_at: float = 0.0
+    refreshed_at: float = 0.0
+
+    def add(self, task: Dict[str, Any], keep_sorted: bool = True) -> None:
+        task_id = task[TASK_ID_FIELD]
+        self.remove(task_id)
+        weights = _term_weights(task)
+        self.tokens_of[task_id] = tuple(weights)
+        if task.get(IS_ARCHIVED_FIELD) is True:
+            self.archived.add(task_id)
+        for token, weight in weights.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                if keep_sorted:
+                    bisect.insort(self.vocabulary, token)
+                else:
+                    self.vocabulary.append(token)
+            postings[task_id] = weight
+
+    def remove(self, task_id: str) -> None:
+        self.archived.discard(task_id)
+        for token in self.tokens_of.pop(task_id, ()):
+            postings = self.postings[token]
+            postings.pop(task_id, None)
+            if not postings:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+
+    def expand(self, prefix: str) -> List[str]:
+        """Tokens starting with prefix, capped at the MAX_PREFIX_EXPANSIONS most common"""
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return [prefix] if prefix in self.postings else []
+        low = bisect.bisect_left(self.vocabulary, prefix)
+        high = bisect.bisect_right(self.vocabulary, prefix + _PREFIX_END, lo=low)
+        tokens = self.vocabulary[low:high]
+        if len(tokens) <= MAX_PREFIX_EXPANSIONS:
+            return tokens
+        common = heapq.nlargest(MAX_PREFIX_EXPANSIONS, tokens, key=lambda token: len(self.postings[token]))
+        # The exact token always takes part
+        return common if prefix not in self.postings or prefix in common else common + [prefix]
+
+
+class TaskSearchIndex:
+    """
+    Inverted index of task titles and descriptions
+
+    Args:
+        crud: CRUD backend used to load tasks; created on first load when omitted
+        ttl: Seconds until the index is rebuilt (0 rebuilds on every search)
+        refresh_interval: Seconds between catch-up reads of tasks written by
+            other processes (0 catches up on every search)
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        crud=None,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        refresh_interval: float = DEFAULT_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._crud = crud
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self.loads = 0
+
+    @property
+    def crud(self):
+        if self._crud is None:
+            self._crud = create_crud()
+        return self._crud
+
+    def invalidate(self) -> None:
+        """Drop the index so the next search rebuilds it"""
+        with self._lock:
+            self._snapshot = None
+
+    def rebuild(self) -> None:
+        """Reload the index from the tasks table now"""
+        with self._lock:
+            self._snapshot = self._load()
+
+    def _load(self) -> _Snapshot:
+        # Taken first, so writes landing during the scan are caught up with later
+        snapshot = _Snapshot(marks=current_marks(self.crud))
+        columns = projection(TASKS_TABLE_NAME, TASK_SEARCH)
+        for task in self.crud.select_iter(TASKS_TABLE_NAME, columns=columns):
+            if task.get(TASK_ID_FIELD) is not None:
+                snapshot.add(task, keep_sorted=False)
+        # Sorted once instead of an insort per new token
+        snapshot.vocabulary.sort()
+        snapshot.loaded_at = snapshot.refreshed_at = self._clock()
+        self.loads += 1
+        return snapshot
+
+    def _catch_up(self, snapshot: _Snapshot) -> None:
+        columns = projection_columns(TASKS_TABLE_NAME, TASK_SEARCH)
+        changed, deleted, snapshot.marks = read_changes_since(
+            self.crud, projection(TASKS_TABLE_NAME, TASK_SEARCH), snapshot.marks
+        )
+        for row in changed:
+            snapshot.add({column: row.get(column) for column in columns})
+        for task_id in deleted:
+            snapshot.remove(task_id)
+        snapshot.refreshed_at = self._clock()
+
+    def _current(self) -> _Snapshot:
+        now = self._clock()
+        if self._snapshot is None or now - self._snapshot.loaded_at >= self.ttl:
+            self._snapshot = self._load()
+        elif now - self._snapshot.refreshed_at >= self.refresh_interval:
+            self._catch_up(self._snapshot)
+        return self._snapshot
+
+    def apply(self, change: TableChange) -> None:
+        """
+        Update the index from a write to the tasks table
+
+        Args:
+            change: The write; rows must carry every indexed column, otherwise
+                the index is dropped and rebuilt on the next search
+        """
+        columns = projection_columns(TASKS_TABLE_NAME, TASK_SEARCH)
+        with self._lock:
+            if self._snapshot is None:
+                return
+            if change.rows is None or not all(all(column in row for column in columns) for row in change.rows):
+                self._snapshot = None
+                return
+            for row in change.rows:
+                if change.deleted:
+                    self._snapshot.remove(row[TASK_ID_FIELD])
+                else:
+                    self._snapshot.add(row)
+
+    def search(self, query: str) -> List[Tuple[str, float]]:
+        """
+        Rank the non-archived tasks matching every term of query
+
+        Args:
+            query: Free text; each word is matched as a token prefix
+
+        Returns:
+            (task id, score) pairs, best first; ties are ordered by task id
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            snapshot = self._current()
+            document_count = max(len(snapshot.tokens_of), 1)
+            scores: Optional[Dict[str, float]] = None
+            for term in terms:
+                term_scores: Dict[str, float] = {}
+                for token in snapshot.expand(term):
+                    postings = snapshot.postings[token]
+                    boost = math.log(1 + document_count / len(postings)) * (1.0 if token == term else PREFIX_MATCH_WEIGHT)
+                    for task_id, weight in postings.items():
+                        if scores is not None and task_id not in scores:
+                            continue
+                        score = weight * boost
+                        if score > term_scores.get(task_id, 0.0):
+                            term_scores[task_id] = score
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {task_id: scores[task_id] + score for task_id, score in term_scores.items()}
+                if not scores:
+                    return []
+            ranked = [(task_id, score) for task_id, score in scores.items() if task_id not in snapshot.archived]
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked
+
+
+_shared_index: Optional[TaskSearchIndex] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_task_search_index() -> TaskSearchIndex:
+    """
+    Process-wide TaskSearchIndex, kept current by writes to the tasks table
+
+    Returns:
+        The shared index
+    """
+    global _shared_index
+    if _shared_index is None:
+        with _shared_index_lock:
+            if _shared_index is None:
+                _shared_index = TaskSearchIndex(
+                    ttl=float(os.getenv("TASK_SEARCH_INDEX_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+                    refresh_interval=float(os.getenv("TASK_SEARCH_INDEX_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS))
+                )
+    return _shared_index
+
+
+def _apply_to_shared_index(change: TableChange) -> None:
+    if _shared_index is not None:
+        _shared_index.apply(change)
+
+
+on_change(TASKS_TABLE_NAME, _apply_to_shared_index)
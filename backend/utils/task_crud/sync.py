@@ -0,0 +1,77 @@
+"""
+Watermarks for delta sync of task lists.
+
+``GET /api/tasks/sync`` hands out an opaque watermark with every response and
+returns, for the next request, only what changed after it. A watermark holds:
+
+- the (updated_at, id) key of the last change the client has seen; changes
+  are read in that order, so equal timestamps are resumed by id
+- a scope fingerprint of the user's role and departments, and for directors
+  of the users in those departments; when any of them change the visible set
+  may change without any task row changing, so the client is told to reset
+  and receives a full snapshot instead of a delta
+"""
+import base64
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Iterable, NamedTuple, Tuple
+
+
+class Watermark(NamedTuple):
+    """Decoded watermark"""
+    updated_at: str
+    task_id: str
+    scope: str
+
+
+def sync_scope(user_role: str, user_departments: Iterable[str], member_ids: Iterable[str] = ()) -> str:
+    """
+    Fingerprint of the inputs to access control other than task rows
+
+    Args:
+        user_role: User's organizational role
+        user_departments: Departments the user belongs to
+        member_ids: Users whose tasks the role sees by ownership (a director's
+            department members); a user joining or leaving them changes the scope
+
+    Returns:
+        Short hex digest; equal for equal role, department and member sets
+    """
+    material = json.dumps([user_role.lower(), sorted(user_departments or []), sorted(member_ids or [])])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_watermark(updated_at: str, task_id: str, scope: str) -> str:
+    """Opaque URL-safe watermark string"""
+    payload = json.dumps([updated_at, task_id, scope], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_watermark(watermark: str) -> Watermark:
+    """
+    Read a watermark produced by encode_watermark
+
+    Raises:
+        ValueError: If the watermark is malformed
+    """
+    try:
+        padded = watermark + "=" * (-len(watermark) % 4)
+        updated_at, task_id, scope = json.loads(base64.urlsafe_b64decode(padded))
+        parse_timestamp(updated_at)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid watermark") from e
+    if not isinstance(task_id, str) or not isinstance(scope, str):
+        raise ValueError("Invalid watermark")
+    return Watermark(updated_at, task_id, scope)
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an updated_at / deleted_at value as an aware datetime (UTC when naive)"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def sync_key(updated_at: str, task_id: str) -> Tuple[datetime, str]:
+    """Comparable (updated_at, id) key"""
+    return parse_timestamp(updated_at), task_id
@@ -1,7 +1,11 @@
+import json
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from backend.utils.notif_util.notification_service import NotificationService
-from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.crud_backend import create_crud
+from backend.wrappers.supabase_wrapper.identity_map import IdentityMap
+from backend.wrappers.supabase_wrapper.supabase_crud import BulkWriteError
+from backend.wrappers.supabase_wrapper.filters import Filter, eq, IS
 from backend.schemas.task import TaskUpdate, SubtaskCreate, MAIN_TASK_PARENT_ID
 from backend.utils.task_crud.create import TaskCreator
 from backend.utils.task_crud.constants import (
@@ -31,7 +35,7 @@ class TaskUpdater:
     """Task update utilities"""
 
     def __init__(self):
-        self.crud = SupabaseCRUD()
+        self.crud = create_crud()
         self.table_name = TASKS_TABLE_NAME
 
     def can_remove_assignees(self, user_role: str) -> bool:
@@ -45,14 +49,13 @@ class TaskUpdater:
         if not is_archived:
             return True
 
-        subtasks = self.crud.select(self.table_name, filters={PARENT_ID_FIELD: main_task_id})
-        if not subtasks:
-            return True
-
-        for subtask in subtasks:
-            if not subtask.get(IS_ARCHIVED_FIELD, False):
-                return False
-        return True
+        # One row is enough to know that an unarchived subtask blocks archival.
+        # "is not true" also matches subtasks whose is_archived is NULL.
+        return not self.crud.exists(
+            self.table_name,
+            [eq(PARENT_ID_FIELD, main_task_id), Filter(IS_ARCHIVED_FIELD, IS, True, negate=True)],
+            column=TASK_ID_FIELD,
+        )
 
     def update_tasks(
         self,
@@ -62,21 +65,32 @@ class TaskUpdater:
         main_task: Optional[TaskUpdate] = None,
         subtasks: Optional[Dict[str, TaskUpdate]] = None,
         new_subtasks: Optional[List[SubtaskCreate]] = None,
+        previous_main_task: Optional[Dict[str, Any]] = None,
+        previous_subtasks: Optional[Dict[str, dict]] = None,
     ) -> Dict[str, Any]:
+        """
+        Update a main task and its subtasks
+
+        previous_main_task / previous_subtasks are the rows as they were before
+        the update. Callers that already read them (the async router fetches
+        them concurrently) pass them in; otherwise they are read here.
+
+        All reads and writes go through one IdentityMap, so each task row is
+        fetched at most once per call and later checks see this call's writes.
+        """
         result = {
             MAIN_TASK_RESPONSE_KEY: None,
             UPDATED_SUBTASKS_RESPONSE_KEY: []
         }
-        previous_main_task_data = self.crud.select(self.table_name, filters={TASK_ID_FIELD: main_task_id})
-        previous_main_task = previous_main_task_data[0] if previous_main_task_data else {}
+        rows = IdentityMap(self.crud, id_column=TASK_ID_FIELD)
+        if previous_main_task:
+            rows.add(self.table_name, [previous_main_task])
+        if previous_subtasks:
+            rows.add(self.table_name, previous_subtasks.values())
 
-        previous_subtasks: Dict[str, dict] = {}
-        if subtasks:
-            # fetch the previous row for each subtask we plan to update
-            for subtask_id in subtasks.keys():
-                prev = self.crud.select(self.table_name, filters={TASK_ID_FIELD: subtask_id})
-                if prev:
-                    previous_subtasks[subtask_id] = prev[0]
+        previous_main_task = rows.get(self.table_name, main_task_id) or {}
+        # fetch the previous row of every subtask we plan to update in one query
+        previous_subtasks = rows.get_many(self.table_name, subtasks.keys()) if subtasks else {}
 
         # --- MAIN TASK UPDATE ---
         if main_task:
@@ -93,9 +107,9 @@ class TaskUpdater:
             if main_task.priority:
                 main_task_dict[PRIORITY_FIELD] = main_task.priority
             if main_task.assignee_ids is not None:
-                current_task = self.crud.select(self.table_name, filters={TASK_ID_FIELD: main_task_id})
+                current_task = rows.get(self.table_name, main_task_id)
                 if current_task:
-                    current_assignees = set(current_task[0].get(ASSIGNEE_IDS_FIELD, []))
+                    current_assignees = set(current_task.get(ASSIGNEE_IDS_FIELD, []))
                     new_assignees = set(main_task.assignee_ids)
                     is_removal = new_assignees.issubset(current_assignees) and len(new_assignees) < len(current_assignees)
 
@@ -125,7 +139,7 @@ class TaskUpdater:
 
             if main_task_dict:
                 main_task_dict_with_parent = {**main_task_dict, PARENT_ID_FIELD: MAIN_TASK_PARENT_ID}
-                results = self.crud.update(
+                results = rows.update(
                     self.table_name,
                     main_task_dict_with_parent,
                     {TASK_ID_FIELD: main_task_id}
@@ -142,7 +156,7 @@ class TaskUpdater:
             ):
                 creator = TaskCreator()
                 try:
-                    self.crud.delete(
+                    rows.delete(
                         self.table_name,
                         filters={
                             PARENT_ID_FIELD: main_task_id,
@@ -151,9 +165,8 @@ class TaskUpdater:
                 except Exception as e:
                     print(f"[TaskUpdater] Warning: Failed to delete old recurrence instances: {e}")
 
-                current_task_data = self.crud.select(self.table_name, filters={TASK_ID_FIELD: main_task_id})
-                if current_task_data:
-                    current_task = current_task_data[0]
+                current_task = rows.get(self.table_name, main_task_id)
+                if current_task:
                     try:
                         recurrence_dates = creator._generate_recurrence_dates(
                             start_date=datetime.fromisoformat(current_task["due_date"]),
@@ -164,6 +177,7 @@ class TaskUpdater:
                             else None
                         )
 
+                        instances = []
                         for due_date in recurrence_dates[1:]:
                             instance_dict = {
                                 TITLE_FIELD: current_task[TITLE_FIELD],
@@ -183,7 +197,10 @@ class TaskUpdater:
                             if current_task.get("project_id"):
                                 instance_dict["project_id"] = current_task["project_id"]
 
-                            self.crud.insert(self.table_name, instance_dict)
+                            instances.append(instance_dict)
+
+                        if instances:
+                            self.crud.insert_many(self.table_name, instances)
 
                         print(f"[TaskUpdater] Regenerated {len(recurrence_dates) - 1} recurrence instances for task {main_task_id}")
                     except Exception as e:
@@ -191,6 +208,7 @@ class TaskUpdater:
 
         # --- ✅ SUBTASKS UPDATE ---
         if subtasks:
+            subtask_patches: Dict[str, tuple] = {}
             for subtask_id, subtask_data in subtasks.items():
                 subtask_dict = {}
 
@@ -206,9 +224,9 @@ class TaskUpdater:
                     subtask_dict[PRIORITY_FIELD] = subtask_data.priority
 
                 if subtask_data.assignee_ids is not None:
-                    current_subtask = self.crud.select(self.table_name, filters={TASK_ID_FIELD: subtask_id})
+                    current_subtask = rows.get(self.table_name, subtask_id)
                     if current_subtask:
-                        current_assignees = set(current_subtask[0].get(ASSIGNEE_IDS_FIELD, []))
+                        current_assignees = set(current_subtask.get(ASSIGNEE_IDS_FIELD, []))
                         new_assignees = set(subtask_data.assignee_ids)
                         is_removal = new_assignees.issubset(current_assignees) and len(new_assignees) < len(current_assignees)
 
@@ -239,13 +257,31 @@ class TaskUpdater:
                 if not subtask_dict:
                     continue
 
-                results = self.crud.update(
+                # Subtasks receiving an identical change share one update request
+                patch_key = json.dumps(subtask_dict, sort_keys=True, default=str)
+                subtask_patches.setdefault(patch_key, (subtask_dict, []))[1].append(subtask_id)
+
+            for subtask_dict, subtask_ids in subtask_patches.values():
+                if len(subtask_ids) == 1:
+                    results = rows.update(
+                        self.table_name,
+                        subtask_dict,
+                        {TASK_ID_FIELD: subtask_ids[0], PARENT_ID_FIELD: main_task_id}
+                    )
+                    if results:
+                        result[UPDATED_SUBTASKS_RESPONSE_KEY].append(results[0] if isinstance(results, list) else results)
+                    continue
+
+                bulk_result = rows.update_many(
                     self.table_name,
                     subtask_dict,
-                    {TASK_ID_FIELD: subtask_id, PARENT_ID_FIELD: main_task_id}
+                    subtask_ids,
+                    filters={PARENT_ID_FIELD: main_task_id}
                 )
-                if results:
-                    result[UPDATED_SUBTASKS_RESPONSE_KEY].append(results[0] if isinstance(results, list) else results)
+                # A failed chunk fails the request, as a failed single update does
+                if bulk_result.errors:
+                    raise BulkWriteError(bulk_result)
+                result[UPDATED_SUBTASKS_RESPONSE_KEY].extend(bulk_result.rows)
 
         if new_subtasks:
             for new_subtask in new_subtasks:
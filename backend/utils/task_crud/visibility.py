@@ -0,0 +1,376 @@
+"""
+Materialized task visibility index.
+
+Answering "which tasks may this user read" from the tasks table means a
+contains(assignee_ids) scan plus a parent lookup for staff and a scan of every
+task for directors. The index keeps the few columns that decide visibility
+(id, parent_id, owner_user_id, assignee_ids, is_archived) for every task, plus
+its due date, with lookups precomputed:
+
+- assignee id -> task ids
+- owner id -> task ids
+- task id -> parent id and archive flag
+- (due day, task id) pairs kept sorted, so due date ranges are bisected
+
+so the set of task ids a user may read is a handful of set operations, and
+reading tasks becomes an id IN (...) fetch of exactly those rows.
+
+The index is built from one paged scan on first use and kept current from the
+rows every CRUD write to the tasks table returns (table_events.on_change);
+a write whose rows are unknown (it raised, or a bulk write had failed chunks)
+drops the index so the next lookup rebuilds it. Department membership comes
+from the UserDirectory, which refreshes itself on user writes. Writes from
+other processes are caught up with at most every
+``TASK_VISIBILITY_INDEX_REFRESH_SECONDS`` (default 5) by reading only the
+tasks changed since (see catch_up), and the index is rebuilt after
+``TASK_VISIBILITY_INDEX_TTL_SECONDS`` (default 300). Rebuilds and catch-up
+reads run outside the index lock, so lookups and writes are not held up by
+the scan; the new snapshot is swapped in when it is complete.
+
+TaskReader uses the index when ``TASK_VISIBILITY_INDEX`` is enabled.
+"""
+import bisect
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from backend.utils.task_crud.catch_up import TaskMarks, current_marks, read_changes_since
+from backend.utils.task_crud.constants import (
+    ADMIN_ROLE,
+    ASSIGNEE_IDS_FIELD,
+    DUE_DATE_FIELD,
+    IS_ARCHIVED_FIELD,
+    OWNER_USER_ID_FIELD,
+    PARENT_ID_FIELD,
+    TASK_ID_FIELD,
+    TASKS_TABLE_NAME,
+)
+from backend.utils.user_crud.user_directory import get_user_directory
+from backend.wrappers.crud_backend import create_crud
+from backend.wrappers.supabase_wrapper.projections import projection, projection_columns, TASK_VISIBILITY
+from backend.wrappers.table_events import TableChange, on_change
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_REFRESH_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class _Entry:
+    parent_id: Optional[str]
+    owner_id: Optional[str]
+    assignee_ids: FrozenSet[str]
+    archived: bool
+    # ISO day (YYYY-MM-DD) the task is due, None without a due date
+    due_day: Optional[str] = None
+
+
+@dataclass
+class _Snapshot:
+    entries: Dict[str, _Entry] = field(default_factory=dict)
+    by_assignee: Dict[str, Set[str]] = field(default_factory=dict)
+    by_owner: Dict[str, Set[str]] = field(default_factory=dict)
+    by_due_day: List[Tuple[str, str]] = field(default_factory=list)
+    marks: TaskMarks = TaskMarks()
+    loaded_at: float = 0.0
+    refreshed_at: float = 0.0
+
+    def add(self, task_id: str, entry: _Entry, keep_sorted: bool = True) -> None:
+        self.remove(task_id)
+        self.entries[task_id] = entry
+        for assignee_id in entry.assignee_ids:
+            self.by_assignee.setdefault(assignee_id, set()).add(task_id)
+        if entry.owner_id is not None:
+            self.by_owner.setdefault(entry.owner_id, set()).add(task_id)
+        if entry.due_day is None:
+            return
+        if keep_sorted:
+            bisect.insort(self.by_due_day, (entry.due_day, task_id))
+        else:
+            self.by_due_day.append((entry.due_day, task_id))
+
+    def remove(self, task_id: str) -> None:
+        entry = self.entries.pop(task_id, None)
+        if entry is None:
+            return
+        for assignee_id in entry.assignee_ids:
+            _discard(self.by_assignee, assignee_id, task_id)
+        if entry.owner_id is not None:
+            _discard(self.by_owner, entry.owner_id, task_id)
+        if entry.due_day is not None:
+            position = bisect.bisect_left(self.by_due_day, (entry.due_day, task_id))
+            if position < len(self.by_due_day) and self.by_due_day[position] == (entry.due_day, task_id):
+                del self.by_due_day[position]
+
+    def due_between(self, start: Optional[str], end: Optional[str]) -> List[str]:
+        """IDs of tasks due from day start to day end inclusive, in due date order"""
+        low = bisect.bisect_left(self.by_due_day, (start,)) if start is not None else 0
+        # (end, chr(0x10FFFF)) sorts after every (end, task_id)
+        high = bisect.bisect_right(self.by_due_day, (end, chr(0x10FFFF))) if end is not None else len(self.by_due_day)
+        return [task_id for _, task_id in self.by_due_day[low:high]]
+
+
+def _discard(index: Dict[str, Set[str]], key: str, task_id: str) -> None:
+    task_ids = index.get(key)
+    if task_ids is not None:
+        task_ids.discard(task_id)
+        if not task_ids:
+            del index[key]
+
+
+def _entry(task: Dict[str, Any]) -> _Entry:
+    assignee_ids = task.get(ASSIGNEE_IDS_FIELD) or []
+    due_date = task.get(DUE_DATE_FIELD)
+    return _Entry(
+        parent_id=task.get(PARENT_ID_FIELD),
+        owner_id=task.get(OWNER_USER_ID_FIELD),
+        assignee_ids=frozenset(assignee_ids) if isinstance(assignee_ids, list) else frozenset(),
+        archived=task.get(IS_ARCHIVED_FIELD) is True,
+        # Dates and timestamps both start with the ISO day
+        due_day=str(due_date)[:10] if due_date else None,
+    )
+
+
+class TaskVisibilityIndex:
+    """
+    Per-user visibility of tasks, kept in memory
+
+    Args:
+        crud: CRUD backend used to load tasks; created on first load when omitted
+        user_directory: Directory used to resolve department members
+        ttl: Seconds a snapshot stays fresh (0 rebuilds on every lookup)
+        refresh_interval: Seconds between catch-up reads of tasks written by
+            other processes (0 catches up on every lookup)
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        crud=None,
+        user_directory=None,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        refresh_interval: float = DEFAULT_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._crud = crud
+        self._user_directory = user_directory
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        # Guards the snapshot; never held during a database read
+        self._lock = threading.Lock()
+        # Lets one thread at a time build a snapshot
+        self._load_lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        # Writes applied so far; tells a build whether one landed during its scan
+        self._writes = 0
+        self.loads = 0
+
+    @property
+    def crud(self):
+        if self._crud is None:
+            self._crud = create_crud()
+        return self._crud
+
+    @property
+    def user_directory(self):
+        return self._user_directory if self._user_directory is not None else get_user_directory()
+
+    def invalidate(self) -> None:
+        """Drop the index so the next lookup rebuilds it"""
+        with self._lock:
+            self._snapshot = None
+
+    def rebuild(self) -> None:
+        """Reload the index from the tasks table now"""
+        with self._load_lock:
+            snapshot, stale = self._build()
+        if stale:
+            self._catch_up(snapshot)
+
+    def _load(self) -> _Snapshot:
+        # Taken first, so writes landing during the scan are caught up with later
+        snapshot = _Snapshot(marks=current_marks(self.crud))
+        columns = projection(TASKS_TABLE_NAME, TASK_VISIBILITY)
+        for task in self.crud.select_iter(TASKS_TABLE_NAME, columns=columns):
+            if task.get(TASK_ID_FIELD) is not None:
+                snapshot.add(task[TASK_ID_FIELD], _entry(task), keep_sorted=False)
+        # Sorted once instead of an insort per row
+        snapshot.by_due_day.sort()
+        snapshot.loaded_at = snapshot.refreshed_at = self._clock()
+        return snapshot
+
+    def _build(self) -> Tuple[_Snapshot, bool]:
+        """
+        Load a snapshot outside the lock and swap it in (call with _load_lock held)
+
+        Returns:
+            The new snapshot, and whether a local write landed during the scan
+            (it went to the previous snapshot, so the new one must catch up)
+        """
+        with self._lock:
+            writes = self._writes
+        snapshot = self._load()
+        with self._lock:
+            self._snapshot = snapshot
+            self.loads += 1
+            return snapshot, self._writes != writes
+
+    def _catch_up(self, snapshot: _Snapshot) -> None:
+        changed, deleted, marks = read_changes_since(self.crud, projection(TASKS_TABLE_NAME, TASK_VISIBILITY), snapshot.marks)
+        with self._lock:
+            for row in changed:
+                snapshot.add(row[TASK_ID_FIELD], _entry(row))
+            for task_id in deleted:
+                snapshot.remove(task_id)
+            snapshot.marks = marks
+
+    def _fresh(self) -> Tuple[Optional[_Snapshot], bool]:
+        """The snapshot if it is within its TTL, and whether this caller should catch it up"""
+        with self._lock:
+            snapshot = self._snapshot
+            now = self._clock()
+            if snapshot is None or now - snapshot.loaded_at >= self.ttl:
+                return None, False
+            due = now - snapshot.refreshed_at >= self.refresh_interval
+            if due:
+                # Claimed here so concurrent lookups do not repeat the read
+                snapshot.refreshed_at = now
+            return snapshot, due
+
+    def _current(self) -> _Snapshot:
+        snapshot, due = self._fresh()
+        if snapshot is None:
+            with self._load_lock:
+                # Another thread may have finished a build while this one waited
+                snapshot, due = self._fresh()
+                if snapshot is None:
+                    snapshot, due = self._build()
+        if due:
+            self._catch_up(snapshot)
+        return snapshot
+
+    def apply(self, change: TableChange) -> None:
+        """
+        Update the index from a write to the tasks table
+
+        Args:
+            change: The write; rows must carry every indexed column, otherwise
+                the index is dropped and rebuilt on the next lookup
+        """
+        columns = projection_columns(TASKS_TABLE_NAME, TASK_VISIBILITY)
+        with self._lock:
+            self._writes += 1
+            if self._snapshot is None:
+                return
+            if change.rows is None or not all(all(column in row for column in columns) for row in change.rows):
+                self._snapshot = None
+                return
+            for row in change.rows:
+                if change.deleted:
+                    self._snapshot.remove(row[TASK_ID_FIELD])
+                else:
+                    self._snapshot.add(row[TASK_ID_FIELD], _entry(row))
+
+    def visible_task_ids(
+        self,
+        user_id: str,
+        user_role: str,
+        user_departments: List[str],
+        include_archived: bool = False
+    ) -> Set[str]:
+        """
+        IDs of the tasks TaskReader.get_tasks_for_user would return
+
+        Args:
+            user_id: ID of the requesting user
+            user_role: User's organizational role
+            user_departments: Departments the user belongs to
+            include_archived: Whether archived tasks count as visible
+
+        Returns:
+            Set of task IDs
+        """
+        role = (user_role or "").lower()
+        if role == "director":
+            owner_ids = self.user_directory.user_ids_in_departments(user_departments) if user_departments else set()
+        snapshot = self._current()
+        with self._lock:
+            def keep(task_ids: Iterable[str]) -> Set[str]:
+                return {
+                    task_id for task_id in task_ids
+                    if task_id in snapshot.entries and (include_archived or not snapshot.entries[task_id].archived)
+                }
+
+            if role in [ADMIN_ROLE, "managing_director"]:
+                return keep(snapshot.entries)
+            if role == "director":
+                return keep(task_id for owner_id in owner_ids for task_id in snapshot.by_owner.get(owner_id, ()))
+            # Staff and managers: assigned tasks plus the main tasks of assigned subtasks
+            assigned = keep(snapshot.by_assignee.get(user_id, ()))
+            return assigned | keep(
+                snapshot.entries[task_id].parent_id for task_id in assigned
+                if snapshot.entries[task_id].parent_id is not None
+            )
+
+    def task_ids_due_between(self, start: Optional[date] = None, end: Optional[date] = None) -> List[str]:
+        """
+        IDs of tasks due in a range of days, found by bisection
+
+        Args:
+            start: First day of the range (None for no lower bound)
+            end: Last day of the range, inclusive (None for no upper bound)
+
+        Returns:
+            Task IDs ordered by due date, then ID; archived tasks and tasks
+            without a due date are not included
+        """
+        snapshot = self._current()
+        with self._lock:
+            task_ids = snapshot.due_between(
+                start.isoformat() if start is not None else None,
+                end.isoformat() if end is not None else None
+            )
+            return [task_id for task_id in task_ids if not snapshot.entries[task_id].archived]
+
+    def can_read(self, task_id: str, user_id: str, user_role: str, user_departments: List[str]) -> bool:
+        """Whether task_id is among the user's visible (non-archived) tasks"""
+        return task_id in self.visible_task_ids(user_id, user_role, user_departments)
+
+
+def visibility_index_enabled() -> bool:
+    return os.getenv("TASK_VISIBILITY_INDEX", "false").lower() in ("1", "true", "yes")
+
+
+_shared_index: Optional[TaskVisibilityIndex] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_task_visibility_index() -> Optional[TaskVisibilityIndex]:
+    """
+    Process-wide TaskVisibilityIndex, kept current by writes to the tasks table
+
+    Returns:
+        The shared index, or None when TASK_VISIBILITY_INDEX is off
+    """
+    global _shared_index
+    if not visibility_index_enabled():
+        return None
+    if _shared_index is None:
+        with _shared_index_lock:
+            if _shared_index is None:
+                _shared_index = TaskVisibilityIndex(
+                    ttl=float(os.getenv("TASK_VISIBILITY_INDEX_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+                    refresh_interval=float(os.getenv("TASK_VISIBILITY_INDEX_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS))
+                )
+    return _shared_index
+
+
+def _apply_to_shared_index(change: TableChange) -> None:
+    if _shared_index is not None:
+        _shared_index.apply(change)
+
+
+on_change(TASKS_TABLE_NAME, _apply_to_shared_index)
@@ -0,0 +1,196 @@
+"""
+In-process directory of users with department and team indexes.
+
+Access control and the reports repeatedly need "which users are in these
+departments" and "what is this user's email". Instead of downloading the
+users table for every such question, the directory keeps one snapshot of it
+together with precomputed indexes:
+
+- user id -> user row
+- department name -> user ids
+- team name -> user ids
+
+Department and team names are matched exactly: access control (TaskReader,
+RBACHelper, the visibility index) must not let a director of "Sales" see the
+users of "sales " or "SALES". Lookups made for display, such as the reports,
+pass fold_case=True to match ignoring case and surrounding whitespace. The snapshot is reloaded when it is older than the TTL
+(``USER_DIRECTORY_TTL_SECONDS``, default 300) and right after any write to the
+users table made through a CRUD backend in this process.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from backend.wrappers.crud_backend import create_crud
+from backend.wrappers.supabase_wrapper.projections import projection, USER_DIRECTORY
+from backend.wrappers.table_events import on_write
+
+USERS_TABLE_NAME = "users"
+USER_ID_COLUMN = "uuid"
+DEFAULT_TTL_SECONDS = 300.0
+
+
+def normalize_name(name: str) -> str:
+    """Normalized form of a department or team name for case-insensitive lookups"""
+    return (name or "").strip().casefold()
+
+
+@dataclass
+class _Snapshot:
+    users: List[Dict[str, Any]] = field(default_factory=list)
+    by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    by_department: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    by_team: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+
+def _index(users: List[Dict[str, Any]], column: str) -> Dict[str, FrozenSet[str]]:
+    index: Dict[str, Set[str]] = {}
+    for user in users:
+        names = user.get(column) or []
+        if not isinstance(names, list):
+            continue
+        for name in names:
+            index.setdefault(name, set()).add(user[USER_ID_COLUMN])
+    return {name: frozenset(user_ids) for name, user_ids in index.items()}
+
+
+class UserDirectory:
+    """
+    Snapshot of the users table with department and team indexes
+
+    Args:
+        crud: CRUD backend used to load users; created on first load when omitted
+        ttl: Seconds a snapshot stays fresh (0 reloads on every access)
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(self, crud=None, ttl: float = DEFAULT_TTL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self._crud = crud
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self.loads = 0
+
+    @property
+    def crud(self):
+        if self._crud is None:
+            self._crud = create_crud()
+        return self._crud
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next lookup reloads it"""
+        with self._lock:
+            self._snapshot = None
+
+    def _current(self) -> _Snapshot:
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and self._clock() - snapshot.loaded_at < self.ttl:
+                return snapshot
+            users = self.crud.select(USERS_TABLE_NAME, columns=projection(USERS_TABLE_NAME, USER_DIRECTORY)) or []
+            users = [user for user in users if user.get(USER_ID_COLUMN) is not None]
+            snapshot = _Snapshot(
+                users=users,
+                by_id={user[USER_ID_COLUMN]: user for user in users},
+                by_department=_index(users, "departments"),
+                by_team=_index(users, "teams"),
+                loaded_at=self._clock(),
+            )
+            self._snapshot = snapshot
+            self.loads += 1
+            return snapshot
+
+    def all_users(self) -> List[Dict[str, Any]]:
+        """
+        Every user row (uuid, email, role, departments, teams)
+
+        Returns:
+            Copies of the user rows, in table order
+        """
+        return [dict(user) for user in self._current().users]
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up one user by ID
+
+        Returns:
+            A copy of the user row, or None if unknown
+        """
+        user = self._current().by_id.get(user_id)
+        return dict(user) if user is not None else None
+
+    def emails(self) -> Dict[str, str]:
+        """Map of user ID to email"""
+        return {user_id: user.get("email", "Unknown") for user_id, user in self._current().by_id.items()}
+
+    def user_ids_in_departments(self, departments: Iterable[str], fold_case: bool = False) -> Set[str]:
+        """
+        IDs of users belonging to any of the departments
+
+        Args:
+            departments: Department names (matched exactly)
+            fold_case: Match ignoring case and surrounding whitespace instead;
+                for display only, never for access control
+
+        Returns:
+            Set of user IDs
+        """
+        return _lookup(self._current().by_department, departments, fold_case)
+
+    def user_ids_in_teams(self, teams: Iterable[str], fold_case: bool = False) -> Set[str]:
+        """IDs of users belonging to any of the teams (see user_ids_in_departments)"""
+        return _lookup(self._current().by_team, teams, fold_case)
+
+    def users_in_department(self, department: str, fold_case: bool = False) -> List[Dict[str, Any]]:
+        """User rows of one department, in table order (see user_ids_in_departments)"""
+        snapshot = self._current()
+        user_ids = _lookup(snapshot.by_department, [department], fold_case)
+        return [dict(user) for user in snapshot.users if user[USER_ID_COLUMN] in user_ids]
+
+    def users_in_team(self, team: str, fold_case: bool = False) -> List[Dict[str, Any]]:
+        """User rows of one team, in table order (see user_ids_in_departments)"""
+        snapshot = self._current()
+        user_ids = _lookup(snapshot.by_team, [team], fold_case)
+        return [dict(user) for user in snapshot.users if user[USER_ID_COLUMN] in user_ids]
+
+
+def _lookup(index: Dict[str, FrozenSet[str]], names: Iterable[str], fold_case: bool = False) -> Set[str]:
+    names = list(names or [])
+    if fold_case:
+        wanted = {normalize_name(name) for name in names}
+        names = [name for name in index if normalize_name(name) in wanted]
+    user_ids: Set[str] = set()
+    for name in names:
+        user_ids |= index.get(name, frozenset())
+    return user_ids
+
+
+_shared_directory: Optional[UserDirectory] = None
+_shared_directory_lock = threading.Lock()
+
+
+def get_user_directory() -> UserDirectory:
+    """
+    Process-wide UserDirectory, refreshed on writes to the users table
+
+    Returns:
+        The shared UserDirectory
+    """
+    global _shared_directory
+    if _shared_directory is None:
+        with _shared_directory_lock:
+            if _shared_directory is None:
+                _shared_directory = UserDirectory(ttl=float(os.getenv("USER_DIRECTORY_TTL_SECONDS", DEFAULT_TTL_SECONDS)))
+    return _shared_directory
+
+
+def _invalidate_shared_directory(table: str) -> None:
+    if _shared_directory is not None:
+        _shared_directory.invalidate()
+
+
+on_write(USERS_TABLE_NAME, _invalidate_shared_directory)
@@ -1,5 +1,7 @@
 from typing import List, Dict, Any, Optional
-from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+from backend.wrappers.crud_backend import create_crud
+from backend.wrappers.supabase_wrapper.projections import projection, USER_DIRECTORY
+from backend.utils.user_crud.user_directory import get_user_directory
 
 
 class UserManager:
@@ -8,7 +10,8 @@ class UserManager:
     """
 
     def __init__(self):
-        self.crud = SupabaseCRUD()
+        self.crud = create_crud()
+        self.directory = get_user_directory()
         self.table_name = "users"
 
     def get_all_users(self) -> List[Dict[str, Any]]:
@@ -18,7 +21,7 @@ class UserManager:
         Returns:
             List of user dictionaries
         """
-        users = self.crud.select(self.table_name, columns="uuid, email, role, departments")
+        users = self.directory.all_users()
 
         return [
             {
@@ -41,15 +44,7 @@ class UserManager:
         Returns:
             List of user dictionaries from the specified department
         """
-        # Get all users and filter by department (works with test table patches)
-        all_users = self.crud.select(self.table_name, columns="uuid, email, role, departments")
-
-        # Filter users that have the department in their departments array
-        department_users = []
-        for user in all_users:
-            user_departments = user.get("departments", [])
-            if isinstance(user_departments, list) and department in user_departments:
-                department_users.append(user)
+        department_users = self.directory.users_in_department(department)
 
         return [
             {
@@ -72,15 +67,7 @@ class UserManager:
         Returns:
             List of user dictionaries from the specified team
         """
-        # Get all users and filter by team (works with test table patches)
-        all_users = self.crud.select(self.table_name, columns="uuid, email, role, departments, teams")
-
-        # Filter users that have the team in their teams array
-        team_users = []
-        for user in all_users:
-            user_teams = user.get("teams", [])
-            if isinstance(user_teams, list) and team in user_teams:
-                team_users.append(user)
+        team_users = self.directory.users_in_team(team)
 
         return [
             {
@@ -106,7 +93,7 @@ class UserManager:
         """
         users = self.crud.select(
             self.table_name,
-            columns="uuid, email, role, departments",
+            columns=projection(self.table_name, USER_DIRECTORY),
             filters={"uuid": user_id}
         )
 
@@ -0,0 +1,73 @@
+from typing import Optional
+
+from backend.wrappers.supabase_wrapper.async_supabase_client import AsyncSupabaseClient
+from backend.wrappers.supabase_wrapper.instrumentation import instrumented_async
+from backend.wrappers.storage import (
+    resolve_bucket_name,
+    build_storage_path,
+    raise_for_upload_error,
+    extract_public_url,
+    extract_storage_path,
+)
+
+
+class AsyncSupabaseStorage:
+
+    def __init__(self, bucket_name: Optional[str] = None, client=None) -> None:
+        self._client = client
+        self.bucket_name = resolve_bucket_name(bucket_name)
+
+    async def _bucket(self):
+        if self._client is None:
+            self._client = await AsyncSupabaseClient.get_client()
+        return self._client.storage.from_(self.bucket_name)
+
+    async def upload_file(
+        self,
+        *,
+        file_name: str,
+        file_bytes: bytes,
+        content_type: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> str:
+        if not file_bytes:
+            raise ValueError("Cannot upload an empty file.")
+
+        storage_path = build_storage_path(file_name, user_id)
+
+        storage_bucket = await self._bucket()
+        options = {"content-type": content_type or "application/octet-stream", "upsert": False}
+        response = await instrumented_async(
+            self.bucket_name, "upload", f"upload {self.bucket_name} {storage_path}",
+            lambda: storage_bucket.upload(storage_path, file_bytes, options),
+        )
+        raise_for_upload_error(response)
+
+        public_response = await storage_bucket.get_public_url(storage_path)
+        return extract_public_url(public_response)
+
+    async def delete_file(self, file_url: str) -> bool:
+        if not file_url:
+            return False
+
+        try:
+            storage_path = self._extract_storage_path_from_url(file_url)
+            if not storage_path:
+                return False
+
+            storage_bucket = await self._bucket()
+            response = await instrumented_async(
+                self.bucket_name, "remove", f"remove {self.bucket_name} {storage_path}",
+                lambda: storage_bucket.remove([storage_path]),
+            )
+
+            error = getattr(response, "error", None)
+            if error:
+                return False
+
+            return True
+        except Exception:
+            return False
+
+    def _extract_storage_path_from_url(self, file_url: str) -> Optional[str]:
+        return extract_storage_path(file_url, self.bucket_name)
@@ -0,0 +1,163 @@
+"""
+Storage backend interface for the CRUD layer.
+
+SupabaseCRUD talks to PostgREST over the network; SQLiteCRUD stores the same
+tables in a local SQLite file. Both implement CRUDBackend, so the task, user,
+notification and report utilities work against either one. create_crud()
+picks the backend from the environment:
+
+    CRUD_BACKEND=supabase   (default) SupabaseCRUD
+    CRUD_BACKEND=sqlite     SQLiteCRUD on SQLITE_DATABASE_PATH (default "spm.sqlite3";
+                            ":memory:" keeps everything in memory)
+"""
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from backend.wrappers.supabase_wrapper.filters import FilterSpec
+
+SUPABASE_BACKEND = "supabase"
+SQLITE_BACKEND = "sqlite"
+DEFAULT_SQLITE_PATH = "spm.sqlite3"
+
+# A column name or a sequence of column names (later columns break ties)
+OrderSpec = Union[str, Sequence[str]]
+
+
+def normalize_order(order_by: Optional[OrderSpec]) -> Tuple[str, ...]:
+    """
+    Convert an order specification into a tuple of column names
+
+    Args:
+        order_by: None, a column name, or a sequence of column names
+
+    Returns:
+        Tuple of columns to order by, most significant first
+    """
+    if not order_by:
+        return ()
+    if isinstance(order_by, str):
+        return (order_by,)
+    return tuple(order_by)
+
+
+class CRUDBackend(ABC):
+    """
+    Common surface of the CRUD backends
+
+    Filters everywhere are either a dictionary of column: value equality
+    filters or a sequence of conditions from supabase_wrapper.filters.
+    """
+
+    @abstractmethod
+    def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[FilterSpec] = None,
+        limit: Optional[int] = None,
+        order_by: Optional[OrderSpec] = None,
+        ascending: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Select rows matching filters, ordered by one or more columns"""
+
+    @abstractmethod
+    def select_iter(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[FilterSpec] = None,
+        key_columns: Sequence[str] = ("id",),
+        page_size: int = 1000,
+        ascending: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily iterate over matching rows in key order"""
+
+    @abstractmethod
+    def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert one row and return it"""
+
+    @abstractmethod
+    def insert_many(self, table: str, data: List[Dict[str, Any]], batch_size: int = 500) -> List[Dict[str, Any]]:
+        """Insert rows in chunks and return them"""
+
+    @abstractmethod
+    def upsert_many(self, table: str, data: List[Dict[str, Any]], on_conflict: str = "id", batch_size: int = 500):
+        """Insert or update rows matched on on_conflict"""
+
+    @abstractmethod
+    def update(self, table: str, data: Dict[str, Any], filters: FilterSpec) -> List[Dict[str, Any]]:
+        """Update matching rows and return them"""
+
+    @abstractmethod
+    def update_many(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        ids: Sequence[Any],
+        id_column: str = "id",
+        filters: Optional[FilterSpec] = None,
+        batch_size: int = 500
+    ):
+        """Apply the same update to every row whose id is in ids"""
+
+    @abstractmethod
+    def delete(self, table: str, filters: FilterSpec) -> List[Dict[str, Any]]:
+        """Delete matching rows and return them"""
+
+    @abstractmethod
+    def delete_many(
+        self,
+        table: str,
+        ids: Sequence[Any],
+        id_column: str = "id",
+        filters: Optional[FilterSpec] = None,
+        batch_size: int = 500
+    ):
+        """Delete every row whose id is in ids"""
+
+    @abstractmethod
+    def count(self, table: str, filters: Optional[FilterSpec] = None, mode: str = "exact") -> int:
+        """Count matching rows ("planned" / "estimated" may trade accuracy for speed)"""
+
+    @abstractmethod
+    def exists(self, table: str, filters: FilterSpec, column: Optional[str] = None) -> bool:
+        """Check if any row matches filters without counting them all"""
+
+
+_sqlite_backends: Dict[str, CRUDBackend] = {}
+_sqlite_backends_lock = threading.Lock()
+
+
+def selected_backend() -> str:
+    """Name of the backend CRUD_BACKEND selects ("supabase" or "sqlite")"""
+    return os.getenv("CRUD_BACKEND", SUPABASE_BACKEND).lower()
+
+
+def create_crud() -> CRUDBackend:
+    """
+    Create the CRUD backend selected by CRUD_BACKEND
+
+    SQLite backends are shared per database path so every caller sees the
+    same connection (and the same data for ":memory:").
+
+    Returns:
+        SupabaseCRUD or SQLiteCRUD instance
+    """
+    backend = selected_backend()
+
+    if backend == SQLITE_BACKEND:
+        from backend.wrappers.sqlite_wrapper.sqlite_crud import SQLiteCRUD
+
+        path = os.getenv("SQLITE_DATABASE_PATH", DEFAULT_SQLITE_PATH)
+        with _sqlite_backends_lock:
+            if path not in _sqlite_backends:
+                _sqlite_backends[path] = SQLiteCRUD(path)
+            return _sqlite_backends[path]
+
+    if backend != SUPABASE_BACKEND:
+        raise ValueError(f"Unknown CRUD_BACKEND '{backend}'. Use '{SUPABASE_BACKEND}' or '{SQLITE_BACKEND}'.")
+
+    from backend.wrappers.supabase_wrapper.supabase_crud import SupabaseCRUD
+    return SupabaseCRUD()
@@ -0,0 +1,225 @@
+"""
+Table definitions for the SQLite CRUD backend.
+
+Supabase owns the real schema; these declarations mirror the columns the
+backend reads and writes so that SQLiteCRUD can store values with the right
+type, index the columns we filter on and keep a membership index for array
+columns. Tables and columns that are not declared here are still accepted:
+they are created on first write with a type inferred from the value.
+
+Tables named ``<name>_test`` (used by the integration tests) share the schema
+of ``<name>``.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+# Column types
+TEXT = "text"
+INTEGER = "integer"
+REAL = "real"
+BOOLEAN = "boolean"
+JSON = "json"    # arbitrary JSON value (objects, lists of objects)
+ARRAY = "array"  # list of scalars, e.g. text[]; gets a membership index
+
+TEST_TABLE_SUFFIX = "_test"
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """
+    Declared shape of one table
+
+    Args:
+        primary_key: Column generated with a uuid4 when an insert omits it
+        columns: Column name -> column type
+        indexes: Scalar columns to index
+        defaults: Values used when an insert omits the column
+        touch_column: Timestamp column set to the current time on every insert
+            and update (mirrors a BEFORE UPDATE trigger)
+        tombstone_table: Table that receives (tombstone_column, deleted_at) for
+            every deleted row (mirrors an AFTER DELETE trigger)
+        tombstone_column: Column of tombstone_table and history_table holding
+            the primary key
+        history_table: Table that receives the previous values of
+            history_columns (with tombstone_column and changed_at) for every
+            updated row where one of them changed and for every deleted row
+            (mirrors AFTER UPDATE and AFTER DELETE triggers)
+        history_columns: Columns whose changes are logged to history_table
+    """
+    primary_key: str
+    columns: Dict[str, str]
+    indexes: Tuple[str, ...] = ()
+    defaults: Dict[str, object] = field(default_factory=dict)
+    touch_column: Optional[str] = None
+    tombstone_table: Optional[str] = None
+    tombstone_column: str = "row_id"
+    history_table: Optional[str] = None
+    history_columns: Tuple[str, ...] = ()
+
+    @property
+    def array_columns(self) -> Tuple[str, ...]:
+        return tuple(name for name, column_type in self.columns.items() if column_type == ARRAY)
+
+
+SCHEMAS: Dict[str, TableSchema] = {
+    "tasks": TableSchema(
+        primary_key="id",
+        columns={
+            "id": TEXT,
+            "title": TEXT,
+            "description": TEXT,
+            "due_date": TEXT,
+            "status": TEXT,
+            "priority": INTEGER,
+            "owner_user_id": TEXT,
+            "assignee_ids": ARRAY,
+            "parent_id": TEXT,
+            "project_id": TEXT,
+            "is_archived": BOOLEAN,
+            "comments": JSON,
+            "attachments": JSON,
+            "file_url": TEXT,
+            "time_log": REAL,
+            "recurrence_rule": TEXT,
+            "recurrence_interval": INTEGER,
+            "recurrence_end_date": TEXT,
+            "created_at": TEXT,
+            "updated_at": TEXT,
+        },
+        indexes=("parent_id", "project_id", "owner_user_id", "due_date", "is_archived", "updated_at"),
+        defaults={"assignee_ids": [], "comments": [], "attachments": [], "is_archived": False},
+        touch_column="updated_at",
+        tombstone_table="task_tombstones",
+        tombstone_column="task_id",
+        history_table="task_access_changes",
+        history_columns=("owner_user_id", "assignee_ids", "parent_id", "is_archived"),
+    ),
+    "task_tombstones": TableSchema(
+        primary_key="id",
+        columns={
+            "id": TEXT,
+            "task_id": TEXT,
+            "deleted_at": TEXT,
+        },
+        indexes=("deleted_at",),
+    ),
+    "task_access_changes": TableSchema(
+        primary_key="id",
+        columns={
+            "id": TEXT,
+            "task_id": TEXT,
+            "owner_user_id": TEXT,
+            "assignee_ids": ARRAY,
+            "parent_id": TEXT,
+            "is_archived": BOOLEAN,
+            "changed_at": TEXT,
+        },
+        indexes=("changed_at",),
+    ),
+    "users": TableSchema(
+        primary_key="uuid",
+        columns={
+            "uuid": TEXT,
+            "email": TEXT,
+            "password_hash": TEXT,
+            "role": TEXT,
+            "departments": ARRAY,
+            "teams": ARRAY,
+            "created_at": TEXT,
+        },
+        indexes=("email", "role"),
+        defaults={"departments": [], "teams": []},
+    ),
+    "projects": TableSchema(
+        primary_key="id",
+        columns={
+            "id": TEXT,
+            "name": TEXT,
+            "description": TEXT,
+            "team_id": TEXT,
+            "created_by": TEXT,
+            "collaborator_ids": ARRAY,
+            "is_archived": BOOLEAN,
+            "created_at": TEXT,
+            "updated_at": TEXT,
+        },
+        indexes=("created_by",),
+        defaults={"collaborator_ids": [], "is_archived": False},
+    ),
+    "teams": TableSchema(
+        primary_key="id",
+        columns={
+            "id": TEXT,
+            "name": TEXT,
+            "description": TEXT,
+            "department_id": TEXT,
+            "member_count": INTEGER,
+            "created_at": TEXT,
+            "updated_at": TEXT,
+        },
+        indexes=("department_id",),
+        defaults={"member_count": 0},
+    ),
+    "notifications": TableSchema(
+        primary_key="id",
+        columns={
+            "id": TEXT,
+            "sender_id": TEXT,
+            "receiver_id": TEXT,
+            "task_id": TEXT,
+            "action": TEXT,
+            "message": TEXT,
+            "timestamp": TEXT,
+            "created_at": TEXT,
+        },
+        indexes=("receiver_id", "task_id"),
+    ),
+}
+
+DEFAULT_SCHEMA = TableSchema(primary_key="id", columns={"id": TEXT})
+
+
+def schema_for(table: str) -> Optional[TableSchema]:
+    """Declared schema of a table (test tables share their base table's schema)"""
+    if table in SCHEMAS:
+        return SCHEMAS[table]
+    if table.endswith(TEST_TABLE_SUFFIX):
+        return SCHEMAS.get(table[:-len(TEST_TABLE_SUFFIX)])
+    return None
+
+
+def tombstone_table_for(table: str) -> Optional[str]:
+    """Tombstone table receiving the rows deleted from table (test tables get their own)"""
+    schema = schema_for(table)
+    return None if schema is None else _companion_table(table, schema.tombstone_table)
+
+
+def history_table_for(table: str) -> Optional[str]:
+    """History table receiving the access changes of table (test tables get their own)"""
+    schema = schema_for(table)
+    return None if schema is None else _companion_table(table, schema.history_table)
+
+
+def _companion_table(table: str, companion: Optional[str]) -> Optional[str]:
+    if companion is None:
+        return None
+    if table not in SCHEMAS:
+        return companion + TEST_TABLE_SUFFIX
+    return companion
+
+
+def infer_column_type(value) -> str:
+    """Column type for a value written to an undeclared column"""
+    if isinstance(value, bool):
+        return BOOLEAN
+    if isinstance(value, int):
+        return INTEGER
+    if isinstance(value, float):
+        return REAL
+    if isinstance(value, list):
+        if all(not isinstance(item, (dict, list)) for item in value):
+            return ARRAY
+        return JSON
+    if isinstance(value, dict):
+        return JSON
+    return TEXT
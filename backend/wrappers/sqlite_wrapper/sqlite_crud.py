@@ -0,0 +1,758 @@
+"""
+SQLite implementation of the CRUD backend.
+
+Stores the Supabase tables in a local SQLite database with the same
+select/insert/update/delete/count semantics as SupabaseCRUD, so TaskReader,
+TaskUpdater and the report generators can run (and be benchmarked) without a
+Supabase project or any network round trip.
+
+Storage layout:
+- every table has a hidden ``_rowid`` integer key; the declared primary key
+  (``id`` / ``uuid``) gets a unique index and a uuid4 default
+- booleans are stored as 0/1, JSON and array columns as JSON text
+- every array column (``assignee_ids``, ``departments``, ``collaborator_ids``
+  ...) has a side table ``<table>__<column>(owner, value)`` indexed on value,
+  so ``contains`` / ``overlaps`` filters are index lookups instead of scans
+- the triggers of the Supabase schema are emulated where the table schema
+  declares them: ``tasks.updated_at`` is stamped on every insert and update,
+  deleted tasks leave a row in ``task_tombstones``, and updates of the access
+  columns (owner, assignees, parent, archived) and deletions log the previous
+  values to ``task_access_changes``
+"""
+import functools
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backend.wrappers.crud_backend import CRUDBackend, OrderSpec, normalize_order
+from backend.wrappers.table_events import notify_write, written_rows
+from backend.wrappers.supabase_wrapper.filters import (
+    FilterSpec,
+    Condition,
+    Filter,
+    LogicalGroup,
+    normalize_filters,
+    in_,
+    EQ,
+    NEQ,
+    GT,
+    GTE,
+    LT,
+    LTE,
+    IN,
+    CONTAINS,
+    OVERLAPS,
+    IS,
+)
+from backend.wrappers.supabase_wrapper.supabase_crud import (
+    SupabaseCRUD,
+    BulkWriteResult,
+    BulkWriteError,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_BATCH_SIZE,
+    COUNT_MODES,
+)
+from .schema import (
+    TEXT,
+    INTEGER,
+    REAL,
+    BOOLEAN,
+    JSON,
+    ARRAY,
+    DEFAULT_SCHEMA,
+    TableSchema,
+    schema_for,
+    tombstone_table_for,
+    history_table_for,
+    infer_column_type,
+)
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_ROWID = '"_rowid"'
+_COLUMNS_TABLE = "_crud_columns"
+# Stay well below SQLite's limit on bound parameters per statement
+_MAX_PARAMS = 900
+
+_COMPARISONS = {EQ: "=", NEQ: "<>", GT: ">", GTE: ">=", LT: "<", LTE: "<="}
+_SQL_TYPES = {TEXT: "TEXT", INTEGER: "INTEGER", REAL: "REAL", BOOLEAN: "INTEGER", JSON: "TEXT", ARRAY: "TEXT"}
+
+
+def _quote(name: str) -> str:
+    """Quote a table/column name, rejecting anything that is not a plain identifier"""
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid table or column name: {name!r}")
+    return f'"{name}"'
+
+
+def _side_table(table: str, column: str) -> str:
+    return _quote(f"{table}__{column}")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _batches(items: Sequence[Any], size: int = _MAX_PARAMS) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _notifies_write(method):
+    """Tell table_events subscribers about the write once it has run"""
+    @functools.wraps(method)
+    def wrapper(self, table, *args, **kwargs):
+        rows = None
+        try:
+            result = method(self, table, *args, **kwargs)
+            rows = written_rows(result)
+            return result
+        finally:
+            notify_write(table, method.__name__, rows)
+    return wrapper
+
+
+class SQLiteCRUD(CRUDBackend):
+    """
+    CRUD operations on a local SQLite database
+
+    Args:
+        path: Database file path, or ":memory:" for a private in-memory database
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        # table -> column -> type, in creation order
+        self._columns: Dict[str, Dict[str, str]] = {}
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {_COLUMNS_TABLE} ("
+                "table_name TEXT NOT NULL, column_name TEXT NOT NULL, column_type TEXT NOT NULL, "
+                "PRIMARY KEY (table_name, column_name))"
+            )
+            for row in self._connection.execute(
+                f"SELECT table_name, column_name, column_type FROM {_COLUMNS_TABLE} ORDER BY rowid"
+            ):
+                self._columns.setdefault(row["table_name"], {})[row["column_name"]] = row["column_type"]
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        with self._lock:
+            self._connection.close()
+
+    # --- reads ---
+
+    def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[FilterSpec] = None,
+        limit: Optional[int] = None,
+        order_by: Optional[OrderSpec] = None,
+        ascending: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Select data from a table with optional filters
+
+        Args:
+            table: Table name
+            columns: Columns to select (default: "*")
+            filters: Dictionary of column: value equality filters, or a list of filter conditions
+            limit: Maximum number of rows to return
+            order_by: Column to order by, or several columns (later ones break ties)
+            ascending: Sort order (True for ASC, False for DESC)
+
+        Returns:
+            List of dictionaries containing the results
+        """
+        return self._select(table, columns, normalize_filters(filters), normalize_order(order_by), ascending, limit)
+
+    def select_iter(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[FilterSpec] = None,
+        key_columns: Sequence[str] = ("id",),
+        page_size: int = DEFAULT_PAGE_SIZE,
+        ascending: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over a table using keyset pagination (see SupabaseCRUD.select_iter)
+
+        Yields:
+            Row dictionaries in key order
+        """
+        if not key_columns:
+            raise ValueError("select_iter requires at least one key column")
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+
+        columns = SupabaseCRUD._with_key_columns(columns, key_columns)
+        base_conditions = normalize_filters(filters)
+        last_key: Optional[tuple] = None
+
+        while True:
+            conditions = list(base_conditions)
+            if last_key is not None:
+                conditions.append(SupabaseCRUD._keyset_condition(key_columns, last_key, ascending))
+
+            rows = self._select(table, columns, conditions, list(key_columns), ascending, page_size)
+            yield from rows
+
+            if len(rows) < page_size:
+                return
+
+            last_key = tuple(rows[-1].get(column) for column in key_columns)
+            if any(value is None for value in last_key):
+                raise ValueError(f"select_iter key columns {tuple(key_columns)} must not be null")
+
+    def count(self, table: str, filters: Optional[FilterSpec] = None, mode: str = "exact") -> int:
+        """
+        Count records in a table
+
+        Args:
+            table: Table name
+            filters: Optional dictionary of column: value filters or list of filter conditions
+            mode: Accepted for compatibility with SupabaseCRUD; SQLite always counts exactly
+
+        Returns:
+            Number of matching records
+        """
+        if mode not in COUNT_MODES:
+            raise ValueError(f"Unknown count mode '{mode}'. Use one of {COUNT_MODES}.")
+        with self._lock:
+            self._ensure_table(table)
+            where, params = self._where(table, normalize_filters(filters))
+            return self._connection.execute(f"SELECT COUNT(*) FROM {_quote(table)}{where}", params).fetchone()[0]
+
+    def exists(self, table: str, filters: FilterSpec, column: Optional[str] = None) -> bool:
+        """
+        Check if a record exists
+
+        Args:
+            table: Table name
+            filters: Dictionary of column: value filters or list of filter conditions
+            column: Ignored; the probe selects a constant
+
+        Returns:
+            True if record exists, False otherwise
+        """
+        with self._lock:
+            self._ensure_table(table)
+            where, params = self._where(table, normalize_filters(filters))
+            return self._connection.execute(f"SELECT 1 FROM {_quote(table)}{where} LIMIT 1", params).fetchone() is not None
+
+    # --- writes ---
+
+    @_notifies_write
+    def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert a single record into a table
+
+        Args:
+            table: Table name
+            data: Dictionary of column: value pairs
+
+        Returns:
+            Dictionary containing the inserted record
+        """
+        with self._lock, self._connection:
+            rows = self._insert_rows(table, [data])
+        return rows[0] if rows else None
+
+    @_notifies_write
+    def insert_many(
+        self,
+        table: str,
+        data: List[Dict[str, Any]],
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert multiple records into a table, one transaction per chunk
+
+        Raises:
+            BulkWriteError: If any chunk failed (rows from successful chunks are on err.result)
+        """
+        if not data:
+            return []
+
+        def insert_chunk(chunk):
+            with self._lock, self._connection:
+                return SimpleNamespace(data=self._insert_rows(table, chunk))
+
+        result = SupabaseCRUD._write_in_chunks(data, batch_size, insert_chunk)
+        if not result.ok:
+            raise BulkWriteError(result)
+        return result.rows
+
+    @_notifies_write
+    def upsert_many(
+        self,
+        table: str,
+        data: List[Dict[str, Any]],
+        on_conflict: str = "id",
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> BulkWriteResult:
+        """Insert or update multiple records, matching existing rows on on_conflict"""
+        conflict_columns = [column.strip() for column in on_conflict.split(",")]
+
+        def upsert_chunk(chunk):
+            written = []
+            with self._lock, self._connection:
+                self._ensure_table(table)
+                for row in chunk:
+                    key = {column: row.get(column) for column in conflict_columns}
+                    existing = [] if None in key.values() else self._matching_rowids(table, normalize_filters(key))
+                    if existing:
+                        written.extend(self._update_rowids(table, row, existing))
+                    else:
+                        written.extend(self._insert_rows(table, [row]))
+            return SimpleNamespace(data=written)
+
+        return SupabaseCRUD._write_in_chunks(data, batch_size, upsert_chunk, key_of=SupabaseCRUD._conflict_key_of(on_conflict))
+
+    @_notifies_write
+    def update(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        filters: FilterSpec
+    ) -> List[Dict[str, Any]]:
+        """
+        Update records in a table
+
+        Args:
+            table: Table name
+            data: Dictionary of column: value pairs to update
+            filters: Dictionary of column: value filters or list of filter conditions to match records
+
+        Returns:
+            List of dictionaries containing the updated records
+        """
+        return self._update_matching(table, data, normalize_filters(filters))
+
+    @_notifies_write
+    def update_many(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        ids: Sequence[Any],
+        id_column: str = "id",
+        filters: Optional[FilterSpec] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> BulkWriteResult:
+        """Apply the same update to every record whose id is in ids"""
+        extra = normalize_filters(filters)
+        return SupabaseCRUD._write_in_chunks(
+            list(ids),
+            batch_size,
+            lambda chunk: SimpleNamespace(data=self._update_matching(table, data, [in_(id_column, chunk), *extra])),
+            key_of=lambda key: key,
+        )
+
+    @_notifies_write
+    def delete(self, table: str, filters: FilterSpec) -> List[Dict[str, Any]]:
+        """
+        Delete records from a table
+
+        Args:
+            table: Table name
+            filters: Dictionary of column: value filters or list of filter conditions to match records
+
+        Returns:
+            List of dictionaries containing the deleted records
+        """
+        return self._delete_matching(table, normalize_filters(filters))
+
+    @_notifies_write
+    def delete_many(
+        self,
+        table: str,
+        ids: Sequence[Any],
+        id_column: str = "id",
+        filters: Optional[FilterSpec] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> BulkWriteResult:
+        """Delete every record whose id is in ids"""
+        extra = normalize_filters(filters)
+        return SupabaseCRUD._write_in_chunks(
+            list(ids),
+            batch_size,
+            lambda chunk: SimpleNamespace(data=self._delete_matching(table, [in_(id_column, chunk), *extra])),
+            key_of=lambda key: key,
+        )
+
+    # Undecorated bodies of update and delete, shared with the bulk variants
+    # so that each public call notifies table_events exactly once
+
+    def _update_matching(self, table: str, data: Dict[str, Any], conditions: List[Condition]) -> List[Dict[str, Any]]:
+        with self._lock, self._connection:
+            self._ensure_table(table)
+            rowids = self._matching_rowids(table, conditions)
+            return self._update_rowids(table, data, rowids)
+
+    def _delete_matching(self, table: str, conditions: List[Condition]) -> List[Dict[str, Any]]:
+        with self._lock, self._connection:
+            self._ensure_table(table)
+            rowids = self._matching_rowids(table, conditions)
+            deleted = self._rows_by_rowid(table, rowids)
+            deleted_at = _now()
+            self._record_tombstones(table, deleted, deleted_at)
+            self._record_history(table, deleted, deleted_at)
+            for batch in _batches(rowids):
+                placeholders = ", ".join("?" * len(batch))
+                for column in self._array_columns(table):
+                    self._connection.execute(
+                        f"DELETE FROM {_side_table(table, column)} WHERE owner IN ({placeholders})", batch
+                    )
+                self._connection.execute(f"DELETE FROM {_quote(table)} WHERE {_ROWID} IN ({placeholders})", batch)
+            return deleted
+
+    # --- schema management ---
+
+    def _schema(self, table: str) -> TableSchema:
+        return schema_for(table) or DEFAULT_SCHEMA
+
+    def _ensure_table(self, table: str) -> None:
+        if table in self._columns:
+            return
+
+        quoted = _quote(table)
+        schema = self._schema(table)
+        self._connection.execute(f"CREATE TABLE IF NOT EXISTS {quoted} ({_ROWID} INTEGER PRIMARY KEY AUTOINCREMENT)")
+        self._columns[table] = {}
+        for column, column_type in schema.columns.items():
+            self._add_column(table, column, column_type)
+
+        self._add_column(table, schema.primary_key, TEXT)
+        self._connection.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote(f'ux_{table}_{schema.primary_key}')} "
+            f"ON {quoted} ({_quote(schema.primary_key)})"
+        )
+        for column in schema.indexes:
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{column}')} ON {quoted} ({_quote(column)})"
+            )
+
+    def _add_column(self, table: str, column: str, column_type: str) -> None:
+        if column in self._columns[table]:
+            return
+
+        self._connection.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)} {_SQL_TYPES[column_type]}")
+        self._connection.execute(
+            f"INSERT OR REPLACE INTO {_COLUMNS_TABLE} (table_name, column_name, column_type) VALUES (?, ?, ?)",
+            (table, column, column_type),
+        )
+        self._columns[table][column] = column_type
+
+        if column_type == ARRAY:
+            side = _side_table(table, column)
+            self._connection.execute(f"CREATE TABLE IF NOT EXISTS {side} (owner INTEGER NOT NULL, value)")
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}__{column}_value')} ON {side} (value, owner)"
+            )
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}__{column}_owner')} ON {side} (owner)"
+            )
+
+    def _column_type(self, table: str, column: str) -> str:
+        try:
+            return self._columns[table][column]
+        except KeyError:
+            raise ValueError(f"Column '{column}' does not exist on table '{table}'") from None
+
+    def _array_columns(self, table: str) -> List[str]:
+        return [column for column, column_type in self._columns[table].items() if column_type == ARRAY]
+
+    # --- value conversion ---
+
+    @staticmethod
+    def _encode(column_type: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if column_type in (JSON, ARRAY):
+            return json.dumps(value, default=str)
+        if column_type == BOOLEAN:
+            if isinstance(value, str) and value.lower() in ("true", "false"):
+                return int(value.lower() == "true")
+            return int(bool(value))
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _decode(column_type: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if column_type in (JSON, ARRAY):
+            return json.loads(value)
+        if column_type == BOOLEAN:
+            return bool(value)
+        return value
+
+    @staticmethod
+    def _encode_element(value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    # --- query building ---
+
+    def _projection(self, table: str, columns: str) -> List[str]:
+        if columns.strip() == "*":
+            return list(self._columns[table])
+        names = [column.strip() for column in columns.split(",") if column.strip()]
+        for name in names:
+            self._column_type(table, name)
+        return names
+
+    def _where(self, table: str, conditions: List[Condition]) -> Tuple[str, List[Any]]:
+        if not conditions:
+            return "", []
+        params: List[Any] = []
+        clauses = [self._compile(table, condition, params) for condition in conditions]
+        return " WHERE " + " AND ".join(clauses), params
+
+    def _compile(self, table: str, condition: Condition, params: List[Any]) -> str:
+        if isinstance(condition, LogicalGroup):
+            joiner = " OR " if condition.operator == "or" else " AND "
+            sql = "(" + joiner.join(self._compile(table, inner, params) for inner in condition.conditions) + ")"
+            return f"NOT {sql}" if condition.negate else sql
+
+        if isinstance(condition, Filter):
+            sql = self._compile_filter(table, condition, params)
+            return f"NOT ({sql})" if condition.negate else sql
+
+        raise TypeError(f"Unsupported condition: {condition!r}")
+
+    def _compile_filter(self, table: str, condition: Filter, params: List[Any]) -> str:
+        column_type = self._column_type(table, condition.column)
+        column = _quote(condition.column)
+        operator = condition.operator
+
+        if operator in _COMPARISONS:
+            params.append(self._encode(column_type, condition.value))
+            return f"{column} {_COMPARISONS[operator]} ?"
+
+        if operator == IN:
+            values = list(condition.value)
+            if not values:
+                return "0"
+            params.extend(self._encode(column_type, value) for value in values)
+            return f"{column} IN ({', '.join('?' * len(values))})"
+
+        if operator in (CONTAINS, OVERLAPS):
+            values = [self._encode_element(value) for value in dict.fromkeys(condition.value)]
+            if not values:
+                return "1" if operator == CONTAINS else "0"
+
+            if column_type == ARRAY:
+                side = _side_table(table, condition.column)
+                if operator == CONTAINS:
+                    params.extend(values)
+                    return "(" + " AND ".join(
+                        f"{_ROWID} IN (SELECT owner FROM {side} WHERE value = ?)" for _ in values
+                    ) + ")"
+                params.extend(values)
+                return f"{_ROWID} IN (SELECT owner FROM {side} WHERE value IN ({', '.join('?' * len(values))}))"
+
+            # JSON columns have no membership index; fall back to json_each
+            params.extend(values)
+            if operator == CONTAINS:
+                return "(" + " AND ".join(
+                    f"EXISTS (SELECT 1 FROM json_each({column}) WHERE value = ?)" for _ in values
+                ) + ")"
+            return f"EXISTS (SELECT 1 FROM json_each({column}) WHERE value IN ({', '.join('?' * len(values))}))"
+
+        if operator == IS:
+            if condition.value is None:
+                return f"{column} IS NULL"
+            params.append(self._encode(column_type, condition.value))
+            return f"{column} IS ?"
+
+        raise ValueError(f"Unsupported filter operator: {operator}")
+
+    @staticmethod
+    def _order_clause(order_columns: Sequence[str], ascending: bool) -> str:
+        # Match PostgreSQL: NULLs sort last ascending and first descending
+        if not order_columns:
+            return ""
+        if ascending:
+            terms = [f"{_quote(column)} IS NULL, {_quote(column)} ASC" for column in order_columns]
+        else:
+            terms = [f"{_quote(column)} IS NULL DESC, {_quote(column)} DESC" for column in order_columns]
+        return " ORDER BY " + ", ".join(terms)
+
+    def _select(
+        self,
+        table: str,
+        columns: str,
+        conditions: List[Condition],
+        order_columns: Sequence[str],
+        ascending: bool,
+        limit: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._ensure_table(table)
+            names = self._projection(table, columns)
+            for column in order_columns:
+                self._column_type(table, column)
+            where, params = self._where(table, conditions)
+
+            sql = f"SELECT {', '.join(_quote(name) for name in names)} FROM {_quote(table)}{where}"
+            sql += self._order_clause(order_columns, ascending)
+            if limit:
+                sql += " LIMIT ?"
+                params.append(limit)
+
+            return self._decode_rows(table, names, self._connection.execute(sql, params))
+
+    def _decode_rows(self, table: str, names: List[str], cursor) -> List[Dict[str, Any]]:
+        types = self._columns[table]
+        return [{name: self._decode(types[name], row[name]) for name in names} for row in cursor]
+
+    def _matching_rowids(self, table: str, conditions: List[Condition]) -> List[int]:
+        where, params = self._where(table, conditions)
+        cursor = self._connection.execute(f"SELECT {_ROWID} FROM {_quote(table)}{where} ORDER BY {_ROWID}", params)
+        return [row[0] for row in cursor]
+
+    def _rows_by_rowid(self, table: str, rowids: Sequence[int]) -> List[Dict[str, Any]]:
+        names = list(self._columns[table])
+        select_list = ", ".join(_quote(name) for name in names)
+        rows: List[Dict[str, Any]] = []
+        for batch in _batches(rowids):
+            cursor = self._connection.execute(
+                f"SELECT {select_list} FROM {_quote(table)} WHERE {_ROWID} IN ({', '.join('?' * len(batch))}) "
+                f"ORDER BY {_ROWID}",
+                batch,
+            )
+            rows.extend(self._decode_rows(table, names, cursor))
+        return rows
+
+    # --- write helpers (called with the lock held, inside a transaction) ---
+
+    def _insert_rows(self, table: str, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self._ensure_table(table)
+        schema = self._schema(table)
+        rowids = []
+
+        for data in rows:
+            row = self._with_defaults(schema, data)
+            for column, value in row.items():
+                if column not in self._columns[table]:
+                    _quote(column)
+                self._add_column(table, column, infer_column_type(value))
+
+            names = list(row)
+            types = self._columns[table]
+            cursor = self._connection.execute(
+                f"INSERT INTO {_quote(table)} ({', '.join(_quote(name) for name in names)}) "
+                f"VALUES ({', '.join('?' * len(names))})",
+                [self._encode(types[name], row[name]) for name in names],
+            )
+            self._index_arrays(table, cursor.lastrowid, row)
+            rowids.append(cursor.lastrowid)
+
+        return self._rows_by_rowid(table, rowids)
+
+    def _update_rowids(self, table: str, data: Dict[str, Any], rowids: List[int]) -> List[Dict[str, Any]]:
+        if not data:
+            raise ValueError("update requires at least one column")
+        if not rowids:
+            return []
+
+        schema = self._schema(table)
+        changed_at = _now()
+        if schema.touch_column:
+            data = {**data, schema.touch_column: changed_at}
+        logged = [column for column in schema.history_columns if column in data]
+        before = self._rows_by_rowid(table, rowids) if logged and history_table_for(table) else []
+
+        for column, value in data.items():
+            if column not in self._columns[table]:
+                _quote(column)
+                self._add_column(table, column, infer_column_type(value))
+
+        types = self._columns[table]
+        names = list(data)
+        assignments = ", ".join(f"{_quote(name)} = ?" for name in names)
+        values = [self._encode(types[name], data[name]) for name in names]
+        for batch in _batches(rowids):
+            self._connection.execute(
+                f"UPDATE {_quote(table)} SET {assignments} WHERE {_ROWID} IN ({', '.join('?' * len(batch))})",
+                values + list(batch),
+            )
+
+        if any(types[name] == ARRAY for name in names):
+            for rowid in rowids:
+                self._index_arrays(table, rowid, data)
+
+        updated = self._rows_by_rowid(table, rowids)
+        # Both lists are in rowid order
+        self._record_history(table, [
+            previous for previous, current in zip(before, updated)
+            if any(previous.get(column) != current.get(column) for column in logged)
+        ], changed_at)
+        return updated
+
+    def _record_tombstones(self, table: str, deleted: List[Dict[str, Any]], deleted_at: str) -> None:
+        tombstones = tombstone_table_for(table)
+        if tombstones is None or not deleted:
+            return
+        schema = self._schema(table)
+        self._insert_rows(tombstones, [
+            {schema.tombstone_column: row.get(schema.primary_key), "deleted_at": deleted_at} for row in deleted
+        ])
+
+    def _record_history(self, table: str, previous: List[Dict[str, Any]], changed_at: str) -> None:
+        history = history_table_for(table)
+        if history is None or not previous:
+            return
+        schema = self._schema(table)
+        self._insert_rows(history, [
+            {
+                schema.tombstone_column: row.get(schema.primary_key),
+                **{column: row.get(column) for column in schema.history_columns},
+                "changed_at": changed_at,
+            }
+            for row in previous
+        ])
+
+    def _with_defaults(self, schema: TableSchema, data: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(data)
+        if row.get(schema.primary_key) is None:
+            row[schema.primary_key] = str(uuid.uuid4())
+        for column, default in schema.defaults.items():
+            if column not in row:
+                row[column] = list(default) if isinstance(default, list) else default
+        if "created_at" in schema.columns and row.get("created_at") is None:
+            row["created_at"] = _now()
+        if schema.touch_column and row.get(schema.touch_column) is None:
+            row[schema.touch_column] = _now()
+        return row
+
+    def _index_arrays(self, table: str, rowid: int, row: Dict[str, Any]) -> None:
+        types = self._columns[table]
+        for column, value in row.items():
+            if types.get(column) != ARRAY:
+                continue
+            side = _side_table(table, column)
+            self._connection.execute(f"DELETE FROM {side} WHERE owner = ?", (rowid,))
+            if not isinstance(value, list):
+                continue
+            elements = [
+                self._encode_element(element) for element in dict.fromkeys(value)
+                if element is not None and not isinstance(element, (dict, list))
+            ]
+            self._connection.executemany(
+                f"INSERT INTO {side} (owner, value) VALUES (?, ?)",
+                [(rowid, element) for element in elements],
+            )
@@ -5,15 +5,14 @@ from uuid import uuid4
 from urllib.parse import urlparse
 
 from backend.wrappers.supabase_wrapper.supabase_client import SupabaseClient
+from backend.wrappers.supabase_wrapper.instrumentation import instrumented
 
 
 class SupabaseStorage:
 
     def __init__(self, bucket_name: Optional[str] = None) -> None:
         self._client = SupabaseClient().client
-        self.bucket_name = bucket_name or os.getenv("SUPABASE_TASK_FILES_BUCKET")
-        if not self.bucket_name:
-            raise ValueError("Supabase storage bucket name is not configured. Set SUPABASE_TASK_FILES_BUCKET.")
+        self.bucket_name = resolve_bucket_name(bucket_name)
 
     def upload_file(
         self,
@@ -26,35 +25,19 @@ class SupabaseStorage:
         if not file_bytes:
             raise ValueError("Cannot upload an empty file.")
 
-        safe_name = Path(file_name).name
-        unique_name = f"{uuid4().hex}_{safe_name}"
-        storage_path = f"tasks/{user_id}/{unique_name}" if user_id else f"tasks/{unique_name}"
+        storage_path = build_storage_path(file_name, user_id)
 
         storage_bucket = self._client.storage.from_(self.bucket_name)
         options = {"content-type": content_type or "application/octet-stream", "upsert": False}
-        response = storage_bucket.upload(storage_path, file_bytes, options)
+        response = instrumented(
+            self.bucket_name, "upload", f"upload {self.bucket_name} {storage_path}",
+            lambda: storage_bucket.upload(storage_path, file_bytes, options),
+        )
 
-        error = getattr(response, "error", None)
-        if error:
-            message = getattr(error, "message", None) or str(error)
-            raise ValueError(f"Supabase storage upload failed: {message}")
+        raise_for_upload_error(response)
 
         public_response = storage_bucket.get_public_url(storage_path)
-
-        if isinstance(public_response, dict):
-            data = public_response.get("data") or {}
-            url = data.get("publicUrl") or data.get("public_url") or public_response.get("publicUrl") or public_response.get("public_url")
-        else:
-            data = getattr(public_response, "data", None)
-            if isinstance(data, dict):
-                url = data.get("publicUrl") or data.get("public_url")
-            else:
-                url = public_response
-
-        if not url:
-            raise ValueError("Supabase did not return a public URL for the uploaded file.")
-
-        return url
+        return extract_public_url(public_response)
 
     def delete_file(self, file_url: str) -> bool:
         if not file_url:
@@ -66,7 +49,10 @@ class SupabaseStorage:
                 return False
 
             storage_bucket = self._client.storage.from_(self.bucket_name)
-            response = storage_bucket.remove([storage_path])
+            response = instrumented(
+                self.bucket_name, "remove", f"remove {self.bucket_name} {storage_path}",
+                lambda: storage_bucket.remove([storage_path]),
+            )
 
             error = getattr(response, "error", None)
             if error:
@@ -77,11 +63,52 @@ class SupabaseStorage:
             return False
 
     def _extract_storage_path_from_url(self, file_url: str) -> Optional[str]:
-        try:
-            parsed_url = urlparse(file_url)
-            path_parts = parsed_url.path.split(f"/object/public/{self.bucket_name}/")
-            if len(path_parts) > 1:
-                return path_parts[1]
-            return None
-        except Exception:
-            return None
+        return extract_storage_path(file_url, self.bucket_name)
+
+
+def resolve_bucket_name(bucket_name: Optional[str] = None) -> str:
+    bucket_name = bucket_name or os.getenv("SUPABASE_TASK_FILES_BUCKET")
+    if not bucket_name:
+        raise ValueError("Supabase storage bucket name is not configured. Set SUPABASE_TASK_FILES_BUCKET.")
+    return bucket_name
+
+
+def build_storage_path(file_name: str, user_id: Optional[str] = None) -> str:
+    safe_name = Path(file_name).name
+    unique_name = f"{uuid4().hex}_{safe_name}"
+    return f"tasks/{user_id}/{unique_name}" if user_id else f"tasks/{unique_name}"
+
+
+def raise_for_upload_error(response) -> None:
+    error = getattr(response, "error", None)
+    if error:
+        message = getattr(error, "message", None) or str(error)
+        raise ValueError(f"Supabase storage upload failed: {message}")
+
+
+def extract_public_url(public_response) -> str:
+    if isinstance(public_response, dict):
+        data = public_response.get("data") or {}
+        url = data.get("publicUrl") or data.get("public_url") or public_response.get("publicUrl") or public_response.get("public_url")
+    else:
+        data = getattr(public_response, "data", None)
+        if isinstance(data, dict):
+            url = data.get("publicUrl") or data.get("public_url")
+        else:
+            url = public_response
+
+    if not url:
+        raise ValueError("Supabase did not return a public URL for the uploaded file.")
+
+    return url
+
+
+def extract_storage_path(file_url: str, bucket_name: str) -> Optional[str]:
+    try:
+        parsed_url = urlparse(file_url)
+        path_parts = parsed_url.path.split(f"/object/public/{bucket_name}/")
+        if len(path_parts) > 1:
+            return path_parts[1]
+        return None
+    except Exception:
+        return None
@@ -0,0 +1,49 @@
+import os
+from supabase import acreate_client, AsyncClientOptions
+from dotenv import load_dotenv
+from .resilience import client_timeout
+
+load_dotenv()
+
+
+class AsyncSupabaseClient:
+    """
+    Shared asyncio Supabase client for database connections
+
+    The async client is created by a coroutine, so unlike SupabaseClient it is
+    obtained with ``await AsyncSupabaseClient.get_client()``.
+    """
+    _client = None
+
+    @classmethod
+    async def get_client(cls):
+        """
+        Get the async Supabase client instance, creating it on first use
+
+        Returns:
+            _type_: supabase AsyncClient instance
+        """
+        if cls._client is None:
+            cls._client = await acreate_client(
+                os.getenv("SUPABASE_URL"),
+                os.getenv("SUPABASE_KEY"),
+                options=AsyncClientOptions(
+                    postgrest_client_timeout=client_timeout(),
+                    storage_client_timeout=30,
+                )
+            )
+        return cls._client
+
+    @classmethod
+    async def get_table(cls, table_name: str):
+        """
+        Get a reference to a specific table
+
+        Args:
+            table_name (str): Name of the table
+
+        Returns:
+            _type_: Async table reference
+        """
+        client = await cls.get_client()
+        return client.table(table_name)
@@ -0,0 +1,402 @@
+import functools
+from typing import List, Dict, Any, Optional, AsyncIterator, Sequence, Callable, Awaitable
+from backend.wrappers.crud_backend import OrderSpec, normalize_order
+from backend.wrappers.table_events import notify_write, written_rows
+from .async_supabase_client import AsyncSupabaseClient
+from .filters import FilterSpec, apply_filters, normalize_filters, in_
+from .query_cache import QueryCache, get_shared_cache, make_cache_key
+from .resilience import ExecutionPolicy, get_execution_policy, disable_builtin_retry
+from .fast_json import async_executor
+from .singleflight import AsyncSingleFlight, get_async_singleflight
+from .instrumentation import current_query_log, instrumented_async, query_fingerprint, query_shape, payload_digest
+from .supabase_crud import (
+    SupabaseCRUD,
+    BulkWriteResult,
+    BulkWriteError,
+    ChunkError,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_BATCH_SIZE,
+    COUNT_MODES,
+    probe_column,
+    _chunks,
+)
+
+
+def _invalidates_cache(method):
+    """Drop the written table's cached query results and in-flight reads once the write has been sent"""
+    @functools.wraps(method)
+    async def wrapper(self, table, *args, **kwargs):
+        rows = None
+        try:
+            result = await method(self, table, *args, **kwargs)
+            rows = written_rows(result)
+            return result
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(table)
+            if self.flights is not None:
+                self.flights.forget(table)
+            notify_write(table, method.__name__, rows)
+    return wrapper
+
+
+class AsyncSupabaseCRUD:
+    """
+    asyncio twin of SupabaseCRUD
+
+    Same method surface and semantics as SupabaseCRUD, but every call is a
+    coroutine running on the async HTTP client so request handlers can await
+    database round trips without blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        cache: Optional[QueryCache] = None,
+        policy: Optional[ExecutionPolicy] = None,
+        flights: Optional[AsyncSingleFlight] = None
+    ):
+        self.client = client
+        self.cache = cache if cache is not None else get_shared_cache()
+        self.policy = policy or get_execution_policy()
+        self.flights = flights if flights is not None else get_async_singleflight()
+
+    async def _table(self, table: str):
+        if self.client is None:
+            self.client = await AsyncSupabaseClient.get_client()
+        return self.client.table(table)
+
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[FilterSpec] = None,
+        limit: Optional[int] = None,
+        order_by: Optional[OrderSpec] = None,
+        ascending: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Select data from a table with optional filters
+
+        Args:
+            table: Table name
+            columns: Columns to select (default: "*")
+            filters: Dictionary of column: value equality filters, or a list of filter conditions
+            limit: Maximum number of rows to return
+            order_by: Column to order by, or several columns (later ones break ties)
+            ascending: Sort order (True for ASC, False for DESC)
+
+        Returns:
+            List of dictionaries containing the results
+        """
+        order_by = normalize_order(order_by)
+        cache_key = make_cache_key("select", columns, filters, limit, order_by, ascending)
+        if self.cache is not None:
+            hit, rows = self.cache.get(table, cache_key)
+            if hit:
+                return [dict(row) for row in rows]
+        generation = self.cache.generation(table) if self.cache is not None else None
+
+        query = (await self._table(table)).select(columns)
+        query = apply_filters(query, filters)
+
+        for column in order_by:
+            query = query.order(column, desc=not ascending)
+
+        if limit:
+            query = query.limit(limit)
+
+        result, shared = await self._read(
+            table, cache_key, lambda: self._execute(query, table, "select", columns, filters, limit, ",".join(order_by) or None, ascending)
+        )
+        if self.cache is not None and result.data is not None:
+            self.cache.set(table, cache_key, [dict(row) for row in result.data], generation)
+        if shared and result.data is not None:
+            # Every joined caller got this same response; hand each its own rows
+            return [dict(row) for row in result.data]
+        return result.data
+
+    async def select_iter(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[FilterSpec] = None,
+        key_columns: Sequence[str] = ("id",),
+        page_size: int = DEFAULT_PAGE_SIZE,
+        ascending: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Lazily iterate over a table using keyset pagination (see SupabaseCRUD.select_iter)
+
+        Yields:
+            Row dictionaries in key order
+        """
+        if not key_columns:
+            raise ValueError("select_iter requires at least one key column")
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+
+        columns = SupabaseCRUD._with_key_columns(columns, key_columns)
+        base_conditions = normalize_filters(filters)
+        last_key: Optional[tuple] = None
+
+        while True:
+            conditions = list(base_conditions)
+            if last_key is not None:
+                conditions.append(SupabaseCRUD._keyset_condition(key_columns, last_key, ascending))
+
+            query = (await self._table(table)).select(columns)
+            query = apply_filters(query, conditions)
+            for column in key_columns:
+                query = query.order(column, desc=not ascending)
+            query = query.limit(page_size)
+
+            rows = (await self._execute(query, table, "select", columns, conditions, page_size)).data or []
+            for row in rows:
+                yield row
+
+            if len(rows) < page_size:
+                return
+
+            last_key = tuple(rows[-1].get(column) for column in key_columns)
+            if any(value is None for value in last_key):
+                raise ValueError(f"select_iter key columns {tuple(key_columns)} must not be null")
+
+    @_invalidates_cache
+    async def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert a single record into a table
+
+        Args:
+            table: Table name
+            data: Dictionary of column: value pairs
+
+        Returns:
+            Dictionary containing the inserted record
+        """
+        result = await self._execute((await self._table(table)).insert(data), table, "insert", "", None, payload_digest(data))
+        return result.data[0] if result.data else None
+
+    @_invalidates_cache
+    async def insert_many(
+        self,
+        table: str,
+        data: List[Dict[str, Any]],
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert multiple records into a table
+
+        Raises:
+            BulkWriteError: If any chunk failed
+        """
+        if not data:
+            return []
+
+        async def insert_chunk(chunk):
+            query = (await self._table(table)).insert(list(chunk))
+            return await self._execute(query, table, "insert", "", None, payload_digest(chunk))
+
+        result = await self._write_in_chunks(data, batch_size, insert_chunk)
+        if not result.ok:
+            raise BulkWriteError(result)
+        return result.rows
+
+    @_invalidates_cache
+    async def upsert_many(
+        self,
+        table: str,
+        data: List[Dict[str, Any]],
+        on_conflict: str = "id",
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> BulkWriteResult:
+        """Insert or update multiple records, matching existing rows on on_conflict"""
+        async def upsert_chunk(chunk):
+            query = (await self._table(table)).upsert(list(chunk), on_conflict=on_conflict)
+            return await self._execute(query, table, "upsert", "", None, payload_digest(chunk))
+
+        return await self._write_in_chunks(
+            data, batch_size, upsert_chunk, key_of=SupabaseCRUD._conflict_key_of(on_conflict)
+        )
+
+    @_invalidates_cache
+    async def update(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        filters: FilterSpec
+    ) -> List[Dict[str, Any]]:
+        """
+        Update records in a table
+
+        Args:
+            table: Table name
+            data: Dictionary of column: value pairs to update
+            filters: Dictionary of column: value filters or list of filter conditions to match records
+
+        Returns:
+            List of dictionaries containing the updated records
+        """
+        query = (await self._table(table)).update(data)
+        query = apply_filters(query, filters)
+
+        result = await self._execute(query, table, "update", "", filters, payload_digest(data))
+        return result.data
+
+    @_invalidates_cache
+    async def update_many(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        ids: Sequence[Any],
+        id_column: str = "id",
+        filters: Optional[FilterSpec] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> BulkWriteResult:
+        """Apply the same update to every record whose id is in ids"""
+        extra = normalize_filters(filters)
+
+        async def update_chunk(chunk):
+            conditions = [in_(id_column, chunk), *extra]
+            query = apply_filters((await self._table(table)).update(data), conditions)
+            return await self._execute(query, table, "update", "", conditions, payload_digest(data))
+
+        return await self._write_in_chunks(list(ids), batch_size, update_chunk, key_of=lambda key: key)
+
+    @_invalidates_cache
+    async def delete(self, table: str, filters: FilterSpec) -> List[Dict[str, Any]]:
+        """
+        Delete records from a table
+
+        Args:
+            table: Table name
+            filters: Dictionary of column: value filters or list of filter conditions to match records
+
+        Returns:
+            List of dictionaries containing the deleted records
+        """
+        query = (await self._table(table)).delete()
+        query = apply_filters(query, filters)
+
+        result = await self._execute(query, table, "delete", "", filters)
+        return result.data
+
+    @_invalidates_cache
+    async def delete_many(
+        self,
+        table: str,
+        ids: Sequence[Any],
+        id_column: str = "id",
+        filters: Optional[FilterSpec] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> BulkWriteResult:
+        """Delete every record whose id is in ids"""
+        extra = normalize_filters(filters)
+
+        async def delete_chunk(chunk):
+            conditions = [in_(id_column, chunk), *extra]
+            query = apply_filters((await self._table(table)).delete(), conditions)
+            return await self._execute(query, table, "delete", "", conditions)
+
+        return await self._write_in_chunks(list(ids), batch_size, delete_chunk, key_of=lambda key: key)
+
+    async def count(self, table: str, filters: Optional[FilterSpec] = None, mode: str = "exact") -> int:
+        """
+        Count records in a table with a HEAD request (see SupabaseCRUD.count)
+
+        Args:
+            table: Table name
+            filters: Optional dictionary of column: value filters or list of filter conditions
+            mode: "exact", "planned" or "estimated"
+
+        Returns:
+            Number of matching records
+        """
+        if mode not in COUNT_MODES:
+            raise ValueError(f"Unknown count mode '{mode}'. Use one of {COUNT_MODES}.")
+
+        cache_key = make_cache_key("count", "*", filters, mode)
+        if self.cache is not None:
+            hit, cached_count = self.cache.get(table, cache_key)
+            if hit:
+                return cached_count
+        generation = self.cache.generation(table) if self.cache is not None else None
+
+        query = (await self._table(table)).select("*", count=mode, head=True)
+        query = apply_filters(query, filters)
+
+        result, _ = await self._read(table, cache_key, lambda: self._execute(query, table, "count", "*", filters, mode))
+        if self.cache is not None and result.count is not None:
+            self.cache.set(table, cache_key, result.count, generation)
+        return result.count
+
+    async def exists(self, table: str, filters: FilterSpec, column: Optional[str] = None) -> bool:
+        """
+        Check if a record exists by fetching at most one row of a single column
+
+        Args:
+            table: Table name
+            filters: Dictionary of column: value filters or list of filter conditions
+            column: Column to fetch; defaults to the first filtered column
+
+        Returns:
+            True if record exists, False otherwise
+        """
+        column = column or probe_column(filters)
+
+        cache_key = make_cache_key("exists", column, filters)
+        if self.cache is not None:
+            hit, found = self.cache.get(table, cache_key)
+            if hit:
+                return found
+        generation = self.cache.generation(table) if self.cache is not None else None
+
+        query = (await self._table(table)).select(column)
+        query = apply_filters(query, filters).limit(1)
+
+        result, _ = await self._read(table, cache_key, lambda: self._execute(query, table, "select", column, filters, 1))
+        found = bool(result.data)
+        if self.cache is not None:
+            self.cache.set(table, cache_key, found, generation)
+        return found
+
+    async def _read(self, table: str, key: Any, execute: Callable[[], Awaitable[Any]]):
+        """Run a read, joining an identical one already in flight; returns (response, shared)"""
+        if self.flights is None:
+            return await execute(), False
+        return await self.flights.do(table, key, execute)
+
+    async def _execute(self, query, table: str, operation: str, columns: str = "", filters: Optional[FilterSpec] = None, *extra: Any):
+        """Send a built query under the execution policy, recording it in the request's QueryLog when one is active"""
+        disable_builtin_retry(query)
+        execute = async_executor(query)
+        if current_query_log() is None:
+            return await self.policy.run_async(operation, execute)
+        fingerprint = query_fingerprint(operation, table, columns, filters, *extra)
+        shape = query_shape(operation, table, filters)
+        return await self.policy.run_async(
+            operation, lambda: instrumented_async(table, operation, fingerprint, execute, shape=shape)
+        )
+
+    @staticmethod
+    async def _write_in_chunks(
+        items: Sequence[Any],
+        batch_size: int,
+        execute_chunk: Callable[[Sequence[Any]], Awaitable[Any]],
+        key_of: Optional[Callable[[Any], Any]] = None
+    ) -> BulkWriteResult:
+        """Await execute_chunk for every chunk of items, collecting rows and per-chunk errors"""
+        result = BulkWriteResult()
+        for index, chunk in enumerate(_chunks(items, batch_size)):
+            result.chunks += 1
+            try:
+                response = await execute_chunk(chunk)
+                result.rows.extend(response.data or [])
+            except Exception as e:
+                result.errors.append(ChunkError(
+                    chunk_index=index,
+                    size=len(chunk),
+                    error=str(e),
+                    keys=[key_of(item) for item in chunk] if key_of else [],
+                ))
+        return result
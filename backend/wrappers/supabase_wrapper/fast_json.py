@@ -0,0 +1,93 @@
+"""
+Fast JSON decoding/encoding for large result sets.
+
+postgrest-py decodes every response body with pydantic's generic JSON
+validator, which is several times slower than a plain parser on large row
+lists. ``executor(query)`` returns a callable that sends a PostgREST query
+and decodes the body with orjson instead, producing the same APIResponse
+(data + count) that ``query.execute()`` would. Only plain query builders
+(select/insert/update/upsert/delete chains) take the fast path;
+single/maybe_single/explain builders and test doubles keep their own
+``execute``.
+
+``loads``/``dumps`` are also used by ``backend.core.responses`` to render API
+responses.
+
+orjson is optional: without it everything falls back to the stdlib ``json``
+module. Set ``SUPABASE_FAST_JSON=false`` to send every query through
+postgrest-py's own ``execute``.
+"""
+import json
+import os
+from typing import Any, Awaitable, Callable
+
+from httpx import Headers
+from postgrest import APIError, APIResponse
+from postgrest._async.request_builder import AsyncQueryRequestBuilder
+from postgrest._sync.request_builder import SyncQueryRequestBuilder
+from postgrest.exceptions import generate_default_error_message
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_json_enabled() -> bool:
+    return os.getenv("SUPABASE_FAST_JSON", "true").lower() not in ("0", "false", "no")
+
+
+def decode_response(response) -> APIResponse:
+    """
+    Build the APIResponse for an httpx response the way postgrest-py does,
+    decoding the body with loads
+
+    Raises:
+        APIError: If PostgREST answered with an error status
+    """
+    if not response.is_success:
+        try:
+            error = loads(response.content)
+        except ValueError:
+            error = None
+        raise APIError(error if isinstance(error, dict) else generate_default_error_message(response))
+
+    count = APIResponse._get_count_from_http_request_response(response)
+    try:
+        data = loads(response.content) if response.content else []
+    except ValueError:
+        data = response.text or []
+    return APIResponse.model_construct(data=data, count=count)
+
+
+def executor(query) -> Callable[[], Any]:
+    """Zero-argument callable that runs a sync query, on the fast path when it applies"""
+    if not fast_json_enabled() or not isinstance(query, SyncQueryRequestBuilder):
+        return query.execute
+    return lambda: decode_response(query.request.send(Headers()))
+
+
+def async_executor(query) -> Callable[[], Awaitable[Any]]:
+    """Async counterpart of executor"""
+    if not fast_json_enabled() or not isinstance(query, AsyncQueryRequestBuilder):
+        return query.execute
+
+    async def execute():
+        return decode_response(await query.request.send(Headers()))
+    return execute
@@ -0,0 +1,289 @@
+"""
+Filter expressions for SupabaseCRUD queries.
+
+SupabaseCRUD historically accepted a dictionary of ``column: value`` pairs which
+were all compiled to equality checks. This module adds expression objects that
+compile to the other PostgREST operators so callers can push filtering into the
+database instead of downloading a whole table and filtering in Python.
+
+Example:
+    crud.select("tasks", filters=[
+        contains("assignee_ids", [user_id]),
+        gte("due_date", "2025-01-01"),
+        lte("due_date", "2025-01-31"),
+        or_(eq("status", "TO_DO"), eq("status", "IN_PROGRESS")),
+    ])
+
+A plain dictionary is still accepted everywhere and keeps its equality meaning.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+# PostgREST operator names
+EQ = "eq"
+NEQ = "neq"
+GT = "gt"
+GTE = "gte"
+LT = "lt"
+LTE = "lte"
+IN = "in"
+CONTAINS = "cs"
+OVERLAPS = "ov"
+IS = "is"
+
+# Characters that must be quoted inside or()/and() groups
+_RESERVED_CHARACTERS = set(',.:()"\\ ')
+
+
+class Condition:
+    """Base class for a single filter expression"""
+
+    def apply(self, query):
+        """Apply this condition to a postgrest query builder and return the builder"""
+        raise NotImplementedError
+
+    def to_postgrest(self) -> str:
+        """Render this condition in PostgREST logical-group syntax (used inside or/and)"""
+        raise NotImplementedError
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and self.to_postgrest() == other.to_postgrest()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__, self.to_postgrest()))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_postgrest()})"
+
+
+class Filter(Condition):
+    """
+    A single ``column <operator> value`` comparison
+
+    Args:
+        column: Column name
+        operator: PostgREST operator (eq, neq, gt, gte, lt, lte, in, cs, ov, is)
+        value: Value to compare against (iterable for in/cs/ov)
+        negate: Whether the comparison is wrapped in ``not``
+    """
+
+    def __init__(self, column: str, operator: str, value: Any, negate: bool = False):
+        self.column = column
+        self.operator = operator
+        self.value = value
+        self.negate = negate
+
+    def apply(self, query):
+        target = query.not_ if self.negate else query
+
+        if self.operator == EQ:
+            return target.eq(self.column, self.value)
+        if self.operator == NEQ:
+            return target.neq(self.column, self.value)
+        if self.operator == GT:
+            return target.gt(self.column, self.value)
+        if self.operator == GTE:
+            return target.gte(self.column, self.value)
+        if self.operator == LT:
+            return target.lt(self.column, self.value)
+        if self.operator == LTE:
+            return target.lte(self.column, self.value)
+        if self.operator == IN:
+            return target.in_(self.column, list(self.value))
+        if self.operator == CONTAINS:
+            return target.contains(self.column, list(self.value))
+        if self.operator == OVERLAPS:
+            return target.overlaps(self.column, list(self.value))
+        if self.operator == IS:
+            return target.is_(self.column, _format_scalar(self.value))
+
+        raise ValueError(f"Unsupported filter operator: {self.operator}")
+
+    def to_postgrest(self) -> str:
+        operator = f"not.{self.operator}" if self.negate else self.operator
+        return f"{self.column}.{operator}.{_format_operand(self.operator, self.value)}"
+
+
+class LogicalGroup(Condition):
+    """
+    An ``or`` / ``and`` group of conditions
+
+    Args:
+        operator: "or" or "and"
+        conditions: Conditions inside the group
+        negate: Whether the whole group is wrapped in ``not``
+    """
+
+    def __init__(self, operator: str, conditions: Sequence[Condition], negate: bool = False):
+        if not conditions:
+            raise ValueError(f"{operator}_ requires at least one condition")
+        self.operator = operator
+        self.conditions = list(conditions)
+        self.negate = negate
+
+    def apply(self, query):
+        if self.operator == "and" and not self.negate:
+            # A top-level and() is the same as applying each condition in turn
+            for condition in self.conditions:
+                query = condition.apply(query)
+            return query
+
+        if self.operator == "and":
+            # not(a AND b) == (not a) OR (not b), which the builder can express directly
+            return LogicalGroup("or", [not_(condition) for condition in self.conditions]).apply(query)
+
+        target = query.not_ if self.negate else query
+        return target.or_(",".join(condition.to_postgrest() for condition in self.conditions))
+
+    def to_postgrest(self) -> str:
+        prefix = f"not.{self.operator}" if self.negate else self.operator
+        inner = ",".join(condition.to_postgrest() for condition in self.conditions)
+        return f"{prefix}({inner})"
+
+
+def _format_scalar(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _quote(value: str) -> str:
+    if any(char in _RESERVED_CHARACTERS for char in value):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    return value
+
+
+def _format_operand(operator: str, value: Any) -> str:
+    if operator == IN:
+        return "(" + ",".join(_quote(_format_scalar(item)) for item in value) + ")"
+    if operator in (CONTAINS, OVERLAPS):
+        return "{" + ",".join(_quote(_format_scalar(item)) for item in value) + "}"
+    return _quote(_format_scalar(value))
+
+
+# Public constructors
+
+
+def eq(column: str, value: Any) -> Filter:
+    """column = value"""
+    return Filter(column, EQ, value)
+
+
+def neq(column: str, value: Any) -> Filter:
+    """column <> value"""
+    return Filter(column, NEQ, value)
+
+
+def gt(column: str, value: Any) -> Filter:
+    """column > value"""
+    return Filter(column, GT, value)
+
+
+def gte(column: str, value: Any) -> Filter:
+    """column >= value"""
+    return Filter(column, GTE, value)
+
+
+def lt(column: str, value: Any) -> Filter:
+    """column < value"""
+    return Filter(column, LT, value)
+
+
+def lte(column: str, value: Any) -> Filter:
+    """column <= value"""
+    return Filter(column, LTE, value)
+
+
+def in_(column: str, values: Iterable[Any]) -> Filter:
+    """column IN (values)"""
+    return Filter(column, IN, list(values))
+
+
+def contains(column: str, values: Iterable[Any]) -> Filter:
+    """Array column contains every one of values (PostgREST ``cs``)"""
+    return Filter(column, CONTAINS, list(values))
+
+
+def overlaps(column: str, values: Iterable[Any]) -> Filter:
+    """Array column shares at least one element with values (PostgREST ``ov``)"""
+    return Filter(column, OVERLAPS, list(values))
+
+
+def is_null(column: str) -> Filter:
+    """column IS NULL"""
+    return Filter(column, IS, None)
+
+
+def not_null(column: str) -> Filter:
+    """column IS NOT NULL"""
+    return Filter(column, IS, None, negate=True)
+
+
+def or_(*conditions: Condition) -> LogicalGroup:
+    """Match rows satisfying any of the conditions"""
+    return LogicalGroup("or", conditions)
+
+
+def and_(*conditions: Condition) -> LogicalGroup:
+    """Match rows satisfying all of the conditions (useful inside or_)"""
+    return LogicalGroup("and", conditions)
+
+
+def not_(condition: Condition) -> Condition:
+    """Negate a condition"""
+    if isinstance(condition, Filter):
+        return Filter(condition.column, condition.operator, condition.value, negate=not condition.negate)
+    if isinstance(condition, LogicalGroup):
+        return LogicalGroup(condition.operator, condition.conditions, negate=not condition.negate)
+    raise TypeError(f"Cannot negate {condition!r}")
+
+
+FilterSpec = Union[Dict[str, Any], Sequence[Condition]]
+
+
+def normalize_filters(filters: Optional[FilterSpec]) -> List[Condition]:
+    """
+    Convert any accepted filter specification into a list of conditions
+
+    Args:
+        filters: Dictionary of column: value equality filters, or a sequence of conditions
+
+    Returns:
+        List of Condition objects (empty when no filters were given)
+    """
+    if not filters:
+        return []
+    if isinstance(filters, dict):
+        return [value if isinstance(value, Condition) else eq(column, value) for column, value in filters.items()]
+    if isinstance(filters, Condition):
+        return [filters]
+    return list(filters)
+
+
+def apply_filters(query, filters: Optional[FilterSpec]):
+    """
+    Apply a filter specification to a postgrest query builder
+
+    Args:
+        query: postgrest request builder
+        filters: Dictionary of column: value equality filters, or a sequence of conditions
+
+    Returns:
+        The query builder with all filters applied
+    """
+    if not filters:
+        return query
+
+    if isinstance(filters, dict):
+        for column, value in filters.items():
+            if isinstance(value, Condition):
+                query = value.apply(query)
+            else:
+                query = query.eq(column, value)
+        return query
+
+    for condition in normalize_filters(filters):
+        query = condition.apply(query)
+    return query
@@ -0,0 +1,129 @@
+"""
+Request-scoped identity map over SupabaseCRUD.
+
+One logical operation (for example TaskUpdater.update_tasks) often reads the
+same row several times: for the previous state, for a permission check and
+again after writing it. An IdentityMap remembers every row it has fetched or
+written by ``(table, id)``, so each row costs one round trip per operation.
+Rows returned by the map's own writes replace the remembered version, so
+later reads see the post-write state without going back to the database.
+
+The map is meant to live for a single request or operation. It does not see
+writes made by other requests, so do not share it between them.
+"""
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .filters import FilterSpec, in_
+
+
+class IdentityMap:
+    """
+    Row cache keyed by (table, primary key), backed by a SupabaseCRUD
+
+    Args:
+        crud: SupabaseCRUD (or compatible) used for misses and writes
+        id_column: Primary key column shared by the mapped tables
+    """
+
+    def __init__(self, crud, id_column: str = "id"):
+        self.crud = crud
+        self.id_column = id_column
+        # (table, id) -> row, or None when the row is known not to exist
+        self._rows: Dict[Tuple[str, Hashable], Optional[Dict[str, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, table: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Remember rows that were fetched elsewhere (e.g. prefetched by the router)"""
+        for row in rows or []:
+            if row and row.get(self.id_column) is not None:
+                self._rows[(table, row[self.id_column])] = dict(row)
+
+    def forget(self, table: str, row_id: Optional[Hashable] = None) -> None:
+        """Drop one remembered row, or every row of a table"""
+        if row_id is not None:
+            self._rows.pop((table, row_id), None)
+            return
+        for key in [key for key in self._rows if key[0] == table]:
+            del self._rows[key]
+
+    def get(self, table: str, row_id: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Get a row by id, fetching it on first access
+
+        Returns:
+            A copy of the row, or None if it does not exist
+        """
+        key = (table, row_id)
+        if key in self._rows:
+            self.hits += 1
+            row = self._rows[key]
+            return dict(row) if row is not None else None
+
+        self.misses += 1
+        rows = self.crud.select(table, filters={self.id_column: row_id})
+        row = rows[0] if rows else None
+        self._rows[key] = dict(row) if row is not None else None
+        return dict(row) if row is not None else None
+
+    def get_many(self, table: str, row_ids: Iterable[Hashable]) -> Dict[Hashable, Dict[str, Any]]:
+        """
+        Get several rows by id, fetching all missing ones in a single query
+
+        Returns:
+            Mapping of id to a copy of the row, for the ids that exist
+        """
+        row_ids = list(dict.fromkeys(row_ids))
+        missing = [row_id for row_id in row_ids if (table, row_id) not in self._rows]
+        self.hits += len(row_ids) - len(missing)
+
+        if missing:
+            self.misses += len(missing)
+            fetched = self.crud.select(table, filters=[in_(self.id_column, missing)]) or []
+            for row_id in missing:
+                self._rows[(table, row_id)] = None
+            self.add(table, fetched)
+
+        found = {}
+        for row_id in row_ids:
+            row = self._rows.get((table, row_id))
+            if row is not None:
+                found[row_id] = dict(row)
+        return found
+
+    def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert through the CRUD and remember the created row"""
+        row = self.crud.insert(table, data)
+        if row:
+            self.add(table, [row])
+        return row
+
+    def update(self, table: str, data: Dict[str, Any], filters: FilterSpec) -> List[Dict[str, Any]]:
+        """Update through the CRUD and refresh the remembered rows it returned"""
+        self._forget_filtered_id(table, filters)
+        rows = self.crud.update(table, data, filters)
+        self.add(table, rows if isinstance(rows, list) else [rows])
+        return rows
+
+    def update_many(self, table: str, data: Dict[str, Any], ids: Iterable[Hashable], **kwargs):
+        """Bulk update through the CRUD and refresh the remembered rows it returned"""
+        ids = list(ids)
+        for row_id in ids:
+            self.forget(table, row_id)
+        result = self.crud.update_many(table, data, ids, **kwargs)
+        self.add(table, result.rows)
+        return result
+
+    def delete(self, table: str, filters: FilterSpec) -> List[Dict[str, Any]]:
+        """Delete through the CRUD and remember the deleted rows as missing"""
+        self._forget_filtered_id(table, filters)
+        rows = self.crud.delete(table, filters)
+        for row in rows or []:
+            if row.get(self.id_column) is not None:
+                self._rows[(table, row[self.id_column])] = None
+        return rows
+
+    def _forget_filtered_id(self, table: str, filters: FilterSpec) -> None:
+        # A write that targets one id may change that row even if nothing is returned
+        if isinstance(filters, dict) and self.id_column in filters:
+            self.forget(table, filters[self.id_column])
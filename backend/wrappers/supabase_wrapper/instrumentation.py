@@ -0,0 +1,303 @@
+"""
+Per-request instrumentation of Supabase calls.
+
+While a QueryLog is active (see ``capture_queries`` and the
+``QueryInstrumentationMiddleware``), every PostgREST and Storage round trip
+made through SupabaseCRUD, AsyncSupabaseCRUD, SupabaseStorage or
+AsyncSupabaseStorage is recorded with its table, operation, latency and row
+count. Response sizes are only known for Storage downloads (raw bytes); a log
+created with ``measure_bytes=True`` also sizes PostgREST responses by
+re-serializing the returned rows, which costs about as much as parsing them
+did, so it is meant for profiling sessions rather than every request. Sizes
+that were not measured are recorded as None rather than 0. The log lives in a
+ContextVar, so it follows the request across ``await`` points and
+``run_in_threadpool`` calls, and nothing is recorded when no log is active.
+
+The log can then flag the usual data-layer smells:
+- too many calls for one request
+- the exact same query sent more than once (a missed reuse)
+- the same query shape sent many times with different values (N+1)
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from .fast_json import dumps
+from .filters import FilterSpec, Condition, Filter, LogicalGroup, normalize_filters
+
+# A request making more calls than this is reported as chatty
+DEFAULT_MAX_CALLS = 20
+# A query shape repeated this many times with different values looks like N+1
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+
+
+@dataclass
+class QueryRecord:
+    """One round trip to Supabase"""
+    table: str
+    operation: str
+    fingerprint: str
+    shape: str
+    duration_ms: float
+    rows: int
+    # None when the size was not measured (see QueryLog.measure_bytes)
+    response_bytes: Optional[int]
+    error: Optional[str] = None
+
+
+def query_fingerprint(
+    operation: str,
+    table: str,
+    columns: str = "",
+    filters: Optional[FilterSpec] = None,
+    *extra: Any
+) -> str:
+    """
+    Identify a query by everything that determines its result
+
+    Args:
+        operation: select, insert, update, delete, count, upload, ...
+        table: Table (or storage bucket) name
+        columns: Projection string
+        filters: Filter specification; condition order does not matter
+        extra: Further result-affecting arguments (limit, order, ids, ...)
+
+    Returns:
+        Human-readable fingerprint, e.g. "select tasks [*] id=eq.t1"
+    """
+    rendered = " ".join(sorted(condition.to_postgrest() for condition in normalize_filters(filters)))
+    parts = [operation, table, f"[{columns}]" if columns else "", rendered] + [str(value) for value in extra]
+    return " ".join(part for part in parts if part)
+
+
+def payload_digest(payload: Any) -> str:
+    """Short stable digest of a write payload, so identical writes share a fingerprint"""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:12]
+
+
+def _condition_shape(condition: Condition) -> str:
+    if isinstance(condition, LogicalGroup):
+        inner = ",".join(sorted(_condition_shape(c) for c in condition.conditions))
+        return f"{'not.' if condition.negate else ''}{condition.operator}({inner})"
+    if isinstance(condition, Filter):
+        return f"{condition.column}.{'not.' if condition.negate else ''}{condition.operator}"
+    return type(condition).__name__
+
+
+def query_shape(operation: str, table: str, filters: Optional[FilterSpec] = None) -> str:
+    """Fingerprint with the filter values stripped, used to spot N+1 patterns"""
+    shapes = sorted(_condition_shape(condition) for condition in normalize_filters(filters))
+    return " ".join([operation, table] + shapes)
+
+
+class QueryLog:
+    """
+    Calls recorded during one request
+
+    Args:
+        max_calls: Call count above which the request is flagged
+        n_plus_one_threshold: Repeats of one query shape that count as N+1
+        measure_bytes: Size row payloads by re-serializing them (slow; raw
+            byte responses are always sized)
+    """
+
+    def __init__(
+        self,
+        max_calls: int = DEFAULT_MAX_CALLS,
+        n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD,
+        measure_bytes: bool = False,
+    ):
+        self.max_calls = max_calls
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.measure_bytes = measure_bytes
+        self._lock = threading.Lock()
+        self._records: List[QueryRecord] = []
+
+    def record(self, record: QueryRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    @property
+    def records(self) -> List[QueryRecord]:
+        with self._lock:
+            return list(self._records)
+
+    @property
+    def call_count(self) -> int:
+        return len(self.records)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(record.duration_ms for record in self.records)
+
+    def repeated_queries(self) -> Dict[str, int]:
+        """Fingerprints sent more than once, with their counts"""
+        counts = Counter(record.fingerprint for record in self.records)
+        return {fingerprint: count for fingerprint, count in counts.items() if count > 1}
+
+    def n_plus_one_suspects(self) -> Dict[str, int]:
+        """Query shapes sent at least n_plus_one_threshold times with different values"""
+        records = self.records
+        shapes = Counter(record.shape for record in records)
+        suspects = {}
+        for shape, count in shapes.items():
+            distinct = {record.fingerprint for record in records if record.shape == shape}
+            if count >= self.n_plus_one_threshold and len(distinct) > 1:
+                suspects[shape] = count
+        return suspects
+
+    def warnings(self) -> List[str]:
+        """Human-readable problems found in this request's calls"""
+        found = []
+        if self.call_count > self.max_calls:
+            found.append(f"{self.call_count} Supabase calls (threshold {self.max_calls})")
+        for fingerprint, count in self.repeated_queries().items():
+            found.append(f"repeated {count}x: {fingerprint}")
+        for shape, count in self.n_plus_one_suspects().items():
+            found.append(f"possible N+1, {count}x: {shape}")
+        return found
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate view of the request's calls, suitable for logging as JSON"""
+        records = self.records
+        by_table: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            entry = by_table.setdefault(record.table, {"calls": 0, "ms": 0.0, "rows": 0, "bytes": None})
+            entry["calls"] += 1
+            entry["ms"] = round(entry["ms"] + record.duration_ms, 3)
+            entry["rows"] += record.rows
+            entry["bytes"] = _add_bytes(entry["bytes"], record.response_bytes)
+        response_bytes = None
+        for record in records:
+            response_bytes = _add_bytes(response_bytes, record.response_bytes)
+        return {
+            "calls": len(records),
+            "total_ms": round(sum(record.duration_ms for record in records), 3),
+            "rows": sum(record.rows for record in records),
+            "response_bytes": response_bytes,
+            "errors": sum(1 for record in records if record.error),
+            "tables": by_table,
+            "warnings": self.warnings(),
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [asdict(record) for record in self.records]
+
+
+def _add_bytes(total: Optional[int], size: Optional[int]) -> Optional[int]:
+    """Sum of the measured sizes; None while none was measured"""
+    if size is None:
+        return total
+    return size if total is None else total + size
+
+
+_current_log: ContextVar[Optional[QueryLog]] = ContextVar("supabase_query_log", default=None)
+
+
+def current_query_log() -> Optional[QueryLog]:
+    """The QueryLog of the current request, or None when nothing is being recorded"""
+    return _current_log.get()
+
+
+@contextmanager
+def capture_queries(log: Optional[QueryLog] = None) -> Iterator[QueryLog]:
+    """
+    Record every Supabase call made inside the block
+
+    Usage:
+        with capture_queries() as log:
+            TaskReader().get_tasks_for_user(user_id)
+        print(log.summary())
+    """
+    log = log or QueryLog()
+    token = _current_log.set(log)
+    try:
+        yield log
+    finally:
+        _current_log.reset(token)
+
+
+def _measure(result: Any, measure_bytes: bool = False) -> tuple:
+    """Row count and response size (raw bytes, or re-serialized rows when measure_bytes is set; else None)"""
+    data = getattr(result, "data", result)
+    if isinstance(data, list):
+        rows = len(data)
+    else:
+        rows = 1 if data else 0
+    if isinstance(data, (bytes, bytearray)):
+        return rows, len(data)
+    if not measure_bytes:
+        return rows, None
+    if data is None:
+        return rows, 0
+    try:
+        return rows, len(dumps(data))
+    except (TypeError, ValueError):
+        return rows, None
+
+
+def _record(log: QueryLog, table: str, operation: str, fingerprint: str, shape: str,
+            started: float, result: Any = None, error: Optional[BaseException] = None) -> None:
+    rows, size = _measure(result, log.measure_bytes) if error is None else (0, None)
+    log.record(QueryRecord(
+        table=table,
+        operation=operation,
+        fingerprint=fingerprint,
+        shape=shape or fingerprint,
+        duration_ms=round((time.perf_counter() - started) * 1000, 3),
+        rows=rows,
+        response_bytes=size,
+        error=type(error).__name__ if error is not None else None,
+    ))
+
+
+def instrumented(table: str, operation: str, fingerprint: str, call: Callable[[], Any], shape: str = "") -> Any:
+    """
+    Run one Supabase call, recording it in the current QueryLog (if any)
+
+    Args:
+        table: Table or bucket name
+        operation: Operation name
+        fingerprint: See query_fingerprint
+        call: Zero-argument callable performing the round trip
+        shape: See query_shape (defaults to the fingerprint)
+
+    Returns:
+        Whatever call returns
+    """
+    log = _current_log.get()
+    if log is None:
+        return call()
+
+    started = time.perf_counter()
+    try:
+        result = call()
+    except BaseException as e:
+        _record(log, table, operation, fingerprint, shape, started, error=e)
+        raise
+    _record(log, table, operation, fingerprint, shape, started, result=result)
+    return result
+
+
+async def instrumented_async(table: str, operation: str, fingerprint: str,
+                             call: Callable[[], Awaitable[Any]], shape: str = "") -> Any:
+    """Async counterpart of instrumented"""
+    log = _current_log.get()
+    if log is None:
+        return await call()
+
+    started = time.perf_counter()
+    try:
+        result = await call()
+    except BaseException as e:
+        _record(log, table, operation, fingerprint, shape, started, error=e)
+        raise
+    _record(log, table, operation, fingerprint, shape, started, result=result)
+    return result
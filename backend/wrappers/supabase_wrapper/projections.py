@@ -0,0 +1,108 @@
+"""
+Named column projections for SupabaseCRUD queries.
+
+``select("*")`` downloads every column of every row: password hashes on users,
+and the inline ``comments`` / ``attachments`` JSON arrays on tasks. This module
+keeps one registry of named column sets per table and use case, so each caller
+asks for the narrowest set it needs.
+
+Example:
+    crud.select("users", columns=projection("users", USER_DIRECTORY))
+"""
+from typing import Dict, Iterable, Tuple
+
+# Projection names
+TASK_FULL = "task_full"
+TASK_SUMMARY = "task_summary"
+TASK_TIME_LOG = "task_time_log"
+TASK_VISIBILITY = "task_visibility"
+TASK_SEARCH = "task_search"
+USER_DIRECTORY = "user_directory"
+USER_DEPARTMENTS = "user_departments"
+USER_AUTH = "user_auth"
+PROJECT_NAME = "project_name"
+PROJECT_COLLABORATORS = "project_collaborators"
+
+_TASK_SUMMARY_COLUMNS = (
+    "id",
+    "title",
+    "status",
+    "priority",
+    "due_date",
+    "parent_id",
+    "project_id",
+    "owner_user_id",
+    "assignee_ids",
+    "is_archived",
+)
+
+_USER_DIRECTORY_COLUMNS = ("uuid", "email", "role", "departments", "teams")
+
+# table -> projection name -> columns; ("*",) means every column
+_PROJECTIONS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "tasks": {
+        TASK_FULL: ("*",),
+        TASK_SUMMARY: _TASK_SUMMARY_COLUMNS,
+        TASK_TIME_LOG: _TASK_SUMMARY_COLUMNS + ("time_log",),
+        TASK_VISIBILITY: ("id", "parent_id", "owner_user_id", "assignee_ids", "is_archived", "due_date"),
+        TASK_SEARCH: ("id", "title", "description", "is_archived"),
+    },
+    "users": {
+        USER_DIRECTORY: _USER_DIRECTORY_COLUMNS,
+        USER_DEPARTMENTS: ("uuid", "departments"),
+        USER_AUTH: ("uuid", "email", "role", "departments", "password_hash"),
+    },
+    "projects": {
+        PROJECT_NAME: ("id", "name"),
+        PROJECT_COLLABORATORS: ("id", "collaborator_ids"),
+    },
+}
+
+
+def projection_columns(table: str, name: str) -> Tuple[str, ...]:
+    """
+    Look up the columns of a named projection
+
+    Args:
+        table: Table name
+        name: Projection name registered for the table
+
+    Returns:
+        Tuple of column names
+
+    Raises:
+        ValueError: If no such projection is registered
+    """
+    try:
+        return _PROJECTIONS[table][name]
+    except KeyError:
+        raise ValueError(f"Unknown projection '{name}' for table '{table}'") from None
+
+
+def projection(table: str, name: str) -> str:
+    """
+    Render a named projection as a PostgREST select string
+
+    Args:
+        table: Table name
+        name: Projection name registered for the table
+
+    Returns:
+        Comma-separated column list suitable for SupabaseCRUD.select(columns=...)
+    """
+    return ", ".join(projection_columns(table, name))
+
+
+def register_projection(table: str, name: str, columns: Iterable[str]) -> None:
+    """
+    Register (or replace) a named projection
+
+    Args:
+        table: Table name
+        name: Projection name
+        columns: Column names to select
+    """
+    columns = tuple(columns)
+    if not columns:
+        raise ValueError("A projection needs at least one column")
+    _PROJECTIONS.setdefault(table, {})[name] = columns
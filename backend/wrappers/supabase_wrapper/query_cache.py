@@ -0,0 +1,228 @@
+"""
+Read-through cache for SupabaseCRUD queries.
+
+Identical reads (``select("users")``, ``select("projects")`` ...) repeat across
+requests and across report generators within one request. When a QueryCache is
+attached, SupabaseCRUD.select and SupabaseCRUD.count are answered from memory
+until the entry's table TTL expires, and every write through SupabaseCRUD drops
+the cached entries of the table it touched. A read that was already in flight
+when the write landed captured the table's generation before it started, so
+its (possibly stale) result is not stored.
+
+The process-wide cache is off by default. Enable it with the environment
+variable ``SUPABASE_QUERY_CACHE=true``; ``SUPABASE_QUERY_CACHE_SIZE`` bounds the
+number of entries. Writes made outside this process (or through the raw
+``crud.client``) are only picked up once the TTL expires, which is why the
+per-table TTLs are short; code that writes through the raw client should
+invalidate the table itself.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .filters import FilterSpec, normalize_filters
+
+# Seconds a cached result stays fresh, per table. Users and projects change
+# rarely; tasks are edited constantly so they get a short window.
+DEFAULT_TABLE_TTLS: Dict[str, float] = {
+    "users": 300.0,
+    "projects": 60.0,
+    "tasks": 5.0,
+}
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 1024
+
+
+@dataclass
+class CacheStats:
+    """Counters for sizing the cache"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def make_cache_key(operation: str, columns: str, filters: Optional[FilterSpec], *extra: Any) -> Tuple[Hashable, ...]:
+    """
+    Build a cache key from the parts of a query that determine its result
+
+    Args:
+        operation: "select" or "count"
+        columns: Projection string
+        filters: Filter specification (dict or conditions); order does not matter
+        extra: Any further result-affecting arguments (limit, order_by, ...)
+
+    Returns:
+        Hashable key (the table is tracked separately by QueryCache)
+    """
+    rendered = tuple(sorted(condition.to_postgrest() for condition in normalize_filters(filters)))
+    return (operation, columns, rendered) + tuple(extra)
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of query results with a per-table TTL
+
+    Args:
+        max_entries: Upper bound on cached results across all tables
+        table_ttls: Seconds each table's results stay fresh
+        default_ttl: TTL for tables not listed in table_ttls
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        table_ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.table_ttls = dict(DEFAULT_TABLE_TTLS if table_ttls is None else table_ttls)
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (table, key) -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._stats = CacheStats()
+        # Bumped by invalidate; a result read under an older generation is not stored
+        self._generations: Dict[str, int] = {}
+        self._global_generation = 0
+
+    def ttl_for(self, table: str) -> float:
+        return self.table_ttls.get(table, self.default_ttl)
+
+    def get(self, table: str, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached result
+
+        Returns:
+            (True, value) on a fresh hit, (False, None) otherwise
+        """
+        with self._lock:
+            entry = self._entries.get((table, key))
+            if entry is None:
+                self._stats.misses += 1
+                return False, None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[(table, key)]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return False, None
+
+            self._entries.move_to_end((table, key))
+            self._stats.hits += 1
+            return True, value
+
+    def generation(self, table: str) -> int:
+        """
+        Current generation of table; capture it before reading and pass it to set
+
+        Returns:
+            A number that grows every time table (or every table) is invalidated
+        """
+        with self._lock:
+            return self._global_generation + self._generations.get(table, 0)
+
+    def set(self, table: str, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Store a result, evicting least recently used entries past max_entries
+
+        Args:
+            table: Table the result was read from
+            key: Cache key of the query
+            value: The result
+            generation: generation(table) captured before the read; the result
+                is dropped if the table was invalidated since
+        """
+        ttl = self.ttl_for(table)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._global_generation + self._generations.get(table, 0):
+                return
+            self._entries[(table, key)] = (self._clock() + ttl, value)
+            self._entries.move_to_end((table, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate(self, table: Optional[str] = None) -> int:
+        """
+        Drop cached results for one table (or every table)
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            if table is None:
+                self._global_generation += 1
+                stale = list(self._entries)
+            else:
+                self._generations[table] = self._generations.get(table, 0) + 1
+                stale = [entry_key for entry_key in self._entries if entry_key[0] == table]
+            for entry_key in stale:
+                del self._entries[entry_key]
+            self._stats.invalidations += len(stale)
+            return len(stale)
+
+    def stats(self) -> CacheStats:
+        """Snapshot of the cache counters"""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                expirations=self._stats.expirations,
+                invalidations=self._stats.invalidations,
+                size=len(self._entries),
+            )
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._global_generation += 1
+            self._entries.clear()
+            self._stats = CacheStats()
+
+
+_shared_cache: Optional[QueryCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def _cache_enabled() -> bool:
+    return os.getenv("SUPABASE_QUERY_CACHE", "false").lower() in ("1", "true", "yes")
+
+
+def get_shared_cache() -> Optional[QueryCache]:
+    """
+    Process-wide cache used by SupabaseCRUD instances created without one
+
+    Returns:
+        The shared QueryCache, or None when SUPABASE_QUERY_CACHE is not enabled
+    """
+    global _shared_cache
+    if not _cache_enabled():
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = QueryCache(
+                    max_entries=int(os.getenv("SUPABASE_QUERY_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+                )
+    return _shared_cache
@@ -0,0 +1,388 @@
+"""
+Execution policy for Supabase calls: time budgets, retries and a circuit breaker.
+
+Every round trip made by SupabaseCRUD / AsyncSupabaseCRUD goes through
+``ExecutionPolicy.run`` (or ``run_async``):
+
+- Timeouts: the HTTP client timeout comes from ``SUPABASE_TIMEOUT_SECONDS``
+  (see ``client_timeout``). On top of that each operation has a time budget
+  covering all of its attempts; a retry is only scheduled if it can start
+  inside the budget. Async calls are additionally cancelled once the budget
+  is spent.
+- Retries: only idempotent operations (select, count, update, upsert) are
+  retried, only on transient errors (network failures, timeouts, 502/503/
+  504/429, serialization failures and deadlocks), with full-jitter
+  exponential backoff. Deletes are not retried: when the first attempt
+  committed but its response was lost, the retry deletes nothing and returns
+  no rows, so the write listeners (search, visibility and calendar indexes)
+  would never learn which tasks went away. Statement timeouts are not
+  retried either; running the same expensive query again only adds load.
+  postgrest-py's own fixed-delay retry is switched off so there is one policy.
+- Circuit breaker: after ``failure_threshold`` consecutive transient failures
+  the breaker opens and calls fail immediately with CircuitOpenError for
+  ``reset_timeout`` seconds, then a single trial call decides whether to close
+  it again. This keeps worker threads from piling up behind a dead upstream.
+
+Counters and per-operation latency are kept in ``ResilienceMetrics``.
+
+Environment (all optional):
+    SUPABASE_TIMEOUT_SECONDS          HTTP timeout per request (default 10)
+    SUPABASE_READ_BUDGET_SECONDS      budget for select/count (default 10)
+    SUPABASE_WRITE_BUDGET_SECONDS     budget for writes (default 20)
+    SUPABASE_RETRY_ATTEMPTS           attempts per idempotent call (default 3)
+    SUPABASE_RETRY_BASE_DELAY         first backoff ceiling in seconds (default 0.1)
+    SUPABASE_RETRY_MAX_DELAY          backoff ceiling in seconds (default 2)
+    SUPABASE_BREAKER_THRESHOLD        consecutive failures that open the breaker (default 5)
+    SUPABASE_BREAKER_RESET_SECONDS    seconds the breaker stays open (default 30)
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional
+
+import httpx
+from postgrest.exceptions import APIError
+
+READ_OPERATIONS: FrozenSet[str] = frozenset({"select", "count"})
+IDEMPOTENT_OPERATIONS: FrozenSet[str] = frozenset({"select", "count", "update", "upsert"})
+
+# PostgREST / HTTP codes worth retrying: gateway errors, rate limiting, and
+# Postgres serialization failure and deadlock
+TRANSIENT_ERROR_CODES: FrozenSet[str] = frozenset({"429", "502", "503", "504", "520", "40001", "40P01"})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Supabase while the circuit breaker is open"""
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether an error is worth retrying (and counts against the breaker)"""
+    if isinstance(error, (httpx.TransportError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, APIError):
+        return str(error.code) in TRANSIENT_ERROR_CODES
+    return False
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def client_timeout() -> httpx.Timeout:
+    """HTTP timeout for the Supabase clients"""
+    seconds = _env_float("SUPABASE_TIMEOUT_SECONDS", 10.0)
+    return httpx.Timeout(seconds, connect=min(seconds, 5.0))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    Args:
+        failure_threshold: Consecutive transient failures that open the breaker
+        reset_timeout: Seconds to stay open before allowing a trial call
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (claims the trial slot when half-open)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() - self._opened_at < self.reset_timeout:
+                return False
+            if self._trial_in_flight:
+                return False
+            self._state = HALF_OPEN
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.trips += 1
+                self._state = OPEN
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give back a half-open trial slot whose call ended without a verdict"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+@dataclass
+class OperationStats:
+    """Latency of one operation type, over all attempts"""
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+@dataclass
+class ResilienceMetrics:
+    """Counters exported by the execution policy"""
+    attempts: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    short_circuits: int = 0
+    operations: Dict[str, OperationStats] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "short_circuits": self.short_circuits,
+            "operations": {
+                name: {"calls": stats.calls, "avg_ms": round(stats.avg_ms, 3), "max_ms": round(stats.max_ms, 3)}
+                for name, stats in self.operations.items()
+            },
+        }
+
+
+class ExecutionPolicy:
+    """
+    Timeouts, retries and circuit breaking around Supabase round trips
+
+    Args:
+        max_attempts: Attempts per idempotent call (1 disables retries)
+        base_delay: Backoff ceiling before the first retry; doubles per retry
+        max_delay: Upper bound for the backoff ceiling
+        read_budget: Seconds select/count may take including retries
+        write_budget: Seconds writes may take including retries
+        budgets: Per-operation overrides of the two budgets
+        breaker: Circuit breaker shared by every call using this policy
+        sleep: Blocking sleep (injectable for tests)
+        clock: Monotonic time source (injectable for tests)
+        rng: Random source for jitter
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+        read_budget: float = 10.0,
+        write_budget: float = 20.0,
+        budgets: Optional[Dict[str, float]] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.read_budget = read_budget
+        self.write_budget = write_budget
+        self.budgets = dict(budgets or {})
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._metrics = ResilienceMetrics()
+
+    def budget_for(self, operation: str) -> float:
+        if operation in self.budgets:
+            return self.budgets[operation]
+        return self.read_budget if operation in READ_OPERATIONS else self.write_budget
+
+    def backoff(self, retry_number: int) -> float:
+        """Full-jitter delay before the given retry (1-based)"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (retry_number - 1)))
+        return self._rng.uniform(0, ceiling)
+
+    def run(self, operation: str, call: Callable[[], Any]) -> Any:
+        """
+        Execute call under the policy
+
+        Args:
+            operation: select, count, insert, update, delete, upsert, ...
+            call: Zero-argument callable performing one round trip
+
+        Returns:
+            Whatever call returns
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            Exception: The last error once retries are exhausted or not allowed
+        """
+        deadline = self._clock() + self.budget_for(operation)
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before_attempt()
+            started = self._clock()
+            try:
+                result = call()
+            except Exception as e:
+                delay = self._after_failure(operation, e, attempt, started, deadline)
+                if delay is None:
+                    raise
+                self._sleep(delay)
+                continue
+            self._after_success(operation, started)
+            return result
+
+    async def run_async(self, operation: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of run; each attempt is also cancelled at the deadline"""
+        deadline = self._clock() + self.budget_for(operation)
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before_attempt()
+            started = self._clock()
+            try:
+                result = await asyncio.wait_for(call(), timeout=max(deadline - started, 0.001))
+            except Exception as e:
+                delay = self._after_failure(operation, e, attempt, started, deadline)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._after_success(operation, started)
+            return result
+
+    def metrics(self) -> ResilienceMetrics:
+        """Snapshot of the counters"""
+        with self._lock:
+            return ResilienceMetrics(
+                attempts=self._metrics.attempts,
+                successes=self._metrics.successes,
+                failures=self._metrics.failures,
+                retries=self._metrics.retries,
+                timeouts=self._metrics.timeouts,
+                short_circuits=self._metrics.short_circuits,
+                operations={
+                    name: OperationStats(stats.calls, stats.total_ms, stats.max_ms)
+                    for name, stats in self._metrics.operations.items()
+                },
+            )
+
+    def _before_attempt(self) -> None:
+        if not self.breaker.allow():
+            with self._lock:
+                self._metrics.short_circuits += 1
+            raise CircuitOpenError("Supabase circuit breaker is open; failing fast")
+        with self._lock:
+            self._metrics.attempts += 1
+
+    def _observe(self, operation: str, started: float) -> None:
+        elapsed_ms = (self._clock() - started) * 1000
+        stats = self._metrics.operations.setdefault(operation, OperationStats())
+        stats.calls += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+    def _after_success(self, operation: str, started: float) -> None:
+        self.breaker.record_success()
+        with self._lock:
+            self._metrics.successes += 1
+            self._observe(operation, started)
+
+    def _after_failure(self, operation: str, error: Exception, attempt: int,
+                       started: float, deadline: float) -> Optional[float]:
+        """Record a failed attempt and return the delay before retrying, or None to give up"""
+        transient = is_transient(error)
+        if transient:
+            self.breaker.record_failure()
+        else:
+            # The upstream answered; a client-side error says nothing about its health
+            self.breaker.release()
+
+        with self._lock:
+            self._metrics.failures += 1
+            if isinstance(error, (httpx.TimeoutException, TimeoutError, asyncio.TimeoutError)):
+                self._metrics.timeouts += 1
+            self._observe(operation, started)
+
+        if not transient or operation not in IDEMPOTENT_OPERATIONS or attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt)
+        if self._clock() + delay >= deadline:
+            return None
+        with self._lock:
+            self._metrics.retries += 1
+        return delay
+
+
+def disable_builtin_retry(query) -> None:
+    """Turn off postgrest-py's own fixed-delay retry so the policy is the only one"""
+    request = getattr(query, "request", None)
+    if request is not None and hasattr(request, "retry_enabled"):
+        request.retry_enabled = False
+
+
+_shared_policy: Optional[ExecutionPolicy] = None
+_shared_policy_lock = threading.Lock()
+
+
+def get_execution_policy() -> ExecutionPolicy:
+    """
+    Process-wide policy (and breaker) used by CRUD instances created without one
+
+    Returns:
+        The shared ExecutionPolicy, configured from the environment on first use
+    """
+    global _shared_policy
+    if _shared_policy is None:
+        with _shared_policy_lock:
+            if _shared_policy is None:
+                _shared_policy = ExecutionPolicy(
+                    max_attempts=int(os.getenv("SUPABASE_RETRY_ATTEMPTS", 3)),
+                    base_delay=_env_float("SUPABASE_RETRY_BASE_DELAY", 0.1),
+                    max_delay=_env_float("SUPABASE_RETRY_MAX_DELAY", 2.0),
+                    read_budget=_env_float("SUPABASE_READ_BUDGET_SECONDS", 10.0),
+                    write_budget=_env_float("SUPABASE_WRITE_BUDGET_SECONDS", 20.0),
+                    breaker=CircuitBreaker(
+                        failure_threshold=int(os.getenv("SUPABASE_BREAKER_THRESHOLD", 5)),
+                        reset_timeout=_env_float("SUPABASE_BREAKER_RESET_SECONDS", 30.0),
+                    ),
+                )
+    return _shared_policy
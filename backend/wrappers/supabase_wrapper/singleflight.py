@@ -0,0 +1,176 @@
+"""
+Coalescing of identical concurrent reads ("singleflight").
+
+When many requests ask for the same rows at the same moment (everyone opening
+the dashboard runs ``select("tasks")`` and ``select("users", ...)``), only the
+first caller goes to Supabase; callers that arrive while that read is in
+flight wait for it and receive the same result. Nothing is cached: once the
+read finishes, the next caller starts a new one.
+
+SingleFlight serves the threaded sync path (SupabaseCRUD under FastAPI's
+threadpool) and AsyncSingleFlight the asyncio path (AsyncSupabaseCRUD).
+Writes call ``forget(table)`` so that a read issued after a write never joins
+a flight that started before it.
+
+Coalescing is on by default; set ``SUPABASE_COALESCE_READS=false`` to turn it
+off.
+"""
+import asyncio
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class CoalescingStats:
+    """Counters for coalesced reads"""
+    executed: int = 0   # reads that went upstream
+    coalesced: int = 0  # reads answered by joining one already in flight
+
+    @property
+    def saved_ratio(self) -> float:
+        total = self.executed + self.coalesced
+        return self.coalesced / total if total else 0.0
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Thread-safe coalescing of identical blocking calls"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Tuple[str, Hashable], _Flight] = {}
+        self._stats = CoalescingStats()
+
+    def do(self, table: str, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn, or wait for an identical call that is already running
+
+        Args:
+            table: Table the read targets (used by forget)
+            key: Identity of the read within the table
+            fn: Zero-argument callable performing the read
+
+        Returns:
+            (result, shared) where shared is True when more than one caller
+            received this result, so mutable results must be copied
+        """
+        flight_key = (table, key)
+        with self._lock:
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[flight_key] = _Flight()
+                self._stats.executed += 1
+            else:
+                flight.waiters += 1
+                self._stats.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(flight_key) is flight:
+                    del self._flights[flight_key]
+            flight.done.set()
+        return flight.result, flight.waiters > 0
+
+    def forget(self, table: str) -> None:
+        """Stop new callers from joining reads of table that are already in flight"""
+        with self._lock:
+            for flight_key in [flight_key for flight_key in self._flights if flight_key[0] == table]:
+                del self._flights[flight_key]
+
+    def stats(self) -> CoalescingStats:
+        with self._lock:
+            return CoalescingStats(executed=self._stats.executed, coalesced=self._stats.coalesced)
+
+
+class AsyncSingleFlight:
+    """Coalescing of identical coroutines running on the same event loop"""
+
+    def __init__(self):
+        self._flights: Dict[Tuple[int, str, Hashable], "asyncio.Future"] = {}
+        self._waiters: Dict[int, int] = {}
+        self._stats = CoalescingStats()
+
+    async def do(self, table: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Async counterpart of SingleFlight.do"""
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), table, key)
+
+        future = self._flights.get(flight_key)
+        if future is not None:
+            self._stats.coalesced += 1
+            self._waiters[id(future)] = self._waiters.get(id(future), 0) + 1
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled, not us: run the read ourselves
+
+        future = loop.create_future()
+        self._flights[flight_key] = future
+        self._stats.executed += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved so an unobserved failure is not logged twice
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            if self._flights.get(flight_key) is future:
+                del self._flights[flight_key]
+            shared = self._waiters.pop(id(future), 0) > 0
+        return result, shared
+
+    def forget(self, table: str) -> None:
+        """Stop new callers from joining reads of table that are already in flight"""
+        for flight_key in [flight_key for flight_key in self._flights if flight_key[1] == table]:
+            del self._flights[flight_key]
+
+    def stats(self) -> CoalescingStats:
+        return CoalescingStats(executed=self._stats.executed, coalesced=self._stats.coalesced)
+
+
+def _coalescing_enabled() -> bool:
+    return os.getenv("SUPABASE_COALESCE_READS", "true").lower() not in ("0", "false", "no")
+
+
+_shared_flights = SingleFlight()
+_shared_async_flights = AsyncSingleFlight()
+
+
+def get_singleflight() -> Optional[SingleFlight]:
+    """Process-wide SingleFlight, or None when SUPABASE_COALESCE_READS is off"""
+    return _shared_flights if _coalescing_enabled() else None
+
+
+def get_async_singleflight() -> Optional[AsyncSingleFlight]:
+    """Process-wide AsyncSingleFlight, or None when SUPABASE_COALESCE_READS is off"""
+    return _shared_async_flights if _coalescing_enabled() else None
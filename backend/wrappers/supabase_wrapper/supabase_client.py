@@ -1,6 +1,7 @@
 import os
 from supabase import create_client, ClientOptions
 from dotenv import load_dotenv
+from .resilience import client_timeout
 
 load_dotenv()
 
@@ -16,12 +17,13 @@ class SupabaseClient:
         if cls._instance is None:
             cls._instance = super(SupabaseClient, cls).__new__(cls)
 
-            # Create client with connection timeout settings for Windows
+            # Create client with connection timeout settings for Windows;
+            # SUPABASE_TIMEOUT_SECONDS bounds how long a slow upstream can hold a worker
             cls._client = create_client(
                 os.getenv("SUPABASE_URL"),
                 os.getenv("SUPABASE_KEY"),
                 options=ClientOptions(
-                    postgrest_client_timeout=30,
+                    postgrest_client_timeout=client_timeout(),
                     storage_client_timeout=30,
                 )
             )
@@ -1,22 +1,128 @@
-from typing import List, Dict, Any, Optional
+import functools
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Iterator, Sequence, Callable
 from .supabase_client import SupabaseClient
+from backend.wrappers.crud_backend import CRUDBackend, OrderSpec, normalize_order
+from backend.wrappers.table_events import notify_write, written_rows
+from .filters import FilterSpec, Condition, Filter, apply_filters, normalize_filters, eq, gt, lt, in_, and_, or_
+from .query_cache import QueryCache, get_shared_cache, make_cache_key
+from .resilience import ExecutionPolicy, get_execution_policy, disable_builtin_retry
+from .fast_json import executor
+from .singleflight import SingleFlight, get_singleflight
+from .instrumentation import current_query_log, instrumented, query_fingerprint, query_shape, payload_digest
+
+# Rows fetched per request by select_iter. Kept at or below PostgREST's default
+# max-rows (1000) so a page is never silently truncated by the server.
+DEFAULT_PAGE_SIZE = 1000
+
+# Rows (or ids) sent per request by the bulk write methods. Large enough to
+# amortise round trips, small enough to keep request bodies and id lists short.
+DEFAULT_BATCH_SIZE = 500
+
+# PostgREST count methods accepted by count()
+COUNT_MODES = ("exact", "planned", "estimated")
+
+
+@dataclass
+class ChunkError:
+    """A failed chunk of a bulk write"""
+    chunk_index: int
+    size: int
+    error: str
+    keys: List[Any] = field(default_factory=list)
+
+
+@dataclass
+class BulkWriteResult:
+    """
+    Outcome of a chunked bulk write
 
-
-class SupabaseCRUD:
+    Chunks are independent requests: a failed chunk is recorded in errors
+    and the remaining chunks are still attempted.
+    """
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[ChunkError] = field(default_factory=list)
+    chunks: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class BulkWriteError(Exception):
+    """Raised by insert_many when one or more chunks failed"""
+
+    def __init__(self, result: BulkWriteResult):
+        self.result = result
+        failed = ", ".join(f"#{e.chunk_index}: {e.error}" for e in result.errors)
+        super().__init__(f"{len(result.errors)} of {result.chunks} chunks failed ({failed})")
+
+
+def _invalidates_cache(method):
+    """Drop the written table's cached query results and in-flight reads once the write has been sent"""
+    @functools.wraps(method)
+    def wrapper(self, table, *args, **kwargs):
+        rows = None
+        try:
+            result = method(self, table, *args, **kwargs)
+            rows = written_rows(result)
+            return result
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(table)
+            if self.flights is not None:
+                self.flights.forget(table)
+            notify_write(table, method.__name__, rows)
+    return wrapper
+
+
+def probe_column(filters: Optional[FilterSpec]) -> str:
+    """Cheapest column to fetch for an existence check: one the filters already reference"""
+    for condition in normalize_filters(filters):
+        if isinstance(condition, Filter):
+            return condition.column
+    return "*"
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    if size <= 0:
+        raise ValueError("batch_size must be positive")
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class SupabaseCRUD(CRUDBackend):
     """
     General-purpose CRUD operations for Supabase
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[QueryCache] = None,
+        policy: Optional[ExecutionPolicy] = None,
+        flights: Optional[SingleFlight] = None
+    ):
+        """
+        Args:
+            cache: Read-through cache for select/count; defaults to the shared
+                process cache when SUPABASE_QUERY_CACHE is enabled, else none
+            policy: Timeouts, retries and circuit breaker for every round trip;
+                defaults to the shared process policy
+            flights: Coalescing of identical concurrent reads; defaults to the
+                shared SingleFlight unless SUPABASE_COALESCE_READS is off
+        """
         self.client = SupabaseClient().client
+        self.cache = cache if cache is not None else get_shared_cache()
+        self.policy = policy or get_execution_policy()
+        self.flights = flights if flights is not None else get_singleflight()
 
     def select(
         self,
         table: str,
         columns: str = "*",
-        filters: Optional[Dict[str, Any]] = None,
+        filters: Optional[FilterSpec] = None,
         limit: Optional[int] = None,
-        order_by: Optional[str] = None,
+        order_by: Optional[OrderSpec] = None,
         ascending: bool = True
     ) -> List[Dict[str, Any]]:
         """
@@ -25,29 +131,124 @@ class SupabaseCRUD:
         Args:
             table: Table name
             columns: Columns to select (default: "*")
-            filters: Dictionary of column: value filters
+            filters: Dictionary of column: value equality filters, or a list of
+                filter conditions from supabase_wrapper.filters (in_, contains, gte, or_, ...)
             limit: Maximum number of rows to return
-            order_by: Column to order by
+            order_by: Column to order by, or several columns (later ones break ties)
             ascending: Sort order (True for ASC, False for DESC)
 
         Returns:
             List of dictionaries containing the results
         """
-        query = self.client.table(table).select(columns)
+        order_by = normalize_order(order_by)
+        cache_key = make_cache_key("select", columns, filters, limit, order_by, ascending)
+        if self.cache is not None:
+            hit, rows = self.cache.get(table, cache_key)
+            if hit:
+                # Hand out copies so callers cannot mutate the cached rows
+                return [dict(row) for row in rows]
+        generation = self.cache.generation(table) if self.cache is not None else None
 
-        if filters:
-            for column, value in filters.items():
-                query = query.eq(column, value)
+        query = self.client.table(table).select(columns)
+        query = apply_filters(query, filters)
 
-        if order_by:
-            query = query.order(order_by, desc=not ascending)
+        for column in order_by:
+            query = query.order(column, desc=not ascending)
 
         if limit:
             query = query.limit(limit)
 
-        result = query.execute()
+        result, shared = self._read(
+            table, cache_key, lambda: self._execute(query, table, "select", columns, filters, limit, ",".join(order_by) or None, ascending)
+        )
+        if self.cache is not None and result.data is not None:
+            self.cache.set(table, cache_key, [dict(row) for row in result.data], generation)
+        if shared and result.data is not None:
+            # Every joined caller got this same response; hand each its own rows
+            return [dict(row) for row in result.data]
         return result.data
 
+    def select_iter(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[FilterSpec] = None,
+        key_columns: Sequence[str] = ("id",),
+        page_size: int = DEFAULT_PAGE_SIZE,
+        ascending: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over a table using keyset pagination
+
+        Pages are requested in key order and each page starts strictly after the
+        last key of the previous one, so memory stays bounded by page_size and
+        results are never cut off by PostgREST's max-rows limit.
+
+        Args:
+            table: Table name
+            columns: Columns to select (key columns are added if missing)
+            filters: Dictionary of column: value filters or list of filter conditions
+            key_columns: Unique, non-null ordering key, e.g. ("id",) or ("due_date", "id")
+            page_size: Number of rows fetched per request
+            ascending: Iterate in ascending (True) or descending (False) key order
+
+        Yields:
+            Row dictionaries in key order
+        """
+        if not key_columns:
+            raise ValueError("select_iter requires at least one key column")
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+
+        columns = self._with_key_columns(columns, key_columns)
+        base_conditions = normalize_filters(filters)
+        last_key: Optional[tuple] = None
+
+        while True:
+            conditions = list(base_conditions)
+            if last_key is not None:
+                conditions.append(self._keyset_condition(key_columns, last_key, ascending))
+
+            query = self.client.table(table).select(columns)
+            query = apply_filters(query, conditions)
+            for column in key_columns:
+                query = query.order(column, desc=not ascending)
+            query = query.limit(page_size)
+
+            rows = self._execute(query, table, "select", columns, conditions, page_size).data or []
+            yield from rows
+
+            if len(rows) < page_size:
+                return
+
+            last_key = tuple(rows[-1].get(column) for column in key_columns)
+            if any(value is None for value in last_key):
+                raise ValueError(f"select_iter key columns {tuple(key_columns)} must not be null")
+
+    @staticmethod
+    def _with_key_columns(columns: str, key_columns: Sequence[str]) -> str:
+        """Make sure the keyset columns are part of the projection"""
+        if columns.strip() == "*":
+            return columns
+        selected = [column.strip() for column in columns.split(",")]
+        missing = [column for column in key_columns if column not in selected]
+        return ", ".join(selected + missing)
+
+    @staticmethod
+    def _keyset_condition(key_columns: Sequence[str], last_key: tuple, ascending: bool) -> Condition:
+        """
+        Build the "row key is after last_key" predicate
+
+        For keys (a, b) ascending this is: a > x OR (a = x AND b > y)
+        """
+        after = gt if ascending else lt
+        branches = []
+        for position, column in enumerate(key_columns):
+            equal_prefix = [eq(key_columns[i], last_key[i]) for i in range(position)]
+            branches.append(and_(*equal_prefix, after(column, last_key[position])) if equal_prefix else after(column, last_key[position]))
+        return branches[0] if len(branches) == 1 else or_(*branches)
+
+    @_invalidates_cache
     def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Insert a single record into a table
@@ -59,28 +260,193 @@ class SupabaseCRUD:
         Returns:
             Dictionary containing the inserted record
         """
-        result = self.client.table(table).insert(data).execute()
+        result = self._execute(self.client.table(table).insert(data), table, "insert", "", None, payload_digest(data))
         return result.data[0] if result.data else None
 
-    def insert_many(self, table: str, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    @_invalidates_cache
+    def insert_many(
+        self,
+        table: str,
+        data: List[Dict[str, Any]],
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> List[Dict[str, Any]]:
         """
         Insert multiple records into a table
 
         Args:
             table: Table name
             data: List of dictionaries containing records
+            batch_size: Maximum records sent per request
 
         Returns:
             List of dictionaries containing the inserted records
+
+        Raises:
+            BulkWriteError: If any chunk failed (rows from successful chunks are on err.result)
         """
-        result = self.client.table(table).insert(data).execute()
-        return result.data
+        if not data:
+            return []
+
+        result = self._write_in_chunks(
+            data,
+            batch_size,
+            lambda chunk: self._execute(
+                self.client.table(table).insert(list(chunk)), table, "insert", "", None, payload_digest(chunk)
+            ),
+        )
+        if not result.ok:
+            raise BulkWriteError(result)
+        return result.rows
+
+    @_invalidates_cache
+    def upsert_many(
+        self,
+        table: str,
+        data: List[Dict[str, Any]],
+        on_conflict: str = "id",
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> BulkWriteResult:
+        """
+        Insert or update multiple records, matching existing rows on on_conflict
+
+        Rows in one request must share the same keys; missing keys are written as NULL.
 
+        Args:
+            table: Table name
+            data: List of dictionaries containing full records
+            on_conflict: Unique column(s) used to detect existing rows
+            batch_size: Maximum records sent per request
+
+        Returns:
+            BulkWriteResult with the written rows and any failed chunks
+        """
+        return self._write_in_chunks(
+            data,
+            batch_size,
+            lambda chunk: self._execute(
+                self.client.table(table).upsert(list(chunk), on_conflict=on_conflict),
+                table, "upsert", "", None, payload_digest(chunk)
+            ),
+            key_of=self._conflict_key_of(on_conflict),
+        )
+
+    @_invalidates_cache
+    def update_many(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        ids: Sequence[Any],
+        id_column: str = "id",
+        filters: Optional[FilterSpec] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> BulkWriteResult:
+        """
+        Apply the same update to every record whose id is in ids
+
+        Args:
+            table: Table name
+            data: Dictionary of column: value pairs to update
+            ids: Ids of the records to update
+            id_column: Column the ids refer to
+            filters: Optional extra filters every updated record must match
+            batch_size: Maximum ids per request
+
+        Returns:
+            BulkWriteResult with the updated rows and any failed chunks
+        """
+        extra = normalize_filters(filters)
+
+        def update_chunk(chunk):
+            conditions = [in_(id_column, chunk), *extra]
+            query = apply_filters(self.client.table(table).update(data), conditions)
+            return self._execute(query, table, "update", "", conditions, payload_digest(data))
+
+        return self._write_in_chunks(list(ids), batch_size, update_chunk, key_of=lambda key: key)
+
+    @_invalidates_cache
+    def delete_many(
+        self,
+        table: str,
+        ids: Sequence[Any],
+        id_column: str = "id",
+        filters: Optional[FilterSpec] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> BulkWriteResult:
+        """
+        Delete every record whose id is in ids
+
+        Args:
+            table: Table name
+            ids: Ids of the records to delete
+            id_column: Column the ids refer to
+            filters: Optional extra filters every deleted record must match
+            batch_size: Maximum ids per request
+
+        Returns:
+            BulkWriteResult with the deleted rows and any failed chunks
+        """
+        extra = normalize_filters(filters)
+
+        def delete_chunk(chunk):
+            conditions = [in_(id_column, chunk), *extra]
+            query = apply_filters(self.client.table(table).delete(), conditions)
+            return self._execute(query, table, "delete", "", conditions)
+
+        return self._write_in_chunks(list(ids), batch_size, delete_chunk, key_of=lambda key: key)
+
+    def _read(self, table: str, key: Any, execute: Callable[[], Any]):
+        """Run a read, joining an identical one already in flight; returns (response, shared)"""
+        if self.flights is None:
+            return execute(), False
+        return self.flights.do(table, key, execute)
+
+    def _execute(self, query, table: str, operation: str, columns: str = "", filters: Optional[FilterSpec] = None, *extra: Any):
+        """Send a built query under the execution policy, recording it in the request's QueryLog when one is active"""
+        disable_builtin_retry(query)
+        execute = executor(query)
+        if current_query_log() is None:
+            return self.policy.run(operation, execute)
+        fingerprint = query_fingerprint(operation, table, columns, filters, *extra)
+        shape = query_shape(operation, table, filters)
+        return self.policy.run(operation, lambda: instrumented(table, operation, fingerprint, execute, shape=shape))
+
+    @staticmethod
+    def _conflict_key_of(on_conflict: str) -> Callable[[Dict[str, Any]], Any]:
+        """Key reported in ChunkError.keys for a row: its on_conflict value, a tuple for composite keys"""
+        columns = [column.strip() for column in on_conflict.split(",")]
+        if len(columns) == 1:
+            return lambda row: row.get(columns[0])
+        return lambda row: tuple(row.get(column) for column in columns)
+
+    @staticmethod
+    def _write_in_chunks(
+        items: Sequence[Any],
+        batch_size: int,
+        execute_chunk: Callable[[Sequence[Any]], Any],
+        key_of: Optional[Callable[[Any], Any]] = None
+    ) -> BulkWriteResult:
+        """Run execute_chunk for every chunk of items, collecting rows and per-chunk errors"""
+        result = BulkWriteResult()
+        for index, chunk in enumerate(_chunks(items, batch_size)):
+            result.chunks += 1
+            try:
+                response = execute_chunk(chunk)
+                result.rows.extend(response.data or [])
+            except Exception as e:
+                result.errors.append(ChunkError(
+                    chunk_index=index,
+                    size=len(chunk),
+                    error=str(e),
+                    keys=[key_of(item) for item in chunk] if key_of else [],
+                ))
+        return result
+
+    @_invalidates_cache
     def update(
         self,
         table: str,
         data: Dict[str, Any],
-        filters: Dict[str, Any]
+        filters: FilterSpec
     ) -> List[Dict[str, Any]]:
         """
         Update records in a table
@@ -88,67 +454,97 @@ class SupabaseCRUD:
         Args:
             table: Table name
             data: Dictionary of column: value pairs to update
-            filters: Dictionary of column: value filters to match records
+            filters: Dictionary of column: value filters or list of filter conditions to match records
 
         Returns:
             List of dictionaries containing the updated records
         """
         query = self.client.table(table).update(data)
+        query = apply_filters(query, filters)
 
-        for column, value in filters.items():
-            query = query.eq(column, value)
-
-        result = query.execute()
+        result = self._execute(query, table, "update", "", filters, payload_digest(data))
         return result.data
 
-    def delete(self, table: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    @_invalidates_cache
+    def delete(self, table: str, filters: FilterSpec) -> List[Dict[str, Any]]:
         """
         Delete records from a table
 
         Args:
             table: Table name
-            filters: Dictionary of column: value filters to match records
+            filters: Dictionary of column: value filters or list of filter conditions to match records
 
         Returns:
             List of dictionaries containing the deleted records
         """
         query = self.client.table(table).delete()
+        query = apply_filters(query, filters)
 
-        for column, value in filters.items():
-            query = query.eq(column, value)
-
-        result = query.execute()
+        result = self._execute(query, table, "delete", "", filters)
         return result.data
 
-    def count(self, table: str, filters: Optional[Dict[str, Any]] = None) -> int:
+    def count(self, table: str, filters: Optional[FilterSpec] = None, mode: str = "exact") -> int:
         """
         Count records in a table
 
+        Sends a HEAD request, so only the count comes back, never the rows.
+
         Args:
             table: Table name
-            filters: Optional dictionary of column: value filters
+            filters: Optional dictionary of column: value filters or list of filter conditions
+            mode: "exact" runs COUNT(*); "planned" returns the query planner's
+                estimate (cheapest, fine for dashboards); "estimated" is exact for
+                small results and planned beyond PostgREST's max-rows
 
         Returns:
             Number of matching records
         """
-        query = self.client.table(table).select("*", count="exact")
-
-        if filters:
-            for column, value in filters.items():
-                query = query.eq(column, value)
-
-        result = query.execute()
+        if mode not in COUNT_MODES:
+            raise ValueError(f"Unknown count mode '{mode}'. Use one of {COUNT_MODES}.")
+
+        cache_key = make_cache_key("count", "*", filters, mode)
+        if self.cache is not None:
+            hit, cached_count = self.cache.get(table, cache_key)
+            if hit:
+                return cached_count
+        generation = self.cache.generation(table) if self.cache is not None else None
+
+        query = self.client.table(table).select("*", count=mode, head=True)
+        query = apply_filters(query, filters)
+
+        result, _ = self._read(table, cache_key, lambda: self._execute(query, table, "count", "*", filters, mode))
+        if self.cache is not None and result.count is not None:
+            self.cache.set(table, cache_key, result.count, generation)
         return result.count
 
-    def exists(self, table: str, filters: Dict[str, Any]) -> bool:
+    def exists(self, table: str, filters: FilterSpec, column: Optional[str] = None) -> bool:
         """
         Check if a record exists
 
+        Fetches at most one row of a single column instead of counting matches.
+
         Args:
             table: Table name
-            filters: Dictionary of column: value filters
+            filters: Dictionary of column: value filters or list of filter conditions
+            column: Column to fetch; defaults to the first filtered column
 
         Returns:
             True if record exists, False otherwise
         """
-        return self.count(table, filters) > 0
+        column = column or probe_column(filters)
+
+        cache_key = make_cache_key("exists", column, filters)
+        if self.cache is not None:
+            hit, found = self.cache.get(table, cache_key)
+            if hit:
+                return found
+        generation = self.cache.generation(table) if self.cache is not None else None
+
+        query = self.client.table(table).select(column)
+        query = apply_filters(query, filters).limit(1)
+
+        result, _ = self._read(table, cache_key, lambda: self._execute(query, table, "select", column, filters, 1))
+        found = bool(result.data)
+        if self.cache is not None:
+            self.cache.set(table, cache_key, found, generation)
+        return found
@@ -0,0 +1,143 @@
+"""
+In-process notifications for table writes.
+
+Every write made through a CRUD backend (SupabaseCRUD, AsyncSupabaseCRUD,
+SQLiteCRUD) calls ``notify_write(table)`` once it has been sent, whether it
+succeeded or not. In-memory views derived from a table (for example the user
+directory) subscribe with ``on_write`` and refresh themselves instead of
+waiting for a TTL.
+
+Views that can apply a write incrementally subscribe with ``on_change``
+instead and receive a ``TableChange`` carrying the rows the write returned
+(``rows`` is None when they are not known, e.g. the write raised, in which
+case the view should rebuild).
+
+Each table also has a change counter, bumped by every notify_write, so
+callers can tell cheaply whether a table was written since they last looked
+(``table_version``); the conditional GET support in backend.core.etag is built
+on it.
+
+Only writes made by this process are seen; anything derived from a table must
+still expire on its own to pick up writes from other processes.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TableChange:
+    """A write to one table, as seen by on_change listeners"""
+    table: str
+    # Name of the CRUD method that wrote, e.g. "insert", "update_many", "delete"
+    operation: Optional[str] = None
+    # Rows returned by the write; None when unknown
+    rows: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def deleted(self) -> bool:
+        """Whether rows were removed rather than inserted or updated"""
+        return (self.operation or "").startswith("delete")
+
+
+_listeners: Dict[str, List[Callable[[str], None]]] = {}
+_change_listeners: Dict[str, List[Callable[[TableChange], None]]] = {}
+_versions: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def on_write(table: str, callback: Callable[[str], None]) -> None:
+    """
+    Call callback(table) after every write to table
+
+    Args:
+        table: Table name
+        callback: Called with the table name; must be cheap and must not raise
+    """
+    with _lock:
+        _listeners.setdefault(table, []).append(callback)
+
+
+def on_change(table: str, callback: Callable[[TableChange], None]) -> None:
+    """
+    Call callback(change) after every write to table
+
+    Args:
+        table: Table name
+        callback: Called with a TableChange; must be cheap and must not raise
+    """
+    with _lock:
+        _change_listeners.setdefault(table, []).append(callback)
+
+
+def remove_listener(table: str, callback: Callable) -> None:
+    """Stop calling callback (registered with on_write or on_change) for writes to table"""
+    with _lock:
+        for registry in (_listeners, _change_listeners):
+            callbacks = registry.get(table, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+
+def written_rows(result: Any) -> Optional[List[Dict[str, Any]]]:
+    """
+    Rows a CRUD write returned, in the shape TableChange.rows expects
+
+    Args:
+        result: Return value of insert/update/delete (a row or a list of
+            rows) or of a bulk write (BulkWriteResult)
+
+    Returns:
+        The rows, or None if the result does not say reliably what was
+        written (e.g. a bulk write with failed chunks)
+    """
+    if isinstance(result, dict):
+        return [result]
+    if isinstance(result, list):
+        return result
+    if hasattr(result, "rows") and getattr(result, "ok", False):
+        return list(result.rows)
+    return None
+
+
+def notify_write(table: str, operation: Optional[str] = None, rows: Optional[List[Dict[str, Any]]] = None) -> None:
+    """
+    Tell subscribers that table was written
+
+    Args:
+        table: Table name
+        operation: Name of the CRUD method that wrote, if known
+        rows: Rows the write returned, or None if unknown
+    """
+    with _lock:
+        _versions[table] = _versions.get(table, 0) + 1
+        callbacks = list(_listeners.get(table, ()))
+        change_callbacks = list(_change_listeners.get(table, ()))
+    for callback in callbacks:
+        try:
+            callback(table)
+        except Exception:
+            logger.exception("table write listener failed for %s", table)
+    if not change_callbacks:
+        return
+    change = TableChange(table, operation, rows)
+    for change_callback in change_callbacks:
+        try:
+            change_callback(change)
+        except Exception:
+            logger.exception("table change listener failed for %s", table)
+
+
+def table_version(table: str) -> int:
+    """Number of writes to table seen by this process"""
+    with _lock:
+        return _versions.get(table, 0)
+
+
+def table_versions(tables: Iterable[str]) -> Tuple[int, ...]:
+    """table_version of each table, read under one lock"""
+    with _lock:
+        return tuple(_versions.get(table, 0) for table in tables)